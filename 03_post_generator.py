@@ -394,12 +394,18 @@ def generate(
 
             # Regenerate failed posts with quality profile
             regenerator = PostRegenerator(quality_profile=profile)
-            regenerated_posts, regen_stats = regenerator.regenerate_failed_posts(
+            regen_kwargs = dict(
                 posts=posts,
                 templates=selected_templates,
                 client_brief=client_brief,
                 system_prompt=None,  # Will build fresh system prompt
             )
+            if settings.PARALLEL_GENERATION:
+                regenerated_posts, regen_stats = asyncio.run(
+                    regenerator.regenerate_failed_posts_async(**regen_kwargs)
+                )
+            else:
+                regenerated_posts, regen_stats = regenerator.regenerate_failed_posts(**regen_kwargs)
 
             posts = regenerated_posts  # Update with regenerated versions
 
@@ -660,6 +666,15 @@ def interactive(brief_file: Optional[str]):
     help="Number of blog posts to generate (default: 5)",
     type=int,
 )
+@click.option(
+    "--teaser-platform",
+    "-t",
+    "teaser_platforms",
+    multiple=True,
+    default=("twitter", "facebook"),
+    help="Platform to write blog teasers for; repeat for several (default: twitter, facebook)",
+    type=click.Choice(["twitter", "facebook", "linkedin"], case_sensitive=False),
+)
 @click.option(
     "--output-dir",
     "-o",
@@ -670,15 +685,18 @@ def generate_multi_platform(
     brief_file: str,
     client_name: str,
     num_blog_posts: int,
+    teaser_platforms: tuple,
     output_dir: Optional[str],
 ):
     """
     Generate multi-platform content package with blog posts and social teasers
 
-    Creates blog posts with Twitter and Facebook teasers that link to them.
+    Creates blog posts with teasers that link to them. Each blog post's teasers
+    start as soon as that post is written, sharing the API concurrency limit.
 
     Example:
         python 03_post_generator.py generate-multi-platform brief.txt -c "Acme Corp" -b 5
+        python 03_post_generator.py generate-multi-platform brief.txt -c "Acme Corp" -t linkedin -t twitter
     """
     start_time = time.time()
     log_client_start(client_name)
@@ -704,32 +722,32 @@ def generate_multi_platform(
         # Generate multi-platform content
         console.print("\n[cyan]Generating multi-platform content package...[/cyan]")
         console.print(f"[dim]Blog posts: {num_blog_posts}[/dim]")
-        console.print(f"[dim]Twitter teasers: {num_blog_posts}[/dim]")
-        console.print(f"[dim]Facebook teasers: {num_blog_posts}[/dim]")
+        platforms = [Platform(name.lower()) for name in dict.fromkeys(teaser_platforms)]
+        for teaser_platform in platforms:
+            console.print(f"[dim]{teaser_platform.value.title()} teasers: {num_blog_posts}[/dim]")
 
         generator = ContentGeneratorAgent()
 
-        # Use async generation
+        # Blog posts and their teasers are generated as one pipelined async run
         content_package = asyncio.run(
             generator.generate_multi_platform_with_blog_links_async(
                 client_brief=client_brief,
                 num_blog_posts=num_blog_posts,
-                social_teasers_per_blog=2,  # 1 Twitter + 1 Facebook
                 max_concurrent=settings.MAX_CONCURRENT_API_CALLS,
+                teaser_platforms=platforms,
             )
         )
 
         # Extract posts from package
         blog_posts = content_package["blog"]
-        twitter_posts = content_package["twitter"]
-        facebook_posts = content_package["facebook"]
-        all_posts = blog_posts + twitter_posts + facebook_posts
-
-        console.print(
-            f"[green]OK[/green] Generated {len(blog_posts)} blog + "
-            f"{len(twitter_posts)} Twitter + {len(facebook_posts)} Facebook posts"
+        teaser_posts = {platform: content_package[platform.value] for platform in platforms}
+        all_posts = blog_posts + [post for posts in teaser_posts.values() for post in posts]
+        package_counts = f"{len(blog_posts)} blog + " + " + ".join(
+            f"{len(posts)} {platform.value.title()}" for platform, posts in teaser_posts.items()
         )
 
+        console.print(f"[green]OK[/green] Generated {package_counts} posts")
+
         # Run QA on all posts together
         console.print("\n[cyan]Running quality assurance...[/cyan]")
         qa_agent = QAAgent()
@@ -761,15 +779,9 @@ def generate_multi_platform(
 
         # Also save platform-specific files
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        blog_file = formatter.output_dir / client_name / f"{client_name}_{timestamp}_blog_posts.txt"
-        twitter_file = (
-            formatter.output_dir / client_name / f"{client_name}_{timestamp}_twitter_teasers.txt"
-        )
-        facebook_file = (
-            formatter.output_dir / client_name / f"{client_name}_{timestamp}_facebook_teasers.txt"
-        )
-
-        blog_file.parent.mkdir(parents=True, exist_ok=True)
+        client_dir = formatter.output_dir / client_name
+        blog_file = client_dir / f"{client_name}_{timestamp}_blog_posts.txt"
+        client_dir.mkdir(parents=True, exist_ok=True)
 
         # Write blog posts
         with open(blog_file, "w", encoding="utf-8") as f:
@@ -780,28 +792,23 @@ def generate_multi_platform(
                 f.write(post.content)
                 f.write("\n\n" + "=" * 80 + "\n\n")
 
-        # Write Twitter teasers
-        with open(twitter_file, "w", encoding="utf-8") as f:
-            for i, post in enumerate(twitter_posts, 1):
-                f.write(f"=== TWITTER TEASER #{i} ===\n")
-                f.write(f"Links to: {post.blog_title}\n")
-                f.write(f"Link: {post.blog_link_placeholder}\n\n")
-                f.write(post.content)
-                f.write("\n\n" + "=" * 80 + "\n\n")
-
-        # Write Facebook teasers
-        with open(facebook_file, "w", encoding="utf-8") as f:
-            for i, post in enumerate(facebook_posts, 1):
-                f.write(f"=== FACEBOOK TEASER #{i} ===\n")
-                f.write(f"Links to: {post.blog_title}\n")
-                f.write(f"Link: {post.blog_link_placeholder}\n\n")
-                f.write(post.content)
-                f.write("\n\n" + "=" * 80 + "\n\n")
+        # Write teasers, one file per platform
+        teaser_files = {}
+        for platform, posts in teaser_posts.items():
+            teaser_file = client_dir / f"{client_name}_{timestamp}_{platform.value}_teasers.txt"
+            with open(teaser_file, "w", encoding="utf-8") as f:
+                for i, post in enumerate(posts, 1):
+                    f.write(f"=== {platform.value.upper()} TEASER #{i} ===\n")
+                    f.write(f"Links to: {post.blog_title}\n")
+                    f.write(f"Link: {post.blog_link_placeholder}\n\n")
+                    f.write(post.content)
+                    f.write("\n\n" + "=" * 80 + "\n\n")
+            teaser_files[platform.value] = teaser_file
 
         console.print("[green]OK[/green] Saved multi-platform package:\n")
         console.print(f"  • blog: {blog_file}")
-        console.print(f"  • twitter: {twitter_file}")
-        console.print(f"  • facebook: {facebook_file}")
+        for platform_name, teaser_file in teaser_files.items():
+            console.print(f"  • {platform_name}: {teaser_file}")
         console.print(f"  • combined: {output_files['markdown']}")
 
         # Register project in revision tracking database
@@ -823,7 +830,7 @@ def generate_multi_platform(
                 num_posts=len(all_posts),
                 quality_profile_name="multi_platform",  # Special profile for multi-platform
                 status=ProjectStatus.COMPLETED,
-                notes=f"Multi-platform: {len(blog_posts)} blog, {len(twitter_posts)} Twitter, {len(facebook_posts)} Facebook",
+                notes=f"Multi-platform: {package_counts}",
             )
 
             db.create_project(project)
@@ -1804,11 +1811,24 @@ def forget_client(client: str, confirm: bool):
     default="mixed",
     help="Source of samples",
 )
-def upload_voice_samples(client: str, files: Optional[str], directory: Optional[str], source: str):
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="Parser processes for bulk uploads (default: CPU count)",
+)
+def upload_voice_samples(
+    client: str,
+    files: Optional[str],
+    directory: Optional[str],
+    source: str,
+    workers: Optional[int],
+):
     """
     Upload client voice samples for authentic voice matching
 
-    Supports: .txt, .md, .docx, .html, .json
+    Supports: .txt, .md, .docx, .html, .json (and .zip archives of these)
     Requirements: 100-2000 words per sample, minimum 500 words total
 
     Examples:
@@ -1817,13 +1837,21 @@ def upload_voice_samples(client: str, files: Optional[str], directory: Optional[
 
         # Upload all files from directory
         python 03_post_generator.py upload-voice-samples -c "Acme" -d "samples/" -s mixed
+
+        # Upload a zip export of old posts
+        python 03_post_generator.py upload-voice-samples -c "Acme" -f "old_posts.zip" -s linkedin
     """
+    import tempfile
     from pathlib import Path
 
     from src.agents.voice_analyzer import VoiceAnalyzer
     from src.database.project_db import ProjectDatabase
     from src.models.voice_sample import VoiceSampleBatch, VoiceSampleUpload
-    from src.utils.file_parser import extract_text_from_file, validate_sample_text
+    from src.utils.file_parser import (
+        collect_sample_files,
+        extract_texts_from_files,
+        validate_sample_text,
+    )
 
     try:
         console.print(f"\n[bold cyan]Uploading voice samples for {client}...[/bold cyan]\n")
@@ -1833,56 +1861,68 @@ def upload_voice_samples(client: str, files: Optional[str], directory: Optional[
             console.print("[red]ERROR:[/red] Must provide either --files or --directory")
             sys.exit(1)
 
-        # Collect file paths
-        file_paths = []
+        # Collect input paths
+        input_paths = []
         if files:
-            file_paths = [Path(f.strip()) for f in files.split(",")]
+            input_paths = [Path(f.strip()) for f in files.split(",")]
         elif directory:
             dir_path = Path(directory)
             if not dir_path.exists():
                 console.print(f"[red]ERROR:[/red] Directory not found: {directory}")
                 sys.exit(1)
+            input_paths = [dir_path]
 
-            # Find supported files
-            extensions = ["*.txt", "*.md", "*.docx", "*.html", "*.json"]
-            for ext in extensions:
-                file_paths.extend(dir_path.glob(ext))
-
-        if not file_paths:
-            console.print("[red]ERROR:[/red] No valid files found")
-            sys.exit(1)
-
-        # Extract and validate samples
         samples = []
         total_words = 0
+        duplicates = 0
 
-        for file_path in file_paths:
-            try:
-                console.print(f"📄 Loading {file_path.name}...", end=" ")
+        with tempfile.TemporaryDirectory(prefix="voice_samples_") as extract_dir:
+            # Expand directories and zip archives
+            file_paths = collect_sample_files(input_paths, Path(extract_dir))
 
-                text, word_count = extract_text_from_file(file_path)
+            if not file_paths:
+                console.print("[red]ERROR:[/red] No valid files found")
+                sys.exit(1)
 
-                # Validate
-                is_valid, error_msg = validate_sample_text(text)
-                if not is_valid:
-                    console.print(f"[yellow]SKIPPED:[/yellow] {error_msg}")
-                    continue
+            console.print(f"📄 Parsing {len(file_paths)} files...\n")
+            results = extract_texts_from_files(file_paths, max_workers=workers)
+
+        # Validate and dedupe samples
+        seen_hashes = set()
+        for result in results:
+            name = result.path.name
+            if result.error:
+                console.print(f"  {name}: [red]ERROR:[/red] {result.error}")
+                continue
 
+            is_valid, error_msg = validate_sample_text(result.text)
+            if not is_valid:
+                console.print(f"  {name}: [yellow]SKIPPED:[/yellow] {error_msg}")
+                continue
+
+            if result.content_hash in seen_hashes:
+                duplicates += 1
+                continue
+            seen_hashes.add(result.content_hash)
+
+            try:
                 sample = VoiceSampleUpload(
                     client_name=client,
-                    sample_text=text,
+                    sample_text=result.text,
                     sample_source=source,
-                    word_count=word_count,
-                    file_name=file_path.name,
+                    word_count=result.word_count,
+                    file_name=name,
                 )
-                samples.append(sample)
-                total_words += word_count
-                console.print(f"[green]✓[/green] ({word_count} words)")
-
             except Exception as e:
-                console.print(f"[red]ERROR:[/red] {str(e)}")
+                console.print(f"  {name}: [red]ERROR:[/red] {str(e)}")
                 continue
 
+            samples.append(sample)
+            total_words += result.word_count
+
+        if duplicates:
+            console.print(f"[yellow]Skipped {duplicates} duplicate samples[/yellow]")
+
         if not samples:
             console.print("\n[red]ERROR:[/red] No valid samples to upload")
             sys.exit(1)
@@ -1907,12 +1947,16 @@ def upload_voice_samples(client: str, files: Optional[str], directory: Optional[
             samples=[s.sample_text for s in samples], client_name=client, source=source
         )
 
-        # Store samples in database
+        # Store samples in database (one transaction, skips already-stored duplicates)
         db = ProjectDatabase()
-        for sample in samples:
-            db.store_voice_sample_upload(sample)
+        stored = db.store_voice_sample_uploads(samples)
 
-        console.print("[green]✓ Voice samples uploaded successfully[/green]\n")
+        console.print(f"[green]✓ {stored} voice samples uploaded successfully[/green]")
+        if stored < len(samples):
+            console.print(
+                f"[yellow]{len(samples) - stored} samples were already on file and skipped[/yellow]"
+            )
+        console.print()
 
         # Display voice guide summary
         console.print("[bold]Voice Guide Summary:[/bold]")
@@ -2439,33 +2483,27 @@ def dashboard(from_date: Optional[str], to_date: Optional[str], metrics: Optiona
         console.print(f"[dim]Period: {from_date} to {to_date}[/dim]")
         console.print("=" * 70 + "\n")
 
+        # Portfolio aggregates are computed in SQL once and shared by all sections
+        client_totals = db.get_client_totals()
+        satisfaction = db.get_satisfaction_summary()
+
         # ============================================================================
         # GENERATION METRICS
         # ============================================================================
         if not focus_metrics or "generation" in focus_metrics:
             console.print("[bold]📊 Generation Metrics[/bold]\n")
 
-            # Get all client names
-            all_clients = db.get_all_client_names()
-            total_clients = len(all_clients)
-
-            # Calculate total posts across all clients
-            total_posts = 0
-            total_projects = 0
-
-            for client_name in all_clients:
-                client_memory = db.get_client_memory(client_name)
-                if client_memory:
-                    total_posts += client_memory.total_posts_generated
-                    total_projects += client_memory.total_projects
-
             # Get feedback summary
             feedback_summary = db.get_post_feedback_summary()
 
             table = Table(show_header=False, box=None, padding=(0, 2))
-            table.add_row("Total Clients Served:", f"[cyan]{total_clients}[/cyan]")
-            table.add_row("Total Projects:", f"[cyan]{total_projects}[/cyan]")
-            table.add_row("Total Posts Generated:", f"[cyan]{total_posts:,}[/cyan]")
+            table.add_row(
+                "Total Clients Served:", f"[cyan]{client_totals['total_clients']}[/cyan]"
+            )
+            table.add_row("Total Projects:", f"[cyan]{client_totals['total_projects']}[/cyan]")
+            table.add_row(
+                "Total Posts Generated:", f"[cyan]{client_totals['total_posts']:,}[/cyan]"
+            )
 
             if feedback_summary["total_feedback"] > 0:
                 table.add_row(
@@ -2484,9 +2522,6 @@ def dashboard(from_date: Optional[str], to_date: Optional[str], metrics: Optiona
         if not focus_metrics or "quality" in focus_metrics:
             console.print("[bold]✨ Quality Metrics[/bold]\n")
 
-            # Get satisfaction summary
-            satisfaction = db.get_satisfaction_summary()
-
             if satisfaction["total_surveys"] > 0:
                 table = Table(show_header=False, box=None, padding=(0, 2))
                 table.add_row("Client Surveys:", f"[cyan]{satisfaction['total_surveys']}[/cyan]")
@@ -2519,48 +2554,17 @@ def dashboard(from_date: Optional[str], to_date: Optional[str], metrics: Optiona
         if not focus_metrics or "templates" in focus_metrics:
             console.print("[bold]📝 Template Performance[/bold]\n")
 
-            # Get feedback grouped by template
-            feedback_records = db.get_post_feedback()
-
-            if feedback_records:
-                # Aggregate by template
-                template_stats = {}
-
-                for feedback in feedback_records:
-                    template_id = feedback["template_id"]
-
-                    if template_id not in template_stats:
-                        template_stats[template_id] = {
-                            "template_name": feedback["template_name"],
-                            "total": 0,
-                            "kept": 0,
-                            "modified": 0,
-                            "rejected": 0,
-                            "loved": 0,
-                        }
-
-                    template_stats[template_id]["total"] += 1
-                    template_stats[template_id][feedback["feedback_type"]] += 1
-
-                # Calculate success rate and sort
-                for tid, stats in template_stats.items():
-                    if stats["total"] > 0:
-                        stats["success_rate"] = (stats["kept"] + stats["loved"]) / stats["total"]
-
-                # Show top performing templates
-                sorted_templates = sorted(
-                    template_stats.items(),
-                    key=lambda x: (x[1]["success_rate"], x[1]["total"]),
-                    reverse=True,
-                )
+            # Feedback grouped by template in SQL, best success rate first
+            template_stats = db.get_template_feedback_stats()
 
+            if template_stats:
                 table = Table(title="Top Performing Templates", show_header=True)
                 table.add_column("Template", style="cyan")
                 table.add_column("Usage", justify="right")
                 table.add_column("Success Rate", justify="right")
                 table.add_column("Loved", justify="right")
 
-                for tid, stats in sorted_templates[:10]:
+                for stats in template_stats[:10]:
                     success_color = (
                         "green"
                         if stats["success_rate"] >= 0.8
@@ -2570,7 +2574,7 @@ def dashboard(from_date: Optional[str], to_date: Optional[str], metrics: Optiona
                     )
 
                     table.add_row(
-                        f"#{tid}",
+                        f"#{stats['template_id']}",
                         f"{stats['total']}",
                         f"[{success_color}]{stats['success_rate']:.0%}[/{success_color}]",
                         f"[green]{stats['loved']}[/green]" if stats["loved"] > 0 else "0",
@@ -2588,25 +2592,15 @@ def dashboard(from_date: Optional[str], to_date: Optional[str], metrics: Optiona
         if not focus_metrics or "clients" in focus_metrics:
             console.print("[bold]👥 Client Metrics[/bold]\n")
 
-            # Analyze client retention
-            repeat_clients = 0
-            new_clients = 0
-
-            for client_name in all_clients:
-                client_memory = db.get_client_memory(client_name)
-                if client_memory:
-                    if client_memory.total_projects > 1:
-                        repeat_clients += 1
-                    else:
-                        new_clients += 1
-
-            retention_rate = repeat_clients / total_clients if total_clients > 0 else 0.0
+            repeat_clients = client_totals["repeat_clients"] + client_totals["loyal_clients"]
 
             table = Table(show_header=False, box=None, padding=(0, 2))
-            table.add_row("Total Clients:", f"[cyan]{total_clients}[/cyan]")
+            table.add_row("Total Clients:", f"[cyan]{client_totals['total_clients']}[/cyan]")
             table.add_row("Repeat Clients:", f"[green]{repeat_clients}[/green]")
-            table.add_row("New Clients:", f"[yellow]{new_clients}[/yellow]")
-            table.add_row("Retention Rate:", f"[green]{retention_rate:.0%}[/green]")
+            table.add_row("New Clients:", f"[yellow]{client_totals['new_clients']}[/yellow]")
+            table.add_row(
+                "Retention Rate:", f"[green]{client_totals['retention_rate']:.0%}[/green]"
+            )
 
             # Average satisfaction
             if satisfaction["total_surveys"] > 0:
@@ -2673,57 +2667,13 @@ def analytics(report: str, output: Optional[str]):
         if report == "templates":
             console.print("\n[bold cyan]📝 Template Performance Analysis[/bold cyan]\n")
 
-            # Get all feedback
-            feedback_records = db.get_post_feedback()
+            # Per-template rates aggregated in SQL, best success rate first
+            sorted_templates = db.get_template_feedback_stats()
 
-            if not feedback_records:
+            if not sorted_templates:
                 console.print("[yellow]No feedback data available yet[/yellow]\n")
                 return
 
-            # Aggregate by template
-            template_stats = {}
-
-            for feedback in feedback_records:
-                template_id = feedback["template_id"]
-
-                if template_id not in template_stats:
-                    template_stats[template_id] = {
-                        "template_name": feedback["template_name"],
-                        "total": 0,
-                        "kept": 0,
-                        "modified": 0,
-                        "rejected": 0,
-                        "loved": 0,
-                        "engagement": [],
-                    }
-
-                template_stats[template_id]["total"] += 1
-                template_stats[template_id][feedback["feedback_type"]] += 1
-
-                if feedback["engagement_data"]:
-                    template_stats[template_id]["engagement"].append(feedback["engagement_data"])
-
-            # Calculate metrics and sort
-            for tid, stats in template_stats.items():
-                if stats["total"] > 0:
-                    stats["success_rate"] = (stats["kept"] + stats["loved"]) / stats["total"]
-                    stats["loved_rate"] = stats["loved"] / stats["total"]
-                    stats["rejected_rate"] = stats["rejected"] / stats["total"]
-
-                    # Average engagement
-                    if stats["engagement"]:
-                        total_likes = sum(e.get("likes", 0) for e in stats["engagement"])
-                        stats["avg_engagement"] = total_likes / len(stats["engagement"])
-                    else:
-                        stats["avg_engagement"] = 0.0
-
-            # Sort by success rate
-            sorted_templates = sorted(
-                template_stats.items(),
-                key=lambda x: (x[1]["success_rate"], x[1]["total"]),
-                reverse=True,
-            )
-
             # Display table
             table = Table(title="Template Performance Ranking", show_header=True)
             table.add_column("Rank", justify="right", style="cyan")
@@ -2734,7 +2684,7 @@ def analytics(report: str, output: Optional[str]):
             table.add_column("Rejected", justify="right")
             table.add_column("Avg Likes", justify="right")
 
-            for rank, (tid, stats) in enumerate(sorted_templates, 1):
+            for rank, stats in enumerate(sorted_templates, 1):
                 success_color = (
                     "green"
                     if stats["success_rate"] >= 0.8
@@ -2745,7 +2695,7 @@ def analytics(report: str, output: Optional[str]):
 
                 table.add_row(
                     f"{rank}",
-                    f"#{tid}",
+                    f"#{stats['template_id']}",
                     f"{stats['total']}",
                     f"[{success_color}]{stats['success_rate']:.0%}[/{success_color}]",
                     f"[green]{stats['loved_rate']:.0%}[/green]",
@@ -2760,20 +2710,20 @@ def analytics(report: str, output: Optional[str]):
 
             top_template = sorted_templates[0]
             console.print(
-                f"  • Best performing template: #{top_template[0]} ({top_template[1]['success_rate']:.0%} success)"
+                f"  • Best performing template: #{top_template['template_id']} ({top_template['success_rate']:.0%} success)"
             )
 
             if len(sorted_templates) > 1:
                 worst_template = sorted_templates[-1]
                 console.print(
-                    f"  • Needs improvement: #{worst_template[0]} ({worst_template[1]['success_rate']:.0%} success)"
+                    f"  • Needs improvement: #{worst_template['template_id']} ({worst_template['success_rate']:.0%} success)"
                 )
 
             # Most loved
-            most_loved = max(sorted_templates, key=lambda x: x[1]["loved"])
-            if most_loved[1]["loved"] > 0:
+            most_loved = max(sorted_templates, key=lambda x: x["loved"])
+            if most_loved["loved"] > 0:
                 console.print(
-                    f"  • Most loved: #{most_loved[0]} ({most_loved[1]['loved']} loved posts)"
+                    f"  • Most loved: #{most_loved['template_id']} ({most_loved['loved']} loved posts)"
                 )
 
             console.print()
@@ -2784,46 +2734,31 @@ def analytics(report: str, output: Optional[str]):
         elif report == "client-retention":
             console.print("\n[bold cyan]👥 Client Retention Analysis[/bold cyan]\n")
 
-            # Get all clients
-            all_clients = db.get_all_client_names()
+            client_totals = db.get_client_totals()
+            total = client_totals["total_clients"]
 
-            if not all_clients:
+            if not total:
                 console.print("[yellow]No client data available yet[/yellow]\n")
                 return
 
-            # Analyze retention
-            new_clients = []
-            repeat_clients = []
-            loyal_clients = []  # 3+ projects
-
-            for client_name in all_clients:
-                client_memory = db.get_client_memory(client_name)
-                if client_memory:
-                    if client_memory.total_projects >= 3:
-                        loyal_clients.append(client_name)
-                    elif client_memory.total_projects >= 2:
-                        repeat_clients.append(client_name)
-                    else:
-                        new_clients.append(client_name)
-
-            total = len(all_clients)
-            repeat_rate = len(repeat_clients) / total if total > 0 else 0.0
-            loyal_rate = len(loyal_clients) / total if total > 0 else 0.0
+            new_clients = client_totals["new_clients"]
+            repeat_clients = client_totals["repeat_clients"]
+            loyal_clients = client_totals["loyal_clients"]  # 3+ projects
 
             # Display metrics
             table = Table(show_header=False, box=None, padding=(0, 2))
             table.add_row("Total Clients:", f"[cyan]{total}[/cyan]")
             table.add_row(
                 "New Clients (1 project):",
-                f"[yellow]{len(new_clients)}[/yellow] ({len(new_clients)/total:.0%})",
+                f"[yellow]{new_clients}[/yellow] ({new_clients/total:.0%})",
             )
             table.add_row(
                 "Repeat Clients (2 projects):",
-                f"[green]{len(repeat_clients)}[/green] ({repeat_rate:.0%})",
+                f"[green]{repeat_clients}[/green] ({repeat_clients/total:.0%})",
             )
             table.add_row(
                 "Loyal Clients (3+ projects):",
-                f"[bold green]{len(loyal_clients)}[/bold green] ({loyal_rate:.0%})",
+                f"[bold green]{loyal_clients}[/bold green] ({loyal_clients/total:.0%})",
             )
 
             console.print(table)
@@ -2831,33 +2766,43 @@ def analytics(report: str, output: Optional[str]):
             # Satisfaction correlation
             console.print("\n[bold]📊 Retention by Satisfaction:[/bold]\n")
 
-            retention_by_satisfaction = {}
-            for client_name in all_clients:
-                client_memory = db.get_client_memory(client_name)
-                if client_memory and client_memory.average_satisfaction:
-                    sat_bucket = int(client_memory.average_satisfaction)
-
-                    if sat_bucket not in retention_by_satisfaction:
-                        retention_by_satisfaction[sat_bucket] = {"total": 0, "repeat": 0}
-
-                    retention_by_satisfaction[sat_bucket]["total"] += 1
-                    if client_memory.total_projects > 1:
-                        retention_by_satisfaction[sat_bucket]["repeat"] += 1
-
             table = Table(show_header=True)
             table.add_column("Satisfaction", justify="center")
             table.add_column("Clients", justify="right")
             table.add_column("Repeat Rate", justify="right")
 
-            for sat_score in sorted(retention_by_satisfaction.keys(), reverse=True):
-                data = retention_by_satisfaction[sat_score]
-                repeat_pct = data["repeat"] / data["total"] if data["total"] > 0 else 0.0
-
+            for bucket in db.get_retention_by_satisfaction():
                 table.add_row(
-                    f"{'⭐' * sat_score}", f"{data['total']}", f"[green]{repeat_pct:.0%}[/green]"
+                    f"{'⭐' * bucket['satisfaction_bucket']}",
+                    f"{bucket['total']}",
+                    f"[green]{bucket['repeat_rate']:.0%}[/green]",
                 )
 
             console.print(table)
+
+            # Cohorts by first project month
+            cohorts = db.get_retention_cohorts()
+            if cohorts:
+                console.print("\n[bold]📅 Retention by First-Project Cohort:[/bold]\n")
+
+                table = Table(show_header=True)
+                table.add_column("Cohort", justify="center")
+                table.add_column("Clients", justify="right")
+                table.add_column("Returned", justify="right")
+                table.add_column("Loyal (3+)", justify="right")
+                table.add_column("Repeat Rate", justify="right")
+
+                for cohort in cohorts:
+                    table.add_row(
+                        cohort["cohort_month"],
+                        f"{cohort['clients']}",
+                        f"{cohort['repeat']}",
+                        f"{cohort['loyal']}",
+                        f"[green]{cohort['repeat_rate']:.0%}[/green]",
+                    )
+
+                console.print(table)
+
             console.print()
 
         # ============================================================================
@@ -2935,22 +2880,14 @@ def analytics(report: str, output: Optional[str]):
         elif report == "cost-analysis":
             console.print("\n[bold cyan]💰 Cost Analysis[/bold cyan]\n")
 
-            # Get all client data
-            all_clients = db.get_all_client_names()
+            client_totals = db.get_client_totals()
 
-            if not all_clients:
+            if not client_totals["total_clients"]:
                 console.print("[yellow]No client data available yet[/yellow]\n")
                 return
 
-            # Calculate costs
-            total_lifetime_value = 0.0
-            total_projects = 0
-
-            for client_name in all_clients:
-                client_memory = db.get_client_memory(client_name)
-                if client_memory:
-                    total_lifetime_value += client_memory.lifetime_value
-                    total_projects += client_memory.total_projects
+            total_lifetime_value = client_totals["total_lifetime_value"]
+            total_projects = client_totals["total_projects"]
 
             avg_project_value = total_lifetime_value / total_projects if total_projects > 0 else 0.0
 
@@ -2960,11 +2897,38 @@ def analytics(report: str, output: Optional[str]):
             table.add_row("Total Projects:", f"[cyan]{total_projects}[/cyan]")
             table.add_row("Avg Project Value:", f"[green]${avg_project_value:,.2f}[/green]")
             table.add_row(
-                "Avg Client LTV:", f"[green]${total_lifetime_value/len(all_clients):,.2f}[/green]"
+                "Avg Client LTV:",
+                f"[green]${total_lifetime_value/client_totals['total_clients']:,.2f}[/green]",
             )
 
             console.print(table)
-            console.print("\n[dim]Note: API costs and operational expenses not included[/dim]\n")
+
+            # Monthly per-client breakdown
+            monthly_costs = db.get_client_costs_by_month()
+            if monthly_costs:
+                console.print("\n[bold]📅 Cost per Client by Month:[/bold]\n")
+
+                table = Table(show_header=True)
+                table.add_column("Month", justify="center")
+                table.add_column("Client", style="cyan")
+                table.add_column("Projects", justify="right")
+                table.add_column("Revisions", justify="right")
+                table.add_column("Revision Cost", justify="right")
+
+                for row in monthly_costs:
+                    table.add_row(
+                        row["month"] or "-",
+                        row["client_name"],
+                        f"{row['projects']}",
+                        f"{row['revisions']}",
+                        f"${row['revision_cost']:,.2f}",
+                    )
+
+                console.print(table)
+            console.print(
+                "\n[dim]Note: Revision cost is the API spend recorded on revisions; "
+                "generation API costs are reported by cost-summary[/dim]\n"
+            )
 
         # Export to file if requested
         if output:
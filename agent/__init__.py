@@ -15,6 +15,7 @@ Week 2: Intelligence
 - SuggestionEngine: Proactive suggestions
 - ErrorRecoverySystem: Retry logic with exponential backoff
 - TaskScheduler: Delayed task execution
+- SchedulerEngine: Runs scheduled tasks as they come due
 - EmailSystem: Email integration
 """
 
@@ -26,7 +27,7 @@ from .core_enhanced import ContentAgentCoreEnhanced
 from .email_system import EmailSystem, EmailType
 from .error_recovery import ErrorCategory, ErrorRecoverySystem, RetryConfig
 from .planner import PlannedTask, TaskType, WorkflowPlan, WorkflowPlanner
-from .scheduler import ScheduledTask, ScheduleFrequency, TaskScheduler
+from .scheduler import ScheduledTask, ScheduleFrequency, SchedulerEngine, TaskScheduler
 from .suggestions import Suggestion, SuggestionEngine, SuggestionType
 from .tools import AgentTools
 
@@ -48,6 +49,7 @@ __all__ = [
     "RetryConfig",
     "ErrorCategory",
     "TaskScheduler",
+    "SchedulerEngine",
     "ScheduledTask",
     "ScheduleFrequency",
     "EmailSystem",
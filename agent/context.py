@@ -3,6 +3,7 @@ Conversation context management for the agent
 """
 
 import json
+import re
 import sqlite3
 from datetime import datetime
 from pathlib import Path
@@ -10,6 +11,9 @@ from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+SNIPPET_MARKERS = ("**", "**")  # Highlight of matched terms in search snippets
+SNIPPET_TOKENS = 16  # Approximate snippet length in words
+
 
 class ConversationContext(BaseModel):
     """Tracks conversation state and context across messages"""
@@ -122,10 +126,21 @@ class ContextManager:
                 ON conversation_messages(session_id, timestamp)
             """
             )
+
+            # Migration: a B-tree index on content cannot serve infix searches
+            # but doubled the write cost of large tool outputs
+            conn.execute("DROP INDEX IF EXISTS idx_message_content")
+            self.fts_enabled = self._init_fts(conn)
+
+            # Rolling summary of turns folded out of the message window
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_message_content
-                ON conversation_messages(content)
+                CREATE TABLE IF NOT EXISTS conversation_summaries (
+                    session_id TEXT PRIMARY KEY,
+                    summary TEXT NOT NULL,
+                    window_start_id INTEGER,
+                    updated_at TIMESTAMP NOT NULL
+                )
             """
             )
 
@@ -133,6 +148,70 @@ class ContextManager:
         finally:
             conn.close()
 
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """Create the FTS5 message index and its sync triggers
+
+        Returns False when SQLite was built without FTS5 (search falls back to LIKE).
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'conversation_messages_fts'"
+        ).fetchone()
+
+        try:
+            conn.execute(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversation_messages_fts USING fts5(
+                    content,
+                    content='conversation_messages',
+                    content_rowid='message_id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """
+            )
+        except sqlite3.OperationalError:
+            return False
+
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS conversation_messages_fts_insert
+            AFTER INSERT ON conversation_messages BEGIN
+                INSERT INTO conversation_messages_fts(rowid, content)
+                VALUES (new.message_id, new.content);
+            END
+        """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS conversation_messages_fts_delete
+            AFTER DELETE ON conversation_messages BEGIN
+                INSERT INTO conversation_messages_fts(conversation_messages_fts, rowid, content)
+                VALUES ('delete', old.message_id, old.content);
+            END
+        """
+        )
+        conn.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS conversation_messages_fts_update
+            AFTER UPDATE OF content ON conversation_messages BEGIN
+                INSERT INTO conversation_messages_fts(conversation_messages_fts, rowid, content)
+                VALUES ('delete', old.message_id, old.content);
+                INSERT INTO conversation_messages_fts(rowid, content)
+                VALUES (new.message_id, new.content);
+            END
+        """
+        )
+
+        if not exists:
+            # Index messages saved before the FTS table existed
+            conn.execute(
+                """
+                INSERT INTO conversation_messages_fts(conversation_messages_fts)
+                VALUES ('rebuild')
+            """
+            )
+
+        return True
+
     def save_context(self, context: ConversationContext):
         """Save context to database"""
         conn = self._get_connection()
@@ -207,17 +286,20 @@ class ContextManager:
         conn = self._get_connection()
         try:
             conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute(
+                "DELETE FROM conversation_summaries WHERE session_id = ?", (session_id,)
+            )
             conn.commit()
         finally:
             conn.close()
 
     def save_message(
         self, session_id: str, role: str, content: str, metadata: Optional[Dict[str, Any]] = None
-    ):
-        """Save a conversation message to database"""
+    ) -> int:
+        """Save a conversation message to database, returning its message_id"""
         conn = self._get_connection()
         try:
-            conn.execute(
+            cursor = conn.execute(
                 """
                 INSERT INTO conversation_messages
                 (session_id, role, content, timestamp, metadata)
@@ -232,19 +314,26 @@ class ContextManager:
                 ),
             )
             conn.commit()
+            return cursor.lastrowid  # type: ignore[return-value]
         finally:
             conn.close()
 
     def load_conversation(
-        self, session_id: str, limit: Optional[int] = None
+        self, session_id: str, limit: Optional[int] = None, start_message_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Load conversation history for a session"""
+        """Load conversation history for a session
+
+        Args:
+            session_id: Session to load
+            limit: Only the most recent messages (newest first)
+            start_message_id: Only messages from this one on (e.g. the current window)
+        """
         conn = self._get_connection()
         try:
             if limit:
                 cursor = conn.execute(
                     """
-                    SELECT role, content, timestamp, metadata
+                    SELECT role, content, timestamp, metadata, message_id
                     FROM conversation_messages
                     WHERE session_id = ?
                     ORDER BY timestamp DESC
@@ -255,17 +344,23 @@ class ContextManager:
             else:
                 cursor = conn.execute(
                     """
-                    SELECT role, content, timestamp, metadata
+                    SELECT role, content, timestamp, metadata, message_id
                     FROM conversation_messages
                     WHERE session_id = ?
-                    ORDER BY timestamp ASC
+                    AND message_id >= ?
+                    ORDER BY timestamp ASC, message_id ASC
                 """,
-                    (session_id,),
+                    (session_id, start_message_id or 0),
                 )
 
             messages = []
             for row in cursor.fetchall():
-                message = {"role": row[0], "content": row[1], "timestamp": row[2]}
+                message = {
+                    "role": row[0],
+                    "content": row[1],
+                    "timestamp": row[2],
+                    "message_id": row[4],
+                }
                 if row[3]:
                     message["metadata"] = json.loads(row[3])
                 messages.append(message)
@@ -274,6 +369,42 @@ class ContextManager:
         finally:
             conn.close()
 
+    def save_summary(self, session_id: str, summary: str, window_start_id: Optional[int]):
+        """Store a session's rolling summary and the first message still in its window"""
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO conversation_summaries
+                (session_id, summary, window_start_id, updated_at)
+                VALUES (?, ?, ?, ?)
+            """,
+                (session_id, summary, window_start_id, datetime.now().isoformat()),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def load_summary(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load a session's rolling summary (None if nothing was summarized yet)"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                """
+                SELECT summary, window_start_id, updated_at FROM conversation_summaries
+                WHERE session_id = ?
+            """,
+                (session_id,),
+            )
+
+            row = cursor.fetchone()
+            if row:
+                return {"summary": row[0], "window_start_id": row[1], "updated_at": row[2]}
+
+            return None
+        finally:
+            conn.close()
+
     def export_conversation_markdown(
         self, session_id: str, output_path: Optional[Path] = None
     ) -> str:
@@ -324,38 +455,116 @@ class ContextManager:
         return markdown_content
 
     def search_conversation(
-        self, session_id: str, query: str, role: Optional[str] = None
+        self,
+        session_id: Optional[str],
+        query: str,
+        role: Optional[str] = None,
+        limit: int = 50,
     ) -> List[Dict[str, Any]]:
-        """Search conversation messages for a query string"""
+        """Search conversation messages, best matches first
+
+        Every word of the query must match (as a word prefix). Results include
+        a snippet around the matched terms.
+
+        Args:
+            session_id: Session to search (None searches all sessions)
+            query: Words to search for
+            role: Optional filter by role (user/assistant)
+            limit: Maximum number of results
+        """
+        if not self.fts_enabled:
+            return self._search_conversation_like(session_id, query, role, limit)
+
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        # Quote each term so user input is never parsed as FTS5 syntax
+        match = " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+
+        filters = ""
+        params: List[Any] = [*SNIPPET_MARKERS, SNIPPET_TOKENS, match]
+        if session_id is not None:
+            filters += " AND m.session_id = ?"
+            params.append(session_id)
+        if role:
+            filters += " AND m.role = ?"
+            params.append(role)
+        params.append(limit)
+
         conn = self._get_connection()
         try:
-            if role:
-                cursor = conn.execute(
-                    """
-                    SELECT role, content, timestamp
-                    FROM conversation_messages
-                    WHERE session_id = ?
-                    AND role = ?
-                    AND content LIKE ?
-                    ORDER BY timestamp ASC
-                """,
-                    (session_id, role, f"%{query}%"),
-                )
-            else:
-                cursor = conn.execute(
-                    """
-                    SELECT role, content, timestamp
-                    FROM conversation_messages
-                    WHERE session_id = ?
-                    AND content LIKE ?
-                    ORDER BY timestamp ASC
-                """,
-                    (session_id, f"%{query}%"),
+            cursor = conn.execute(
+                f"""
+                SELECT m.role, m.content, m.timestamp, m.session_id, m.message_id,
+                       snippet(conversation_messages_fts, 0, ?, ?, '...', ?),
+                       bm25(conversation_messages_fts) AS rank
+                FROM conversation_messages_fts
+                JOIN conversation_messages m
+                    ON m.message_id = conversation_messages_fts.rowid
+                WHERE conversation_messages_fts MATCH ?{filters}
+                ORDER BY rank
+                LIMIT ?
+            """,
+                params,
+            )
+
+            results = []
+            for row in cursor.fetchall():
+                results.append(
+                    {
+                        "role": row[0],
+                        "content": row[1],
+                        "timestamp": row[2],
+                        "session_id": row[3],
+                        "message_id": row[4],
+                        "snippet": row[5],
+                        "rank": row[6],
+                    }
                 )
 
+            return results
+        finally:
+            conn.close()
+
+    def _search_conversation_like(
+        self, session_id: Optional[str], query: str, role: Optional[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Substring search for SQLite builds without FTS5"""
+        filters = ""
+        params: List[Any] = [f"%{query}%"]
+        if session_id is not None:
+            filters += " AND session_id = ?"
+            params.append(session_id)
+        if role:
+            filters += " AND role = ?"
+            params.append(role)
+        params.append(limit)
+
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                f"""
+                SELECT role, content, timestamp, session_id, message_id
+                FROM conversation_messages
+                WHERE content LIKE ?{filters}
+                ORDER BY timestamp ASC
+                LIMIT ?
+            """,
+                params,
+            )
+
             results = []
             for row in cursor.fetchall():
-                results.append({"role": row[0], "content": row[1], "timestamp": row[2]})
+                results.append(
+                    {
+                        "role": row[0],
+                        "content": row[1],
+                        "timestamp": row[2],
+                        "session_id": row[3],
+                        "message_id": row[4],
+                        "snippet": row[1][:200],
+                    }
+                )
 
             return results
         finally:
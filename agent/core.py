@@ -2,7 +2,6 @@
 Core agent orchestrator - main conversation loop and intelligence
 """
 
-import asyncio
 import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
@@ -10,7 +9,9 @@ from typing import Any, Dict, List, Optional
 import anthropic
 
 from .context import ContextManager, ConversationContext
+from .memory import ConversationMemory
 from .prompts import AGENT_SYSTEM_PROMPT, build_conversation_context_prompt, get_tool_descriptions
+from .tool_executor import ToolExecutor
 from .tools import AgentTools
 from .workflows import WorkflowExecutor
 
@@ -41,6 +42,7 @@ class ContentAgentCore:
         self.client = anthropic.Anthropic(api_key=api_key)
         self.model = model
         self.tools = AgentTools()
+        self.tool_executor = ToolExecutor(self.tools)
         self.workflow_executor = WorkflowExecutor(self.tools)
         self.context_manager = ContextManager()
 
@@ -50,8 +52,13 @@ class ContentAgentCore:
         else:
             self.context = ConversationContext(session_id=session_id or str(uuid.uuid4()))
 
-        # Conversation history
-        self.messages: List[Dict[str, Any]] = []
+        # Conversation history (recent window + rolling summary of older turns)
+        self.memory = ConversationMemory(self.client, self.context_manager, self.context.session_id)
+
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """Messages sent with the next request"""
+        return self.memory.messages
 
     async def handle_message(self, user_message: str) -> AgentResponse:
         """
@@ -59,8 +66,9 @@ class ContentAgentCore:
 
         This is the main entry point for conversational interaction.
         """
-        # Add user message to history
-        self.messages.append({"role": "user", "content": user_message})
+        # Add user message to history, summarizing old turns if over budget
+        self.memory.add_user_message(user_message)
+        self.memory.compact()
 
         # Build system prompt with tools and context
         system_prompt = self._build_system_prompt()
@@ -145,40 +153,16 @@ class ContentAgentCore:
             return AgentResponse(message=error_message)
 
     async def _execute_tool_calls(self, tool_calls: List[Dict]) -> List[Dict]:
-        """Execute multiple tool calls"""
-        results = []
-
-        for tool_call in tool_calls:
-            tool_name = tool_call["name"]
-            tool_input = tool_call["input"]
-
-            try:
-                # Get tool method
-                tool_method = getattr(self.tools, tool_name, None)
-
-                if not tool_method:
-                    result = {"success": False, "error": f"Tool not found: {tool_name}"}
-                else:
-                    # Execute tool
-                    if asyncio.iscoroutinefunction(tool_method):
-                        result = await tool_method(**tool_input)
-                    else:
-                        result = tool_method(**tool_input)
-
-                results.append({"tool_use_id": tool_call["id"], "content": str(result)})
-
-            except Exception as e:
-                results.append(
-                    {
-                        "tool_use_id": tool_call["id"],
-                        "content": str({"success": False, "error": str(e)}),
-                    }
-                )
+        """Execute multiple tool calls (independent read-only calls run concurrently)"""
+        return await self.tool_executor.execute(tool_calls)
 
-        return results
+    def _build_system_prompt(self) -> List[Dict[str, Any]]:
+        """Build system prompt with tools and context
 
-    def _build_system_prompt(self) -> str:
-        """Build system prompt with tools and context"""
+        The tool prompt and conversation summary only change between
+        compactions, so they form the cached prefix; the per-turn context
+        comes last.
+        """
         # Get tool descriptions
         available_tools = self.tools.get_available_tools()
         tool_desc = get_tool_descriptions(available_tools)
@@ -188,10 +172,8 @@ class ContentAgentCore:
 
         # Add conversation context
         context_info = build_conversation_context_prompt(self.context)
-        if context_info:
-            prompt += "\n\n" + context_info
 
-        return prompt
+        return self.memory.system_blocks(prompt, context_info)
 
     def _get_tool_definitions(self) -> List[Dict]:
         """Get tool definitions for Claude API"""
@@ -318,15 +300,19 @@ class ContentAgentCore:
 
     def reset_conversation(self):
         """Reset conversation history (keeps context)"""
-        self.messages = []
+        self.memory.reset()
 
     def start_new_session(self) -> str:
         """Start a completely new session"""
         session_id = str(uuid.uuid4())
         self.context = ConversationContext(session_id=session_id)
-        self.messages = []
+        self.memory = ConversationMemory(self.client, self.context_manager, session_id)
         return session_id
 
+    def close(self):
+        """End the agent: releases the tool thread pool (the session stays saved)"""
+        self.tool_executor.shutdown()
+
     def get_session_id(self) -> str:
         """Get current session ID"""
         return self.context.session_id
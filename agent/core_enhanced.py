@@ -8,7 +8,7 @@ Enhanced agent core with Week 2 intelligence features:
 - Email integration
 """
 
-import asyncio
+import functools
 import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
@@ -18,12 +18,14 @@ import anthropic
 from .context import ContextManager, ConversationContext
 from .email_system import EmailSystem
 from .error_recovery import ErrorRecoverySystem, RetryConfig
+from .memory import ConversationMemory
 
 # Week 2 imports
 from .planner import TaskType, WorkflowPlan, WorkflowPlanner
 from .prompts import AGENT_SYSTEM_PROMPT, build_conversation_context_prompt, get_tool_descriptions
 from .scheduler import TaskScheduler
 from .suggestions import Suggestion, SuggestionEngine
+from .tool_executor import ToolExecutor, ToolTimeoutError
 from .tools import AgentTools
 from .workflows import WorkflowExecutor
 
@@ -59,6 +61,7 @@ class ContentAgentCoreEnhanced:
         self.client = anthropic.Anthropic(api_key=api_key)
         self.model = model
         self.tools = AgentTools()
+        self.tool_executor = ToolExecutor(self.tools)
         self.workflow_executor = WorkflowExecutor(self.tools)
         self.context_manager = ContextManager()
 
@@ -72,17 +75,26 @@ class ContentAgentCoreEnhanced:
         # Initialize or load session
         if session_id and self.context_manager.load_context(session_id):
             self.context = self.context_manager.load_context(session_id)
-            # Load conversation history from database
-            self.messages = self._load_messages_from_db()
+            # Conversation history (recent window + rolling summary of older turns)
+            self.memory = ConversationMemory(self.client, self.context_manager, session_id)
+            # Load the window's messages from database
+            self.memory.load_history()
         else:
             self.context = ConversationContext(session_id=session_id or str(uuid.uuid4()))
             # Conversation history
-            self.messages: List[Dict[str, Any]] = []
+            self.memory = ConversationMemory(
+                self.client, self.context_manager, self.context.session_id
+            )
 
         # Current workflow execution
         self.current_workflow: Optional[WorkflowPlan] = None
         self.completed_task_ids: List[str] = []
 
+    @property
+    def messages(self) -> List[Dict[str, Any]]:
+        """Messages sent with the next request"""
+        return self.memory.messages
+
     async def handle_message(self, user_message: str) -> AgentResponse:
         """
         Process user message with intelligence features
@@ -111,11 +123,11 @@ class ContentAgentCoreEnhanced:
         if "all pending" in user_message.lower() or "batch" in user_message.lower():
             return await self._handle_batch_operations()
 
-        # Add user message to history
-        self.messages.append({"role": "user", "content": user_message})
-
-        # Save user message to database
-        self._save_message_to_db("user", user_message)
+        # Save user message to database and add it to history,
+        # summarizing old turns if over budget
+        message_id = self._save_message_to_db("user", user_message)
+        self.memory.add_user_message(user_message, message_id=message_id)
+        self.memory.compact()
 
         # Build system prompt with tools and context
         system_prompt = self._build_enhanced_system_prompt()
@@ -250,48 +262,47 @@ class ContentAgentCoreEnhanced:
         return AgentResponse(message=workflow_plan.to_summary(), workflow_plan=workflow_plan)
 
     async def _execute_tool_calls_with_recovery(self, tool_calls: List[Dict]) -> List[Dict]:
-        """Execute tool calls with error recovery"""
-        results = []
+        """Execute tool calls with error recovery
+
+        Independent read-only calls run concurrently, each with its own
+        retries; see ToolExecutor for the ordering rules.
+        """
 
-        for tool_call in tool_calls:
+        async def run_with_recovery(tool_call: Dict) -> str:
             tool_name = tool_call["name"]
             tool_input = tool_call["input"]
 
+            async def attempt() -> Any:
+                return await self._execute_single_tool(tool_name, tool_input)
+
             # Execute with retry logic
             success, result, error_record = await self.error_recovery.execute_with_retry_async(
-                func=lambda: self._execute_single_tool(tool_name, tool_input),
+                func=attempt,
                 config=RetryConfig(max_retries=3),
                 context={"tool": tool_name, "input": tool_input},
             )
 
             if success:
-                results.append({"tool_use_id": tool_call["id"], "content": str(result)})
-            else:
-                results.append(
-                    {
-                        "tool_use_id": tool_call["id"],
-                        "content": str(
-                            {
-                                "success": False,
-                                "error": error_record.message if error_record else "Unknown error",
-                            }
-                        ),
-                    }
-                )
+                return str(result)
+            return str(
+                {
+                    "success": False,
+                    "error": error_record.message if error_record else "Unknown error",
+                }
+            )
 
-        return results
+        return await self.tool_executor.execute(tool_calls, run=run_with_recovery)
 
     async def _execute_single_tool(self, tool_name: str, tool_input: Dict) -> Any:
-        """Execute a single tool"""
-        tool_method = getattr(self.tools, tool_name, None)
-
-        if not tool_method:
-            raise ValueError(f"Tool not found: {tool_name}")
+        """Execute a single tool
 
-        if asyncio.iscoroutinefunction(tool_method):
-            return await tool_method(**tool_input)
-        else:
-            return tool_method(**tool_input)
+        A timed-out tool is reported rather than raised: it already used its
+        whole budget, so retrying would only multiply the wait.
+        """
+        try:
+            return await self.tool_executor.call(tool_name, tool_input)
+        except ToolTimeoutError as e:
+            return {"success": False, "error": str(e)}
 
     def plan_workflow(self, intent: str, context: Dict[str, Any]) -> WorkflowPlan:
         """
@@ -349,7 +360,9 @@ class ContentAgentCoreEnhanced:
 
             # Execute task with error recovery
             success, result, error_record = await self.error_recovery.execute_with_retry_async(
-                func=lambda: self._execute_single_tool(next_task.tool_name, next_task.tool_params),
+                func=functools.partial(
+                    self._execute_single_tool, next_task.tool_name, next_task.tool_params
+                ),
                 config=RetryConfig(
                     max_retries=next_task.max_retries if next_task.retry_on_failure else 0
                 ),
@@ -378,8 +391,13 @@ class ContentAgentCoreEnhanced:
 
         return results
 
-    def _build_enhanced_system_prompt(self) -> str:
-        """Build system prompt with intelligence features"""
+    def _build_enhanced_system_prompt(self) -> List[Dict[str, Any]]:
+        """Build system prompt with intelligence features
+
+        The tool prompt, guidance and conversation summary only change between
+        compactions, so they form the cached prefix; the per-turn context
+        comes last.
+        """
         # Get tool descriptions
         available_tools = self.tools.get_available_tools()
         tool_desc = get_tool_descriptions(available_tools)
@@ -387,11 +405,6 @@ class ContentAgentCoreEnhanced:
         # Build base prompt
         prompt = AGENT_SYSTEM_PROMPT.format(tool_descriptions=tool_desc)
 
-        # Add conversation context
-        context_info = build_conversation_context_prompt(self.context)
-        if context_info:
-            prompt += "\n\n" + context_info
-
         # Add Week 2 intelligence guidance
         prompt += """
 
@@ -421,7 +434,10 @@ You now have enhanced capabilities:
 Always be proactive and suggest next actions based on context.
 """
 
-        return prompt
+        # Add conversation context
+        context_info = build_conversation_context_prompt(self.context)
+
+        return self.memory.system_blocks(prompt, context_info)
 
     def _get_enhanced_tool_definitions(self) -> List[Dict]:
         """
@@ -511,30 +527,19 @@ Always be proactive and suggest next actions based on context.
 
     def reset_conversation(self):
         """Reset conversation history (keep session context)"""
-        self.messages = []
+        self.memory.reset()
         self.context.recent_actions = []
         self.context.pending_decisions = []
         self.context_manager.save_context(self.context)
 
-    def _load_messages_from_db(self) -> List[Dict[str, Any]]:
-        """Load conversation history from database when resuming session"""
-        db_messages = self.context_manager.load_conversation(self.context.session_id)
-
-        # Convert to Claude API format
-        messages = []
-        for msg in db_messages:
-            # Skip messages with empty content (violates API requirement)
-            content = msg.get("content", "")
-            if not content or (isinstance(content, str) and not content.strip()):
-                continue
-
-            # Simple format for now - just role and content
-            messages.append({"role": msg["role"], "content": content})
-
-        return messages
+    def close(self):
+        """End the agent: releases the tool thread pool (the session stays saved)"""
+        self.tool_executor.shutdown()
 
-    def _save_message_to_db(self, role: str, content: Any, metadata: Optional[Dict] = None):
-        """Save a message to database"""
+    def _save_message_to_db(
+        self, role: str, content: Any, metadata: Optional[Dict] = None
+    ) -> Optional[int]:
+        """Save a message to database, returning its message_id (None if not saved)"""
         # Extract text content if it's a complex message
         if isinstance(content, list):
             # Handle content blocks
@@ -552,10 +557,10 @@ Always be proactive and suggest next actions based on context.
 
         # Don't save empty messages (violates API requirement)
         if not content_text or not content_text.strip():
-            return
+            return None
 
         # Save to database
-        self.context_manager.save_message(
+        return self.context_manager.save_message(
             session_id=self.context.session_id, role=role, content=content_text, metadata=metadata
         )
 
@@ -580,14 +585,14 @@ Always be proactive and suggest next actions based on context.
 
     def search_conversation(self, query: str, role: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Search conversation history for a query string
+        Search conversation history (full-text, best matches first)
 
         Args:
             query: Search query
             role: Optional filter by role (user/assistant)
 
         Returns:
-            List of matching messages
+            List of matching messages with snippets
         """
         return self.context_manager.search_conversation(
             self.context.session_id, query=query, role=role
@@ -0,0 +1,109 @@
+"""
+Bounded conversation memory for agent sessions
+"""
+
+from typing import Any, Dict, List, Optional
+
+from src.config.settings import settings
+from src.utils.conversation_window import (
+    SUMMARY_MAX_TOKENS,
+    ConversationWindow,
+    build_summary_request,
+    is_turn_start,
+)
+
+from .context import ContextManager
+
+
+class ConversationMemory:
+    """Message history of one session, bounded by a token budget
+
+    Turns that no longer fit the window are folded into a rolling summary
+    stored with the session (ContextManager.save_summary), so sessions kept
+    open all day send a constant-size history, and resuming a session only
+    reloads the messages still in the window.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        context_manager: ContextManager,
+        session_id: str,
+        max_tokens: Optional[int] = None,
+        summary_model: Optional[str] = None,
+    ):
+        self.client = client
+        self.context_manager = context_manager
+        self.session_id = session_id
+        self.summary_model = summary_model or settings.CONVERSATION_SUMMARY_MODEL
+
+        stored = context_manager.load_summary(session_id) or {}
+        self.window = ConversationWindow(
+            summarize=self._summarize, max_tokens=max_tokens, summary=stored.get("summary", "")
+        )
+        self.window_start_id: Optional[int] = stored.get("window_start_id")
+
+        self.messages: List[Dict[str, Any]] = []
+        self._turn_message_ids: List[Optional[int]] = []  # DB id of each turn in the window
+
+    @property
+    def summary(self) -> str:
+        return self.window.summary
+
+    def load_history(self):
+        """Reload the persisted messages of the current window (resumed sessions)"""
+        for msg in self.context_manager.load_conversation(
+            self.session_id, start_message_id=self.window_start_id
+        ):
+            # Skip messages with empty content (violates API requirement)
+            content = msg.get("content", "")
+            if not content or (isinstance(content, str) and not content.strip()):
+                continue
+
+            if msg["role"] == "user":
+                self.add_user_message(content, message_id=msg.get("message_id"))
+            else:
+                self.messages.append({"role": msg["role"], "content": content})
+
+        self.compact()
+
+    def add_user_message(self, content: str, message_id: Optional[int] = None):
+        """Start a new turn"""
+        self.messages.append({"role": "user", "content": content})
+        self._turn_message_ids.append(message_id)
+
+    def compact(self):
+        """Fold the oldest turns into the summary if the window is over budget"""
+        retained = self.window.compact(self.messages)
+        evicted = len(self.messages) - len(retained)
+        if not evicted:
+            return
+
+        turns = sum(1 for message in self.messages[:evicted] if is_turn_start(message))
+        del self._turn_message_ids[:turns]
+        self.messages[:] = retained  # In place: callers may hold the list
+
+        self.window_start_id = self._turn_message_ids[0] if self._turn_message_ids else None
+        self.context_manager.save_summary(self.session_id, self.summary, self.window_start_id)
+
+    def system_blocks(self, stable: str, dynamic: str = "") -> List[Dict[str, Any]]:
+        """System prompt with the cached stable prefix and summary"""
+        return self.window.system_blocks(stable, dynamic)
+
+    def reset(self):
+        """Forget the window and the summary"""
+        self.messages.clear()
+        self._turn_message_ids.clear()
+        self.window.summary = ""
+        self.window_start_id = None
+        self.context_manager.save_summary(self.session_id, "", None)
+
+    def _summarize(self, previous_summary: str, messages: List[Dict[str, Any]]) -> str:
+        """Fold evicted turns into the summary with a small, fast model"""
+        response = self.client.messages.create(
+            model=self.summary_model,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            temperature=0,
+            **build_summary_request(previous_summary, messages),
+        )
+        return "\n".join(block.text for block in response.content if hasattr(block, "text"))
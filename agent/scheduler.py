@@ -1,13 +1,21 @@
 """
 Task scheduling system for delayed/scheduled execution
+
+TaskScheduler stores tasks in SQLite; SchedulerEngine runs them. The engine
+keeps a min-heap of fire times, sleeps until the earliest one (or until a
+new task is scheduled), then claims every due task in one indexed query and
+runs them concurrently on a bounded pool.
 """
 
+import asyncio
+import heapq
 import json
 import sqlite3
+import threading
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -91,6 +99,12 @@ class ScheduledTask(BaseModel):
         return cls(**data)
 
 
+TASK_COLUMNS = (
+    "task_id, description, tool_name, tool_params, scheduled_for, frequency, status, "
+    "created_at, executed_at, next_execution, execution_count, max_executions, last_error"
+)
+
+
 class TaskScheduler:
     """Manages scheduled task execution"""
 
@@ -99,6 +113,7 @@ class TaskScheduler:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_db()
         self.task_id_counter = 0
+        self._listeners: List[Callable[[str, datetime], None]] = []
 
     def _get_connection(self):
         """Get database connection"""
@@ -135,16 +150,56 @@ class TaskScheduler:
                 ON scheduled_tasks(scheduled_for)
             """
             )
+
+            # due_at is next_execution, or scheduled_for before the first run,
+            # so "what is due" is a range scan of (status, due_at)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(scheduled_tasks)")}
+            if "due_at" not in columns:
+                conn.execute("ALTER TABLE scheduled_tasks ADD COLUMN due_at TIMESTAMP")
+                conn.execute(
+                    "UPDATE scheduled_tasks SET due_at = COALESCE(next_execution, scheduled_for)"
+                )
+            conn.execute("DROP INDEX IF EXISTS idx_status")
             conn.execute(
                 """
-                CREATE INDEX IF NOT EXISTS idx_status
-                ON scheduled_tasks(status)
+                CREATE INDEX IF NOT EXISTS idx_status_due
+                ON scheduled_tasks(status, due_at)
             """
             )
             conn.commit()
         finally:
             conn.close()
 
+    def add_listener(self, callback: Callable[[str, datetime], None]):
+        """Call callback(task_id, due_at) whenever a pending task is saved"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, datetime], None]):
+        """Stop notifying callback"""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @staticmethod
+    def _row_to_task(row: Tuple) -> ScheduledTask:
+        """Build a task from a row selected with TASK_COLUMNS"""
+        return ScheduledTask.from_dict(
+            {
+                "task_id": row[0],
+                "description": row[1],
+                "tool_name": row[2],
+                "tool_params": json.loads(row[3]),
+                "scheduled_for": row[4],
+                "frequency": row[5],
+                "status": row[6],
+                "created_at": row[7],
+                "executed_at": row[8],
+                "next_execution": row[9],
+                "execution_count": row[10],
+                "max_executions": row[11],
+                "last_error": row[12],
+            }
+        )
+
     def schedule_task(
         self,
         description: str,
@@ -180,16 +235,16 @@ class TaskScheduler:
 
     def _save_task(self, task: ScheduledTask):
         """Save task to database"""
+        due_at = task.next_execution or task.scheduled_for
         conn = self._get_connection()
         try:
-            task.to_dict()
             conn.execute(
                 """
                 INSERT OR REPLACE INTO scheduled_tasks
                 (task_id, description, tool_name, tool_params, scheduled_for,
                  frequency, status, created_at, executed_at, next_execution,
-                 execution_count, max_executions, last_error)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                 execution_count, max_executions, last_error, due_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     task.task_id,
@@ -205,53 +260,103 @@ class TaskScheduler:
                     task.execution_count,
                     task.max_executions,
                     task.last_error,
+                    due_at.isoformat(),
                 ),
             )
             conn.commit()
         finally:
             conn.close()
 
+        if task.status == TaskStatus.PENDING:
+            for listener in list(self._listeners):
+                listener(task.task_id, due_at)
+
     def get_due_tasks(self) -> List[ScheduledTask]:
         """Get all tasks due for execution"""
         conn = self._get_connection()
         try:
-            now = datetime.now().isoformat()
             cursor = conn.execute(
-                """
-                SELECT * FROM scheduled_tasks
-                WHERE status = ?
-                AND (next_execution IS NULL AND scheduled_for <= ?)
-                OR (next_execution IS NOT NULL AND next_execution <= ?)
-                ORDER BY scheduled_for ASC
+                f"""
+                SELECT {TASK_COLUMNS} FROM scheduled_tasks
+                WHERE status = ? AND due_at <= ?
+                ORDER BY due_at ASC
             """,
-                (TaskStatus.PENDING.value, now, now),
+                (TaskStatus.PENDING.value, datetime.now().isoformat()),
             )
 
-            tasks = []
-            for row in cursor.fetchall():
-                task_dict = {
-                    "task_id": row[0],
-                    "description": row[1],
-                    "tool_name": row[2],
-                    "tool_params": json.loads(row[3]),
-                    "scheduled_for": row[4],
-                    "frequency": row[5],
-                    "status": row[6],
-                    "created_at": row[7],
-                    "executed_at": row[8],
-                    "next_execution": row[9],
-                    "execution_count": row[10],
-                    "max_executions": row[11],
-                    "last_error": row[12],
-                }
-                tasks.append(ScheduledTask.from_dict(task_dict))
-
-            return tasks
+            return [self._row_to_task(row) for row in cursor.fetchall()]
         finally:
             conn.close()
 
-    def mark_task_executed(self, task: ScheduledTask, success: bool, error: Optional[str] = None):
-        """Mark task as executed and schedule next execution if recurring"""
+    def claim_due_tasks(self, now: Optional[datetime] = None) -> List[ScheduledTask]:
+        """
+        Atomically mark due tasks as running and return them
+
+        A claimed task is not returned again until mark_task_executed()
+        makes it pending for its next run.
+        """
+        now = now or datetime.now()
+        conn = self._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"""
+                SELECT {TASK_COLUMNS} FROM scheduled_tasks
+                WHERE status = ? AND due_at <= ?
+                ORDER BY due_at ASC
+            """,
+                (TaskStatus.PENDING.value, now.isoformat()),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE scheduled_tasks SET status = ? WHERE task_id = ?",
+                [(TaskStatus.RUNNING.value, row[0]) for row in rows],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        tasks = [self._row_to_task(row) for row in rows]
+        for task in tasks:
+            task.status = TaskStatus.RUNNING
+        return tasks
+
+    def release_running_tasks(self) -> int:
+        """Return tasks left running by an interrupted engine to pending"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                "UPDATE scheduled_tasks SET status = ? WHERE status = ?",
+                (TaskStatus.PENDING.value, TaskStatus.RUNNING.value),
+            )
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_pending_due_times(self) -> List[Tuple[datetime, str]]:
+        """Get (due_at, task_id) for every pending task (index-only scan)"""
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                "SELECT due_at, task_id FROM scheduled_tasks WHERE status = ?",
+                (TaskStatus.PENDING.value,),
+            )
+            return [(datetime.fromisoformat(due_at), task_id) for due_at, task_id in cursor]
+        finally:
+            conn.close()
+
+    def mark_task_executed(
+        self, task: ScheduledTask, success: bool, error: Optional[str] = None
+    ) -> bool:
+        """
+        Mark task as executed and schedule next execution if recurring
+
+        Only a task still marked running is updated, so one cancelled while
+        it ran stays cancelled instead of being rescheduled.
+
+        Returns:
+            True if the stored task was updated
+        """
         task.execution_count += 1
         task.executed_at = datetime.now()
 
@@ -267,7 +372,36 @@ class TaskScheduler:
             task.next_execution = task.calculate_next_execution()
             task.status = TaskStatus.PENDING
 
-        self._save_task(task)
+        due_at = task.next_execution or task.scheduled_for
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                """
+                UPDATE scheduled_tasks
+                SET status = ?, executed_at = ?, next_execution = ?,
+                    execution_count = ?, last_error = ?, due_at = ?
+                WHERE task_id = ? AND status = ?
+            """,
+                (
+                    task.status.value,
+                    task.executed_at.isoformat(),
+                    task.next_execution.isoformat() if task.next_execution else None,
+                    task.execution_count,
+                    task.last_error,
+                    due_at.isoformat(),
+                    task.task_id,
+                    TaskStatus.RUNNING.value,
+                ),
+            )
+            conn.commit()
+            updated = cursor.rowcount > 0
+        finally:
+            conn.close()
+
+        if updated and task.status == TaskStatus.PENDING:
+            for listener in list(self._listeners):
+                listener(task.task_id, due_at)
+        return updated
 
     def cancel_task(self, task_id: str):
         """Cancel a scheduled task"""
@@ -290,39 +424,16 @@ class TaskScheduler:
         conn = self._get_connection()
         try:
             cursor = conn.execute(
-                """
-                SELECT * FROM scheduled_tasks
+                f"""
+                SELECT {TASK_COLUMNS} FROM scheduled_tasks
                 WHERE status = ?
-                ORDER BY
-                    CASE
-                        WHEN next_execution IS NOT NULL THEN next_execution
-                        ELSE scheduled_for
-                    END ASC
+                ORDER BY due_at ASC
                 LIMIT ?
             """,
                 (TaskStatus.PENDING.value, limit),
             )
 
-            tasks = []
-            for row in cursor.fetchall():
-                task_dict = {
-                    "task_id": row[0],
-                    "description": row[1],
-                    "tool_name": row[2],
-                    "tool_params": json.loads(row[3]),
-                    "scheduled_for": row[4],
-                    "frequency": row[5],
-                    "status": row[6],
-                    "created_at": row[7],
-                    "executed_at": row[8],
-                    "next_execution": row[9],
-                    "execution_count": row[10],
-                    "max_executions": row[11],
-                    "last_error": row[12],
-                }
-                tasks.append(ScheduledTask.from_dict(task_dict))
-
-            return tasks
+            return [self._row_to_task(row) for row in cursor.fetchall()]
         finally:
             conn.close()
 
@@ -374,3 +485,135 @@ class TaskScheduler:
             return f"In {weeks} week{'s' if weeks > 1 else ''}"
         else:
             return dt.strftime("%B %d, %Y")
+
+
+class SchedulerEngine:
+    """
+    Runs scheduled tasks as they come due
+
+    Keeps a min-heap of (due_at, task_id) for pending tasks and sleeps until
+    the earliest one, waking early when a task is scheduled through the same
+    TaskScheduler. The heap only decides when to wake: due tasks are claimed
+    from the database, so cancelled or rescheduled entries are harmless. Tasks
+    added by other processes are picked up at the next resync.
+
+    Run one engine per database; starting an engine releases tasks an
+    interrupted engine left running.
+    """
+
+    def __init__(
+        self,
+        scheduler: TaskScheduler,
+        execute: Callable[[ScheduledTask], Awaitable[Any]],
+        max_concurrency: int = 8,
+        resync_interval: float = 300.0,
+    ):
+        """
+        Args:
+            scheduler: Task store to run tasks from
+            execute: Coroutine running one task; a raised exception or a
+                {"success": False, "error": ...} result marks it failed
+            max_concurrency: Tasks executing at once
+            resync_interval: Seconds between reloads of the heap from the database
+        """
+        self.scheduler = scheduler
+        self.execute = execute
+        self.max_concurrency = max_concurrency
+        self.resync_interval = resync_interval
+
+        self._heap: List[Tuple[datetime, str]] = []
+        self._running: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    async def run(self):
+        """Run due tasks until stop() is called, then wait for running tasks"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop_thread = threading.get_ident()
+
+        def notify(task_id: str, due_at: datetime):
+            if threading.get_ident() == loop_thread:
+                self._push(due_at, task_id)
+            else:
+                self._loop.call_soon_threadsafe(self._push, due_at, task_id)
+
+        self.scheduler.release_running_tasks()
+        self.scheduler.add_listener(notify)
+        try:
+            self._reload()
+            next_resync = self._loop.time() + self.resync_interval
+
+            while not self._stopping:
+                if self._loop.time() >= next_resync:
+                    self._reload()
+                    next_resync = self._loop.time() + self.resync_interval
+
+                delay = self._seconds_until_next()
+                if delay > 0:
+                    self._wakeup.clear()
+                    timeout = min(delay, next_resync - self._loop.time())
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                self._dispatch_due(semaphore)
+        finally:
+            self.scheduler.remove_listener(notify)
+            if self._running:
+                await asyncio.gather(*self._running, return_exceptions=True)
+
+    def stop(self):
+        """Stop scheduling new runs (running tasks finish)"""
+        self._stopping = True
+        if self._loop and self._wakeup:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    @property
+    def pending_count(self) -> int:
+        """Fire times currently in the heap"""
+        return len(self._heap)
+
+    def _push(self, due_at: datetime, task_id: str):
+        heapq.heappush(self._heap, (due_at, task_id))
+        # Only wake up if this task is now the earliest
+        if self._wakeup and self._heap[0] == (due_at, task_id):
+            self._wakeup.set()
+
+    def _reload(self):
+        self._heap = self.scheduler.get_pending_due_times()
+        heapq.heapify(self._heap)
+
+    def _seconds_until_next(self) -> float:
+        if not self._heap:
+            return float("inf")
+        return (self._heap[0][0] - datetime.now()).total_seconds()
+
+    def _dispatch_due(self, semaphore: asyncio.Semaphore):
+        """Claim every due task and start it (the semaphore bounds execution)"""
+        now = datetime.now()
+        while self._heap and self._heap[0][0] <= now:
+            heapq.heappop(self._heap)
+
+        for task in self.scheduler.claim_due_tasks(now):
+            running = asyncio.create_task(self._run_task(task, semaphore))
+            self._running.add(running)
+            running.add_done_callback(self._running.discard)
+
+    async def _run_task(self, task: ScheduledTask, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            try:
+                result = await self.execute(task)
+            except Exception as e:
+                success, error = False, str(e)
+            else:
+                success = not (isinstance(result, dict) and result.get("success") is False)
+                error = None if success else str(result.get("error", "Task failed"))
+
+        # Recurring tasks come back through the listener with their next fire time
+        self.scheduler.mark_task_executed(task, success=success, error=error)
@@ -0,0 +1,150 @@
+"""
+Concurrent execution of the tool calls in one agent turn
+
+Claude often asks for several lookups at once ("status of all my clients"
+is 5-10 read-only calls). Consecutive read-only calls run concurrently;
+any other call waits for everything before it and runs alone, so calls
+that change state still happen in the order the model asked for them.
+Synchronous tools (database queries, file reads) run on a thread pool so
+they don't block the event loop.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.config.settings import settings
+
+# Tools that only read state and can safely overlap
+READ_ONLY_TOOLS = frozenset(
+    {
+        "list_projects",
+        "get_project_status",
+        "list_clients",
+        "get_client_history",
+        "read_file",
+        "search_files",
+        "show_dashboard",
+        "generate_analytics_report",
+    }
+)
+
+# Tools that legitimately run longer than the default timeout (seconds)
+TOOL_TIMEOUTS: Dict[str, float] = {
+    "generate_posts": 900.0,
+    "process_revision": 240.0,
+}
+
+
+class ToolTimeoutError(TimeoutError):
+    """A tool call exceeded its time budget"""
+
+
+class ToolExecutor:
+    """Runs a turn's tool calls against AgentTools, overlapping read-only calls"""
+
+    def __init__(
+        self,
+        tools: Any,
+        max_concurrency: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.tools = tools
+        self.max_concurrency = max_concurrency or settings.AGENT_TOOL_CONCURRENCY
+        self.default_timeout = default_timeout or settings.AGENT_TOOL_TIMEOUT
+        self.timeouts = {**TOOL_TIMEOUTS, **(timeouts or {})}
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="agent-tool"
+        )
+
+    def timeout_for(self, tool_name: str) -> float:
+        """Time budget for one call of a tool"""
+        return self.timeouts.get(tool_name, self.default_timeout)
+
+    async def call(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
+        """
+        Run a single tool with its timeout
+
+        Raises ValueError for unknown tools and ToolTimeoutError when the
+        budget runs out. Async tools are cancelled on timeout; a sync tool's
+        thread can't be interrupted, so it finishes in the background and its
+        result is discarded.
+        """
+        tool_method = getattr(self.tools, tool_name, None)
+        if not tool_method or tool_name.startswith("_"):
+            raise ValueError(f"Tool not found: {tool_name}")
+
+        if asyncio.iscoroutinefunction(tool_method):
+            pending = tool_method(**tool_input)
+        else:
+            loop = asyncio.get_running_loop()
+            pending = loop.run_in_executor(
+                self._thread_pool, functools.partial(tool_method, **tool_input)
+            )
+
+        timeout = self.timeout_for(tool_name)
+        try:
+            return await asyncio.wait_for(pending, timeout)
+        except asyncio.TimeoutError:
+            raise ToolTimeoutError(f"Tool {tool_name} timed out after {timeout:g}s") from None
+
+    async def execute(
+        self,
+        tool_calls: List[Dict[str, Any]],
+        run: Optional[Callable[[Dict[str, Any]], Awaitable[str]]] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Execute a turn's tool calls and return tool results in request order
+
+        Args:
+            tool_calls: Calls from the model ({"id", "name", "input"})
+            run: Coroutine producing the result content for one call
+                (defaults to run_one); lets callers add retries
+
+        Returns:
+            List of {"tool_use_id", "content"} dicts, one per call
+        """
+        run = run or self.run_one
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(tool_call: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await run(tool_call)
+
+        contents: List[str] = []
+        for batch in self._batches(tool_calls):
+            if len(batch) == 1:
+                contents.append(await run(batch[0]))
+            else:
+                # Cancelling the turn cancels every call in the batch
+                contents.extend(await asyncio.gather(*(bounded(call) for call in batch)))
+
+        return [
+            {"tool_use_id": tool_call["id"], "content": content}
+            for tool_call, content in zip(tool_calls, contents)
+        ]
+
+    async def run_one(self, tool_call: Dict[str, Any]) -> str:
+        """Run one call, reporting failures to the model as an error result"""
+        try:
+            result = await self.call(tool_call["name"], tool_call["input"])
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        return str(result)
+
+    def _batches(self, tool_calls: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group consecutive read-only calls; every other call is its own batch"""
+        batches: List[List[Dict[str, Any]]] = []
+        for tool_call in tool_calls:
+            read_only = tool_call["name"] in READ_ONLY_TOOLS
+            if read_only and batches and batches[-1][0]["name"] in READ_ONLY_TOOLS:
+                batches[-1].append(tool_call)
+            else:
+                batches.append([tool_call])
+        return batches
+
+    def shutdown(self):
+        """Release the tool thread pool (queued sync calls are cancelled)"""
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
@@ -2,8 +2,9 @@
 Agent tools - wrappers for existing CLI commands and operations
 """
 
+import asyncio
+import json
 import os
-import subprocess
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -12,6 +13,8 @@ from typing import Any, Dict, List, Optional
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.database.project_db import ProjectDatabase
+from src.models.project import Revision, RevisionPost, RevisionStatus
+from src.utils.worker_pool import GenerationJob, RevisionJob, get_worker_pool
 
 
 class AgentTools:
@@ -31,48 +34,33 @@ class AgentTools:
         """
         Generate posts for a client
 
-        Wraps: python 03_post_generator.py generate [brief] -c [client] -n [num]
+        Runs the content workflow on the warm worker pool and registers the
+        project for revision tracking (same as 03_post_generator.py generate).
         """
-        cmd = [
-            sys.executable,
-            str(self.project_dir / "03_post_generator.py"),
-            "generate",
-            brief_path,
-            "-c",
-            client_name,
-            "-n",
-            str(num_posts),
-            "--platform",
-            platform,
-        ]
+        job = GenerationJob(
+            brief_path=brief_path,
+            num_posts=num_posts,
+            platform=platform,
+            register_project=True,
+            client_name=client_name,
+        )
 
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=str(self.project_dir),
-            )
-
-            stdout, stderr = process.communicate()
-
-            if process.returncode == 0:
-                # Extract project ID from output
-                project_id = self._extract_project_id(stdout)
-
-                return {
-                    "success": True,
-                    "message": f"Generated {num_posts} posts for {client_name}",
-                    "project_id": project_id,
-                    "output": stdout,
-                }
-            else:
-                return {"success": False, "error": stderr or stdout, "message": "Generation failed"}
-
+            result = await get_worker_pool().submit(job)
         except Exception as e:
             return {"success": False, "error": str(e), "message": "Exception during generation"}
 
+        if not result.success:
+            return {"success": False, "error": result.error, "message": "Generation failed"}
+
+        return {
+            "success": True,
+            "message": f"Generated {len(result.posts)} posts for {client_name}",
+            "project_id": result.project_id,
+            "output_dir": result.output_dir,
+            "files": result.files,
+        }
+
     def list_projects(self, client_name: Optional[str] = None, limit: int = 10) -> Dict[str, Any]:
         """
         List projects, optionally filtered by client
@@ -176,22 +164,13 @@ class AgentTools:
 
         Wraps: python 03_post_generator.py feedback [project_id]
         """
-        cmd = [
-            sys.executable,
-            str(self.project_dir / "03_post_generator.py"),
-            "feedback",
-            project_id,
-            "-c",
-            client_name,
-        ]
-
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(self.project_dir))
+            returncode, stdout, _ = await self._run_cli("feedback", project_id, "-c", client_name)
 
             return {
-                "success": result.returncode == 0,
-                "message": "Feedback collection initiated" if result.returncode == 0 else "Failed",
-                "output": result.stdout,
+                "success": returncode == 0,
+                "message": "Feedback collection initiated" if returncode == 0 else "Failed",
+                "output": stdout,
             }
 
         except Exception as e:
@@ -203,22 +182,15 @@ class AgentTools:
 
         Wraps: python 03_post_generator.py satisfaction [project_id]
         """
-        cmd = [
-            sys.executable,
-            str(self.project_dir / "03_post_generator.py"),
-            "satisfaction",
-            project_id,
-            "-c",
-            client_name,
-        ]
-
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(self.project_dir))
+            returncode, stdout, _ = await self._run_cli(
+                "satisfaction", project_id, "-c", client_name
+            )
 
             return {
-                "success": result.returncode == 0,
-                "message": "Satisfaction survey initiated" if result.returncode == 0 else "Failed",
-                "output": result.stdout,
+                "success": returncode == 0,
+                "message": "Satisfaction survey initiated" if returncode == 0 else "Failed",
+                "output": stdout,
             }
 
         except Exception as e:
@@ -236,28 +208,20 @@ class AgentTools:
 
         Wraps: python 03_post_generator.py upload-voice-samples
         """
-        cmd = [
-            sys.executable,
-            str(self.project_dir / "03_post_generator.py"),
-            "upload-voice-samples",
-            "--client",
-            client_name,
-            "--source",
-            source,
-        ]
+        args = ["upload-voice-samples", "--client", client_name, "--source", source]
 
         for file_path in file_paths:
-            cmd.extend(["--file", file_path])
+            args.extend(["--file", file_path])
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(self.project_dir))
+            returncode, stdout, _ = await self._run_cli(*args)
 
             return {
-                "success": result.returncode == 0,
+                "success": returncode == 0,
                 "message": f"Uploaded {len(file_paths)} voice samples"
-                if result.returncode == 0
+                if returncode == 0
                 else "Upload failed",
-                "output": result.stdout,
+                "output": stdout,
             }
 
         except Exception as e:
@@ -273,15 +237,15 @@ class AgentTools:
 
         Wraps: python 03_post_generator.py dashboard
         """
-        cmd = [sys.executable, str(self.project_dir / "03_post_generator.py"), "dashboard"]
+        args = ["dashboard"]
 
         if client_name:
-            cmd.extend(["-c", client_name])
+            args.extend(["-c", client_name])
 
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=str(self.project_dir))
+            returncode, stdout, _ = await self._run_cli(*args)
 
-            return {"success": result.returncode == 0, "output": result.stdout}
+            return {"success": returncode == 0, "output": stdout}
 
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -326,55 +290,130 @@ class AgentTools:
         """
         Process revision request for a project
 
-        Wraps: python 03_post_generator.py revision command
+        Applies the same revision scope check and revision tracking as
+        03_post_generator.py revise, then revises the project's first
+        regenerate_count posts against the notes on the warm worker pool.
         """
         try:
-            # Create revision notes file
-            revision_file = self.project_dir / "data" / "revisions" / f"{project_id}_revision.txt"
-            revision_file.parent.mkdir(parents=True, exist_ok=True)
-            revision_file.write_text(revision_notes, encoding="utf-8")
-
-            cmd = [
-                sys.executable,
-                str(self.project_dir / "03_post_generator.py"),
-                "revision",
-                project_id,
-                str(revision_file),
-                "-n",
-                str(regenerate_count),
-            ]
-
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=str(self.project_dir),
+            project = self.db.get_project(project_id)
+            if not project:
+                return {"success": False, "error": f"Project {project_id} not found"}
+            if not project.brief_path:
+                return {"success": False, "error": f"Project {project_id} has no brief on record"}
+
+            # Check scope before proceeding
+            scope = self.db.get_revision_scope(project_id)
+            if scope is None:
+                return {"success": False, "error": f"Project {project_id} has no revision scope"}
+            if scope.is_at_limit and not scope.upsell_accepted:
+                if not scope.upsell_offered:
+                    self.db.mark_upsell_offered(project_id)
+                return {
+                    "success": False,
+                    "error": "revision_limit_reached",
+                    "message": (
+                        f"All {scope.allowed_revisions} included revisions are used; "
+                        "the client must accept an upsell before revising again"
+                    ),
+                    "upsell_offered": True,
+                }
+
+            posts_files = sorted(
+                Path(project.deliverable_path).parent.glob("*_posts.json"),
+                key=lambda p: p.stat().st_mtime,
             )
+            if not posts_files:
+                return {"success": False, "error": f"No posts found for project {project_id}"}
 
-            stdout, stderr = process.communicate(timeout=180)  # 3 minute timeout
+            posts = json.loads(posts_files[-1].read_text(encoding="utf-8"))[:regenerate_count]
 
-            if process.returncode == 0:
-                return {
-                    "success": True,
-                    "message": f"Revision processed for {client_name}",
-                    "project_id": project_id,
-                    "regenerated_posts": regenerate_count,
-                    "output": stdout,
-                }
-            else:
+            # Keep the revision notes on disk alongside the revised posts
+            revisions_dir = self.project_dir / "data" / "revisions"
+            revisions_dir.mkdir(parents=True, exist_ok=True)
+            (revisions_dir / f"{project_id}_revision.txt").write_text(
+                revision_notes, encoding="utf-8"
+            )
+
+            revision = Revision(
+                revision_id=f"{project_id}_rev_{scope.used_revisions + 1}",
+                project_id=project_id,
+                attempt_number=scope.used_revisions + 1,
+                feedback=revision_notes,
+                status=RevisionStatus.PENDING,
+            )
+            self.db.create_revision(revision)
+            self.db.update_revision_status(revision.revision_id, RevisionStatus.IN_PROGRESS)
+
+            try:
+                result = await get_worker_pool().submit(
+                    RevisionJob(
+                        brief_path=project.brief_path,
+                        posts=posts,
+                        client_feedback=revision_notes,
+                        project_id=project_id,
+                    ),
+                    timeout=180,  # 3 minute timeout
+                )
+            except Exception:
+                self.db.update_revision_status(revision.revision_id, RevisionStatus.FAILED)
+                raise
+
+            if not result.success:
+                self.db.update_revision_status(revision.revision_id, RevisionStatus.FAILED)
                 return {
                     "success": False,
-                    "error": stderr or stdout,
+                    "error": result.error,
                     "message": "Revision processing failed",
+                    "revision_id": revision.revision_id,
                 }
 
-        except subprocess.TimeoutExpired:
-            return {"success": False, "error": "Revision processing timed out (>3 minutes)"}
+            self.db.save_revision_posts(
+                revision.revision_id,
+                [
+                    RevisionPost(
+                        post_index=index,
+                        template_id=original["template_id"],
+                        template_name=original["template_name"],
+                        original_content=original["content"],
+                        original_word_count=len(original["content"].split()),
+                        revised_content=revised["content"],
+                        revised_word_count=len(revised["content"].split()),
+                        changes_summary=changes,
+                    )
+                    for index, (original, revised, changes) in enumerate(
+                        zip(posts, result.posts, result.changes), start=1
+                    )
+                ],
+            )
+            self.db.update_revision_status(revision.revision_id, RevisionStatus.COMPLETED)
+
+            revised_file = revisions_dir / f"{project_id}_revised_posts.json"
+            revised_file.write_text(
+                json.dumps(
+                    [
+                        {**post, "changes": changes}
+                        for post, changes in zip(result.posts, result.changes)
+                    ],
+                    indent=2,
+                ),
+                encoding="utf-8",
+            )
+
+            return {
+                "success": True,
+                "message": f"Revision processed for {client_name}",
+                "project_id": project_id,
+                "revision_id": revision.revision_id,
+                "regenerated_posts": len(result.posts),
+                "remaining_revisions": scope.remaining_revisions - 1,
+                "changes": result.changes,
+                "output_file": str(revised_file),
+            }
+
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def generate_analytics_report(
+    async def generate_analytics_report(
         self, client_name: Optional[str] = None, report_type: str = "summary"
     ) -> Dict[str, Any]:
         """
@@ -383,24 +422,16 @@ class AgentTools:
         Wraps: python 03_post_generator.py analytics command
         """
         try:
-            cmd = [sys.executable, str(self.project_dir / "03_post_generator.py"), "analytics"]
+            args = ["analytics"]
 
             if client_name:
-                cmd.extend(["-c", client_name])
-
-            cmd.extend(["--format", report_type])
+                args.extend(["-c", client_name])
 
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=str(self.project_dir),
-            )
+            args.extend(["--format", report_type])
 
-            stdout, stderr = process.communicate(timeout=30)
+            returncode, stdout, stderr = await self._run_cli(*args, timeout=30)
 
-            if process.returncode == 0:
+            if returncode == 0:
                 return {
                     "success": True,
                     "message": "Analytics report generated",
@@ -411,7 +442,7 @@ class AgentTools:
             else:
                 return {"success": False, "error": stderr or stdout}
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return {"success": False, "error": "Analytics generation timed out"}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -491,6 +522,39 @@ class AgentTools:
     # HELPER METHODS
     # ============================================================================
 
+    async def _run_cli(self, *args: str, timeout: Optional[float] = None) -> tuple[int, str, str]:
+        """
+        Run a 03_post_generator.py command without blocking the event loop
+
+        The process is killed if the timeout expires or the calling task is
+        cancelled (asyncio.TimeoutError / CancelledError are re-raised).
+
+        Returns:
+            Tuple of (returncode, stdout, stderr)
+        """
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            str(self.project_dir / "03_post_generator.py"),
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(self.project_dir),
+        )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except BaseException:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        return (
+            process.returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+
     def _extract_project_id(self, output: str) -> Optional[str]:
         """Extract project ID from CLI output"""
         for line in output.split("\n"):
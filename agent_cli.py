@@ -142,6 +142,8 @@ def chat(session, api_key):
             console.print(f"\n[red]Error: {str(e)}[/red]\n")
             continue
 
+    agent.close()
+
 
 @cli.command()
 def sessions():
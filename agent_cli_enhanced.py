@@ -287,6 +287,7 @@ def chat(session, api_key, debug):
 
             if user_input.lower() == "new":
                 # Start new session
+                agent.close()
                 agent = ContentAgentCoreEnhanced(api_key=api_key)
                 console.print("\n[green]✅ New session started[/green]\n")
                 continue
@@ -376,6 +377,8 @@ def chat(session, api_key, debug):
 
                 console.print(traceback.format_exc())
 
+    agent.close()
+
 
 @cli.command()
 @click.option("--limit", "-l", default=10, help="Number of sessions to show")
@@ -432,6 +435,31 @@ def scheduled():
     console.print(table)
 
 
+@cli.command("run-scheduler")
+@click.option("--concurrency", "-c", default=8, help="Tasks to run at once")
+def run_scheduler(concurrency):
+    """Run scheduled tasks as they come due (Ctrl+C to stop)"""
+    from agent.scheduler import SchedulerEngine
+    from agent.tool_executor import ToolExecutor
+    from agent.tools import AgentTools
+
+    tool_executor = ToolExecutor(AgentTools())
+
+    async def execute(task):
+        console.print(f"[cyan]▶ {task.description}[/cyan] [dim]({task.tool_name})[/dim]")
+        return await tool_executor.call(task.tool_name, task.tool_params)
+
+    engine = SchedulerEngine(TaskScheduler(), execute, max_concurrency=concurrency)
+    console.print("[green]Scheduler running. Press Ctrl+C to stop.[/green]")
+
+    try:
+        asyncio.run(engine.run())
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Scheduler stopped[/yellow]")
+    finally:
+        tool_executor.shutdown()
+
+
 @cli.command()
 def pending():
     """Show pending items and suggestions"""
@@ -519,7 +547,10 @@ def search(session, query, role):
         console.print(f"[yellow]No messages found matching '{query}'[/yellow]")
         return
 
-    console.print(f"\n[bold cyan]Found {len(results)} message(s) matching '{query}':[/bold cyan]\n")
+    console.print(
+        f"\n[bold cyan]Found {len(results)} message(s) matching '{query}' "
+        f"(best matches first):[/bold cyan]\n"
+    )
 
     for i, msg in enumerate(results, 1):
         role_color = "cyan" if msg["role"] == "user" else "magenta"
@@ -527,11 +558,8 @@ def search(session, query, role):
             f"[{role_color}]{i}. {msg['role'].upper()}[/{role_color}] ({msg['timestamp']})"
         )
 
-        # Show snippet of content (first 200 chars)
-        content = msg["content"]
-        if len(content) > 200:
-            content = content[:200] + "..."
-        console.print(f"   {content}\n")
+        # Show snippet around the matched terms
+        console.print(f"   {msg['snippet']}\n")
 
 
 @cli.command()
@@ -123,6 +123,11 @@ class Settings(BaseSettings):
     OUTPUTS_DIR: str = str(DATA_DIR / "outputs")
     LOGS_DIR: str = str(BACKEND_DIR / "logs")
 
+    # Startup profiling: stderr capture of a server started with `python -X importtime`
+    # (e.g. `python -X importtime -m uvicorn backend.main:app 2> logs/importtime.log`),
+    # summarized by GET /api/health/startup. Empty disables the log source.
+    IMPORTTIME_LOG: str = ""
+
     # Cache Configuration
     # Tuned for production load: 10 concurrent projects, 300 total posts
     # Week 3 optimization: Increased from initial values (100/50/20)
@@ -153,6 +158,18 @@ class Settings(BaseSettings):
     CELERY_TASK_TIME_LIMIT: int = 600          # 10 minutes max per task
     CELERY_TASK_SOFT_TIME_LIMIT: int = 540     # 9 minutes soft limit (allows cleanup)
 
+    # Durable job queue (generation and research runs; no Redis required)
+    # Jobs live in the application database. Workers run embedded in the API
+    # process and/or as `python -m backend.tasks.job_worker` processes.
+    JOB_WORKERS_EMBEDDED: int = 4  # Worker loops for all job kinds in the API process (0 = none)
+    JOB_RESEARCH_WORKERS_EMBEDDED: int = 2  # Research-only loops (POST /research/run waits on them)
+    JOB_LEASE_SECONDS: int = 120  # Jobs whose worker stops heartbeating are requeued after this
+    JOB_HEARTBEAT_SECONDS: int = 30  # How often a running job renews its lease
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0  # Idle worker poll interval
+    JOB_MAX_ATTEMPTS: int = 3  # Attempts (including lease expiries) before a job fails
+    JOB_MAX_RUNNING_PER_TENANT: int = 2  # Running jobs per user; others wait their turn
+    JOB_RESEARCH_WAIT_SECONDS: int = 600  # How long POST /research/run waits for its job
+
     # Redis connection settings
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_MAX_CONNECTIONS: int = 50
@@ -2,14 +2,17 @@
 Database configuration and session management.
 """
 
+import hashlib
+import re
 import sys
-from typing import Generator
+from datetime import datetime
+from typing import Callable, Generator, List, Optional, Tuple
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.engine.url import make_url
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError, OperationalError
 
 from backend.config import settings
 from backend.utils.query_profiler import enable_sqlalchemy_profiling
@@ -118,20 +121,285 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def init_db():
+# Versioned startup migrations: (version, description, migrate(conn, inspector)).
+# Append new entries (never renumber); the last version is what init_db()
+# records once the schema is current. Each step is idempotent, so databases
+# created before version tracking existed can safely replay all of them.
+SCHEMA_VERSION_TABLE = "schema_version"
+
+# SECURITY FIX: Whitelist of allowed SQL column types (TR-015)
+ALLOWED_COLUMN_TYPES = {
+    "TEXT", "VARCHAR", "INTEGER", "REAL", "FLOAT", "JSON", "BOOLEAN", "TIMESTAMP", "DATETIME"
+}
+_IDENTIFIER_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def _add_missing_columns(conn, inspector, table: str, new_columns: List[Tuple[str, str]]) -> None:
     """
-    Initialize database by creating all tables.
-    Call this on application startup.
-    Handles existing indexes gracefully to support database persistence.
+    Add columns missing from an existing table (ALTER TABLE ... ADD COLUMN).
+
+    Args:
+        conn: Open connection
+        inspector: SQLAlchemy inspector for the engine
+        table: Table name
+        new_columns: (column name, SQL type) pairs, e.g. ("price_per_post", "REAL DEFAULT 40.0")
+
+    Raises:
+        ValueError: Column name or type fails the security checks
+        DBAPIError: ALTER TABLE failed (init_db() then retries the step next boot)
     """
-    from sqlalchemy import text, inspect
-    from sqlalchemy.exc import OperationalError
+    if table not in inspector.get_table_names():
+        return
+
+    columns = [col["name"] for col in inspector.get_columns(table)]
+
+    for col_name, col_type in new_columns:
+        if col_name in columns:
+            continue
 
-    # Import all models to ensure they're registered with SQLAlchemy
-    # This must happen before Base.metadata.create_all() or mapper configuration
+        # SECURITY FIX: Validate SQL identifiers to prevent injection (TR-015)
+        if not _IDENTIFIER_RE.match(col_name):
+            raise ValueError(f"Invalid column name '{col_name}' (security check failed)")
+
+        # SECURITY FIX: Validate column type against whitelist (TR-015)
+        # Extract base type (handle "REAL DEFAULT 40.0" -> "REAL", "VARCHAR(64)" -> "VARCHAR")
+        base_type = col_type.split()[0].split("(")[0]
+        if base_type not in ALLOWED_COLUMN_TYPES:
+            raise ValueError(f"Invalid column type '{col_type}' (security check failed)")
+
+        print(f">> Running migration: Adding {col_name} column to {table} table")
+        try:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col_name} {col_type}"))
+            conn.commit()
+            print(f">> Migration for {col_name} completed successfully")
+        except Exception as e:
+            conn.rollback()
+            print(f">> Migration for {col_name} failed: {e}")
+            raise
+
+
+def _migrate_deliverable_file_size(conn, inspector) -> None:
+    _add_missing_columns(conn, inspector, "deliverables", [("file_size_bytes", "INTEGER")])
+
+
+def _migrate_client_brief_columns(conn, inspector) -> None:
+    _add_missing_columns(
+        conn,
+        inspector,
+        "clients",
+        [
+            ("business_description", "TEXT"),
+            ("ideal_customer", "TEXT"),
+            ("main_problem_solved", "TEXT"),
+            ("tone_preference", "VARCHAR"),
+            ("platforms", "JSON"),
+            ("customer_pain_points", "JSON"),
+            ("customer_questions", "JSON"),
+        ],
+    )
+
+
+def _migrate_project_template_quantities(conn, inspector) -> None:
+    """Template quantities & pricing columns, then convert legacy templates lists"""
     from backend.models import Project
 
-    # Create all tables (handles existing indexes gracefully)
+    _add_missing_columns(
+        conn,
+        inspector,
+        "projects",
+        [
+            ("template_quantities", "JSON"),  # Dict mapping template_id -> quantity
+            ("num_posts", "INTEGER"),  # Total post count
+            ("price_per_post", "REAL DEFAULT 40.0"),  # Base price per post
+            ("research_price_per_post", "REAL DEFAULT 0.0"),  # Research add-on per post
+            ("total_price", "REAL"),  # Total calculated price
+        ],
+    )
+
+    if "projects" not in inspector.get_table_names():
+        return
+
+    # Re-read columns: the inspector caches reflection from before the ALTERs
+    columns = [col["name"] for col in inspect(engine).get_columns("projects")]
+
+    # Migrate existing projects: convert templates array to template_quantities dict
+    # Only migrate projects that have templates but no template_quantities
+    if "templates" not in columns or "template_quantities" not in columns:
+        return
+
+    print(">> Running data migration: Converting templates to template_quantities")
+    try:
+        session = Session(bind=engine)
+        try:
+            projects = (
+                session.query(Project)
+                .filter(Project.templates.isnot(None), Project.template_quantities.is_(None))
+                .all()
+            )
+
+            migrated_count = 0
+            for project in projects:
+                if project.templates and isinstance(project.templates, list):
+                    # Equal distribution (legacy behavior)
+                    num_templates = len(project.templates)
+                    if num_templates > 0:
+                        default_total_posts = 30  # Assume 30 posts for legacy projects
+                        quantity_per_template = default_total_posts // num_templates
+                        remainder = default_total_posts % num_templates
+
+                        # Create template_quantities dict
+                        template_quantities = {}
+                        for i, template_id in enumerate(project.templates):
+                            # Distribute remainder to first templates
+                            quantity = quantity_per_template + (1 if i < remainder else 0)
+                            template_quantities[str(template_id)] = quantity
+
+                        # Update project
+                        project.template_quantities = template_quantities
+                        project.num_posts = default_total_posts
+                        project.price_per_post = 40.0
+                        project.research_price_per_post = 0.0
+                        project.total_price = default_total_posts * 40.0
+
+                        migrated_count += 1
+
+            if migrated_count > 0:
+                session.commit()
+                print(f">> Data migration completed: Migrated {migrated_count} projects")
+            else:
+                print(">> No projects to migrate")
+
+        finally:
+            session.close()
+
+    except Exception as e:
+        print(f">> Data migration failed: {e}")
+        raise
+
+
+def _migrate_run_usage_summary(conn, inspector) -> None:
+    # Same change as migrations/004_add_run_usage_summary.sql
+    _add_missing_columns(conn, inspector, "runs", [("usage_summary", "JSON")])
+
+
+def _migrate_jobs_table(conn, inspector) -> None:
+    # Same change as migrations/005_add_jobs_table.sql (create_all() normally made it already)
+    from backend.models import Job
+
+    Job.__table__.create(bind=engine, checkfirst=True)
+
+
+def _migrate_deliverable_previews(conn, inspector) -> None:
+    # Same change as migrations/006_add_deliverable_previews.sql
+    _add_missing_columns(
+        conn,
+        inspector,
+        "deliverables",
+        [("preview_text", "TEXT"), ("preview_truncated", "BOOLEAN DEFAULT FALSE")],
+    )
+
+
+def _migrate_job_error_type(conn, inspector) -> None:
+    # Same change as migrations/007_add_job_error_type.sql
+    _add_missing_columns(conn, inspector, "jobs", [("error_type", "VARCHAR")])
+
+
+def _migrate_deliverable_file_mtime(conn, inspector) -> None:
+    # Same change as migrations/008_add_deliverable_file_mtime.sql
+    _add_missing_columns(conn, inspector, "deliverables", [("file_mtime", "FLOAT")])
+
+
+def _migrate_deliverable_preview_version(conn, inspector) -> None:
+    # Same change as migrations/009_add_deliverable_preview_version.sql
+    _add_missing_columns(conn, inspector, "deliverables", [("preview_file_version", "VARCHAR")])
+
+
+SCHEMA_MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "deliverables.file_size_bytes", _migrate_deliverable_file_size),
+    (2, "clients brief columns", _migrate_client_brief_columns),
+    (3, "projects template quantities and pricing", _migrate_project_template_quantities),
+    (4, "runs.usage_summary", _migrate_run_usage_summary),
+    (5, "jobs table (durable job queue)", _migrate_jobs_table),
+    (6, "deliverables preview columns", _migrate_deliverable_previews),
+    (7, "jobs.error_type", _migrate_job_error_type),
+    (8, "deliverables.file_mtime", _migrate_deliverable_file_mtime),
+    (9, "deliverables.preview_file_version", _migrate_deliverable_preview_version),
+]
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+
+def schema_fingerprint() -> str:
+    """
+    Hash of the tables and columns declared by the SQLAlchemy models.
+
+    Stored next to the schema version so a model change that forgot to add a
+    migration entry (e.g. a new table) still triggers create_all() on boot.
+    """
+    import backend.models  # noqa: F401  (register every model with Base.metadata)
+
+    tables = sorted(Base.metadata.tables.values(), key=lambda table: table.name)
+    description = "|".join(
+        f"{table.name}:{','.join(sorted(column.name for column in table.columns))}"
+        for table in tables
+    )
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+def get_schema_version() -> Tuple[int, Optional[str]]:
+    """
+    Read the stored schema version.
+
+    Returns:
+        (version, fingerprint); (0, None) if the database has never been versioned
+    """
+    with engine.connect() as conn:
+        try:
+            row = conn.execute(
+                text(f"SELECT version, fingerprint FROM {SCHEMA_VERSION_TABLE} WHERE id = 1")
+            ).fetchone()
+        except DBAPIError:
+            # Table missing: new database, or one created before version tracking
+            return 0, None
+    return (row[0], row[1]) if row else (0, None)
+
+
+def _record_schema_version(conn, version: int, fingerprint: str) -> None:
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+            "id INTEGER PRIMARY KEY, "
+            "version INTEGER NOT NULL, "
+            "fingerprint VARCHAR(64) NOT NULL, "
+            "applied_at TIMESTAMP NOT NULL)"
+        )
+    )
+    conn.execute(text(f"DELETE FROM {SCHEMA_VERSION_TABLE}"))
+    conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA_VERSION_TABLE} (id, version, fingerprint, applied_at) "
+            "VALUES (1, :version, :fingerprint, :applied_at)"
+        ),
+        {"version": version, "fingerprint": fingerprint, "applied_at": datetime.utcnow()},
+    )
+    conn.commit()
+
+
+def _add_model_columns(conn, inspector) -> None:
+    """
+    Add every column declared by the models but missing from its table.
+
+    Covers model changes that forgot a SCHEMA_MIGRATIONS entry: create_all()
+    only creates missing tables. Columns are added nullable, without defaults.
+    """
+    for table in Base.metadata.sorted_tables:
+        columns = [
+            (column.name, column.type.compile(dialect=engine.dialect)) for column in table.columns
+        ]
+        _add_missing_columns(conn, inspector, table.name, columns)
+
+
+def _create_tables() -> None:
+    """Create all tables (handles existing indexes gracefully)"""
     try:
         Base.metadata.create_all(bind=engine)
     except OperationalError as e:
@@ -150,173 +418,62 @@ def init_db():
         else:
             raise  # Re-raise if it's a different error
 
-    # Run migrations (add missing columns)
+
+def init_db() -> bool:
+    """
+    Initialize database by creating all tables and running pending migrations.
+    Call this on application startup.
+    Handles existing indexes gracefully to support database persistence.
+
+    When the stored schema version and model fingerprint are current (every
+    boot after the first), this is a single SELECT: create_all() and the
+    inspector-based column checks are skipped.
+
+    A failed migration step stops the upgrade: the version of the last step
+    that completed is recorded (with the old fingerprint), so the failed step
+    runs again on the next boot. When only the fingerprint changed, every
+    model table is checked for missing columns.
+
+    Returns:
+        True if schema work ran (new database, upgrade or model change)
+    """
+    fingerprint = schema_fingerprint()
+    stored_version, stored_fingerprint = get_schema_version()
+
+    if stored_version == SCHEMA_VERSION and stored_fingerprint == fingerprint:
+        return False
+
+    print(f">> Database schema at version {stored_version}, upgrading to {SCHEMA_VERSION}")
+    _create_tables()
+
     with engine.connect() as conn:
         inspector = inspect(engine)
+        completed = stored_version
+        for version, description, migrate in SCHEMA_MIGRATIONS:
+            if version <= stored_version:
+                continue
+            print(f">> Schema migration {version}: {description}")
+            try:
+                migrate(conn, inspector)
+            except Exception as e:
+                conn.rollback()
+                print(f">> Schema migration {version} failed, retrying next boot: {e}")
+                break
+            completed = version
+
+        upgraded = completed == SCHEMA_VERSION
+        if upgraded and stored_fingerprint != fingerprint:
+            try:
+                # Fresh inspector: reflection is cached from before the migrations
+                _add_model_columns(conn, inspect(engine))
+            except Exception as e:
+                conn.rollback()
+                print(f">> Model column check failed, retrying next boot: {e}")
+                upgraded = False
+
+        # Only a complete upgrade records the new fingerprint (fast path next boot)
+        _record_schema_version(
+            conn, completed, fingerprint if upgraded else (stored_fingerprint or "")
+        )
 
-        # Check if deliverables table exists
-        if "deliverables" in inspector.get_table_names():
-            # Check if file_size_bytes column exists
-            columns = [col["name"] for col in inspector.get_columns("deliverables")]
-
-            if "file_size_bytes" not in columns:
-                print(">> Running migration: Adding file_size_bytes column to deliverables table")
-                try:
-                    conn.execute(
-                        text("ALTER TABLE deliverables ADD COLUMN file_size_bytes INTEGER")
-                    )
-                    conn.commit()
-                    print(">> Migration completed successfully")
-                except Exception as e:
-                    print(f">> Migration failed: {e}")
-                    # Non-critical - continue startup
-
-        # Check if clients table exists
-        if "clients" in inspector.get_table_names():
-            # Check for ClientBrief columns
-            columns = [col["name"] for col in inspector.get_columns("clients")]
-
-            # List of columns to add
-            new_columns = [
-                ("business_description", "TEXT"),
-                ("ideal_customer", "TEXT"),
-                ("main_problem_solved", "TEXT"),
-                ("tone_preference", "VARCHAR"),
-                ("platforms", "JSON"),
-                ("customer_pain_points", "JSON"),
-                ("customer_questions", "JSON"),
-            ]
-
-            # SECURITY FIX: Whitelist of allowed SQL column types (TR-015)
-            ALLOWED_TYPES = {"TEXT", "VARCHAR", "INTEGER", "REAL", "JSON", "BOOLEAN", "TIMESTAMP"}
-
-            for col_name, col_type in new_columns:
-                if col_name not in columns:
-                    # SECURITY FIX: Validate SQL identifiers to prevent injection (TR-015)
-                    import re
-
-                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", col_name):
-                        print(f">> ERROR: Invalid column name '{col_name}' (security check failed)")
-                        continue
-
-                    # SECURITY FIX: Validate column type against whitelist (TR-015)
-                    # Extract base type (handle "REAL DEFAULT 40.0" -> "REAL")
-                    base_type = col_type.split()[0] if " " in col_type else col_type
-                    if base_type not in ALLOWED_TYPES:
-                        print(f">> ERROR: Invalid column type '{col_type}' (security check failed)")
-                        continue
-
-                    print(f">> Running migration: Adding {col_name} column to clients table")
-                    try:
-                        conn.execute(text(f"ALTER TABLE clients ADD COLUMN {col_name} {col_type}"))
-                        conn.commit()
-                        print(f">> Migration for {col_name} completed successfully")
-                    except Exception as e:
-                        print(f">> Migration for {col_name} failed: {e}")
-                        # Non-critical - continue startup
-
-        # Check if projects table exists (template quantities & pricing migration)
-        if "projects" in inspector.get_table_names():
-            # Check for new template quantities and pricing columns
-            columns = [col["name"] for col in inspector.get_columns("projects")]
-
-            # List of new columns to add for template quantities and pricing refactor
-            new_project_columns = [
-                ("template_quantities", "JSON"),  # Dict mapping template_id -> quantity
-                ("num_posts", "INTEGER"),  # Total post count
-                ("price_per_post", "REAL DEFAULT 40.0"),  # Base price per post
-                ("research_price_per_post", "REAL DEFAULT 0.0"),  # Research add-on per post
-                ("total_price", "REAL"),  # Total calculated price
-            ]
-
-            # SECURITY FIX: Whitelist of allowed SQL column types (TR-015)
-            # Reuse same whitelist from clients table migration
-            ALLOWED_TYPES = {"TEXT", "VARCHAR", "INTEGER", "REAL", "JSON", "BOOLEAN", "TIMESTAMP"}
-
-            for col_name, col_type in new_project_columns:
-                if col_name not in columns:
-                    # SECURITY FIX: Validate SQL identifiers to prevent injection (TR-015)
-                    import re
-
-                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", col_name):
-                        print(f">> ERROR: Invalid column name '{col_name}' (security check failed)")
-                        continue
-
-                    # SECURITY FIX: Validate column type against whitelist (TR-015)
-                    # Extract base type (handle "REAL DEFAULT 40.0" -> "REAL")
-                    base_type = col_type.split()[0] if " " in col_type else col_type
-                    if base_type not in ALLOWED_TYPES:
-                        print(f">> ERROR: Invalid column type '{col_type}' (security check failed)")
-                        continue
-
-                    print(f">> Running migration: Adding {col_name} column to projects table")
-                    try:
-                        conn.execute(text(f"ALTER TABLE projects ADD COLUMN {col_name} {col_type}"))
-                        conn.commit()
-                        print(f">> Migration for {col_name} completed successfully")
-                    except Exception as e:
-                        print(f">> Migration for {col_name} failed: {e}")
-                        # Non-critical - continue startup
-
-            # Migrate existing projects: convert templates array to template_quantities dict
-            # Only migrate projects that have templates but no template_quantities
-            if "templates" in columns and "template_quantities" in columns:
-                print(">> Running data migration: Converting templates to template_quantities")
-                try:
-                    # This SQL is database-agnostic for projects with legacy data
-                    # We'll handle the conversion in Python for better control
-                    from sqlalchemy.orm import Session
-
-                    session = Session(bind=engine)
-                    try:
-                        # Project already imported at line 131
-                        projects = (
-                            session.query(Project)
-                            .filter(
-                                Project.templates.isnot(None), Project.template_quantities.is_(None)
-                            )
-                            .all()
-                        )
-
-                        migrated_count = 0
-                        for project in projects:
-                            if project.templates and isinstance(project.templates, list):
-                                # Equal distribution (legacy behavior)
-                                num_templates = len(project.templates)
-                                if num_templates > 0:
-                                    default_total_posts = 30  # Assume 30 posts for legacy projects
-                                    quantity_per_template = default_total_posts // num_templates
-                                    remainder = default_total_posts % num_templates
-
-                                    # Create template_quantities dict
-                                    template_quantities = {}
-                                    for i, template_id in enumerate(project.templates):
-                                        # Distribute remainder to first templates
-                                        quantity = quantity_per_template + (
-                                            1 if i < remainder else 0
-                                        )
-                                        template_quantities[str(template_id)] = quantity
-
-                                    # Update project
-                                    project.template_quantities = template_quantities
-                                    project.num_posts = default_total_posts
-                                    project.price_per_post = 40.0
-                                    project.research_price_per_post = 0.0
-                                    project.total_price = default_total_posts * 40.0
-
-                                    migrated_count += 1
-
-                        if migrated_count > 0:
-                            session.commit()
-                            print(
-                                f">> Data migration completed: Migrated {migrated_count} projects"
-                            )
-                        else:
-                            print(">> No projects to migrate")
-
-                    finally:
-                        session.close()
-
-                except Exception as e:
-                    print(f">> Data migration failed: {e}")
-                    # Non-critical - continue startup
+    return True
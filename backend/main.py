@@ -16,6 +16,8 @@ import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse, Response
@@ -31,6 +33,7 @@ from backend.routers import (
     deliverables,
     generator,
     health,
+    jobs,
     posts,
     pricing,
     projects,
@@ -43,9 +46,10 @@ from slowapi.errors import RateLimitExceeded
 # Import models so SQLAlchemy can create tables
 import backend.models  # noqa: F401
 from backend.config import settings
-from backend.database import init_db
+from backend.database import SCHEMA_VERSION, init_db
 from backend.utils.rate_limiter import rate_limiter
 from backend.utils.http_rate_limiter import limiter
+from backend.utils.startup_profile import record_phase, set_startup_info, startup_phase
 
 
 @asynccontextmanager
@@ -85,11 +89,43 @@ async def lifespan(app: FastAPI):
     else:
         print(">> Database: SQLite (local)")
 
-    # Initialize database
-    init_db()
-    print(">> Database initialized")
+    # Initialize database (a single version check once the schema is current)
+    with startup_phase("init_db"):
+        schema_migrated = init_db()
+    set_startup_info(schema_version=SCHEMA_VERSION, schema_migrated=schema_migrated)
+    print(">> Database initialized" if schema_migrated else ">> Database schema up to date")
+
+    # Auto-seed users if database is empty. Only needed when the schema was just
+    # created or upgraded; steady-state boots skip the query.
+    if schema_migrated:
+        with startup_phase("seed_users"):
+            _seed_default_users()
+
+    # Durable job queue workers (queued runs survive restarts; see backend/tasks/job_worker.py)
+    from backend.tasks.job_worker import start_embedded_workers, stop_embedded_workers
+
+    if start_embedded_workers():
+        print(
+            f">> Job queue: {settings.JOB_WORKERS_EMBEDDED} embedded worker(s), "
+            f"{settings.JOB_RESEARCH_WORKERS_EMBEDDED} research-only"
+        )
+
+    yield  # Application runs here
+
+    # Shutdown
+    print(">> Shutting down Content Jumpstart API...")
+
+    # Hand running jobs back to the queue instead of waiting out their leases
+    await stop_embedded_workers()
+
+    # Stop warm generation workers (no-op if no job ever started them)
+    from src.utils.worker_pool import shutdown_worker_pool
 
-    # Auto-seed users if database is empty
+    shutdown_worker_pool(wait=False)
+
+
+def _seed_default_users() -> None:
+    """Create the default operator accounts if the users table is empty"""
     from backend.database import SessionLocal
     from backend.models.user import User
     from backend.utils.auth import get_password_hash
@@ -142,11 +178,6 @@ async def lifespan(app: FastAPI):
     finally:
         db.close()
 
-    yield  # Application runs here
-
-    # Shutdown
-    print(">> Shutting down Content Jumpstart API...")
-
 
 # Create FastAPI app
 app = FastAPI(
@@ -429,10 +460,13 @@ app.include_router(deliverables.router, prefix="/api/deliverables", tags=["Deliv
 app.include_router(posts.router, prefix="/api/posts", tags=["Posts"])
 app.include_router(generator.router, prefix="/api/generator", tags=["Generator"])
 app.include_router(research.router, prefix="/api/research", tags=["Research"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
 app.include_router(pricing.router, prefix="/api/pricing", tags=["Pricing"])
 app.include_router(assistant.router, prefix="/api/assistant", tags=["AI Assistant"])
 app.include_router(database.router, prefix="/api", tags=["Database"])
 
+record_phase("app_import", time.perf_counter() - _import_started)
+
 
 if __name__ == "__main__":
     import uvicorn
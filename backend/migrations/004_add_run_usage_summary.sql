@@ -0,0 +1,7 @@
+-- Migration: Add usage_summary column to runs table
+-- Schema version: 4 (SCHEMA_MIGRATIONS in backend/database.py)
+-- Date: 2026-10-18
+-- Purpose: Store per-run API usage (tokens, prompt cache, latency, retries, cost)
+
+-- Add usage_summary column (JSON works on both PostgreSQL and SQLite)
+ALTER TABLE runs ADD COLUMN usage_summary JSON;
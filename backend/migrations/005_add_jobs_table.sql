@@ -0,0 +1,35 @@
+-- Migration: Add jobs table for the durable job queue
+-- Schema version: 5 (SCHEMA_MIGRATIONS in backend/database.py)
+-- Date: 2026-10-18
+-- Purpose: Queue generation/research runs in the database (no Redis) with
+--          priorities, idempotency keys, leases/heartbeats and checkpoints
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id VARCHAR PRIMARY KEY,
+    kind VARCHAR NOT NULL,
+    status VARCHAR NOT NULL DEFAULT 'queued',
+    tenant_id VARCHAR NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    idempotency_key VARCHAR,
+    active_key VARCHAR UNIQUE,
+    payload JSON NOT NULL,
+    result JSON,
+    checkpoint JSON,
+    error_message VARCHAR,
+    run_id VARCHAR REFERENCES runs(id),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    lease_owner VARCHAR,
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    available_at TIMESTAMP,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_tenant_id ON jobs (tenant_id);
+CREATE INDEX IF NOT EXISTS ix_jobs_idempotency_key ON jobs (idempotency_key);
+CREATE INDEX IF NOT EXISTS ix_jobs_run_id ON jobs (run_id);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_priority_created ON jobs (status, priority, created_at);
+CREATE INDEX IF NOT EXISTS ix_jobs_status_lease ON jobs (status, lease_expires_at);
@@ -0,0 +1,10 @@
+-- Migration: Add stored previews to deliverables table
+-- Schema version: 6 (SCHEMA_MIGRATIONS in backend/database.py)
+-- Date: 2026-10-18
+-- Purpose: Extract the drawer preview once when a deliverable is created
+--          instead of re-reading the file on every details request
+-- Rollback: ALTER TABLE deliverables DROP COLUMN preview_text;
+--           ALTER TABLE deliverables DROP COLUMN preview_truncated;
+
+ALTER TABLE deliverables ADD COLUMN preview_text TEXT;
+ALTER TABLE deliverables ADD COLUMN preview_truncated BOOLEAN DEFAULT FALSE;
@@ -0,0 +1,8 @@
+-- Migration: Add error_type column to jobs table
+-- Schema version: 7 (SCHEMA_MIGRATIONS in backend/database.py)
+-- Date: 2026-10-19
+-- Purpose: Keep why a job failed (invalid_input, not_found, exception class) so
+--          callers waiting on a job can map validation errors to 400/404
+-- Rollback: ALTER TABLE jobs DROP COLUMN error_type;
+
+ALTER TABLE jobs ADD COLUMN error_type VARCHAR;
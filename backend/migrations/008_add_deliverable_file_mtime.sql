@@ -0,0 +1,9 @@
+-- Migration: Add file_mtime column to deliverables table
+-- Schema version: 8 (SCHEMA_MIGRATIONS in backend/database.py)
+-- Date: 2026-10-19
+-- Purpose: Record the file mtime next to checksum/file_size_bytes so a file
+--          rewritten in place with the same size is rehashed before its
+--          checksum is used as the download's strong ETag
+-- Rollback: ALTER TABLE deliverables DROP COLUMN file_mtime;
+
+ALTER TABLE deliverables ADD COLUMN file_mtime FLOAT;
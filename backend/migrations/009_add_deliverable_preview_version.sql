@@ -0,0 +1,8 @@
+-- Migration: Add preview_file_version column to deliverables table
+-- Schema version: 9 (SCHEMA_MIGRATIONS in backend/database.py)
+-- Date: 2026-10-19
+-- Purpose: Record the file version ("<mtime_ns>:<size>") a stored preview was
+--          extracted from, so a changed file is previewed again
+-- Rollback: ALTER TABLE deliverables DROP COLUMN preview_file_version;
+
+ALTER TABLE deliverables ADD COLUMN preview_file_version VARCHAR;
@@ -4,6 +4,7 @@ Database models.
 from .brief import Brief
 from .client import Client
 from .deliverable import Deliverable
+from .job import Job
 from .post import Post
 from .project import Project
 from .run import Run
@@ -17,4 +18,5 @@ __all__ = [
     "Run",
     "Post",
     "Deliverable",
+    "Job",
 ]
@@ -1,7 +1,7 @@
 """
 Deliverable model for exported content packages.
 """
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -26,6 +26,10 @@ class Deliverable(Base):
     proof_notes = Column(String)  # Notes about delivery
     checksum = Column(String)  # File checksum for verification
     file_size_bytes = Column(Integer)  # Actual file size in bytes
+    file_mtime = Column(Float)  # st_mtime of the file checksum/file_size_bytes describe
+    preview_text = Column(Text)  # Preview extracted once at creation (deliverable_service)
+    preview_truncated = Column(Boolean, default=False)  # File has more than the preview
+    preview_file_version = Column(String)  # "<mtime_ns>:<size>" the preview was extracted from
 
     # Relationships (using fully qualified paths to avoid conflicts with Pydantic models in src.models)
     project = relationship("backend.models.project.Project", back_populates="deliverables")
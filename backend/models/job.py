@@ -0,0 +1,51 @@
+"""
+Job model for the durable generation/research queue.
+"""
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+
+from backend.database import Base
+
+
+class Job(Base):
+    """Queued unit of background work (see backend/services/job_queue.py)"""
+
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)  # generation, research
+    status = Column(
+        String, nullable=False, default="queued"
+    )  # queued, running, succeeded, failed, cancelled
+    tenant_id = Column(String, nullable=False, index=True)  # Owning user (fairness unit)
+    priority = Column(Integer, nullable=False, default=0)  # Higher runs first
+    idempotency_key = Column(String, index=True)  # Dedupes double submits
+    active_key = Column(String, unique=True)  # idempotency_key while queued/running, else NULL
+    payload = Column(JSON, nullable=False)  # Handler arguments
+    result = Column(JSON)  # Handler return value
+    checkpoint = Column(JSON)  # Progress persisted by the handler (resume point)
+    error_message = Column(String)
+    error_type = Column(String)  # Why it failed: invalid_input, not_found, or exception class
+    run_id = Column(String, ForeignKey("runs.id"), index=True)  # Run the job reports into
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    lease_owner = Column(String)  # Worker currently holding the job
+    lease_expires_at = Column(DateTime)  # UTC; expired leases are requeued
+    heartbeat_at = Column(DateTime)  # UTC
+    available_at = Column(DateTime)  # UTC; not claimable before (retry backoff)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Claim query: queued jobs by priority, oldest first
+        Index("ix_jobs_status_priority_created", "status", "priority", "created_at"),
+        # Lease recovery scan
+        Index("ix_jobs_status_lease", "status", "lease_expires_at"),
+        {"extend_existing": True},
+    )
+
+    def __repr__(self):
+        return f"<Job {self.id} {self.kind} ({self.status})>"
@@ -24,6 +24,7 @@ class Run(Base):
     )  # pending, running, succeeded, failed
     logs = Column(JSON)  # Array of log messages
     error_message = Column(String)  # Error details if failed
+    usage_summary = Column(JSON)  # API tokens, cache, latency, retries and cost for the run
 
     # Relationships (using fully qualified paths to avoid conflicts with Pydantic models in src.models)
     project = relationship("backend.models.project.Project", back_populates="runs")
@@ -4,7 +4,8 @@ AI Assistant API endpoints.
 Provides context-aware AI assistance throughout the operator dashboard.
 """
 
-from typing import List, Optional
+import importlib.util
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -16,16 +17,22 @@ from backend.middleware.auth_dependency import get_current_user
 from backend.models import User
 from backend.utils.logger import logger
 from backend.utils.http_rate_limiter import standard_limiter, lenient_limiter
+from src.config.settings import settings
+from src.utils.conversation_window import (
+    SUMMARY_MAX_TOKENS,
+    ConversationWindow,
+    build_summary_request,
+)
+from src.utils.prompt_fragments import SystemPrompt
+from src.utils.run_context import run_scope
 from src.validators.prompt_injection_defense import sanitize_prompt_input
 
-# Will use Claude API directly for assistant conversations
-try:
-    from src.utils.anthropic_client import get_default_client
-    from src.utils.response_cache import ResponseCache
+from src.utils.response_cache import ResponseCache
 
-    CLAUDE_AVAILABLE = True
-except ImportError:
-    CLAUDE_AVAILABLE = False
+# Will use Claude API directly for assistant conversations. The anthropic SDK
+# takes ~2s to import, so the client module is loaded on the first chat request.
+CLAUDE_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+if not CLAUDE_AVAILABLE:
     logger.warning("Claude API client not available for assistant")
 
 # Initialize chat response cache with 1-hour TTL (Phase 3: Performance optimization)
@@ -55,6 +62,10 @@ class ChatRequest(BaseModel):
     message: str
     context: Optional[dict] = {}  # Current page context (page name, project ID, etc.)
     conversation_history: List[Message] = []
+    # Rolling summary and window start from the previous response: history
+    # messages before window_start are already folded into the summary
+    summary: str = ""
+    window_start: int = 0
 
 
 class ChatResponse(BaseModel):
@@ -62,6 +73,10 @@ class ChatResponse(BaseModel):
 
     message: str
     suggestions: List[str] = []  # Context-aware quick actions
+    # Send back with the next request (conversation_history indices; the
+    # current message is at len(conversation_history))
+    summary: str = ""
+    window_start: int = 0
 
 
 class ContextRequest(BaseModel):
@@ -149,36 +164,79 @@ I can help you navigate the system and explain any features.""",
 }
 
 
-def build_assistant_prompt(
-    page: str, context: dict, user_message: str, history: List[Message]
-) -> str:
-    """Build context-aware system prompt for assistant"""
+def build_assistant_prompt(page: str, context: dict, summary: str = "") -> SystemPrompt:
+    """Build context-aware system prompt for assistant
+
+    The page prompt is the same for every conversation on a page, and the
+    summary/page data only change between compactions, so both segments are
+    cached (the conversation itself is sent as messages).
+    """
 
     # Get page-specific context
     page_context = PAGE_CONTEXTS.get(page, PAGE_CONTEXTS["overview"])
 
-    # Build conversation context from history
-    conversation = ""
-    if history:
-        conversation = "\n\nConversation history:\n"
-        for msg in history[-5:]:  # Last 5 messages for context
-            conversation += f"{msg.role}: {msg.content}\n"
+    stable = f"""{page_context}
+
+Current page: {page}
 
-    # Add current page data context
-    data_context = ""
+Provide a helpful, concise response. If the user's question is about something outside your scope, politely redirect them to the appropriate page or documentation."""
+
+    # Summary of earlier turns and current page data context
+    session = ""
+    if summary:
+        session += f"\n\nSummary of the earlier conversation:\n{summary}"
     if context:
-        data_context = f"\n\nCurrent page data:\n{context}"
+        session += f"\n\nCurrent page data:\n{context}"
 
-    # Combine into full prompt
-    full_prompt = f"""{page_context}
+    return SystemPrompt([stable, session])
 
-Current page: {page}{data_context}{conversation}
 
-User question: {user_message}
+def _summarize_history(previous_summary: str, messages: List[dict]) -> str:
+    """Fold older turns into the rolling summary (cached for clients that don't send it back)"""
+    request = build_summary_request(previous_summary, messages)
+    cached = chat_cache.get(request["messages"], request["system"], 0) if chat_cache else None
+    if cached:
+        return cached
 
-Provide a helpful, concise response. If the user's question is about something outside your scope, politely redirect them to the appropriate page or documentation."""
+    from src.utils.anthropic_client import get_default_client
+
+    summary = get_default_client().create_message(
+        model=settings.CONVERSATION_SUMMARY_MODEL,
+        max_tokens=SUMMARY_MAX_TOKENS,
+        temperature=0,
+        **request,
+    )
+    if chat_cache:
+        chat_cache.put(request["messages"], request["system"], 0, summary)
+    return summary
 
-    return full_prompt
+
+def build_conversation(
+    history: List[Message], user_message: str, summary: str = "", window_start: int = 0
+) -> Tuple[List[dict], str, int]:
+    """Token-budgeted messages for a chat request, the summary of older turns and window start
+
+    Only history from window_start on is replayed, continuing from summary,
+    so a client that sends both back never has the whole history re-summarized.
+    The returned window start indexes history (len(history) if the window
+    starts at the current message).
+    """
+    window_start = min(max(window_start, 0), len(history))
+    positions, messages = [], []
+    for position, msg in enumerate(history[window_start:], start=window_start):
+        if msg.role in ("user", "assistant") and msg.content.strip():
+            positions.append(position)
+            messages.append({"role": msg.role, "content": msg.content})
+    # Conversations sent to the API start with a user turn
+    while messages and messages[0]["role"] != "user":
+        positions.pop(0)
+        messages.pop(0)
+    positions.append(len(history))
+    messages.append({"role": "user", "content": user_message})
+
+    window = ConversationWindow(summarize=_summarize_history, summary=summary)
+    recent = window.fit(messages)  # A suffix of messages
+    return recent, window.summary, positions[len(messages) - len(recent)]
 
 
 @router.post("/chat", response_model=ChatResponse)
@@ -216,33 +274,44 @@ async def chat_with_assistant(
         # Get current page from context
         page = request.context.get("page", "overview")
 
+        # The summary is returned to the client, so treat it like user input
+        try:
+            previous_summary = sanitize_prompt_input(request.summary, strict=False)
+        except ValueError:
+            logger.warning("Prompt injection detected in assistant summary; discarding it")
+            previous_summary, request.window_start = "", 0
+
+        # Recent turns within the token budget; older ones are summarized
+        with run_scope(project_id="assistant", operation="assistant_summary"):
+            messages, summary, window_start = build_conversation(
+                request.conversation_history,
+                sanitized_message,  # Use sanitized message
+                summary=previous_summary,
+                window_start=request.window_start,
+            )
+
         # Build context-aware prompt
-        system_prompt = build_assistant_prompt(
-            page=page,
-            context=request.context,
-            user_message=sanitized_message,  # Use sanitized message
-            history=request.conversation_history,
-        )
+        system_prompt = build_assistant_prompt(page=page, context=request.context, summary=summary)
 
         # PERFORMANCE (Phase 3): Check cache before calling Claude API
-        messages = [{"role": "user", "content": sanitized_message}]
         cached_response = chat_cache.get(messages, system_prompt, 0.7) if chat_cache else None
 
         if cached_response:
             assistant_message = cached_response
             logger.info(f"AI assistant cache hit for user {current_user.email} on page {page}")
         else:
-            # Call Claude API
-            client = get_default_client()
-            response = client.create_message(
-                model="claude-3-5-sonnet-latest",
-                max_tokens=1024,
-                temperature=0.7,
-                system=system_prompt,
-                messages=messages,
-            )
+            from src.utils.anthropic_client import get_default_client
 
-            assistant_message = response.content[0].text
+            # Call Claude API (usage is charged to the shared "assistant" project)
+            client = get_default_client()
+            with run_scope(project_id="assistant", operation="assistant_chat"):
+                assistant_message = client.create_message(
+                    model="claude-3-5-sonnet-latest",
+                    max_tokens=1024,
+                    temperature=0.7,
+                    system=system_prompt,
+                    messages=messages,
+                )
 
             # Cache the response for future requests
             if chat_cache:
@@ -256,7 +325,12 @@ async def chat_with_assistant(
 
         logger.info(f"AI assistant responded to user {current_user.email} on page {page}")
 
-        return ChatResponse(message=assistant_message, suggestions=suggestions)
+        return ChatResponse(
+            message=assistant_message,
+            suggestions=suggestions,
+            summary=summary,
+            window_start=window_start,
+        )
 
     except Exception as e:
         logger.error(f"AI assistant error: {str(e)}", exc_info=True)
@@ -1,10 +1,12 @@
 """Deliverables router"""
 
+import hashlib
 from typing import List, Optional
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from backend.middleware.auth_dependency import get_current_user
 from backend.middleware.authorization import (
     verify_deliverable_ownership,
@@ -14,17 +16,106 @@ from backend.schemas.deliverable import (
     DeliverableResponse,
     DeliverableDetailResponse,
     MarkDeliveredRequest,
+    PreviewWindow,
 )
 from backend.services import crud
-from backend.services.deliverable_service import get_deliverable_details
+from backend.services.deliverable_service import (
+    PREVIEW_MAX_CHARS,
+    get_deliverable_details,
+    read_preview_window,
+)
 from sqlalchemy.orm import Session
 
 from backend.database import get_db
 from backend.models import Deliverable, User
+from backend.utils.caching import CacheConfig, add_cache_headers, check_etag_match
+from backend.utils.file_streaming import (
+    get_gzip_variant,
+    iter_file,
+    iter_zip,
+    parse_range_header,
+)
+from backend.utils.file_utils import calculate_file_checksum
 from backend.utils.http_rate_limiter import standard_limiter
+from backend.utils.logger import logger
 
 router = APIRouter()
 
+# Deliverable files live under data/outputs/ (deliverable.path is relative to it)
+OUTPUTS_DIR = Path("data/outputs")
+
+MEDIA_TYPES = {
+    ".txt": "text/plain",
+    ".md": "text/markdown",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".pdf": "application/pdf",
+    ".json": "application/json",
+    ".csv": "text/csv",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".ics": "text/calendar",
+}
+
+
+def _resolve_deliverable_file(deliverable: Deliverable) -> Path:
+    """
+    Resolve a deliverable's file, ensuring it stays inside OUTPUTS_DIR.
+
+    Raises:
+        HTTPException 403: Path escapes the outputs directory
+        HTTPException 400: Path can't be resolved
+        HTTPException 404: File doesn't exist
+    """
+    try:
+        resolved_path = (OUTPUTS_DIR / deliverable.path).resolve()
+        resolved_base = OUTPUTS_DIR.resolve()
+    except (ValueError, OSError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid file path: {str(e)}"
+        )
+
+    if not resolved_path.is_relative_to(resolved_base):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Access to this file is forbidden"
+        )
+
+    if not resolved_path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"File not found: {deliverable.path}"
+        )
+
+    return resolved_path
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Whether Accept-Encoding allows gzip (ignores gzip;q=0)"""
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+async def _deliverable_checksum(db: Session, deliverable: Deliverable, file_path: Path) -> str:
+    """
+    SHA-256 of the deliverable's file, as stored at creation time.
+
+    The stored checksum is only trusted while the file's size and mtime match
+    the ones recorded with it; otherwise (file rewritten in place, or rows
+    from before checksums/mtimes were recorded) the file is hashed again and
+    the row updated.
+    """
+    stat = file_path.stat()  # Before hashing: a write during the hash rehashes next time
+    if (
+        not deliverable.checksum
+        or deliverable.file_size_bytes != stat.st_size
+        or deliverable.file_mtime != stat.st_mtime
+    ):
+        deliverable.checksum = await run_in_threadpool(calculate_file_checksum, str(file_path))
+        deliverable.file_size_bytes = stat.st_size
+        deliverable.file_mtime = stat.st_mtime
+        db.commit()
+    return deliverable.checksum
+
 
 @router.get("/", response_model=List[DeliverableResponse])
 @standard_limiter.limit("100/hour")  # TR-004: Standard operation
@@ -129,55 +220,134 @@ async def download_deliverable(
 
     Returns the file as an attachment with appropriate headers.
     Validates file existence and path security.
+
+    - Strong ETag from the stored checksum (If-None-Match -> 304)
+    - Range / If-Range for resuming interrupted downloads (206)
+    - Precompressed .gz for text formats when the client accepts gzip
     """
     # TR-021: deliverable already verified by dependency
+    file_path = _resolve_deliverable_file(deliverable)
+    file_size = file_path.stat().st_size
+    media_type = MEDIA_TYPES.get(file_path.suffix.lower(), "application/octet-stream")
+
+    # Strong ETag from the stored content hash
+    etag = f'"{await _deliverable_checksum(db, deliverable, file_path)}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{file_path.name}"',
+    }
 
-    # Construct file path
-    # Assuming files are stored in data/outputs/ relative to project root
-    base_path = Path("data/outputs")
-    file_path = base_path / deliverable.path
+    # Resume: honor Range unless If-Range names an older version of the file
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range != etag:
+        range_header = None
+
+    # Whole-file downloads of text formats are served from a precompressed .gz
+    gzip_etag = f'"{deliverable.checksum}-gzip"'
+    wants_gzip = not range_header and _accepts_gzip(request)
+    gz_path = await run_in_threadpool(get_gzip_variant, file_path) if wants_gzip else None
+    if gz_path:
+        etag = gzip_etag
+        headers["Content-Encoding"] = "gzip"
+
+    if check_etag_match(request, etag):
+        response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        return add_cache_headers(response, CacheConfig.USER_DATA, etag)
+
+    if gz_path:
+        headers["Content-Length"] = str(gz_path.stat().st_size)
+        response = StreamingResponse(iter_file(gz_path), media_type=media_type, headers=headers)
+        return add_cache_headers(response, CacheConfig.USER_DATA, etag)
 
-    # Security: Ensure the resolved path is within the base directory
     try:
-        resolved_path = file_path.resolve()
-        resolved_base = base_path.resolve()
-        if not str(resolved_path).startswith(str(resolved_base)):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Access to this file is forbidden"
-            )
-    except (ValueError, OSError) as e:
+        byte_range = parse_range_header(range_header, file_size)
+    except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid file path: {str(e)}"
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{file_size}"},
+        )
+
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        response = StreamingResponse(
+            iter_file(file_path, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers,
         )
+    else:
+        headers["Content-Length"] = str(file_size)
+        response = StreamingResponse(iter_file(file_path), media_type=media_type, headers=headers)
 
-    # Check if file exists
-    if not file_path.exists():
+    return add_cache_headers(response, CacheConfig.USER_DATA, etag)
+
+
+@router.get("/runs/{run_id}/package")
+@standard_limiter.limit("100/hour")  # TR-004: Standard operation
+async def download_run_package(
+    request: Request,
+    run_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Download all deliverables of a run as one zip.
+
+    Rate limit: 100/hour per IP+user (standard operation)
+    Authorization: TR-021 - Only deliverables from the user's own projects are included
+
+    The archive is streamed as it is built (no temp file). Its ETag is
+    derived from the members' stored checksums, so unchanged packages
+    revalidate with 304 instead of being rebuilt.
+    """
+    # TR-021: Filter to user's deliverables only (via project ownership)
+    deliverables = (
+        filter_user_deliverables(db, current_user)
+        .filter(Deliverable.run_id == run_id)
+        .order_by(Deliverable.created_at, Deliverable.id)
+        .all()
+    )
+    if not deliverables:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail=f"File not found: {deliverable.path}"
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"No deliverables found for run {run_id}"
         )
 
-    # Determine media type based on file extension
-    media_types = {
-        ".txt": "text/plain",
-        ".md": "text/markdown",
-        ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        ".pdf": "application/pdf",
-        ".json": "application/json",
-        ".csv": "text/csv",
-        ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        ".ics": "text/calendar",
-    }
+    resolved_base = OUTPUTS_DIR.resolve()
+    members = []
+    digest = hashlib.sha256()
+    for deliverable in deliverables:
+        try:
+            file_path = _resolve_deliverable_file(deliverable)
+        except HTTPException as e:
+            logger.warning(f"Skipping deliverable {deliverable.id} in package: {e.detail}")
+            continue
+
+        arcname = file_path.relative_to(resolved_base).as_posix()
+        checksum = await _deliverable_checksum(db, deliverable, file_path)
+        digest.update(f"{arcname}:{checksum}:{int(file_path.stat().st_mtime)}\n".encode())
+        members.append((file_path, arcname))
+
+    if not members:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No deliverable files found for run {run_id}",
+        )
 
-    file_extension = file_path.suffix.lower()
-    media_type = media_types.get(file_extension, "application/octet-stream")
+    etag = f'"{digest.hexdigest()}"'
+    if check_etag_match(request, etag):
+        response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        return add_cache_headers(response, CacheConfig.USER_DATA, etag)
 
-    # Return file as download
-    return FileResponse(
-        path=file_path,
-        media_type=media_type,
-        filename=file_path.name,
-        headers={"Content-Disposition": f'attachment; filename="{file_path.name}"'},
+    response = StreamingResponse(
+        iter_zip(members),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="run-{run_id}.zip"'},
     )
+    return add_cache_headers(response, CacheConfig.USER_DATA, etag)
 
 
 @router.get("/{deliverable_id}/details", response_model=DeliverableDetailResponse)
@@ -195,7 +365,8 @@ async def get_deliverable_details_endpoint(
     Rate limit: 100/hour per IP+user (standard operation)
     Authorization: TR-021 - User must own deliverable's project
 
-    - File preview (first 5000 characters)
+    - File preview (stored when the deliverable was created, re-extracted if
+      the file changed since; text snippet, docx text, or first rows of csv/xlsx)
     - Related posts from the same run
     - QA summary statistics
     - File modification timestamp
@@ -204,7 +375,36 @@ async def get_deliverable_details_endpoint(
     to display comprehensive information about a deliverable.
     """
     # TR-021: deliverable already verified by dependency
-    details = get_deliverable_details(db, deliverable_id)
+    # May re-extract a changed file's preview, so run off the event loop
+    details = await run_in_threadpool(get_deliverable_details, db, deliverable_id)
     if not details:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deliverable not found")
     return details
+
+
+@router.get("/{deliverable_id}/preview", response_model=PreviewWindow)
+@standard_limiter.limit("100/hour")  # TR-004: Standard operation
+async def get_deliverable_preview(
+    request: Request,
+    deliverable_id: str,
+    offset: int = Query(0, ge=0),
+    length: int = Query(PREVIEW_MAX_CHARS, ge=1, le=65536),
+    deliverable: Deliverable = Depends(verify_deliverable_ownership),  # TR-021: Authorization check
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Read a window of the deliverable's content for paging past the stored preview.
+
+    Rate limit: 100/hour per IP+user (standard operation)
+    Authorization: TR-021 - User must own deliverable's project
+
+    Text formats are read from a byte offset (the file is seeked, not read
+    from the start); docx/xlsx offsets are characters of the extracted text.
+    Pass the returned nextOffset to get the following window.
+    """
+    # TR-021: deliverable already verified by dependency
+    file_path = _resolve_deliverable_file(deliverable)
+    try:
+        return await run_in_threadpool(read_preview_window, file_path, offset, length)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
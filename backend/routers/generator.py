@@ -7,11 +7,12 @@ Handles content generation, regeneration, and export operations.
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from backend.database import get_db, SessionLocal
+from backend.database import get_db
 from backend.middleware.auth_dependency import get_current_user
 from backend.middleware.authorization import (
     verify_project_ownership,
@@ -21,9 +22,9 @@ from backend.schemas.run import RunResponse, LogEntry
 from backend.schemas.deliverable import DeliverableResponse
 from backend.services import crud
 from backend.services.generator_service import generator_service
+from backend.services.job_queue import PRIORITY_LOW, PRIORITY_NORMAL, job_queue
 from backend.utils.logger import logger
 from backend.utils.http_rate_limiter import strict_limiter, standard_limiter
-from src.validators.prompt_injection_defense import sanitize_prompt_input
 
 router = APIRouter()
 
@@ -38,6 +39,7 @@ class GenerateAllInput(BaseModel):
         None  # Optional template quantities from frontend
     )
     custom_topics: Optional[list[str]] = None  # NEW: topic override for content generation
+    num_posts: int = Field(30, ge=1, le=100, description="Number of posts to generate")
 
 
 class RegenerateInput(BaseModel):
@@ -54,98 +56,17 @@ class ExportInput(BaseModel):
     format: str = "txt"  # txt, docx, pdf
 
 
-async def run_generation_background(
-    run_id: str,
-    project_id: str,
-    client_id: str,
-    num_posts: int = 30,
-    template_quantities: Optional[dict[str, int]] = None,
-    custom_topics: Optional[list[str]] = None,  # NEW: topic override for generation
-):
-    """
-    Background task to run content generation.
-
-    This prevents HTTP timeouts by running generation asynchronously.
-    Updates the Run record with progress and results.
-    """
-    # Create new DB session for background task
-    db = SessionLocal()
-
-    try:
-        logger.info(f"Background generation started for run {run_id}")
-        if template_quantities:
-            logger.info(f"Using template quantities from request: {template_quantities}")
-
-        # SECURITY (TR-020): Sanitize custom_topics before passing to LLM
-        sanitized_topics = None
-        if custom_topics:
-            try:
-                sanitized_topics = [
-                    sanitize_prompt_input(topic, strict=False) for topic in custom_topics
-                ]
-                logger.info(f"Sanitized {len(custom_topics)} custom topics for generation")
-            except ValueError as e:
-                logger.error(f"Prompt injection detected in custom_topics: {e}")
-                # Update run to failed status
-                crud.update_run(
-                    db,
-                    run_id,
-                    status="failed",
-                    error_message=f"Security validation failed: {str(e)}",
-                )
-                return
-
-        # Execute content generation via service
-        result = await generator_service.generate_all_posts(
-            db=db,
-            project_id=project_id,
-            client_id=client_id,
-            num_posts=num_posts,
-            template_quantities=template_quantities,
-            custom_topics=sanitized_topics,  # Use sanitized topics
-            run_id=run_id,  # Pass run_id so posts can reference the run
-        )
-
-        # Update run status to succeeded (use LogEntry format)
-        from datetime import datetime
-        from backend.schemas.run import LogEntry
-
-        timestamp = datetime.now().isoformat()
-        logs = [
-            LogEntry(timestamp=timestamp, message="Generation started"),
-            LogEntry(timestamp=timestamp, message="CLI execution completed"),
-            LogEntry(
-                timestamp=timestamp,
-                message=f"Created {result['posts_created']} post records",
-            ),
-            LogEntry(timestamp=timestamp, message=f"Output directory: {result['output_dir']}"),
-        ]
-
-        crud.update_run(db, run_id, status="succeeded", logs=[log.model_dump() for log in logs])
-
-        logger.info(f"Background generation completed successfully for run {run_id}")
-
-    except Exception as e:
-        logger.error(f"Background generation failed for run {run_id}: {str(e)}", exc_info=True)
-
-        # Update run status to failed
-        crud.update_run(db, run_id, status="failed", error_message=str(e))
-
-    finally:
-        db.close()
-
-
 @router.post("/generate-all", response_model=RunResponse)
 @strict_limiter.limit("10/hour")  # TR-004: Expensive AI generation (composite key: IP+user)
 async def generate_all(
     request: Request,
-    background_tasks: BackgroundTasks,
     input: GenerateAllInput,
     project: Project = Depends(
         verify_project_ownership
     ),  # TR-021: Authorization check (using project_id from input)
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
     """
     Generate all posts for a project.
@@ -154,11 +75,14 @@ async def generate_all(
 
     This endpoint:
     1. Creates a Run record with status="pending"
-    2. Queues background task to run generation
+    2. Enqueues a generation job on the durable job queue
     3. Returns immediately with run_id
     4. Client polls GET /api/runs/{run_id} for status updates
 
-    Prevents HTTP timeouts by running generation asynchronously.
+    Prevents HTTP timeouts by running generation asynchronously. The job
+    survives restarts and resumes from its last saved post. Submitting again
+    while the project's generation is queued or running returns the existing
+    run (override the default per-project key with an Idempotency-Key header).
     """
     # TR-021: project already verified by dependency (verify_project_ownership uses project_id from path/query)
     # Note: We need to manually verify since project_id comes from request body, not path
@@ -188,26 +112,40 @@ async def generate_all(
             detail=f"Client {input.client_id} not found",
         )
 
-    # Create Run record with status="pending"
+    # Double submits (e.g. repeated "generate all" clicks) share the active run
+    key = f"generate-all:{input.project_id}:{idempotency_key or 'default'}"
+    active_job = job_queue.find_active(db, key)
+    if active_job:
+        logger.info(f"Generation already queued for project {input.project_id}: {active_job.id}")
+        return crud.get_run(db, active_job.run_id)
+
+    # Create Run record with status="pending" (the worker sets running/succeeded/failed)
     db_run = crud.create_run(db, project_id=input.project_id, is_batch=input.is_batch)
 
     logger.info(f"Created run {db_run.id} for project {input.project_id}")
 
-    # Queue background task (returns immediately)
-    background_tasks.add_task(
-        run_generation_background,
+    job, created = job_queue.enqueue(
+        db,
+        kind="generation",
+        payload={
+            "project_id": input.project_id,
+            "client_id": input.client_id,
+            "num_posts": input.num_posts,
+            "template_quantities": input.template_quantities,  # From frontend
+            "custom_topics": input.custom_topics,  # NEW: topic override for generation
+        },
+        tenant_id=current_user.id,
+        priority=PRIORITY_LOW if input.is_batch else PRIORITY_NORMAL,
+        idempotency_key=key,
         run_id=db_run.id,
-        project_id=input.project_id,
-        client_id=input.client_id,
-        num_posts=30,  # TODO: Make configurable via input
-        template_quantities=input.template_quantities,  # Pass template quantities from frontend
-        custom_topics=input.custom_topics,  # NEW: pass topic override for generation
     )
+    if not created:
+        # Lost a race with a concurrent submit: drop our run, report theirs
+        db.delete(db_run)
+        db.commit()
+        return crud.get_run(db, job.run_id)
 
-    # Update run status to running (background task will update to succeeded/failed)
-    db_run = crud.update_run(db, db_run.id, status="running")
-
-    logger.info(f"Queued background generation task for run {db_run.id}")
+    logger.info(f"Queued generation job {job.id} for run {db_run.id}")
 
     return db_run
 
@@ -344,7 +282,13 @@ async def export_package(
         from backend.models import Deliverable
         import uuid
         from datetime import datetime
-        from backend.utils.file_utils import calculate_file_size
+        from pathlib import Path
+        from backend.services.deliverable_service import store_file_preview
+        from backend.utils.file_utils import (
+            calculate_file_checksum,
+            calculate_file_mtime,
+            calculate_file_size,
+        )
 
         # Generate deliverable path based on project name and format
         # Path is relative to data/ directory (download endpoint will prepend data/outputs/)
@@ -353,6 +297,10 @@ async def export_package(
         # Calculate file size if file exists (use full path for file size calculation)
         full_path = f"data/outputs/{deliverable_path}"
         file_size = calculate_file_size(full_path)
+        # Checksum doubles as the download's strong ETag (reused while the mtime matches);
+        # hashing reads the whole file, so keep it off the event loop
+        file_mtime = calculate_file_mtime(full_path)
+        checksum = await run_in_threadpool(calculate_file_checksum, full_path)
 
         # Create deliverable record
         db_deliverable = Deliverable(
@@ -364,7 +312,12 @@ async def export_package(
             status="ready",
             created_at=datetime.utcnow(),
             file_size_bytes=file_size,
+            file_mtime=file_mtime,
+            checksum=checksum,
         )
+        # Extract the drawer preview once, here, rather than on every details request
+        if Path(full_path).is_file():
+            await run_in_threadpool(store_file_preview, db_deliverable, Path(full_path))
 
         db.add(db_deliverable)
         db.commit()
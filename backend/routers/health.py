@@ -5,12 +5,15 @@ Health and monitoring endpoints.
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
 
+from backend.database import get_db
 from backend.middleware.auth_dependency import get_current_user
 from backend.models.user import User
 from backend.utils.db_monitor import get_pool_status, get_pool_events
 from backend.utils.logger import logger
 from backend.utils.query_cache import get_cache_info, clear_cache, reset_cache_stats
+from backend.utils.startup_profile import get_startup_report, profile_imports
 from backend.utils.query_profiler import (
     get_query_statistics,
     get_slow_queries,
@@ -232,6 +235,60 @@ async def full_health_check():
     }
 
 
+@router.get("/health/jobs")
+async def job_queue_health(
+    db: Session = Depends(get_db),
+    admin: User = Depends(require_admin),
+):
+    """
+    Durable job queue depth and health.
+
+    Returns:
+    - queued / running job counts, per kind and status
+    - queued and running jobs per tenant (fairness)
+    - age of the oldest claimable job (worker backlog)
+    - running jobs past their lease (crashed workers awaiting requeue)
+
+    Requires admin privileges (lists per-user counts).
+    """
+    from backend.services.job_queue import job_queue
+
+    return job_queue.get_metrics(db)
+
+
+@router.get("/health/startup")
+async def startup_report():
+    """
+    Cold start report.
+
+    Returns:
+    - Boot phase durations (module import, database init, user seeding)
+    - Schema version and whether this boot had to migrate
+    - Import-time profile summary (from settings.IMPORTTIME_LOG or the last
+      POST /health/startup/profile-imports run), or None
+    """
+    return get_startup_report()
+
+
+@router.post("/health/startup/profile-imports")
+async def run_import_profile(
+    top: int = Query(15, ge=1, le=100, description="Modules listed per ranking"),
+    current_user: User = Depends(require_admin),
+):
+    """
+    Profile a cold import of the API in a fresh interpreter (`python -X importtime`).
+
+    Takes a few seconds; the summary is cached and served by GET /health/startup.
+
+    Requires admin privileges (spawns a subprocess).
+    """
+    import asyncio
+
+    summary = await asyncio.to_thread(profile_imports, top=top)
+    logger.info(f"Import profile generated by admin {current_user.email}")
+    return summary
+
+
 @router.get("/health/profiling")
 async def profiling_overview():
     """
@@ -0,0 +1,70 @@
+"""
+Jobs router - status and cancellation of queued generation/research jobs.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.middleware.auth_dependency import get_current_user
+from backend.models import Job, User
+from backend.schemas.job import JobResponse
+from backend.services.job_queue import job_queue
+
+router = APIRouter()
+
+
+def _get_owned_job(job_id: str, db: Session, current_user: User) -> Job:
+    """Load a job the current user submitted (superusers see all jobs)"""
+    job = job_queue.get(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found",
+        )
+
+    # TR-021: Jobs belong to the user who submitted them
+    if job.tenant_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: You don't own this job",
+        )
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get job status, progress checkpoint and result.
+
+    Authorization: TR-021 - User must have submitted the job
+    """
+    return _get_owned_job(job_id, db, current_user)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Cancel a queued or running job.
+
+    A running job stops at its worker's next heartbeat; posts it already
+    saved are kept.
+
+    Authorization: TR-021 - User must have submitted the job
+    """
+    job = _get_owned_job(job_id, db, current_user)
+    if not job_queue.cancel(db, job.id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job {job_id} already {job.status}",
+        )
+    db.refresh(job)
+    return job
@@ -27,14 +27,27 @@ from backend.schemas import (
     StoryMiningParams,
     BrandArchetypeParams,
 )
+from backend.config import settings
 from backend.services import crud
-from backend.services.research_service import research_service
+from backend.services.job_queue import (
+    JOB_ERROR_INVALID_INPUT,
+    JOB_ERROR_NOT_FOUND,
+    PRIORITY_HIGH,
+    job_queue,
+)
 from backend.utils.logger import logger
 from backend.utils.http_rate_limiter import strict_limiter, lenient_limiter
+from src.utils.prompt_fragments import content_hash
 from backend.middleware.authorization import _check_ownership  # TR-021: IDOR prevention
 
 router = APIRouter()
 
+# Failed research jobs whose error is the caller's, not the tool's
+JOB_ERROR_STATUS_CODES = {
+    JOB_ERROR_INVALID_INPUT: status.HTTP_400_BAD_REQUEST,
+    JOB_ERROR_NOT_FOUND: status.HTTP_404_NOT_FOUND,
+}
+
 
 class ResearchTool(BaseModel):
     """Research tool metadata"""
@@ -54,6 +67,7 @@ class RunResearchInput(BaseModel):
     client_id: str
     tool: str
     params: Optional[Dict[str, Any]] = {}
+    force_refresh: bool = False  # Re-run even if an identical run is cached
 
 
 class ResearchRunResult(BaseModel):
@@ -363,6 +377,11 @@ async def run_research(
     3. Recursive sanitization of nested dicts and lists
 
     All string parameters are sanitized before being passed to LLM prompts.
+
+    The tool runs as a high-priority job on the durable job queue and this
+    request waits for it (settings.JOB_RESEARCH_WAIT_SECONDS). Identical
+    concurrent requests share one job. If the wait times out the job keeps
+    running and a 504 response carries its job_id for GET /api/jobs/{job_id}.
     """
     # Verify project exists
     project = crud.get_project(db, input.project_id)
@@ -496,35 +515,62 @@ async def run_research(
         )
 
     try:
-        # Execute research tool via service with sanitized params
-        result = await research_service.execute_research_tool(
-            db=db,
-            project_id=input.project_id,
-            client_id=input.client_id,
-            tool_name=input.tool,
-            params=sanitized_params,  # Use sanitized params for LLM safety
+        # Queue the research tool with sanitized params (for LLM safety)
+        queued, _ = job_queue.enqueue(
+            db,
+            kind="research",
+            payload={
+                "project_id": input.project_id,
+                "client_id": input.client_id,
+                "tool": input.tool,
+                "params": sanitized_params,
+                "force_refresh": input.force_refresh,
+            },
+            tenant_id=current_user.id,
+            priority=PRIORITY_HIGH,
+            idempotency_key=(
+                f"research:{input.project_id}:{input.client_id}:{input.tool}:"
+                f"{content_hash(sanitized_params)}:{int(input.force_refresh)}"
+            ),
         )
+        job = await job_queue.wait_for(db, queued.id, timeout=settings.JOB_RESEARCH_WAIT_SECONDS)
 
-        if not result["success"]:
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail={
+                    "error": "research_still_running",
+                    "message": "Research is still running; poll the job for its result",
+                    "job_id": queued.id,
+                },
+            )
+
+        if job.status != "succeeded" and job.error_type in JOB_ERROR_STATUS_CODES:
+            # Bad input or a missing project/client/tool, reported by the handler
+            raise HTTPException(
+                status_code=JOB_ERROR_STATUS_CODES[job.error_type], detail=job.error_message
+            )
+        if job.status != "succeeded":
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Research tool execution failed: {result.get('error', 'Unknown error')}",
+                detail=f"Research tool execution failed: {job.error_message or job.status}",
             )
 
         # Return result in expected format
         return ResearchRunResult(
             tool=input.tool,
-            outputs=result["outputs"],
+            outputs=job.result["outputs"],
             metadata={
-                **result["metadata"],
+                **job.result["metadata"],
                 "price": tool.price,
                 "project_id": input.project_id,
                 "client_id": input.client_id,
+                "job_id": job.id,
             },
         )
 
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Research execution failed: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -18,6 +18,7 @@ from .deliverable import (
     DeliverableResponse,
     MarkDeliveredRequest,
 )
+from .job import JobResponse
 from .post import PostCreate, PostUpdate, PostResponse
 from .project import ProjectCreate, ProjectResponse, ProjectUpdate
 from .research_schemas import (
@@ -63,6 +64,7 @@ __all__ = [
     "RunCreate",
     "RunUpdate",
     "RunResponse",
+    "JobResponse",
     # Research tool validation schemas
     "VoiceAnalysisParams",
     "SEOKeywordParams",
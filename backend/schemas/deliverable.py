@@ -162,3 +162,24 @@ class DeliverableDetailResponse(DeliverableResponse):
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.isoformat()
+
+
+class PreviewWindow(BaseModel):
+    """
+    A window of a deliverable's content for the paged preview.
+
+    Offsets are bytes for text formats and characters of the extracted
+    text for docx/xlsx. Request the next window with offset=next_offset.
+    """
+
+    content: str
+    offset: int
+    next_offset: Optional[int] = None  # None at end of file
+    total_size: int
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+        alias_generator=lambda field_name: "".join(
+            word.capitalize() if i > 0 else word for i, word in enumerate(field_name.split("_"))
+        ),
+    )
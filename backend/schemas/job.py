@@ -0,0 +1,40 @@
+"""
+Pydantic schemas for Job API.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobResponse(BaseModel):
+    """
+    Schema for job response.
+
+    Payloads are not returned (they may hold client research inputs); the
+    run_id links generation jobs to their Run.
+    """
+
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed, cancelled
+    priority: int
+    run_id: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    checkpoint: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    error_type: Optional[str] = None  # invalid_input, not_found, or exception class
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        populate_by_name=True,  # Allow both snake_case and camelCase
+        alias_generator=lambda field_name: "".join(
+            word.capitalize() if i > 0 else word for i, word in enumerate(field_name.split("_"))
+        ),  # Convert snake_case to camelCase
+    )
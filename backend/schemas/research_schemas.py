@@ -176,15 +176,15 @@ class ContentAuditParams(BaseModel):
 
     content_inventory: List[ContentPiece] = Field(
         ...,
-        description="1-100 content pieces to audit",
+        description="1-2000 content pieces to audit",
     )
 
     @field_validator("content_inventory")
     @classmethod
     def validate_inventory(cls, v: List[ContentPiece]) -> List[ContentPiece]:
         """Validate content inventory."""
-        if not 1 <= len(v) <= 100:
-            raise ValueError("Must provide between 1-100 content pieces")
+        if not 1 <= len(v) <= 2000:
+            raise ValueError("Must provide between 1-2000 content pieces")
 
         return v
 
@@ -3,7 +3,7 @@ Pydantic schemas for Run API.
 """
 
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, field_validator
 
@@ -21,7 +21,8 @@ class RunCreate(BaseModel):
 
     TR-022: Mass assignment protection
     - Only allows: project_id, is_batch
-    - Protected fields set by system: id, started_at, completed_at, status, logs, error_message
+    - Protected fields set by system: id, started_at, completed_at, status, logs, error_message,
+      usage_summary
     """
 
     project_id: str
@@ -63,6 +64,7 @@ class RunResponse(BaseModel):
     status: str  # pending, running, succeeded, failed
     logs: Optional[List[LogEntry]] = None
     error_message: Optional[str] = None
+    usage_summary: Optional[Dict[str, Any]] = None
 
     model_config = ConfigDict(
         from_attributes=True,
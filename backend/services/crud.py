@@ -13,7 +13,7 @@ from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session, joinedload
 from backend.utils.query_cache import cache_short, cache_medium, invalidate_related_caches
 
-from backend.models import Brief, Client, Deliverable, Post, Project, User
+from backend.models import Brief, Client, Deliverable, Post, Project, Run, User
 
 
 # ==================== Cursor Pagination Utilities ====================
@@ -650,8 +650,6 @@ def get_run(db: Session, run_id: str):
     Performance: Uses eager loading for project relationship
     to prevent N+1 query problem.
     """
-    from models import Run
-
     return db.query(Run).options(joinedload(Run.project)).filter(Run.id == run_id).first()
 
 
@@ -668,8 +666,6 @@ def get_runs(
     Performance: Uses eager loading for project relationship
     to prevent N+1 query problem.
     """
-    from models import Run
-
     # Eager load project relationship
     query = db.query(Run).options(joinedload(Run.project))
 
@@ -683,8 +679,6 @@ def get_runs(
 
 def create_run(db: Session, project_id: str, is_batch: bool = False):
     """Create new run"""
-    from models import Run
-
     db_run = Run(
         id=f"run-{uuid.uuid4().hex[:12]}",
         project_id=project_id,
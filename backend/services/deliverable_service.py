@@ -3,51 +3,245 @@ Deliverable service for extended operations.
 
 Provides functions for fetching deliverable details including
 file previews, related posts, and QA summaries.
+
+Previews are extracted once when a deliverable is created and stored on the
+record together with the file version (mtime and size) they were read from,
+so opening the deliverable drawer only stats the file; a changed file is
+extracted again. Longer reads go through read_preview_window(), which seeks
+to the requested offset.
 """
+import codecs
+import csv
 from collections import Counter
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from backend.models import Deliverable
 from backend.models.post import Post
-from backend.schemas.deliverable import DeliverableDetailResponse, PostSummary, QASummary
+from backend.schemas.deliverable import (
+    DeliverableDetailResponse,
+    PostSummary,
+    PreviewWindow,
+    QASummary,
+)
 from backend.services import crud
 from backend.utils.logger import logger
 
+PREVIEW_MAX_CHARS = 5000
+PREVIEW_MAX_ROWS = 20  # csv/xlsx previews show the first rows
+
+# Plain-text formats: previews and windows read the file directly
+TEXT_PREVIEW_SUFFIXES = {".md", ".txt", ".json", ".csv", ".ics"}
 
-def get_file_preview(file_path: Path, max_chars: int = 5000) -> Tuple[Optional[str], bool]:
+
+def get_file_preview(
+    file_path: Path, max_chars: int = PREVIEW_MAX_CHARS
+) -> Tuple[Optional[str], bool]:
     """
-    Read file preview (first max_chars characters).
+    Extract a file preview.
+
+    - md/txt/json/ics: first max_chars characters
+    - csv/xlsx: first PREVIEW_MAX_ROWS rows, cells separated by " | "
+    - docx: paragraph text, up to max_chars characters
 
     Args:
         file_path: Path to the file
-        max_chars: Maximum number of characters to read
+        max_chars: Maximum number of characters to return
 
     Returns:
         Tuple of (content, was_truncated)
-        - content: File content or None if file doesn't exist
-        - was_truncated: True if content was truncated
+        - content: Preview text or None if file doesn't exist
+        - was_truncated: True if the file has more than the preview
+
+    Raises:
+        UnicodeDecodeError: File is binary or not UTF-8
+        ImportError: Extracting the format needs a missing optional package
+        OSError: File can't be read
     """
     if not file_path.exists():
         logger.warning(f"File not found for preview: {file_path}")
         return None, False
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+    suffix = file_path.suffix.lower()
+    if suffix == ".csv":
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            content, truncated = _preview_rows(csv.reader(f))
+    elif suffix == ".xlsx":
+        content, truncated = _preview_xlsx(file_path)
+    elif suffix == ".docx":
+        content, truncated = _preview_docx(file_path, max_chars)
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
             content = f.read(max_chars + 1)
-            truncated = len(content) > max_chars
-            if truncated:
-                content = content[:max_chars]
-            return content, truncated
+        truncated = len(content) > max_chars
+
+    if len(content) > max_chars:
+        content, truncated = content[:max_chars], True
+    return content, truncated
+
+
+def _preview_rows(rows) -> Tuple[str, bool]:
+    """Render the first PREVIEW_MAX_ROWS rows of an iterable of cell sequences"""
+    lines = []
+    for row in rows:
+        if len(lines) == PREVIEW_MAX_ROWS:
+            return "\n".join(lines), True
+        lines.append(" | ".join("" if cell is None else str(cell) for cell in row))
+    return "\n".join(lines), False
+
+
+def _preview_xlsx(file_path: Path) -> Tuple[str, bool]:
+    """First rows of the workbook's active sheet"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        return _preview_rows(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def _preview_docx(file_path: Path, max_chars: int) -> Tuple[str, bool]:
+    """Paragraph text of a Word document"""
+    text = _extracted_text(file_path, *_file_version(file_path))
+    return text[:max_chars], len(text) > max_chars
+
+
+def _file_version(file_path: Path) -> Tuple[int, int]:
+    stat = file_path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def preview_file_version(file_path: Path) -> str:
+    """File version a stored preview was extracted from ("<mtime_ns>:<size>")"""
+    mtime_ns, size = _file_version(file_path)
+    return f"{mtime_ns}:{size}"
+
+
+@lru_cache(maxsize=32)
+def _extracted_text(file_path: Path, mtime_ns: int, size: int) -> str:
+    """
+    Full text of a docx (paragraphs) or xlsx (active sheet rows).
+
+    Cached per file version so paging through a document extracts it once.
+    """
+    if file_path.suffix.lower() == ".xlsx":
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            return "\n".join(
+                " | ".join("" if cell is None else str(cell) for cell in row)
+                for row in workbook.active.iter_rows(values_only=True)
+            )
+        finally:
+            workbook.close()
+
+    from docx import Document
+
+    return "\n\n".join(paragraph.text for paragraph in Document(file_path).paragraphs)
+
+
+def store_file_preview(deliverable: Deliverable, file_path: Path) -> None:
+    """
+    Extract the deliverable's preview and store it with the file's version.
+
+    Called when the deliverable is created, and again when the file changed
+    since; the caller commits. Files that can't be previewed store no preview
+    (the version is still stored, so they aren't retried until they change).
+    """
+    # Version first: a write during extraction is picked up on the next request
+    version = preview_file_version(file_path)
+    try:
+        preview, truncated = get_file_preview(file_path)
     except UnicodeDecodeError:
-        # File is binary or has encoding issues
         logger.warning(f"Unable to decode file as UTF-8: {file_path}")
-        return "Unable to preview this file (binary or encoding issue)", False
+        preview, truncated = None, False
+    except ImportError as e:
+        logger.warning(f"Preview dependency missing for {file_path}: {e}")
+        preview, truncated = None, False
     except Exception as e:
         logger.error(f"Error reading file {file_path}: {e}", exc_info=True)
-        return f"Error reading file: {str(e)}", False
+        preview, truncated = None, False
+
+    deliverable.preview_text = preview
+    deliverable.preview_truncated = truncated
+    deliverable.preview_file_version = version
+
+
+def read_preview_window(
+    file_path: Path, offset: int = 0, length: int = PREVIEW_MAX_CHARS
+) -> PreviewWindow:
+    """
+    Read a window of a deliverable for the paged preview.
+
+    Text formats seek to a byte offset, so later windows cost the same as
+    the first. A window never splits a UTF-8 character: it starts at the
+    next character boundary and stops before a partial one. docx/xlsx
+    windows are character offsets into the extracted text.
+
+    Args:
+        file_path: Path to the file
+        offset: Where to start (pass the previous window's next_offset)
+        length: Bytes (text formats) or characters (docx/xlsx) to return
+
+    Returns:
+        PreviewWindow; next_offset is None at the end of the file
+
+    Raises:
+        FileNotFoundError: File doesn't exist
+        ValueError: Format has no windowed preview
+    """
+    suffix = file_path.suffix.lower()
+
+    if suffix in (".docx", ".xlsx"):
+        text = _extracted_text(file_path, *_file_version(file_path))
+        end = min(offset + length, len(text))
+        return PreviewWindow(
+            content=text[offset:end],
+            offset=offset,
+            next_offset=end if end < len(text) else None,
+            total_size=len(text),
+        )
+
+    if suffix not in TEXT_PREVIEW_SUFFIXES:
+        raise ValueError(f"No windowed preview for {suffix or 'extensionless'} files")
+
+    total_size = file_path.stat().st_size
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        data = f.read(length)
+        # Skip UTF-8 continuation bytes so the window starts on a character
+        start = 0
+        while start < min(len(data), 3) and data[start] & 0xC0 == 0x80:
+            start += 1
+
+        content, consumed = _decode_complete(data, start)
+        if not content and start < len(data):
+            # Window smaller than one character: include the whole character
+            data += f.read(3)
+            content, consumed = _decode_complete(data, start)
+
+    end = offset + consumed
+
+    return PreviewWindow(
+        content=content,
+        offset=offset + start,
+        next_offset=end if end < total_size else None,
+        total_size=total_size,
+    )
+
+
+def _decode_complete(data: bytes, start: int) -> Tuple[str, int]:
+    """Decode data[start:], leaving out a character cut off at the end"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    content = decoder.decode(data[start:], final=False)
+    # Bytes held back by the decoder belong to the incomplete character
+    return content, len(data) - len(decoder.getstate()[0])
 
 
 def calculate_qa_summary(posts: List[Post]) -> Optional[QASummary]:
@@ -120,9 +314,17 @@ def get_deliverable_details(db: Session, deliverable_id: str) -> Optional[Delive
         logger.warning(f"Deliverable not found: {deliverable_id}")
         return None
 
-    # Get file preview
+    # Preview stored at creation; extracted again here if the file changed
+    # since (or the deliverable predates stored previews)
     file_path = Path("data/outputs") / deliverable.path
-    file_preview, was_truncated = get_file_preview(file_path)
+    if (
+        file_path.is_file()
+        and deliverable.preview_file_version != preview_file_version(file_path)
+    ):
+        store_file_preview(deliverable, file_path)
+        db.commit()
+    file_preview = deliverable.preview_text
+    was_truncated = bool(deliverable.preview_truncated)
 
     # Get file modified time
     file_modified_at = None
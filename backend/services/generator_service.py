@@ -4,14 +4,15 @@ Generator Service - Orchestrates content generation workflow
 Handles:
 - Brief file creation from project data
 - CLI execution for content generation
-- Post creation in database
-- Run status tracking
+- Post creation in database (each post as soon as it is generated)
+- Run status tracking and resuming interrupted runs from their persisted posts
 """
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from backend.models import Post, Project
@@ -49,6 +50,7 @@ class GeneratorService:
         template_quantities: Optional[Dict[str, int]] = None,
         custom_topics: Optional[List[str]] = None,  # NEW: topic override for generation
         run_id: Optional[str] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
     ) -> Dict[str, any]:
         """
         Generate all posts for a project
@@ -56,6 +58,10 @@ class GeneratorService:
         NEW: Supports template quantities from project model OR from parameter.
         Priority: parameter template_quantities > project.template_quantities > num_posts
 
+        Posts already persisted for run_id (by an interrupted earlier attempt of
+        the same queued job) count towards the requested posts, so a resumed run
+        only generates what is missing.
+
         Args:
             db: Database session
             project_id: Project ID
@@ -63,11 +69,13 @@ class GeneratorService:
             num_posts: Number of posts to generate (optional, lowest priority)
             platform: Target platform (optional)
             template_quantities: Template quantities from frontend (optional, highest priority)
+            run_id: Run the posts belong to (also the resume key)
+            on_progress: Called with the run's persisted post count after each saved post
 
         Returns:
             Dict with:
-                - run_id: str
-                - posts_created: int
+                - posts_created: int (this attempt)
+                - resumed_posts: int (persisted by earlier attempts)
                 - output_dir: str
                 - files: Dict[str, str]
         """
@@ -100,8 +108,29 @@ class GeneratorService:
                 f"(total: {total_posts} posts)"
             )
 
+            # Resume: only generate what earlier attempts of this run did not persist
+            persisted = self._persisted_posts_by_template(db, run_id) if run_id else {}
+            resumed_posts = sum(persisted.values())
+            if resumed_posts:
+                template_quantities_int = {
+                    template_id: quantity - persisted.get(str(template_id), 0)
+                    for template_id, quantity in template_quantities_int.items()
+                    if quantity > persisted.get(str(template_id), 0)
+                }
+                logger.info(
+                    f"Resuming run {run_id}: {resumed_posts} posts already persisted, "
+                    f"remaining quantities {template_quantities_int}"
+                )
+                if not template_quantities_int:
+                    return {
+                        "posts_created": 0,
+                        "resumed_posts": resumed_posts,
+                        "output_dir": None,
+                        "files": {},
+                    }
+
             # Use template quantities for generation
-            return await self._generate_with_template_quantities(
+            result = await self._generate_with_template_quantities(
                 db=db,
                 project=project,
                 client=client,
@@ -109,13 +138,31 @@ class GeneratorService:
                 platform=platform,
                 custom_topics=custom_topics,  # NEW: pass topic override
                 run_id=run_id,
+                on_progress=(
+                    (lambda count: on_progress(resumed_posts + count)) if on_progress else None
+                ),
             )
+            result["resumed_posts"] = resumed_posts
+            return result
 
         # Legacy mode: use num_posts parameter
         if num_posts is None:
             num_posts = project.num_posts or 30
         logger.info(f"Using legacy num_posts mode: {num_posts} posts")
 
+        # Resume: the CLI path persists posts only once the whole run succeeds
+        resumed_posts = sum(self._persisted_posts_by_template(db, run_id).values()) if run_id else 0
+        if resumed_posts:
+            num_posts -= resumed_posts
+            logger.info(f"Resuming run {run_id}: {resumed_posts} posts already persisted")
+            if num_posts <= 0:
+                return {
+                    "posts_created": 0,
+                    "resumed_posts": resumed_posts,
+                    "output_dir": None,
+                    "files": {},
+                }
+
         # Create brief file from project data
         brief_path = self._create_brief_file(project, client)
 
@@ -125,6 +172,8 @@ class GeneratorService:
             client_name=client.name,
             num_posts=num_posts,
             platform=platform,
+            project_id=project_id,
+            run_id=run_id,
         )
 
         if not result["success"]:
@@ -140,12 +189,16 @@ class GeneratorService:
                 db=db,
                 project_id=project_id,
                 posts_data=result["posts"],
+                run_id=run_id,
             )
+            if on_progress:
+                on_progress(resumed_posts + posts_created)
 
         logger.info(f"Successfully created {posts_created} post records")
 
         return {
             "posts_created": posts_created,
+            "resumed_posts": resumed_posts,
             "output_dir": result.get("output_dir"),
             "files": result.get("files", {}),
         }
@@ -191,6 +244,7 @@ class GeneratorService:
         platform: Optional[str] = None,
         custom_topics: Optional[List[str]] = None,  # NEW: topic override for generation
         run_id: Optional[str] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
     ) -> Dict[str, any]:
         """
         Generate posts using template quantities (direct content generator call)
@@ -205,6 +259,11 @@ class GeneratorService:
             client: Client model
             template_quantities: Dict mapping template_id -> quantity
             platform: Target platform (optional)
+            run_id: Run the posts belong to
+            on_progress: Called with the number of posts saved so far
+
+        Each post is saved as soon as it is generated, so an interrupted run
+        keeps its finished posts and can be resumed.
 
         Returns:
             Dict with generation results
@@ -286,6 +345,25 @@ class GeneratorService:
             logger.info(f"Template quantities values: {list(template_quantities.values()) if template_quantities else 'None'}")
             logger.info(f"Expected total posts: {sum(template_quantities.values()) if template_quantities else 0}")
 
+            # Save each post as soon as it is generated
+            run_id = run_id or f"run-{uuid.uuid4().hex[:12]}"
+            posts_created = 0
+
+            def save_post(post) -> None:
+                nonlocal posts_created
+                try:
+                    post_id = self._save_post(db, project.id, run_id, post)
+                except Exception as e:
+                    logger.error(f"Failed to save post record: {str(e)}", exc_info=True)
+                    db.rollback()
+                    return
+                posts_created += 1
+                logger.info(
+                    f"Saved post {posts_created}: {post_id} (template: {post.template_name})"
+                )
+                if on_progress:
+                    on_progress(posts_created)
+
             try:
                 posts = await generator.generate_posts_async(
                     client_brief=brief,
@@ -294,6 +372,7 @@ class GeneratorService:
                     randomize=True,
                     max_concurrent=5,
                     use_client_memory=False,  # Not using client memory for now
+                    on_post=save_post,
                 )
                 logger.info(f"Successfully generated {len(posts)} posts (expected: {sum(template_quantities.values()) if template_quantities else 'unknown'})")
 
@@ -305,46 +384,7 @@ class GeneratorService:
                 logger.error(f"Failed to generate posts: {str(e)}", exc_info=True)
                 raise
 
-            # Create Post records in database
-            logger.info(f"Creating {len(posts)} Post records in database for project {project.id}")
-            posts_created = 0
-
-            for idx, post in enumerate(posts):
-                try:
-                    post_id = f"post-{uuid.uuid4().hex[:12]}"
-                    logger.info(f"Creating post {idx+1}/{len(posts)}: {post_id} (template: {post.template_name})")
-
-                    db_post = Post(
-                        id=post_id,
-                        project_id=project.id,
-                        run_id=run_id or f"run-{uuid.uuid4().hex[:12]}",  # Use provided run_id or generate new one
-                        content=post.content,
-                        target_platform=post.target_platform.value.lower(),  # Fixed: was 'platform', should be 'target_platform'
-                        template_id=str(post.template_id),
-                        template_name=post.template_name,
-                        variant=post.variant,
-                        word_count=post.word_count,
-                        has_cta=post.has_cta,
-                        status="approved",  # Template quantities are deliberate choices
-                        created_at=datetime.utcnow(),
-                    )
-                    db.add(db_post)
-                    posts_created += 1
-                    logger.info(f"Successfully created post record {post_id}")
-
-                except Exception as e:
-                    logger.error(f"Failed to create post record {idx+1}: {str(e)}", exc_info=True)
-                    continue
-
-            # Commit all posts
-            logger.info(f"Committing {posts_created} posts to database...")
-            try:
-                db.commit()
-                logger.info(f"✅ Successfully committed {posts_created} post records to database")
-            except Exception as e:
-                logger.error(f"Failed to commit posts to database: {str(e)}", exc_info=True)
-                db.rollback()
-                raise
+            logger.info(f"✅ Saved {posts_created} post records to database")
 
             # Verify posts were saved
             from services import crud
@@ -366,6 +406,37 @@ class GeneratorService:
             # Re-raise with more context
             raise Exception(f"Template-based generation failed ({error_type}): {str(e)}") from e
 
+    @staticmethod
+    def _save_post(db: Session, project_id: str, run_id: str, post) -> str:
+        """Insert and commit one generated post; returns its ID"""
+        db_post = Post(
+            id=f"post-{uuid.uuid4().hex[:12]}",
+            project_id=project_id,
+            run_id=run_id,
+            content=post.content,
+            target_platform=post.target_platform.value.lower(),
+            template_id=str(post.template_id),
+            template_name=post.template_name,
+            variant=post.variant,
+            word_count=post.word_count,
+            has_cta=post.has_cta,
+            status="approved",  # Template quantities are deliberate choices
+            created_at=datetime.utcnow(),
+        )
+        db.add(db_post)
+        db.commit()
+        return db_post.id
+
+    @staticmethod
+    def _persisted_posts_by_template(db: Session, run_id: str) -> Dict[str, int]:
+        """Posts already saved for a run, by template ID (resume point)"""
+        return dict(
+            db.query(Post.template_id, func.count(Post.id))
+            .filter(Post.run_id == run_id)
+            .group_by(Post.template_id)
+            .all()
+        )
+
     def _create_brief_file(self, project: Project, client: any) -> Path:
         """
         Create a brief file from project/client data
@@ -411,6 +482,7 @@ Client ID: {client.id}
         db: Session,
         project_id: str,
         posts_data: List[Dict],
+        run_id: Optional[str] = None,
     ) -> int:
         """
         Create Post records in database from generated posts
@@ -419,6 +491,7 @@ Client ID: {client.id}
             db: Database session
             project_id: Project ID
             posts_data: List of post data dicts from CLI
+            run_id: Run the posts belong to (required by the posts table)
 
         Returns:
             Number of posts created
@@ -428,20 +501,22 @@ Client ID: {client.id}
         for post_data in posts_data:
             try:
                 # Create Post model
+                # Post has no needs_review/review_reasons/keywords_used columns:
+                # review flags map onto status/flags
+                needs_review = post_data.get("needs_review", False)
                 post = Post(
                     id=f"post-{uuid.uuid4().hex[:12]}",
                     project_id=project_id,
+                    run_id=run_id or f"run-{uuid.uuid4().hex[:12]}",
                     content=post_data.get("content", ""),
-                    platform=post_data.get("target_platform", "linkedin"),
+                    target_platform=post_data.get("target_platform", "linkedin"),
                     template_id=str(post_data.get("template_id", "")),
                     template_name=post_data.get("template_name", ""),
                     variant=post_data.get("variant", 1),
                     word_count=post_data.get("word_count", 0),
                     has_cta=post_data.get("has_cta", False),
-                    needs_review=post_data.get("needs_review", False),
-                    review_reasons=post_data.get("review_reasons", []),
-                    keywords_used=post_data.get("keywords_used", []),
-                    status="approved",  # Default to approved, QA can flag
+                    status="flagged" if needs_review else "approved",  # QA can flag
+                    flags=post_data.get("review_reasons") or None,
                     created_at=datetime.utcnow(),
                 )
 
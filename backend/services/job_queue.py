@@ -0,0 +1,554 @@
+"""
+Job Queue Service - Durable queue for generation and research runs
+
+Jobs are rows in the application database (SQLite or PostgreSQL), so queued
+and in-flight work survives deploys and restarts without a Redis broker.
+Workers (backend/tasks/job_worker.py) claim jobs, renew a lease while they
+run and report the outcome; a job whose worker dies is requeued once its
+lease expires and the handler resumes from what was already persisted.
+
+Handles:
+- Enqueueing with priorities and idempotency keys (double submits share one job)
+- Claiming with per-tenant fairness (conditional UPDATE, no SKIP LOCKED needed)
+- Leases, heartbeats and checkpoints; requeueing expired leases
+- Completion, retry with backoff, release on shutdown, cancellation
+- Queue depth metrics
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.models import Job, Run
+from backend.utils.logger import logger
+
+# Priorities (higher is claimed first)
+PRIORITY_HIGH = 10  # Interactive requests a user is waiting on (research)
+PRIORITY_NORMAL = 0  # Single generation runs
+PRIORITY_LOW = -10  # Batch generation
+
+# Failed-job error types that callers waiting on the job map to client errors
+JOB_ERROR_INVALID_INPUT = "invalid_input"
+JOB_ERROR_NOT_FOUND = "not_found"
+
+ACTIVE_STATUSES = ("queued", "running")
+TERMINAL_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Queued jobs considered per claim (fairness is applied within this window)
+CLAIM_SCAN_LIMIT = 200
+RETRY_BACKOFF_SECONDS = 10  # Doubles per attempt
+
+
+class JobQueue:
+    """Service for durable background job operations"""
+
+    def __init__(
+        self,
+        lease_seconds: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        max_running_per_tenant: Optional[int] = None,
+    ):
+        """
+        Initialize job queue
+
+        Args:
+            lease_seconds: Lease length granted on claim and heartbeat
+            max_attempts: Default attempts per job (including expired leases)
+            max_running_per_tenant: Running jobs allowed per tenant before others go first
+        """
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        self.max_running_per_tenant = max_running_per_tenant or settings.JOB_MAX_RUNNING_PER_TENANT
+
+    # ==================== Submitting ====================
+
+    def enqueue(
+        self,
+        db: Session,
+        kind: str,
+        payload: Dict[str, Any],
+        tenant_id: str,
+        priority: int = PRIORITY_NORMAL,
+        idempotency_key: Optional[str] = None,
+        run_id: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> Tuple[Job, bool]:
+        """
+        Add a job, or return the active job already holding its idempotency key
+
+        Args:
+            db: Database session
+            kind: Handler kind (generation, research)
+            payload: JSON-serializable handler arguments
+            tenant_id: Owning user (fairness unit)
+            priority: Claim priority (PRIORITY_HIGH/NORMAL/LOW)
+            idempotency_key: Jobs sharing a key while queued/running are deduplicated
+            run_id: Run the job reports progress into
+            max_attempts: Override the default attempt limit
+
+        Returns:
+            (job, created) - created is False when an active duplicate was returned
+        """
+        if idempotency_key:
+            existing = self.find_active(db, idempotency_key)
+            if existing:
+                return existing, False
+
+        job = Job(
+            id=f"job-{uuid.uuid4().hex[:12]}",
+            kind=kind,
+            status="queued",
+            tenant_id=tenant_id,
+            priority=priority,
+            idempotency_key=idempotency_key,
+            active_key=idempotency_key,
+            payload=payload,
+            run_id=run_id,
+            attempts=0,
+            max_attempts=max_attempts or self.max_attempts,
+            created_at=datetime.utcnow(),
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent submit with the same key won the unique active_key
+            db.rollback()
+            existing = self.find_active(db, idempotency_key) if idempotency_key else None
+            if existing is None:
+                raise
+            return existing, False
+
+        db.refresh(job)
+        logger.info(f"Enqueued {kind} job {job.id} (tenant={tenant_id}, priority={priority})")
+        return job, True
+
+    def find_active(self, db: Session, idempotency_key: str) -> Optional[Job]:
+        """Queued or running job holding an idempotency key"""
+        return db.query(Job).filter(Job.active_key == idempotency_key).first()
+
+    def get(self, db: Session, job_id: str) -> Optional[Job]:
+        """Get job by ID"""
+        return db.query(Job).filter(Job.id == job_id).first()
+
+    def cancel(self, db: Session, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+
+        A running job's worker notices on its next heartbeat and stops the handler.
+
+        Returns:
+            True if the job was active and is now cancelled
+        """
+        cancelled = (
+            db.query(Job)
+            .filter(Job.id == job_id, Job.status.in_(ACTIVE_STATUSES))
+            .update(
+                {
+                    Job.status: "cancelled",
+                    Job.active_key: None,
+                    Job.lease_owner: None,
+                    Job.lease_expires_at: None,
+                    Job.completed_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        if cancelled:
+            job = self.get(db, job_id)
+            self._update_run(db, job, status="failed", error_message="Cancelled")
+            logger.info(f"Cancelled job {job_id}")
+        return bool(cancelled)
+
+    async def wait_for(
+        self, db: Session, job_id: str, timeout: float, poll_interval: float = 0.5
+    ) -> Optional[Job]:
+        """
+        Wait until a job reaches a terminal status
+
+        Args:
+            db: Database session
+            job_id: Job to wait for
+            timeout: Seconds to wait
+            poll_interval: Seconds between checks
+
+        Returns:
+            The finished job, or None if it is still active after timeout
+        """
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            db.expire_all()
+            job = self.get(db, job_id)
+            if job is None or job.status in TERMINAL_STATUSES:
+                return job
+            if asyncio.get_running_loop().time() >= deadline:
+                return None
+            await asyncio.sleep(poll_interval)
+
+    # ==================== Working ====================
+
+    def claim(
+        self, db: Session, worker_id: str, kinds: Optional[Iterable[str]] = None
+    ) -> Optional[Job]:
+        """
+        Lease the next job for a worker
+
+        Highest priority first. Within a priority, the tenant with the fewest
+        running jobs goes first (oldest job breaks ties), and tenants already at
+        max_running_per_tenant are skipped, so one user's burst cannot starve
+        everyone else. Only running jobs of the requested kinds count toward
+        that limit, so a dedicated lane (e.g. research) is not blocked by the
+        tenant's jobs in other lanes. The claim is a conditional UPDATE on status, so
+        concurrent workers never run the same job.
+
+        Args:
+            db: Database session
+            worker_id: Unique worker identifier (lease owner)
+            kinds: Only claim these job kinds (default: all)
+
+        Returns:
+            Claimed job (status running, attempts incremented) or None if idle
+        """
+        kinds = list(kinds) if kinds else None
+
+        for _ in range(3):  # Retry when another worker wins the race
+            now = datetime.utcnow()
+            query = db.query(Job).filter(
+                Job.status == "queued",
+                or_(Job.available_at.is_(None), Job.available_at <= now),
+            )
+            if kinds:
+                query = query.filter(Job.kind.in_(kinds))
+            candidates = (
+                query.order_by(Job.priority.desc(), Job.created_at, Job.id)
+                .limit(CLAIM_SCAN_LIMIT)
+                .all()
+            )
+            if not candidates:
+                return None
+
+            job = self._pick_fair(candidates, self._running_by_tenant(db, kinds))
+            if job is None:
+                return None
+
+            claimed = (
+                db.query(Job)
+                .filter(Job.id == job.id, Job.status == "queued")
+                .update(
+                    {
+                        Job.status: "running",
+                        Job.lease_owner: worker_id,
+                        Job.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+                        Job.heartbeat_at: now,
+                        Job.attempts: Job.attempts + 1,
+                        Job.started_at: now,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if claimed:
+                db.refresh(job)
+                logger.info(
+                    f"Worker {worker_id} claimed {job.kind} job {job.id} "
+                    f"(attempt {job.attempts}/{job.max_attempts})"
+                )
+                return job
+
+        return None
+
+    def heartbeat(
+        self,
+        db: Session,
+        job_id: str,
+        worker_id: str,
+        checkpoint: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Renew a job's lease (and persist its checkpoint)
+
+        Returns:
+            False if the worker no longer owns the job (lease expired and was
+            requeued, or the job was cancelled) - the worker should stop it
+        """
+        now = datetime.utcnow()
+        values: Dict[Any, Any] = {
+            Job.lease_expires_at: now + timedelta(seconds=self.lease_seconds),
+            Job.heartbeat_at: now,
+        }
+        if checkpoint is not None:
+            values[Job.checkpoint] = checkpoint
+
+        renewed = self._owned(db, job_id, worker_id).update(values, synchronize_session=False)
+        db.commit()
+        return bool(renewed)
+
+    def complete(
+        self,
+        db: Session,
+        job_id: str,
+        worker_id: str,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Mark a job succeeded
+
+        Returns:
+            False if the worker had lost the job (the result is discarded)
+        """
+        completed = self._owned(db, job_id, worker_id).update(
+            {
+                Job.status: "succeeded",
+                Job.result: result,
+                Job.active_key: None,
+                Job.lease_owner: None,
+                Job.lease_expires_at: None,
+                Job.completed_at: datetime.utcnow(),
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+        return bool(completed)
+
+    def fail(
+        self,
+        db: Session,
+        job_id: str,
+        worker_id: str,
+        error: str,
+        retry: bool = True,
+        error_type: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Record a failed attempt: requeue with backoff, or fail for good
+
+        Args:
+            db: Database session
+            job_id: Job ID
+            worker_id: Lease owner
+            error: Error message
+            retry: False for errors retrying cannot fix
+            error_type: Kind of failure (e.g. invalid_input, not_found), kept on the job
+
+        Returns:
+            New status ("queued" or "failed"), or None if the worker had lost the job
+        """
+        job = self._owned(db, job_id, worker_id).first()
+        if job is None:
+            return None
+
+        if retry and job.attempts < job.max_attempts:
+            backoff = RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+            values = self._requeue_values(error, datetime.utcnow() + timedelta(seconds=backoff))
+            status = "queued"
+        else:
+            values = self._failed_values(error)
+            status = "failed"
+        values[Job.error_type] = error_type
+
+        updated = self._owned(db, job_id, worker_id).update(values, synchronize_session=False)
+        db.commit()
+        if not updated:
+            return None
+
+        if status == "failed":
+            self._update_run(db, job, status="failed", error_message=error)
+        logger.warning(f"Job {job_id} attempt {job.attempts} failed ({status}): {error}")
+        return status
+
+    def release(self, db: Session, job_id: str, worker_id: str) -> bool:
+        """
+        Hand a running job back to the queue without counting the attempt
+
+        Used on graceful worker shutdown so a deploy does not wait out the lease.
+        """
+        released = self._owned(db, job_id, worker_id).update(
+            {
+                Job.status: "queued",
+                Job.attempts: Job.attempts - 1,
+                Job.lease_owner: None,
+                Job.lease_expires_at: None,
+            },
+            synchronize_session=False,
+        )
+        db.commit()
+        return bool(released)
+
+    def requeue_expired(self, db: Session) -> int:
+        """
+        Requeue running jobs whose worker stopped heartbeating
+
+        Jobs out of attempts are failed instead (and their run marked failed).
+
+        Returns:
+            Number of expired leases handled
+        """
+        now = datetime.utcnow()
+        expired = (
+            db.query(Job)
+            .filter(Job.status == "running", Job.lease_expires_at < now)
+            .all()
+        )
+
+        handled = 0
+        for job in expired:
+            error = f"Worker {job.lease_owner} lost its lease (attempt {job.attempts})"
+            if job.attempts < job.max_attempts:
+                values = self._requeue_values(error, None)
+            else:
+                values = self._failed_values(error)
+
+            # Conditional on the lease we saw, in case the worker heartbeat just now
+            updated = (
+                db.query(Job)
+                .filter(
+                    Job.id == job.id,
+                    Job.status == "running",
+                    Job.lease_expires_at == job.lease_expires_at,
+                )
+                .update(values, synchronize_session=False)
+            )
+            db.commit()
+            if not updated:
+                continue
+
+            handled += 1
+            if values[Job.status] == "failed":
+                self._update_run(db, job, status="failed", error_message=error)
+            logger.warning(f"Job {job.id}: {error}; now {values[Job.status]}")
+
+        return handled
+
+    # ==================== Metrics ====================
+
+    def get_metrics(self, db: Session) -> Dict[str, Any]:
+        """
+        Queue depth and health
+
+        Returns:
+            Dictionary with:
+                - queued / running: active job counts
+                - by_kind: {kind: {status: count}}
+                - queued_by_tenant: queued jobs per tenant
+                - running_by_tenant: running jobs per tenant
+                - oldest_queued_age_seconds: wait of the oldest claimable job
+                - expired_leases: running jobs past their lease (awaiting requeue)
+        """
+        now = datetime.utcnow()
+
+        by_kind: Dict[str, Dict[str, int]] = {}
+        for kind, status, count in (
+            db.query(Job.kind, Job.status, func.count(Job.id)).group_by(Job.kind, Job.status).all()
+        ):
+            by_kind.setdefault(kind, {})[status] = count
+
+        queued_by_tenant = dict(
+            db.query(Job.tenant_id, func.count(Job.id))
+            .filter(Job.status == "queued")
+            .group_by(Job.tenant_id)
+            .all()
+        )
+        oldest = (
+            db.query(func.min(Job.created_at))
+            .filter(
+                Job.status == "queued",
+                or_(Job.available_at.is_(None), Job.available_at <= now),
+            )
+            .scalar()
+        )
+        expired = (
+            db.query(func.count(Job.id))
+            .filter(Job.status == "running", Job.lease_expires_at < now)
+            .scalar()
+        )
+        running_by_tenant = self._running_by_tenant(db)
+
+        return {
+            "queued": sum(queued_by_tenant.values()),
+            "running": sum(running_by_tenant.values()),
+            "by_kind": by_kind,
+            "queued_by_tenant": queued_by_tenant,
+            "running_by_tenant": running_by_tenant,
+            "oldest_queued_age_seconds": (
+                round((now - _as_naive_utc(oldest)).total_seconds(), 1) if oldest else 0.0
+            ),
+            "expired_leases": expired or 0,
+            "max_running_per_tenant": self.max_running_per_tenant,
+        }
+
+    # ==================== Helpers ====================
+
+    def _pick_fair(self, candidates: List[Job], running: Dict[str, int]) -> Optional[Job]:
+        """Highest-priority job of the least busy tenant under its running limit"""
+        eligible = [
+            job for job in candidates if running.get(job.tenant_id, 0) < self.max_running_per_tenant
+        ]
+        if not eligible:
+            return None
+        top_priority = eligible[0].priority
+        same_priority = [job for job in eligible if job.priority == top_priority]
+        # min() keeps the first (oldest) job among equally busy tenants
+        return min(same_priority, key=lambda job: running.get(job.tenant_id, 0))
+
+    @staticmethod
+    def _running_by_tenant(db: Session, kinds: Optional[List[str]] = None) -> Dict[str, int]:
+        query = db.query(Job.tenant_id, func.count(Job.id)).filter(Job.status == "running")
+        if kinds:
+            query = query.filter(Job.kind.in_(kinds))
+        return dict(query.group_by(Job.tenant_id).all())
+
+    @staticmethod
+    def _owned(db: Session, job_id: str, worker_id: str):
+        return db.query(Job).filter(
+            Job.id == job_id, Job.status == "running", Job.lease_owner == worker_id
+        )
+
+    @staticmethod
+    def _requeue_values(error: str, available_at: Optional[datetime]) -> Dict[Any, Any]:
+        return {
+            Job.status: "queued",
+            Job.error_message: error,
+            Job.error_type: None,
+            Job.lease_owner: None,
+            Job.lease_expires_at: None,
+            Job.available_at: available_at,
+        }
+
+    @staticmethod
+    def _failed_values(error: str) -> Dict[Any, Any]:
+        return {
+            Job.status: "failed",
+            Job.error_message: error,
+            Job.error_type: None,
+            Job.active_key: None,
+            Job.lease_owner: None,
+            Job.lease_expires_at: None,
+            Job.completed_at: datetime.utcnow(),
+        }
+
+    @staticmethod
+    def _update_run(db: Session, job: Optional[Job], **values: Any) -> None:
+        """Mirror a terminal job outcome onto its run (no handler is left to do it)"""
+        if job is None or not job.run_id:
+            return
+        db.query(Run).filter(Run.id == job.run_id).update(
+            {**values, "completed_at": datetime.utcnow()}, synchronize_session=False
+        )
+        db.commit()
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    """Timezone-aware columns come back aware on PostgreSQL and naive (UTC) on SQLite"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# Global instance
+job_queue = JobQueue()
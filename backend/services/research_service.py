@@ -7,9 +7,12 @@ Handles:
 - Research tool execution
 - Output file management
 """
+import importlib
+import importlib.util
 import sys
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
 from sqlalchemy.orm import Session
 
@@ -26,45 +29,57 @@ else:
     if app_src.exists():
         sys.path.insert(0, "/app")
 
-# Try importing research tools
-RESEARCH_TOOLS_AVAILABLE = False
-RESEARCH_TOOL_MAP = {}
-
-try:
-    from src.research.voice_analysis import VoiceAnalyzer
-    from src.research.brand_archetype import BrandArchetypeAnalyzer
-    from src.research.seo_keyword_research import SEOKeywordResearcher
-    from src.research.competitive_analysis import CompetitiveAnalyzer
-    from src.research.content_gap_analysis import ContentGapAnalyzer
-    from src.research.market_trends_research import MarketTrendsResearcher
-    from src.research.content_audit import ContentAuditor
-    from src.research.platform_strategy import PlatformStrategist
-    from src.research.content_calendar_strategy import ContentCalendarStrategist
-    from src.research.audience_research import AudienceResearcher
-    from src.research.icp_workshop import ICPWorkshopFacilitator
-    from src.research.story_mining import StoryMiner
-
-    RESEARCH_TOOLS_AVAILABLE = True
-    RESEARCH_TOOL_MAP = {
-        "voice_analysis": VoiceAnalyzer,
-        "brand_archetype": BrandArchetypeAnalyzer,
-        "seo_keyword_research": SEOKeywordResearcher,
-        "competitive_analysis": CompetitiveAnalyzer,
-        "content_gap_analysis": ContentGapAnalyzer,
-        "market_trends_research": MarketTrendsResearcher,
-        "content_audit": ContentAuditor,
-        "platform_strategy": PlatformStrategist,
-        "content_calendar": ContentCalendarStrategist,
-        "audience_research": AudienceResearcher,
-        "icp_workshop": ICPWorkshopFacilitator,
-        "story_mining": StoryMiner,
-    }
-except ImportError as e:
-    # Research tools not available - service will return stub responses
-    RESEARCH_TOOLS_AVAILABLE = False
-    RESEARCH_TOOL_MAP = {}
-    logger = __import__("logging").getLogger(__name__)
-    logger.warning(f"Research tools not available: {str(e)}")
+# Research tools are resolved lazily: importing them pulls in the whole agent
+# stack (anthropic client, validators, datasketch/scipy), which dominated API
+# cold start. Tools execute on the worker pool, so the API process only needs
+# their import paths; classes are imported on first lookup.
+RESEARCH_TOOL_PATHS = {
+    "voice_analysis": "src.research.voice_analysis:VoiceAnalyzer",
+    "brand_archetype": "src.research.brand_archetype:BrandArchetypeAnalyzer",
+    "seo_keyword_research": "src.research.seo_keyword_research:SEOKeywordResearcher",
+    "competitive_analysis": "src.research.competitive_analysis:CompetitiveAnalyzer",
+    "content_gap_analysis": "src.research.content_gap_analysis:ContentGapAnalyzer",
+    "market_trends_research": "src.research.market_trends_research:MarketTrendsResearcher",
+    "content_audit": "src.research.content_audit:ContentAuditor",
+    "platform_strategy": "src.research.platform_strategy:PlatformStrategist",
+    "content_calendar": "src.research.content_calendar_strategy:ContentCalendarStrategist",
+    "audience_research": "src.research.audience_research:AudienceResearcher",
+    "icp_workshop": "src.research.icp_workshop:ICPWorkshopFacilitator",
+    "story_mining": "src.research.story_mining:StoryMiner",
+}
+
+
+class _LazyToolMap(Mapping):
+    """Tool name -> ResearchTool class, importing each class on first access"""
+
+    def __init__(self, paths: Dict[str, str]):
+        self._paths = paths
+        self._classes: Dict[str, type] = {}
+
+    def __getitem__(self, tool_name: str) -> type:
+        if tool_name not in self._classes:
+            module_name, _, class_name = self._paths[tool_name].partition(":")
+            module = importlib.import_module(module_name)
+            self._classes[tool_name] = getattr(module, class_name)
+        return self._classes[tool_name]
+
+    def __contains__(self, tool_name: object) -> bool:
+        # Mapping's default would import the class just to test membership
+        return tool_name in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+RESEARCH_TOOL_MAP: Mapping = _LazyToolMap(RESEARCH_TOOL_PATHS)
+
+# Checked without importing: find_spec only locates the packages
+RESEARCH_TOOLS_AVAILABLE = all(
+    importlib.util.find_spec(name) is not None for name in ("src.research", "anthropic")
+)
 
 # IMPORTANT: Use relative imports to avoid SQLAlchemy table redefinition errors
 # Absolute imports (backend.models) cause circular dependencies in production
@@ -100,6 +115,7 @@ class ResearchService:
         client_id: str,
         tool_name: str,
         params: Optional[Dict] = None,
+        force_refresh: bool = False,
     ) -> Dict[str, any]:
         """
         Execute a research tool
@@ -110,6 +126,7 @@ class ResearchService:
             client_id: Client ID
             tool_name: Name of research tool to execute
             params: Optional parameters for the tool
+            force_refresh: Re-run the analysis even if an identical run is cached
 
         Returns:
             Dict with:
@@ -151,29 +168,31 @@ class ResearchService:
             }
 
         # Check if tool exists
-        if tool_name not in RESEARCH_TOOL_MAP:
+        if tool_name not in RESEARCH_TOOL_PATHS:
             raise ValueError(f"Research tool '{tool_name}' not found")
 
-        # Get tool class
-        ToolClass = RESEARCH_TOOL_MAP[tool_name]
-
         # Prepare inputs based on tool requirements
         inputs = self._prepare_inputs(project, client, tool_name, params or {})
 
         try:
-            # Instantiate and execute tool
-            tool = ToolClass(project_id=project_id)
-            result = tool.execute(inputs)
+            from src.utils.worker_pool import ResearchJob, get_worker_pool
+
+            # Execute on a warm worker so the tool's blocking API calls stay off the event loop.
+            # The worker imports the tool class; this process never has to.
+            result = await get_worker_pool().submit(
+                ResearchJob(
+                    tool_path=RESEARCH_TOOL_PATHS[tool_name],
+                    project_id=project_id,
+                    inputs=inputs,
+                    force_refresh=force_refresh,
+                )
+            )
 
             # Convert result to backend format
             return {
                 "success": result.success,
-                "outputs": {k: str(v) for k, v in result.outputs.items()},
-                "metadata": {
-                    **result.metadata,
-                    "executed_at": result.executed_at.isoformat(),
-                    "tool_name": result.tool_name,
-                },
+                "outputs": result.files,
+                "metadata": result.metadata or {"tool_name": tool_name, "project_id": project_id},
                 "error": result.error,
             }
 
@@ -0,0 +1,149 @@
+"""
+Job queue handlers for generation and research runs.
+
+Each handler receives its own database session, the claimed Job and a
+JobContext. Raising JobFailed fails the job for good; any other exception is
+retried (with backoff) until the job runs out of attempts. Handlers must be
+safe to run again: generation skips posts an earlier attempt already saved.
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.models import Job
+from backend.schemas.run import LogEntry
+from backend.services import crud
+from backend.services.generator_service import generator_service
+from backend.services.job_queue import JOB_ERROR_INVALID_INPUT, JOB_ERROR_NOT_FOUND
+from backend.services.research_service import research_service
+from backend.tasks.job_worker import JobContext, JobFailed, register_handler
+from backend.utils.logger import logger
+from src.utils.run_context import RunUsage, run_scope
+from src.validators.prompt_injection_defense import sanitize_prompt_input
+
+
+@register_handler("generation")
+async def run_generation_job(db: Session, job: Job, context: JobContext) -> Dict[str, Any]:
+    """
+    Run content generation for a project.
+
+    Payload: project_id, client_id, num_posts, template_quantities, custom_topics.
+    Updates the job's Run record with progress and results; API usage of every
+    attempt is accumulated in the run's usage summary.
+    """
+    payload = job.payload
+    run_id = job.run_id
+    project_id = payload["project_id"]
+    usage: Optional[RunUsage] = None
+
+    logger.info(f"Generation job {job.id} started for run {run_id} (attempt {context.attempt})")
+    if payload.get("template_quantities"):
+        logger.info(f"Using template quantities from request: {payload['template_quantities']}")
+
+    # SECURITY (TR-020): Sanitize custom_topics before passing to LLM
+    sanitized_topics = None
+    if payload.get("custom_topics"):
+        try:
+            sanitized_topics = [
+                sanitize_prompt_input(topic, strict=False) for topic in payload["custom_topics"]
+            ]
+            logger.info(f"Sanitized {len(sanitized_topics)} custom topics for generation")
+        except ValueError as e:
+            logger.error(f"Prompt injection detected in custom_topics: {e}")
+            crud.update_run(
+                db, run_id, status="failed", error_message=f"Security validation failed: {str(e)}"
+            )
+            raise JobFailed(f"Security validation failed: {str(e)}")
+
+    run = crud.update_run(db, run_id, status="running")
+    previous_usage = run.usage_summary if run is not None and context.is_retry else None
+
+    try:
+        # Every API call made underneath is attributed to this run
+        with run_scope(run_id=run_id, project_id=project_id, operation="post_generation") as usage:
+            if previous_usage:
+                usage.merge_summary(previous_usage)
+            result = await generator_service.generate_all_posts(
+                db=db,
+                project_id=project_id,
+                client_id=payload["client_id"],
+                num_posts=payload.get("num_posts", 30),
+                template_quantities=payload.get("template_quantities"),
+                custom_topics=sanitized_topics,  # Use sanitized topics
+                run_id=run_id,  # Pass run_id so posts can reference the run (and resume)
+                on_progress=lambda count: context.update_checkpoint(posts_persisted=count),
+            )
+    except Exception:
+        # Keep whatever usage was spent before the failure (retries add to it)
+        if usage is not None:
+            db.rollback()
+            crud.update_run(db, run_id, usage_summary=usage.to_dict())
+        raise
+
+    timestamp = datetime.now().isoformat()
+    logs = [
+        LogEntry(timestamp=timestamp, message="Generation started"),
+        LogEntry(timestamp=timestamp, message="CLI execution completed"),
+        LogEntry(timestamp=timestamp, message=f"Created {result['posts_created']} post records"),
+        LogEntry(timestamp=timestamp, message=f"Output directory: {result['output_dir']}"),
+    ]
+    if result.get("resumed_posts"):
+        logs.insert(
+            1,
+            LogEntry(
+                timestamp=timestamp,
+                message=(
+                    f"Resumed (attempt {context.attempt}): "
+                    f"{result['resumed_posts']} posts kept from the interrupted attempt"
+                ),
+            ),
+        )
+
+    crud.update_run(
+        db,
+        run_id,
+        status="succeeded",
+        logs=[log.model_dump() for log in logs],
+        usage_summary=usage.to_dict(),
+        completed_at=datetime.utcnow(),
+    )
+    logger.info(f"Generation job {job.id} completed for run {run_id}")
+
+    return {
+        "posts_created": result["posts_created"],
+        "resumed_posts": result.get("resumed_posts", 0),
+        "output_dir": result.get("output_dir"),
+    }
+
+
+@register_handler("research")
+async def run_research_job(db: Session, job: Job, context: JobContext) -> Dict[str, Any]:
+    """
+    Execute a research tool.
+
+    Payload: project_id, client_id, tool, params (already validated and
+    sanitized by the research router), force_refresh.
+    """
+    payload = job.payload
+
+    try:
+        result = await research_service.execute_research_tool(
+            db=db,
+            project_id=payload["project_id"],
+            client_id=payload["client_id"],
+            tool_name=payload["tool"],
+            params=payload.get("params") or {},
+            force_refresh=payload.get("force_refresh", False),
+        )
+    except ValueError as e:
+        # Missing project/client/tool or invalid input: retrying cannot help
+        not_found = str(e).endswith("not found")
+        raise JobFailed(
+            str(e), error_type=JOB_ERROR_NOT_FOUND if not_found else JOB_ERROR_INVALID_INPUT
+        )
+
+    if not result["success"]:
+        raise JobFailed(result.get("error") or "Unknown error")
+
+    return {"outputs": result["outputs"], "metadata": result.get("metadata") or {}}
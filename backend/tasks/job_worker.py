@@ -0,0 +1,360 @@
+"""
+Durable job queue worker.
+
+Claims jobs from the database-backed queue (backend/services/job_queue.py)
+and runs the handler registered for their kind, renewing the job's lease
+while it runs. A worker that dies mid-job stops heartbeating; once the lease
+expires any worker requeues the job and the handler resumes from what the
+previous attempt persisted. Graceful shutdown hands running jobs straight
+back to the queue.
+
+Usage:
+    # Standalone worker processes (any number, sharing the application database)
+    python -m backend.tasks.job_worker --concurrency 2
+
+    # Embedded in the API process: settings.JOB_WORKERS_EMBEDDED loops for all
+    # kinds plus settings.JOB_RESEARCH_WORKERS_EMBEDDED research-only loops are
+    # started and stopped by the FastAPI lifespan (start_embedded_workers)
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Standalone runs need the backend directory importable (crud uses `from models import ...`)
+_backend_dir = str(Path(__file__).resolve().parent.parent)
+if _backend_dir not in sys.path:
+    sys.path.insert(0, _backend_dir)
+
+from sqlalchemy.orm import Session  # noqa: E402
+
+from backend.config import settings  # noqa: E402
+from backend.database import SessionLocal  # noqa: E402
+from backend.models import Job  # noqa: E402
+from backend.services.job_queue import JobQueue, job_queue  # noqa: E402
+from backend.utils.logger import logger  # noqa: E402
+
+
+class JobFailed(Exception):
+    """Raised by handlers for failures that retrying cannot fix"""
+
+    def __init__(self, message: str, error_type: Optional[str] = None):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class JobContext:
+    """What a handler knows about its attempt, and where it records progress"""
+
+    def __init__(self, job: Job):
+        self.job_id = job.id
+        self.attempt = job.attempts
+        self.max_attempts = job.max_attempts
+        self.checkpoint: Dict[str, Any] = dict(job.checkpoint or {})
+        self._dirty = False
+
+    @property
+    def is_retry(self) -> bool:
+        """True when an earlier attempt may have persisted partial results"""
+        return self.attempt > 1
+
+    def update_checkpoint(self, **values: Any) -> None:
+        """Record progress; persisted with the next heartbeat"""
+        self.checkpoint.update(values)
+        self._dirty = True
+
+    def take_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """Checkpoint to persist, if it changed since the last heartbeat"""
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return dict(self.checkpoint)
+
+
+JobHandler = Callable[[Session, Job, JobContext], Awaitable[Optional[Dict[str, Any]]]]
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+def register_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the coroutine that runs jobs of a kind"""
+
+    def decorator(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return decorator
+
+
+def _load_handlers() -> None:
+    """Import the modules that register handlers (deferred: they import the agent stack)"""
+    from backend.tasks import job_handlers  # noqa: F401
+
+
+class JobWorker:
+    """Claims and runs queued jobs with leases and heartbeats"""
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        kinds: Optional[List[str]] = None,
+        concurrency: int = 1,
+        poll_interval: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        session_factory: Callable[[], Session] = SessionLocal,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        Initialize worker
+
+        Args:
+            queue: Job queue (default: the global job_queue)
+            kinds: Only run these job kinds (default: all registered)
+            concurrency: Jobs run at the same time by this worker
+            poll_interval: Seconds between claims when the queue is empty
+            heartbeat_interval: Seconds between lease renewals
+            session_factory: Creates database sessions
+            worker_id: Lease owner name (default: host:pid:random)
+        """
+        self.queue = queue or job_queue
+        self.kinds = kinds
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL_SECONDS
+        self.heartbeat_interval = heartbeat_interval or settings.JOB_HEARTBEAT_SECONDS
+        self.session_factory = session_factory
+        self.worker_id = worker_id or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Process jobs until stopped (or cancelled)
+
+        Args:
+            stop: Event that ends the loop once in-flight jobs finish
+        """
+        _load_handlers()
+        stop = stop or asyncio.Event()
+        logger.info(f"Job worker {self.worker_id} started (concurrency={self.concurrency})")
+        try:
+            await asyncio.gather(*(self._loop(stop) for _ in range(self.concurrency)))
+        finally:
+            logger.info(f"Job worker {self.worker_id} stopped")
+
+    async def run_once(self) -> Optional[str]:
+        """
+        Requeue expired leases, then claim and run at most one job
+
+        Returns:
+            ID of the job that ran, or None if the queue was empty
+        """
+        _load_handlers()
+        db = self.session_factory()
+        try:
+            self.queue.requeue_expired(db)
+            job = self.queue.claim(db, self.worker_id, self.kinds)
+        finally:
+            db.close()
+
+        if job is None:
+            return None
+        await self._process(job)
+        return job.id
+
+    async def _loop(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                ran = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {self.worker_id} poll failed: {e}", exc_info=True)
+                ran = None
+
+            if ran is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _process(self, job: Job) -> None:
+        """Run one claimed job under a heartbeat and record its outcome"""
+        context = JobContext(job)
+        handler = JOB_HANDLERS.get(job.kind)
+        db = self.session_factory()
+        try:
+            if handler is None:
+                self.queue.fail(
+                    db, job.id, self.worker_id, f"No handler for job kind '{job.kind}'", retry=False
+                )
+                return
+
+            task = asyncio.ensure_future(handler(db, job, context))
+            lease_lost = asyncio.Event()
+            heartbeat = asyncio.create_task(self._heartbeat(job.id, context, task, lease_lost))
+            try:
+                result = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if lease_lost.is_set():
+                    logger.warning(f"Job {job.id} abandoned: lease lost or job cancelled")
+                    return
+                # Worker shutting down: stop the handler and hand the job back
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                self.queue.release(db, job.id, self.worker_id)
+                logger.info(f"Job {job.id} released back to the queue")
+                raise
+            except JobFailed as e:
+                db.rollback()
+                self.queue.fail(
+                    db, job.id, self.worker_id, str(e), retry=False, error_type=e.error_type
+                )
+            except Exception as e:
+                logger.error(f"Job {job.id} failed: {e}", exc_info=True)
+                db.rollback()
+                self.queue.fail(
+                    db, job.id, self.worker_id, str(e), retry=True, error_type=type(e).__name__
+                )
+            else:
+                if self.queue.complete(db, job.id, self.worker_id, result):
+                    logger.info(f"Job {job.id} succeeded")
+                else:
+                    logger.warning(f"Job {job.id} finished after losing its lease")
+            finally:
+                heartbeat.cancel()
+                await asyncio.gather(heartbeat, return_exceptions=True)
+        finally:
+            db.close()
+
+    async def _heartbeat(
+        self,
+        job_id: str,
+        context: JobContext,
+        task: "asyncio.Future[Any]",
+        lease_lost: asyncio.Event,
+    ) -> None:
+        """Renew the lease until the handler finishes; stop it if the lease is lost"""
+        while not task.done():
+            await asyncio.sleep(self.heartbeat_interval)
+            if task.done():
+                return
+
+            db = self.session_factory()
+            try:
+                renewed = self.queue.heartbeat(
+                    db, job_id, self.worker_id, checkpoint=context.take_checkpoint()
+                )
+            except Exception as e:
+                # Transient database error: try again next beat (the lease has slack)
+                logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+                continue
+            finally:
+                db.close()
+
+            if not renewed:
+                lease_lost.set()
+                task.cancel()
+                return
+
+
+# ==================== Embedded workers ====================
+
+_embedded_stop: Optional[asyncio.Event] = None
+_embedded_task: Optional["asyncio.Task[None]"] = None
+
+
+def start_embedded_workers(
+    concurrency: Optional[int] = None, research_concurrency: Optional[int] = None
+) -> bool:
+    """
+    Start worker loops inside the running event loop (API process)
+
+    Research gets its own lane: synchronous research requests wait for their
+    job, so they must not queue behind long generation runs.
+
+    Args:
+        concurrency: Loops for all job kinds (default settings.JOB_WORKERS_EMBEDDED)
+        research_concurrency: Research-only loops
+            (default settings.JOB_RESEARCH_WORKERS_EMBEDDED)
+
+    Returns:
+        True if workers were started (both counts 0 disables)
+    """
+    global _embedded_stop, _embedded_task
+
+    if concurrency is None:
+        concurrency = settings.JOB_WORKERS_EMBEDDED
+    if research_concurrency is None:
+        research_concurrency = settings.JOB_RESEARCH_WORKERS_EMBEDDED
+    if _embedded_task is not None:
+        return False
+
+    workers = []
+    if concurrency > 0:
+        workers.append(JobWorker(concurrency=concurrency))
+    if research_concurrency > 0:
+        workers.append(JobWorker(kinds=["research"], concurrency=research_concurrency))
+    if not workers:
+        return False
+
+    _embedded_stop = asyncio.Event()
+    _embedded_task = asyncio.create_task(_run_workers(workers, _embedded_stop))
+    return True
+
+
+async def _run_workers(workers: List[JobWorker], stop: asyncio.Event) -> None:
+    await asyncio.gather(*(worker.run(stop) for worker in workers))
+
+
+async def stop_embedded_workers() -> None:
+    """Stop embedded worker loops; running jobs are released back to the queue"""
+    global _embedded_stop, _embedded_task
+
+    if _embedded_task is None:
+        return
+    _embedded_stop.set()
+    _embedded_task.cancel()
+    await asyncio.gather(_embedded_task, return_exceptions=True)
+    _embedded_stop = None
+    _embedded_task = None
+
+
+async def _serve(worker: JobWorker) -> None:
+    """Run a worker; SIGTERM (deploys) releases its running jobs and exits"""
+    main_task = asyncio.current_task()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, main_task.cancel)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows: Ctrl+C still cancels via asyncio.run
+    await worker.run()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run a standalone worker process"""
+    parser = argparse.ArgumentParser(description="Content Jumpstart job queue worker")
+    parser.add_argument("--concurrency", type=int, default=1, help="Jobs run at once")
+    parser.add_argument(
+        "--kind",
+        action="append",
+        dest="kinds",
+        help="Only run this job kind (repeatable; default: all)",
+    )
+    args = parser.parse_args(argv)
+
+    worker = JobWorker(kinds=args.kinds, concurrency=args.concurrency)
+    try:
+        asyncio.run(_serve(worker))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    finally:
+        from src.utils.worker_pool import shutdown_worker_pool
+
+        shutdown_worker_pool(wait=False)
+
+
+if __name__ == "__main__":
+    main()
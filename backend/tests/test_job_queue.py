@@ -0,0 +1,385 @@
+"""
+Tests for the durable job queue and its workers.
+
+Tests cover:
+- Idempotency keys deduplicating double submits while a job is active
+- Priority ordering and per-tenant fairness when claiming
+- Lease expiry requeueing a crashed worker's job (and fencing the old worker)
+- Retry with backoff, final failure marking the run failed
+- Research validation errors kept on the failed job as an error type
+- JobWorker running handlers, stopping on cancellation, releasing on shutdown
+- Generation resuming from the posts an interrupted attempt persisted
+- Queue depth metrics
+"""
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models import Job, Post, Run
+from backend.routers.generator import GenerateAllInput
+from backend.services.generator_service import generator_service
+from backend.services.job_queue import (
+    JOB_ERROR_INVALID_INPUT,
+    JOB_ERROR_NOT_FOUND,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    JobQueue,
+)
+from backend.services.research_service import research_service
+from backend.tasks import job_worker
+from backend.tasks.job_worker import JobFailed, JobWorker
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a fresh file-backed SQLite database"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def queue():
+    return JobQueue(lease_seconds=60, max_attempts=2, max_running_per_tenant=1)
+
+
+@pytest.fixture
+def handlers():
+    """Register throwaway handlers for a test"""
+    registered = []
+
+    def register(kind, handler):
+        job_worker.JOB_HANDLERS[kind] = handler
+        registered.append(kind)
+
+    yield register
+    for kind in registered:
+        job_worker.JOB_HANDLERS.pop(kind, None)
+
+
+def _run(db, run_id="run-1"):
+    db.add(Run(id=run_id, project_id="proj-1", status="pending"))
+    db.commit()
+    return run_id
+
+
+class TestEnqueue:
+    """Test submitting jobs"""
+
+    def test_idempotency_key_dedupes_active_jobs(self, db, queue):
+        """Test a double submit returns the active job; a finished one allows a new job"""
+        first, created = queue.enqueue(db, "generation", {}, "user-1", idempotency_key="k")
+        second, created_again = queue.enqueue(db, "generation", {}, "user-1", idempotency_key="k")
+
+        assert created and not created_again
+        assert second.id == first.id
+
+        claimed = queue.claim(db, "worker-1")
+        queue.complete(db, claimed.id, "worker-1", {"ok": True})
+        third, created_third = queue.enqueue(db, "generation", {}, "user-1", idempotency_key="k")
+
+        assert created_third and third.id != first.id
+
+
+class TestClaim:
+    """Test claim order"""
+
+    def test_priority_then_fairness(self, db, queue):
+        """Test high priority goes first and a busy tenant cannot starve others"""
+        for i in range(3):
+            queue.enqueue(db, "generation", {"n": i}, "tenant-a", priority=PRIORITY_LOW)
+        late, _ = queue.enqueue(db, "generation", {}, "tenant-b", priority=PRIORITY_LOW)
+        urgent, _ = queue.enqueue(db, "research", {}, "tenant-c", priority=PRIORITY_HIGH)
+
+        claims = [queue.claim(db, f"worker-{i}") for i in range(4)]
+
+        assert claims[0].id == urgent.id
+        assert claims[1].tenant_id == "tenant-a" and claims[1].payload == {"n": 0}
+        assert claims[2].id == late.id  # tenant-a is at its running limit
+        assert claims[3] is None
+
+    def test_kinds_filter(self, db, queue):
+        """Test workers can be dedicated to job kinds"""
+        queue.enqueue(db, "generation", {}, "user-1")
+
+        assert queue.claim(db, "worker-1", kinds=["research"]) is None
+        assert queue.claim(db, "worker-1", kinds=["generation"]).kind == "generation"
+
+    def test_research_lane_not_blocked_by_tenant_generation(self, db, queue):
+        """Test the tenant limit counts only the kinds a lane claims"""
+        queue.enqueue(db, "generation", {}, "user-1")
+        queue.enqueue(db, "generation", {}, "user-1")
+        research, _ = queue.enqueue(db, "research", {}, "user-1")
+
+        assert queue.claim(db, "worker-1", kinds=["generation"]).kind == "generation"
+        assert queue.claim(db, "worker-2") is None  # user-1 at its running limit
+        assert queue.claim(db, "research-1", kinds=["research"]).id == research.id
+
+
+class TestLeases:
+    """Test crash recovery"""
+
+    def test_expired_lease_is_requeued_and_old_worker_fenced(self, db, queue):
+        """Test another worker takes over a job whose worker stopped heartbeating"""
+        job, _ = queue.enqueue(db, "generation", {}, "user-1")
+        queue.claim(db, "crashed")
+        db.query(Job).filter(Job.id == job.id).update(
+            {Job.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+
+        assert queue.requeue_expired(db) == 1
+        retaken = queue.claim(db, "healthy")
+
+        assert retaken.id == job.id and retaken.attempts == 2
+        assert queue.heartbeat(db, job.id, "crashed") is False
+        assert queue.complete(db, job.id, "crashed", {"stale": True}) is False
+        assert queue.heartbeat(db, job.id, "healthy", checkpoint={"posts_persisted": 4})
+        assert queue.get(db, job.id).checkpoint == {"posts_persisted": 4}
+
+    def test_retries_then_fails_run(self, db, queue):
+        """Test a failing job is retried with backoff, then fails its run"""
+        run_id = _run(db)
+        job, _ = queue.enqueue(db, "generation", {}, "user-1", run_id=run_id)
+
+        queue.claim(db, "worker-1")
+        assert queue.fail(db, job.id, "worker-1", "API overloaded") == "queued"
+        assert queue.claim(db, "worker-1") is None  # Backing off
+
+        db.query(Job).filter(Job.id == job.id).update({Job.available_at: None})
+        db.commit()
+        queue.claim(db, "worker-1")
+        assert queue.fail(db, job.id, "worker-1", "API overloaded") == "failed"
+
+        db.expire_all()
+        assert queue.get(db, job.id).active_key is None
+        run = db.query(Run).filter(Run.id == run_id).one()
+        assert run.status == "failed" and run.error_message == "API overloaded"
+
+
+class TestJobWorker:
+    """Test running jobs"""
+
+    def test_runs_handler_and_records_result(self, session_factory, db, queue, handlers):
+        """Test a handler's return value becomes the job result"""
+        async def echo(session, job, context):
+            return {"echo": job.payload["value"], "attempt": context.attempt}
+
+        handlers("echo", echo)
+        job, _ = queue.enqueue(db, "echo", {"value": 42}, "user-1")
+        worker = JobWorker(queue=queue, session_factory=session_factory)
+
+        assert asyncio.run(worker.run_once()) == job.id
+        assert asyncio.run(worker.run_once()) is None
+
+        db.expire_all()
+        finished = queue.get(db, job.id)
+        assert finished.status == "succeeded"
+        assert finished.result == {"echo": 42, "attempt": 1}
+
+    def test_job_failed_is_not_retried(self, session_factory, db, queue, handlers):
+        """Test JobFailed fails the job on the first attempt"""
+        async def reject(session, job, context):
+            raise JobFailed("Security validation failed")
+
+        handlers("reject", reject)
+        job, _ = queue.enqueue(db, "reject", {}, "user-1")
+        asyncio.run(JobWorker(queue=queue, session_factory=session_factory).run_once())
+
+        db.expire_all()
+        assert queue.get(db, job.id).status == "failed"
+        assert queue.get(db, job.id).attempts == 1
+
+    def test_research_validation_error_kept_on_job(self, session_factory, db, queue):
+        """Test a research ValueError fails the job with an error type the router can map"""
+        cases = {
+            "Project proj-9 not found": JOB_ERROR_NOT_FOUND,
+            "Unknown research tool: nope": JOB_ERROR_INVALID_INPUT,
+        }
+        for message, error_type in cases.items():
+            job, _ = queue.enqueue(
+                db, "research", {"project_id": "proj-9", "client_id": "c", "tool": "t"}, message
+            )
+            with patch.object(
+                research_service, "execute_research_tool", side_effect=ValueError(message)
+            ):
+                worker = JobWorker(queue=queue, session_factory=session_factory)
+                asyncio.run(worker.run_once())
+
+            db.expire_all()
+            failed = queue.get(db, job.id)
+            assert (failed.status, failed.attempts) == ("failed", 1)
+            assert (failed.error_type, failed.error_message) == (error_type, message)
+
+    def test_cancel_stops_running_handler(self, session_factory, db, queue, handlers):
+        """Test a cancelled job's handler is stopped at the next heartbeat"""
+        stopped = []
+
+        async def slow(session, job, context):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                stopped.append(job.id)
+                raise
+
+        handlers("slow", slow)
+        job, _ = queue.enqueue(db, "slow", {}, "user-1")
+        worker = JobWorker(queue=queue, session_factory=session_factory, heartbeat_interval=0.05)
+
+        async def scenario():
+            running = asyncio.create_task(worker.run_once())
+            await asyncio.sleep(0.1)
+            queue.cancel(db, job.id)
+            await asyncio.wait_for(running, timeout=2)
+
+        asyncio.run(scenario())
+
+        db.expire_all()
+        assert stopped == [job.id]
+        assert queue.get(db, job.id).status == "cancelled"
+
+    def test_shutdown_releases_job(self, session_factory, db, queue, handlers):
+        """Test stopping a worker hands its job back without using up an attempt"""
+        async def slow(session, job, context):
+            await asyncio.sleep(5)
+
+        handlers("slow", slow)
+        job, _ = queue.enqueue(db, "slow", {}, "user-1")
+        worker = JobWorker(queue=queue, session_factory=session_factory)
+
+        async def scenario():
+            running = asyncio.create_task(worker.run_once())
+            await asyncio.sleep(0.1)
+            running.cancel()
+            await asyncio.gather(running, return_exceptions=True)
+
+        asyncio.run(scenario())
+
+        db.expire_all()
+        released = queue.get(db, job.id)
+        assert released.status == "queued" and released.attempts == 0
+
+    def test_generation_job_updates_run(self, session_factory, db, queue):
+        """Test the generation handler reports progress and results into the run"""
+        run_id = _run(db)
+        job, _ = queue.enqueue(
+            db,
+            "generation",
+            {"project_id": "proj-1", "client_id": "client-1", "template_quantities": {"1": 2}},
+            "user-1",
+            run_id=run_id,
+        )
+
+        async def generate(**kwargs):
+            kwargs["on_progress"](2)
+            return {"posts_created": 2, "resumed_posts": 0, "output_dir": None, "files": {}}
+
+        with patch.object(generator_service, "generate_all_posts", side_effect=generate):
+            worker = JobWorker(queue=queue, session_factory=session_factory)
+            asyncio.run(worker.run_once())
+
+        db.expire_all()
+        run = db.query(Run).filter(Run.id == run_id).one()
+        assert run.status == "succeeded"
+        assert any("Created 2 post records" in log["message"] for log in run.logs)
+        assert queue.get(db, job.id).result["posts_created"] == 2
+
+    def test_generation_job_uses_requested_num_posts(self, session_factory, db, queue):
+        """Test the num_posts chosen on generate-all reaches the generator"""
+        run_id = _run(db)
+        payload = GenerateAllInput(project_id="proj-1", client_id="client-1", num_posts=12)
+        queue.enqueue(
+            db,
+            "generation",
+            {"project_id": "proj-1", "client_id": "client-1", "num_posts": payload.num_posts},
+            "user-1",
+            run_id=run_id,
+        )
+        captured = {}
+
+        async def generate(**kwargs):
+            captured.update(kwargs)
+            return {"posts_created": 12, "resumed_posts": 0, "output_dir": None, "files": {}}
+
+        with patch.object(generator_service, "generate_all_posts", side_effect=generate):
+            worker = JobWorker(queue=queue, session_factory=session_factory)
+            asyncio.run(worker.run_once())
+
+        assert captured["num_posts"] == 12
+        assert GenerateAllInput(project_id="p", client_id="c").num_posts == 30
+        with pytest.raises(ValidationError):
+            GenerateAllInput(project_id="p", client_id="c", num_posts=0)
+
+
+class TestGenerationResume:
+    """Test resuming interrupted generation runs"""
+
+    def test_only_missing_posts_are_generated(self, db):
+        """Test posts persisted by an earlier attempt are subtracted per template"""
+        run_id = _run(db)
+        for i, template_id in enumerate(["1", "1", "2"]):
+            db.add(
+                Post(id=f"post-{i}", project_id="proj-1", run_id=run_id, content="x",
+                     template_id=template_id)
+            )
+        db.commit()
+
+        captured = {}
+
+        async def generate(**kwargs):
+            captured.update(kwargs)
+            return {"posts_created": 3, "output_dir": None, "files": {}}
+
+        project = MagicMock(template_quantities=None)
+        with patch("backend.services.generator_service.crud") as crud, patch.object(
+            generator_service, "_generate_with_template_quantities", side_effect=generate
+        ):
+            crud.get_project.return_value = project
+            crud.get_client.return_value = MagicMock()
+            result = asyncio.run(
+                generator_service.generate_all_posts(
+                    db=db,
+                    project_id="proj-1",
+                    client_id="client-1",
+                    template_quantities={"1": 2, "2": 3, "3": 1},
+                    run_id=run_id,
+                )
+            )
+
+        assert captured["template_quantities"] == {2: 2, 3: 1}
+        assert result["resumed_posts"] == 3
+
+
+class TestMetrics:
+    """Test queue depth reporting"""
+
+    def test_depth_by_kind_and_tenant(self, db, queue):
+        """Test metrics count queued/running jobs per kind and tenant"""
+        queue.enqueue(db, "generation", {}, "tenant-a")
+        queue.enqueue(db, "generation", {}, "tenant-a")
+        queue.enqueue(db, "research", {}, "tenant-b")
+        queue.claim(db, "worker-1", kinds=["research"])
+
+        metrics = queue.get_metrics(db)
+
+        assert metrics["queued"] == 2 and metrics["running"] == 1
+        assert metrics["by_kind"] == {"generation": {"queued": 2}, "research": {"running": 1}}
+        assert metrics["queued_by_tenant"] == {"tenant-a": 2}
+        assert metrics["oldest_queued_age_seconds"] >= 0
+        assert metrics["expired_leases"] == 0
@@ -0,0 +1,197 @@
+"""
+Tests for cold start work: versioned schema initialization and the startup report.
+
+Tests cover:
+- init_db() skipping create_all()/inspection once the stored version is current
+- Upgrading databases created before version tracking (missing columns)
+- Re-running when the models change without a new migration entry
+- Failed migration steps being retried instead of recorded as applied
+- Parsing and summarizing `python -X importtime` output
+- GET /api/health/startup
+"""
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, text
+
+from main import app
+from backend import database
+from backend.utils import startup_profile
+from backend.utils.startup_profile import parse_importtime, summarize_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |       2500 |   backend.database
+import time:      1500 |       4000 | backend.main
+some unrelated log line
+import time:       800 |        800 | json
+"""
+
+
+@pytest.fixture
+def temp_engine(tmp_path):
+    """File-backed SQLite engine swapped in for the application engine"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'startup.db'}", connect_args={"check_same_thread": False}
+    )
+    with patch.object(database, "engine", engine):
+        yield engine
+    engine.dispose()
+
+
+class TestVersionedInitDb:
+    """Test schema initialization is gated on the stored version"""
+
+    def test_first_boot_creates_schema_and_records_version(self, temp_engine):
+        """Test a new database is created and stamped with the current version"""
+        assert database.init_db() is True
+
+        assert "projects" in inspect(temp_engine).get_table_names()
+        version, fingerprint = database.get_schema_version()
+        assert version == database.SCHEMA_VERSION
+        assert fingerprint == database.schema_fingerprint()
+
+    def test_steady_state_boot_skips_schema_work(self, temp_engine):
+        """Test a current database is not inspected or migrated again"""
+        database.init_db()
+
+        with patch.object(database, "_create_tables") as create_tables, patch.object(
+            database, "inspect"
+        ) as inspector:
+            assert database.init_db() is False
+
+        create_tables.assert_not_called()
+        inspector.assert_not_called()
+
+    def test_unversioned_database_gets_missing_columns(self, temp_engine):
+        """Test a database from before version tracking is upgraded in place"""
+        database.init_db()
+        with temp_engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE {database.SCHEMA_VERSION_TABLE}"))
+            conn.execute(text("ALTER TABLE runs DROP COLUMN usage_summary"))
+
+        assert database.get_schema_version() == (0, None)
+        assert database.init_db() is True
+
+        columns = [col["name"] for col in inspect(temp_engine).get_columns("runs")]
+        assert "usage_summary" in columns
+        assert database.get_schema_version()[0] == database.SCHEMA_VERSION
+
+    def test_deliverable_file_mtime_column_is_added(self, temp_engine):
+        """Test the version 8 migration passes the column type whitelist"""
+        database.init_db()
+        with temp_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE deliverables DROP COLUMN file_mtime"))
+            conn.execute(text(f"UPDATE {database.SCHEMA_VERSION_TABLE} SET version = 7"))
+
+        assert database.init_db() is True
+
+        columns = [col["name"] for col in inspect(temp_engine).get_columns("deliverables")]
+        assert "file_mtime" in columns
+
+    def test_model_change_without_migration_reruns_create_all(self, temp_engine):
+        """Test a changed model fingerprint still triggers table creation"""
+        database.init_db()
+
+        with patch.object(database, "schema_fingerprint", return_value="changed"), patch.object(
+            database, "_create_tables"
+        ) as create_tables:
+            assert database.init_db() is True
+
+        create_tables.assert_called_once()
+        assert database.get_schema_version()[1] == "changed"
+
+    def test_model_change_adds_missing_columns_to_existing_tables(self, temp_engine):
+        """Test a fingerprint-only change checks every table for missing columns"""
+        database.init_db()
+        with temp_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE posts DROP COLUMN has_cta"))
+            conn.execute(text(f"UPDATE {database.SCHEMA_VERSION_TABLE} SET fingerprint = 'old'"))
+
+        assert database.init_db() is True
+
+        columns = [col["name"] for col in inspect(temp_engine).get_columns("posts")]
+        assert "has_cta" in columns
+        assert database.get_schema_version()[1] == database.schema_fingerprint()
+
+    def test_failed_migration_is_retried_next_boot(self, temp_engine):
+        """Test a failing step stops the upgrade without recording the new version"""
+        database.init_db()
+        with temp_engine.begin() as conn:
+            conn.execute(text("ALTER TABLE jobs DROP COLUMN error_type"))
+            conn.execute(text(f"UPDATE {database.SCHEMA_VERSION_TABLE} SET version = 6"))
+
+        def fail(conn, inspector):
+            raise RuntimeError("disk I/O error")
+
+        migrations = [
+            (version, description, fail if version == 7 else migrate)
+            for version, description, migrate in database.SCHEMA_MIGRATIONS
+        ]
+        with patch.object(database, "SCHEMA_MIGRATIONS", migrations):
+            assert database.init_db() is True
+        assert database.get_schema_version()[0] == 6
+
+        assert database.init_db() is True  # Not the fast path: step 7 runs again
+        columns = [col["name"] for col in inspect(temp_engine).get_columns("jobs")]
+        assert "error_type" in columns
+        assert database.get_schema_version() == (
+            database.SCHEMA_VERSION,
+            database.schema_fingerprint(),
+        )
+
+    def test_rejected_column_type_fails_the_step(self, temp_engine):
+        """Test columns failing the security checks raise instead of being skipped"""
+        database.init_db()
+        with temp_engine.connect() as conn, pytest.raises(ValueError):
+            database._add_missing_columns(
+                conn, inspect(temp_engine), "runs", [("extra", "BLOB; DROP TABLE runs")]
+            )
+
+
+class TestImportTimeSummary:
+    """Test `-X importtime` parsing"""
+
+    def test_parse_skips_header_and_other_lines(self):
+        """Test only timing lines are parsed, with nesting depth"""
+        timings = parse_importtime(IMPORTTIME_OUTPUT)
+
+        assert [(t.module, t.depth) for t in timings] == [
+            ("_io", 2),
+            ("backend.database", 1),
+            ("backend.main", 0),
+            ("json", 0),
+        ]
+        assert timings[2].cumulative_us == 4000
+
+    def test_summary_ranks_top_level_and_self_time(self):
+        """Test totals count top-level imports once and rankings are sorted"""
+        summary = summarize_importtime(IMPORTTIME_OUTPUT, top=2)
+
+        assert summary["total_ms"] == 4.8
+        assert summary["modules"] == 4
+        assert summary["slowest_top_level"] == [
+            {"module": "backend.main", "ms": 4.0},
+            {"module": "json", "ms": 0.8},
+        ]
+        assert summary["slowest_self"][0] == {"module": "backend.main", "ms": 1.5}
+
+
+class TestStartupEndpoint:
+    """Test GET /api/health/startup"""
+
+    def test_report_includes_import_log_summary(self, tmp_path):
+        """Test the configured importtime log is summarized in the report"""
+        log_path = tmp_path / "importtime.log"
+        log_path.write_text(IMPORTTIME_OUTPUT, encoding="utf-8")
+
+        with patch.object(startup_profile.settings, "IMPORTTIME_LOG", str(log_path)):
+            response = TestClient(app).get("/api/health/startup")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "app_import" in data["phases_ms"]
+        assert data["import_profile"]["source"] == "log"
+        assert data["import_profile"]["slowest_top_level"][0]["module"] == "backend.main"
@@ -1,25 +1,23 @@
 """
-CLI Executor - Execute Python CLI scripts and parse output
+CLI Executor - Execute content generation jobs and return structured results
 
-Handles subprocess execution of run_jumpstart.py and other CLI tools
-Uses asyncio.create_subprocess_exec (safe, no shell injection)
+Generation runs on the persistent worker pool (src/utils/worker_pool.py):
+warm worker processes run the same CoordinatorAgent workflow as
+run_jumpstart.py without spawning an interpreter or scraping its stdout.
 """
-import asyncio
-import json
-import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 
 from backend.utils.logger import logger
+from src.utils.worker_pool import GenerationJob, get_worker_pool
 
 
 class CLIExecutor:
-    """Execute CLI scripts and parse their output"""
+    """Execute generation jobs and normalize their results"""
 
     def __init__(self):
         # Get project root (backend's parent directory)
         self.project_root = Path(__file__).parent.parent.parent
-        self.python_exe = "python"  # Could be made configurable
 
     async def run_content_generation(
         self,
@@ -28,9 +26,11 @@ class CLIExecutor:
         num_posts: int = 30,
         platform: Optional[str] = None,
         voice_samples: Optional[List[str]] = None,
+        project_id: Optional[str] = None,
+        run_id: Optional[str] = None,
     ) -> Dict[str, any]:
         """
-        Run run_jumpstart.py to generate content
+        Run the content workflow on the worker pool
 
         Args:
             brief_path: Path to client brief file
@@ -38,6 +38,8 @@ class CLIExecutor:
             num_posts: Number of posts to generate
             platform: Target platform (linkedin, twitter, etc.)
             voice_samples: Optional list of voice sample file paths
+            project_id: Project the run's API costs are charged to
+            run_id: Generation run the API calls are recorded under
 
         Returns:
             Dict with:
@@ -49,73 +51,47 @@ class CLIExecutor:
         """
         logger.info(f"Executing content generation for {client_name}")
 
-        # Build command (safe: arguments as list, not shell string)
-        cmd = [
-            self.python_exe,
-            str(self.project_root / "run_jumpstart.py"),
-            brief_path,
-            "-n", str(num_posts),
-        ]
-
-        if platform:
-            cmd.extend(["-p", platform])
-
+        sample_texts = None
         if voice_samples:
-            cmd.extend(["--voice-samples"] + voice_samples)
-
-        logger.info(f"Command: {' '.join(cmd)}")
-
-        try:
-            # Execute subprocess (SECURE: create_subprocess_exec, not shell)
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(self.project_root),
-            )
-
-            stdout, stderr = await process.communicate()
-
-            stdout_text = stdout.decode('utf-8', errors='replace')
-            stderr_text = stderr.decode('utf-8', errors='replace')
-
-            logger.info(f"Process exit code: {process.returncode}")
-
-            if process.returncode != 0:
-                logger.error(f"CLI execution failed:\n{stderr_text}")
-                return {
-                    "success": False,
-                    "error": f"Generation failed: {stderr_text[:500]}",
-                    "stdout": stdout_text,
-                    "stderr": stderr_text,
-                }
-
-            # Parse output to find generated files
-            output_dir, files = self._parse_output_files(stdout_text)
-
-            # Load posts from generated JSON file if available
-            posts = []
-            if "posts_json" in files:
-                posts = self._load_posts_from_json(files["posts_json"])
-
-            logger.info(f"Successfully generated {len(posts)} posts")
-            logger.info(f"Output directory: {output_dir}")
-
-            return {
-                "success": True,
-                "output_dir": str(output_dir),
-                "files": {k: str(v) for k, v in files.items()},
-                "posts": posts,
-                "stdout": stdout_text,
-            }
-
-        except Exception as e:
-            logger.error(f"CLI execution error: {str(e)}", exc_info=True)
+            sample_texts = []
+            for sample_path in voice_samples:
+                sample_file = Path(sample_path)
+                if not sample_file.exists():
+                    logger.warning(f"Voice sample not found: {sample_file}")
+                    continue
+                sample_texts.append(sample_file.read_text(encoding="utf-8"))
+
+        job = GenerationJob(
+            brief_path=brief_path,
+            num_posts=num_posts,
+            platform=platform,
+            voice_samples=sample_texts or None,
+            client_name=client_name,
+            run_id=run_id,
+            project_id=project_id,
+        )
+
+        result = await get_worker_pool().submit(job)
+
+        if not result.success:
+            logger.error(f"Content generation failed: {result.error}")
             return {
                 "success": False,
-                "error": str(e),
+                "error": f"Generation failed: {(result.error or 'unknown error')[:500]}",
             }
 
+        logger.info(
+            f"Successfully generated {len(result.posts)} posts in {result.duration_seconds}s"
+        )
+        logger.info(f"Output directory: {result.output_dir}")
+
+        return {
+            "success": True,
+            "output_dir": result.output_dir,
+            "files": result.files,
+            "posts": result.posts,
+        }
+
     async def run_research_tool(
         self,
         tool_name: str,
@@ -161,55 +137,6 @@ class CLIExecutor:
             },
         }
 
-    def _parse_output_files(self, stdout: str) -> Tuple[Path, Dict[str, Path]]:
-        """Parse stdout to find generated file paths"""
-        output_dir = None
-        files = {}
-
-        # Find output directory
-        dir_match = re.search(r'Deliverables saved to:\s*(.+?)$', stdout, re.MULTILINE)
-        if dir_match:
-            output_dir = Path(dir_match.group(1).strip())
-
-        # If we found output dir, scan it for files
-        if output_dir and output_dir.exists():
-            file_patterns = {
-                "deliverable": "*_deliverable.md",
-                "posts_txt": "*_posts.txt",
-                "posts_json": "*_posts.json",
-                "brand_voice": "*_brand_voice.md",
-                "qa_report": "*_qa_report.md",
-            }
-
-            for key, pattern in file_patterns.items():
-                matches = list(output_dir.glob(pattern))
-                if matches:
-                    files[key] = max(matches, key=lambda p: p.stat().st_mtime)
-
-        return output_dir or Path("data/outputs/unknown"), files
-
-    def _load_posts_from_json(self, json_path: Path) -> List[Dict]:
-        """Load posts from generated JSON file"""
-        try:
-            if not json_path.exists():
-                logger.warning(f"Posts JSON file not found: {json_path}")
-                return []
-
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            if isinstance(data, list):
-                return data
-            elif isinstance(data, dict) and "posts" in data:
-                return data["posts"]
-            else:
-                logger.warning(f"Unexpected JSON structure")
-                return []
-
-        except Exception as e:
-            logger.error(f"Failed to load posts from JSON: {str(e)}")
-            return []
-
 
 # Global instance
 cli_executor = CLIExecutor()
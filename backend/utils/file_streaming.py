@@ -0,0 +1,167 @@
+"""
+Streaming helpers for deliverable downloads.
+
+Provides:
+- Single-range parsing for HTTP Range / resume
+- Chunked file iteration (never reads a whole file into memory)
+- Zip archives streamed on the fly (no temp file)
+- Precompressed .gz variants of text deliverables
+"""
+import gzip
+import os
+import shutil
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+# Formats worth gzipping; docx/xlsx/pdf are already compressed
+COMPRESSIBLE_SUFFIXES = {".txt", ".md", ".json", ".csv", ".ics"}
+
+
+def parse_range_header(range_header: Optional[str], file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single byte range.
+
+    Args:
+        range_header: Value of the Range header (e.g. "bytes=0-1023", "bytes=-500")
+        file_size: Size of the file in bytes
+
+    Returns:
+        Inclusive (start, end) tuple, or None to serve the whole file
+        (no header, malformed header, or multiple ranges)
+
+    Raises:
+        ValueError: Range is well-formed but unsatisfiable (respond 416)
+    """
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+
+    spec = range_header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    start_text, end_text = (part.strip() for part in spec.split("-", 1))
+    if not (start_text or end_text) or not all(t.isdigit() for t in (start_text, end_text) if t):
+        return None
+
+    if not start_text:
+        # Suffix range: the last N bytes
+        length = int(end_text)
+        if length == 0 or file_size == 0:
+            raise ValueError(f"Range {spec} not satisfiable for {file_size} bytes")
+        return max(file_size - length, 0), file_size - 1
+
+    start = int(start_text)
+    end = int(end_text) if end_text else file_size - 1
+    if start >= file_size or end < start:
+        raise ValueError(f"Range {spec} not satisfiable for {file_size} bytes")
+
+    return start, min(end, file_size - 1)
+
+
+def iter_file(path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Yield a file (or the inclusive byte range start..end) in chunks.
+
+    Args:
+        path: File to read
+        start: First byte offset
+        end: Last byte offset (inclusive), defaults to end of file
+    """
+    remaining = (end - start + 1) if end is not None else None
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining is None or remaining > 0:
+            size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+            chunk = f.read(size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+class _ChunkSink:
+    """Write-only stream collecting what ZipFile writes until it is drained"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, []
+        yield from chunks
+
+
+def iter_zip(members: Iterable[Tuple[Path, str]]) -> Iterator[bytes]:
+    """
+    Stream a zip archive of files without building it on disk or in memory.
+
+    ZipFile writes to an unseekable sink, so sizes and CRCs go into data
+    descriptors after each member. Text formats are deflated; formats that
+    are already compressed are stored.
+
+    Args:
+        members: (file path, name inside the archive) pairs
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for path, arcname in members:
+            info = zipfile.ZipInfo.from_file(path, arcname)
+            compressible = path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+            info.compress_type = zipfile.ZIP_DEFLATED if compressible else zipfile.ZIP_STORED
+
+            force_zip64 = info.file_size > zipfile.ZIP64_LIMIT
+            with archive.open(info, mode="w", force_zip64=force_zip64) as dest:
+                for chunk in iter_file(path):
+                    dest.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+
+    # Central directory
+    yield from sink.drain()
+
+
+def get_gzip_variant(path: Path) -> Optional[Path]:
+    """
+    Return the precompressed <file>.gz for a text deliverable, creating it if needed.
+
+    The variant is rebuilt whenever it is older than the file. It is written
+    to a temporary name and renamed, so concurrent downloads never see a
+    partial file.
+
+    Args:
+        path: Deliverable file
+
+    Returns:
+        Path to the .gz file, or None for formats that aren't compressed
+    """
+    if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+        return None
+
+    gz_path = path.with_name(path.name + ".gz")
+    try:
+        if gz_path.exists() and gz_path.stat().st_mtime >= path.stat().st_mtime:
+            return gz_path
+
+        tmp_path = gz_path.with_name(f".{gz_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with open(path, "rb") as src, gzip.open(tmp_path, "wb", compresslevel=6) as dest:
+                shutil.copyfileobj(src, dest, CHUNK_SIZE)
+            os.replace(tmp_path, gz_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        return gz_path
+    except OSError:
+        # Read-only or full disk: fall back to the uncompressed file
+        return None
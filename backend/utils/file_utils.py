@@ -1,7 +1,9 @@
 """
 File utility functions for deliverables.
 """
+import hashlib
 from pathlib import Path
+from typing import Optional
 
 
 def calculate_file_size(file_path: str) -> int:
@@ -34,6 +36,63 @@ def calculate_file_size(file_path: str) -> int:
         return 0
 
 
+def calculate_file_checksum(file_path: str) -> Optional[str]:
+    """
+    Calculate SHA-256 checksum of a file, reading it in chunks.
+
+    Stored on the deliverable at creation time and used as its strong ETag.
+
+    Args:
+        file_path: Relative path to file from project root or absolute path
+
+    Returns:
+        Hex digest, or None if file doesn't exist
+    """
+    try:
+        path = Path(file_path)
+
+        if not path.is_absolute():
+            project_root = Path(__file__).parent.parent.parent
+            path = project_root / file_path
+
+        if not path.is_file():
+            return None
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    except OSError:
+        return None
+
+
+def calculate_file_mtime(file_path: str) -> Optional[float]:
+    """
+    Modification time (st_mtime) of a file.
+
+    Stored next to the checksum; the checksum is only reused while it matches.
+
+    Args:
+        file_path: Relative path to file from project root or absolute path
+
+    Returns:
+        st_mtime, or None if file doesn't exist
+    """
+    try:
+        path = Path(file_path)
+
+        if not path.is_absolute():
+            project_root = Path(__file__).parent.parent.parent
+            path = project_root / file_path
+
+        return path.stat().st_mtime if path.is_file() else None
+
+    except OSError:
+        return None
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     Format bytes to human-readable size.
@@ -0,0 +1,182 @@
+"""
+Startup profiling: boot phase timings and `python -X importtime` summaries.
+
+Cold start matters on scale-to-zero deploys, where the first request waits for
+module imports and database initialization. This module records how long each
+boot phase took and summarizes import-time profiles so the slowest imports can
+be spotted from /api/health/startup without shell access.
+
+Import profiles come from either:
+- settings.IMPORTTIME_LOG: stderr of a server started with `python -X importtime`
+  (non-profile lines in the file are ignored), or
+- profile_imports(): a one-off `python -X importtime -c "import backend.main"`
+  subprocess, cached until the next call.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from backend.config import settings
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+_phases_ms: Dict[str, float] = {}
+_startup_info: Dict[str, Any] = {}
+_cached_import_profile: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class ImportTiming:
+    """One line of `-X importtime` output"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 for modules imported directly by the profiled code
+
+
+def record_phase(name: str, duration_seconds: float) -> None:
+    """Record the duration of a boot phase (e.g. "app_import", "init_db")"""
+    _phases_ms[name] = round(duration_seconds * 1000, 1)
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time the block as a boot phase"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - start)
+
+
+def set_startup_info(**info: Any) -> None:
+    """Attach facts about the boot (e.g. schema_migrated=False) to the report"""
+    _startup_info.update(info)
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse `-X importtime` stderr output.
+
+    Args:
+        output: Text containing "import time: self | cumulative | module" lines
+
+    Returns:
+        Timings in output order (children before their parent)
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header line ("self [us] | cumulative | imported package")
+
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        timings.append(
+            ImportTiming(
+                module=stripped,
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def summarize_importtime(output: str, top: int = 15) -> Dict[str, Any]:
+    """
+    Summarize `-X importtime` output.
+
+    Args:
+        output: Raw importtime output
+        top: Number of modules to list per ranking
+
+    Returns:
+        Dictionary with total import time, module count, the slowest top-level
+        imports (cumulative) and the modules with the most self time
+    """
+    timings = parse_importtime(output)
+    top_level = [timing for timing in timings if timing.depth == 0]
+
+    def as_dict(timing: ImportTiming, key: str) -> Dict[str, Any]:
+        return {"module": timing.module, "ms": round(getattr(timing, key) / 1000, 1)}
+
+    return {
+        "total_ms": round(sum(timing.cumulative_us for timing in top_level) / 1000, 1),
+        "modules": len(timings),
+        "slowest_top_level": [
+            as_dict(timing, "cumulative_us")
+            for timing in sorted(top_level, key=lambda t: t.cumulative_us, reverse=True)[:top]
+        ],
+        "slowest_self": [
+            as_dict(timing, "self_us")
+            for timing in sorted(timings, key=lambda t: t.self_us, reverse=True)[:top]
+        ],
+    }
+
+
+def profile_imports(
+    module: str = "backend.main", top: int = 15, timeout: int = 120
+) -> Dict[str, Any]:
+    """
+    Profile a cold import of a module in a fresh interpreter.
+
+    Args:
+        module: Module to import
+        top: Number of modules to list per ranking
+        timeout: Seconds before the profiling subprocess is abandoned
+
+    Returns:
+        summarize_importtime() result, also cached for get_startup_report()
+    """
+    global _cached_import_profile
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    summary = summarize_importtime(completed.stderr, top=top)
+    summary.update({"source": "subprocess", "module": module, "exit_code": completed.returncode})
+    _cached_import_profile = summary
+    return summary
+
+
+def _import_profile_from_log() -> Optional[Dict[str, Any]]:
+    if not settings.IMPORTTIME_LOG:
+        return None
+
+    log_path = Path(settings.IMPORTTIME_LOG)
+    if not log_path.exists():
+        return None
+
+    summary = summarize_importtime(log_path.read_text(encoding="utf-8", errors="replace"))
+    summary.update({"source": "log", "path": str(log_path)})
+    return summary
+
+
+def get_startup_report() -> Dict[str, Any]:
+    """
+    Boot phase timings plus the latest import-time profile, if any.
+
+    Returns:
+        Dictionary with phases_ms, startup info and import_profile (None when
+        no importtime log is configured and profile_imports() has not run)
+    """
+    return {
+        "phases_ms": dict(_phases_ms),
+        **_startup_info,
+        "import_profile": _cached_import_profile or _import_profile_from_log(),
+    }
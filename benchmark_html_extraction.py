@@ -0,0 +1,118 @@
+"""Benchmark HTML Voice Sample Extraction
+
+Compares the legacy regex extractor (DOTALL script/style removal, tag-strip
+regex, chained entity replaces) against the streaming html.parser extractor
+on multi-MB website exports, including a malformed page with unclosed
+script tags where the DOTALL regexes backtrack across the whole document.
+
+The regexes run in C, so on clean markup they remain faster than the pure
+Python parser; the parser's win is linear worst-case behaviour, bounded
+memory, full entity decoding and paragraph-preserving output.
+"""
+
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from src.utils.file_parser import _clean_text, _extract_from_html
+
+ARTICLE = """
+<article class="post">
+  <h2>Why most onboarding calls fail &mdash; and what to do instead</h2>
+  <p>Every client brings a different story. We start by listening &amp; asking
+  the questions nobody else asks: what does &ldquo;success&rdquo; look like in
+  90 days? Which customers do you <em>never</em> want again?</p>
+  <p>Then we write. Short sentences. Clear takeaways.<br>No jargon&nbsp;allowed.</p>
+  <script>window.dataLayer.push({"event": "view", "id": 42});</script>
+  <style>.post p { margin: 0 0 1em; }</style>
+</article>
+"""
+
+PAGE_HEADER = "<html><head><title>Blog export</title></head><body><nav><a href='/'>Home</a></nav>"
+PAGE_FOOTER = "</body></html>"
+
+
+def legacy_extract(file_path: Path) -> str:
+    """Regex extraction, as implemented before the streaming parser"""
+    html_content = file_path.read_text(encoding="utf-8")
+    html_content = re.sub(r"<script[^>]*>.*?</script>", "", html_content, flags=re.DOTALL)
+    html_content = re.sub(r"<style[^>]*>.*?</style>", "", html_content, flags=re.DOTALL)
+    text = re.sub(r"<[^>]+>", " ", html_content)
+    text = text.replace("&nbsp;", " ")
+    text = text.replace("&amp;", "&")
+    text = text.replace("&lt;", "<")
+    text = text.replace("&gt;", ">")
+    text = text.replace("&quot;", '"')
+    text = text.replace("&#39;", "'")
+    return _clean_text(text)
+
+
+def streaming_extract(file_path: Path) -> str:
+    """Streaming html.parser extraction"""
+    return _clean_text(_extract_from_html(file_path))
+
+
+def build_page(target_size: int, malformed: bool = False) -> str:
+    """Repeat the sample article until the page reaches target_size characters"""
+    article = ARTICLE
+    if malformed:
+        # Exports from broken CMS templates often drop closing script tags
+        article = article.replace("</script>", "")
+    count = max(1, target_size // len(article))
+    return PAGE_HEADER + article * count + PAGE_FOOTER
+
+
+def time_call(func: Callable[[Path], str], file_path: Path, iterations: int) -> float:
+    """Return average seconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(file_path)
+    return (time.perf_counter() - start) / iterations
+
+
+def run_benchmark():
+    """Run benchmark across export sizes, well-formed and malformed"""
+    print("=" * 80)
+    print("HTML EXTRACTION BENCHMARK")
+    print("=" * 80)
+
+    sizes = [100_000, 1_000_000, 5_000_000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for label, malformed in (("well-formed", False), ("unclosed <script>", True)):
+                page = build_page(size, malformed=malformed)
+                file_path = Path(tmp) / "export.html"
+                file_path.write_text(page, encoding="utf-8")
+                size_mb = len(page.encode("utf-8")) / (1024 * 1024)
+                iterations = 3 if size >= 1_000_000 else 10
+
+                print(f"\n{'-' * 80}")
+                print(f"Export: {size_mb:.2f} MB, {label} ({iterations} iterations)")
+                print("-" * 80)
+
+                # The quadratic regex blows up on large malformed pages; cap it
+                if malformed and size > 100_000:
+                    print("  Legacy (regex):      skipped (quadratic backtracking)")
+                    legacy_time = None
+                else:
+                    legacy_time = time_call(legacy_extract, file_path, iterations)
+                    print(f"  Legacy (regex):      {legacy_time * 1000:.1f}ms")
+
+                streaming_time = time_call(streaming_extract, file_path, iterations)
+                print(
+                    f"  Streaming parser:    {streaming_time * 1000:.1f}ms "
+                    f"({size_mb / streaming_time:.1f} MB/s)"
+                )
+                if legacy_time:
+                    print(f"  Speedup:             {legacy_time / streaming_time:.2f}x")
+
+    print(f"\n{'=' * 80}")
+    print("BENCHMARK COMPLETE")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -14,6 +14,7 @@ export interface RunResearchInput {
   clientId: string;
   tool: string;
   params?: Record<string, unknown>;
+  forceRefresh?: boolean; // Re-run even if an identical run is cached
 }
 
 export interface ResearchRunResult {
@@ -35,6 +36,7 @@ export const researchApi = {
       client_id: input.clientId,
       tool: input.tool,
       params: input.params,
+      force_refresh: input.forceRefresh ?? false,
     };
     const { data } = await apiClient.post<ResearchRunResult>('/api/research/run', backendInput);
     return data;
@@ -11,6 +11,14 @@ interface Message {
 interface AssistantResponse {
   message: string;
   suggestions: string[];
+  summary: string;
+  window_start: number;
+}
+
+// Rolling summary of older turns; messages before windowStart are folded into it
+interface ConversationSummary {
+  summary: string;
+  windowStart: number;
 }
 
 export default function AIAssistantSidebar() {
@@ -19,6 +27,10 @@ export default function AIAssistantSidebar() {
   const [inputMessage, setInputMessage] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const [suggestions, setSuggestions] = useState<string[]>([]);
+  const [conversationSummary, setConversationSummary] = useState<ConversationSummary>({
+    summary: '',
+    windowStart: 0,
+  });
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const location = useLocation();
 
@@ -100,6 +112,8 @@ export default function AIAssistantSidebar() {
             // TODO: Add more context (current project, client, etc.)
           },
           conversation_history: messages,
+          summary: conversationSummary.summary,
+          window_start: conversationSummary.windowStart,
         }),
       });
 
@@ -113,6 +127,10 @@ export default function AIAssistantSidebar() {
           timestamp: new Date(),
         };
         setMessages((prev) => [...prev, assistantMessage]);
+        setConversationSummary({
+          summary: data.summary || '',
+          windowStart: data.window_start || 0,
+        });
 
         // Update suggestions
         if (data.suggestions && data.suggestions.length > 0) {
@@ -145,6 +163,7 @@ export default function AIAssistantSidebar() {
       });
 
       setMessages([]);
+      setConversationSummary({ summary: '', windowStart: 0 });
       loadContextSuggestions();
     } catch (error) {
       console.error('Failed to reset conversation:', error);
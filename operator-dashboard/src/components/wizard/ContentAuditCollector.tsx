@@ -258,11 +258,11 @@ export function ContentAuditCollector({ value, onChange, error }: ContentAuditCo
           <div className="mb-3 flex items-center justify-between">
             <label className="flex items-center gap-2 text-sm font-medium text-neutral-800 dark:text-neutral-200">
               <FileText className="h-4 w-4" />
-              Content Inventory ({count}/100)
+              Content Inventory ({count}/2000)
             </label>
-            {count > 100 && (
+            {count > 2000 && (
               <span className="text-xs text-rose-600 dark:text-rose-400">
-                Maximum 100 pieces
+                Maximum 2000 pieces
               </span>
             )}
           </div>
@@ -318,7 +318,7 @@ export function ContentAuditCollector({ value, onChange, error }: ContentAuditCo
 
       {/* Helper Text */}
       <p className="text-xs text-neutral-500 dark:text-neutral-400">
-        Provide 1-100 content pieces to audit. URLs are auto-analyzed for type and title. For content without URLs (like internal docs), use manual entry.
+        Provide 1-2000 content pieces to audit. URLs are auto-analyzed for type and title. For content without URLs (like internal docs), use manual entry.
       </p>
     </div>
   );
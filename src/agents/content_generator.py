@@ -3,7 +3,21 @@
 import asyncio
 import random
 import re
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+import time
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 from ..config.brand_frameworks import (
     get_archetype_from_client_type,
@@ -13,6 +27,7 @@ from ..config.brand_frameworks import (
 from ..config.constants import AI_TELL_PHRASES, MAX_POST_WORD_COUNT, MIN_POST_WORD_COUNT
 from ..config.platform_specs import get_platform_prompt_guidance, get_platform_target_length
 from ..config.prompts import SystemPrompts
+from ..config.settings import settings
 from ..models.client_brief import ClientBrief, Platform
 from ..models.client_memory import ClientMemory
 from ..models.post import Post
@@ -20,7 +35,15 @@ from ..models.seo_keyword import KeywordStrategy
 from ..models.template import Template
 from ..models.voice_sample import VoiceMatchReport
 from ..utils.anthropic_client import AnthropicClient
+from ..utils.api_limiter import api_call_slot
 from ..utils.logger import log_post_generated, logger
+from ..utils.prompt_fragments import SystemPrompt, get_prompt_fragment_cache
+from ..utils.run_context import (
+    get_current_run,
+    operation_scope,
+    record_queue_wait,
+    tracked_operation,
+)
 from ..utils.template_loader import TemplateLoader
 from ..validators.prompt_injection_defense import (
     sanitize_prompt_input,
@@ -31,6 +54,12 @@ from ..validators.prompt_injection_defense import (
 if TYPE_CHECKING:
     from ..database.project_db import ProjectDatabase
 
+# Operation tag for quality retries; their tokens count against the retry budget
+RETRY_OPERATION = "post_generation_retry"
+
+# Teaser platforms for blog-first packages, in the order social_teasers_per_blog takes them
+DEFAULT_TEASER_PLATFORMS = (Platform.TWITTER, Platform.FACEBOOK, Platform.LINKEDIN)
+
 
 class ContentGeneratorAgent:
     """
@@ -61,6 +90,7 @@ class ContentGeneratorAgent:
         self.keyword_strategy = keyword_strategy
         self.db = db
 
+    @tracked_operation("post_generation")
     def generate_posts(
         self,
         client_brief: ClientBrief,
@@ -205,6 +235,7 @@ class ContentGeneratorAgent:
         logger.info(f"Successfully generated {len(posts)} posts")
         return posts
 
+    @tracked_operation("post_generation")
     async def generate_posts_async(
         self,
         client_brief: ClientBrief,
@@ -216,6 +247,7 @@ class ContentGeneratorAgent:
         template_ids: Optional[List[int]] = None,
         platform: Platform = Platform.LINKEDIN,
         use_client_memory: bool = True,
+        on_post: Optional[Callable[[Post], None]] = None,
     ) -> List[Post]:
         """
         Generate posts in parallel using async API calls
@@ -231,6 +263,8 @@ class ContentGeneratorAgent:
             template_ids: Optional list of specific template IDs to use (overrides intelligent selection)
             platform: Target platform for content generation (default LinkedIn)
             use_client_memory: Whether to use client memory for optimization (default True)
+            on_post: Optional callback invoked with each post as soon as it is generated
+                     (e.g. incremental QA), before the full list is returned
 
         Returns:
             List of generated Post objects
@@ -250,6 +284,7 @@ class ContentGeneratorAgent:
                 max_concurrent=max_concurrent,
                 platform=platform,
                 use_client_memory=use_client_memory,
+                on_post=on_post,
             )
 
         # Legacy mode: equal distribution
@@ -258,6 +293,69 @@ class ContentGeneratorAgent:
             f"using {template_count} templates (async mode, legacy equal distribution, max concurrent: {max_concurrent})"
         )
 
+        tasks = self._plan_post_tasks(
+            client_brief,
+            num_posts=num_posts,
+            template_count=template_count,
+            template_ids=template_ids,
+            platform=platform,
+            use_client_memory=use_client_memory,
+        )
+
+        # Generate posts in parallel; the limit applies to each API call,
+        # including retry candidates
+        call_slot = self._api_call_limiter(max_concurrent)
+
+        async def generate_with_limit(task_params):
+            """Generate single post with quality retry, one call slot per API call"""
+            return await self._generate_single_post_with_retry_async(
+                template=task_params["template"],
+                client_brief=client_brief,  # Brief is used from outer scope
+                variant=task_params["variant"],
+                post_number=task_params["post_number"],
+                cached_system_prompt=task_params["cached_system_prompt"],
+                base_context=task_params["base_context"],
+                platform=platform,
+                max_attempts=10,  # Try up to 10 times for quality
+                call_slot=call_slot,
+            )
+
+        # Execute all tasks in parallel
+        cache_stats_before = self.client.get_prompt_cache_stats()
+        posts = await self._gather_post_tasks(tasks, generate_with_limit, on_post)
+        self._log_prompt_cache_usage(cache_stats_before)
+
+        # Randomize order for variety
+        if randomize:
+            random.shuffle(posts)
+            logger.info("Randomized post order for variety")
+
+        logger.info(f"Successfully generated {len(posts)} posts (async)")
+        return posts
+
+    def _plan_post_tasks(
+        self,
+        client_brief: ClientBrief,
+        num_posts: int,
+        template_count: int,
+        template_ids: Optional[List[int]],
+        platform: Platform,
+        use_client_memory: bool,
+    ) -> List[Dict[str, Any]]:
+        """Select templates and build post tasks for equal-distribution generation
+
+        Args:
+            client_brief: Client brief with context
+            num_posts: Total number of posts to plan
+            template_count: Number of unique templates to use
+            template_ids: Optional list of specific template IDs to use
+            platform: Target platform for content generation
+            use_client_memory: Whether to use client memory for optimization
+
+        Returns:
+            Task parameter dicts (template, variant, post_number, cached_system_prompt,
+            base_context), in post order
+        """
         # Load client memory if available and enabled
         client_memory = None
         if use_client_memory and self.db:
@@ -341,33 +439,7 @@ class ContentGeneratorAgent:
             )
             post_number += 1
 
-        # Generate posts in parallel with concurrency limit
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def generate_with_limit(task_params):
-            """Generate single post with concurrency limit via semaphore and quality retry"""
-            async with semaphore:
-                return await self._generate_single_post_with_retry_async(
-                    template=task_params["template"],
-                    client_brief=client_brief,  # Brief is used from outer scope
-                    variant=task_params["variant"],
-                    post_number=task_params["post_number"],
-                    cached_system_prompt=task_params["cached_system_prompt"],
-                    base_context=task_params["base_context"],
-                    platform=platform,
-                    max_attempts=10,  # Try up to 10 times for quality
-                )
-
-        # Execute all tasks in parallel
-        posts = await asyncio.gather(*[generate_with_limit(task) for task in tasks])
-
-        # Randomize order for variety
-        if randomize:
-            random.shuffle(posts)
-            logger.info("Randomized post order for variety")
-
-        logger.info(f"Successfully generated {len(posts)} posts (async)")
-        return posts
+        return tasks
 
     async def generate_posts_with_voice_matching_async(
         self,
@@ -627,6 +699,7 @@ class ContentGeneratorAgent:
         max_concurrent: int = 5,
         platform: Platform = Platform.LINKEDIN,
         use_client_memory: bool = True,
+        on_post: Optional[Callable[[Post], None]] = None,
     ) -> List[Post]:
         """
         Generate posts using exact template quantities (async version).
@@ -641,6 +714,7 @@ class ContentGeneratorAgent:
             max_concurrent: Maximum concurrent API calls (default 5)
             platform: Target platform for content generation
             use_client_memory: Whether to use client memory for optimization
+            on_post: Optional callback invoked with each post as soon as it is generated
 
         Returns:
             List of generated Post objects
@@ -690,25 +764,28 @@ class ContentGeneratorAgent:
                 )
                 post_number += 1
 
-        # Generate posts in parallel with concurrency limit
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # Generate posts in parallel; the limit applies to each API call,
+        # including retry candidates
+        call_slot = self._api_call_limiter(max_concurrent)
 
         async def generate_with_limit(task_params):
-            """Generate single post with concurrency limit via semaphore and quality retry"""
-            async with semaphore:
-                return await self._generate_single_post_with_retry_async(
-                    template=task_params["template"],
-                    client_brief=client_brief,  # Brief is used from outer scope
-                    variant=task_params["variant"],
-                    post_number=task_params["post_number"],
-                    cached_system_prompt=task_params["cached_system_prompt"],
-                    base_context=task_params["base_context"],
-                    platform=platform,
-                    max_attempts=10,  # Try up to 10 times for quality
-                )
+            """Generate single post with quality retry, one call slot per API call"""
+            return await self._generate_single_post_with_retry_async(
+                template=task_params["template"],
+                client_brief=client_brief,  # Brief is used from outer scope
+                variant=task_params["variant"],
+                post_number=task_params["post_number"],
+                cached_system_prompt=task_params["cached_system_prompt"],
+                base_context=task_params["base_context"],
+                platform=platform,
+                max_attempts=10,  # Try up to 10 times for quality
+                call_slot=call_slot,
+            )
 
         # Execute all tasks in parallel
-        posts = await asyncio.gather(*[generate_with_limit(task) for task in tasks])
+        cache_stats_before = self.client.get_prompt_cache_stats()
+        posts = await self._gather_post_tasks(tasks, generate_with_limit, on_post)
+        self._log_prompt_cache_usage(cache_stats_before)
 
         # Randomize order for variety
         if randomize:
@@ -718,6 +795,54 @@ class ContentGeneratorAgent:
         logger.info(f"Successfully generated {len(posts)} posts from template quantities (async)")
         return posts
 
+    async def _gather_post_tasks(
+        self,
+        tasks: List[Dict[str, Any]],
+        generate: Callable[[Dict[str, Any]], Awaitable[Post]],
+        on_post: Optional[Callable[[Post], None]] = None,
+    ) -> List[Post]:
+        """Run post generation tasks concurrently, priming the prompt cache first
+
+        A cache entry is only readable once the request that writes it has
+        started responding, so firing every post at once would pay cache
+        creation on each of them. The first post runs alone to write the shared
+        system/client prefix; the rest then read it.
+
+        Args:
+            tasks: Task parameter dicts, in post order
+            generate: Coroutine function generating one post from a task
+            on_post: Optional callback invoked with each post in completion order
+
+        Returns:
+            Generated posts in task order
+        """
+
+        async def run(task: Dict[str, Any]) -> Post:
+            post = await generate(task)
+            if on_post:
+                on_post(post)
+            return post
+
+        if len(tasks) < 2 or not settings.ENABLE_PROMPT_CACHING:
+            return list(await asyncio.gather(*[run(task) for task in tasks]))
+
+        first_post = await run(tasks[0])
+        remaining = await asyncio.gather(*[run(task) for task in tasks[1:]])
+        return [first_post, *remaining]
+
+    def _log_prompt_cache_usage(self, since: Dict[str, Any]) -> None:
+        """Log prompt cache reads/writes accumulated since a stats snapshot"""
+        stats = self.client.get_prompt_cache_stats(since=since)
+        if not stats["requests"]:
+            return
+
+        logger.info(
+            f"Prompt cache: {stats['cache_read_tokens']:,} tokens read, "
+            f"{stats['cache_creation_tokens']:,} written, "
+            f"{stats['input_tokens']:,} uncached across {stats['requests']} requests "
+            f"({stats['cache_hit_rate']:.0%} of prompt tokens from cache)"
+        )
+
     def _generate_single_post(
         self,
         template: Template,
@@ -813,6 +938,7 @@ class ContentGeneratorAgent:
         cached_system_prompt: Optional[str] = None,
         base_context: Optional[Dict[str, Any]] = None,
         platform: Platform = Platform.LINKEDIN,
+        attempt_guidance: Optional[str] = None,
     ) -> Post:
         """
         Generate a single post from a template (async version)
@@ -824,12 +950,15 @@ class ContentGeneratorAgent:
             post_number: Post number in sequence
             cached_system_prompt: Pre-built system prompt (for performance)
             base_context: Pre-built base context dictionary (for performance)
+            attempt_guidance: Per-attempt retry guidance (sent in the uncached post block)
 
         Returns:
             Generated Post object
         """
         # Build context for template rendering
         context = self._build_context(client_brief, template, variant, base_context)
+        if attempt_guidance:
+            context["attempt_guidance"] = attempt_guidance
 
         # Use cached system prompt if available, otherwise build it
         # Note: When using cached prompt, platform info is already embedded from the cache
@@ -918,12 +1047,19 @@ Focus on providing deep value and comprehensive coverage of the topic. This is a
         base_context: Optional[Dict[str, Any]] = None,
         platform: Platform = Platform.LINKEDIN,
         max_attempts: int = 10,
+        parallel_candidates: Optional[int] = None,
+        call_slot: Optional[Callable[[], AsyncContextManager[None]]] = None,
     ) -> Post:
         """
         Generate a single post with quality-based retry logic.
 
-        Attempts up to max_attempts times, caching all results.
-        Returns first post with no quality flags, or best of all attempts.
+        The first attempt runs alone (most posts pass it). After a flagged
+        attempt, retries run in rounds of up to parallel_candidates concurrent
+        candidates, each with its own attempt guidance so neither the response
+        cache nor sampling collapses them into the same output. The first
+        candidate without quality flags wins and the rest of its round is
+        cancelled. Retry tokens count against settings.QUALITY_RETRY_TOKEN_BUDGET
+        for the active run; once spent, no new rounds are started.
 
         Args:
             template: Template to use
@@ -934,63 +1070,143 @@ Focus on providing deep value and comprehensive coverage of the topic. This is a
             base_context: Pre-built base context
             platform: Target platform
             max_attempts: Maximum generation attempts (default 10)
+            parallel_candidates: Concurrent candidates per retry round
+                (default settings.QUALITY_RETRY_PARALLELISM)
+            call_slot: Limiter held around each API call (default the shared
+                api_call_slot); candidates wait for a slot, so a retry round
+                never exceeds the caller's concurrency limit
 
         Returns:
             Generated Post object (either first adequate or best of attempts)
         """
-        attempts = []
+        round_size = max(1, parallel_candidates or settings.QUALITY_RETRY_PARALLELISM)
+        attempts: List[Dict[str, Any]] = []
 
-        for attempt in range(max_attempts):
-            # Generate post
-            post = await self._generate_single_post_async(
-                template=template,
-                client_brief=client_brief,
-                variant=variant,
-                post_number=post_number,
-                cached_system_prompt=cached_system_prompt,
-                base_context=base_context,
-                platform=platform,
-            )
+        slot = call_slot or api_call_slot
 
-            # Calculate quality score based on flags and metrics
-            quality_score = self._calculate_post_quality_score(post)
+        async def generate(attempt_guidance: Optional[str] = None) -> Post:
+            async with slot():
+                return await self._generate_single_post_async(
+                    template=template,
+                    client_brief=client_brief,
+                    variant=variant,
+                    post_number=post_number,
+                    cached_system_prompt=cached_system_prompt,
+                    base_context=base_context,
+                    platform=platform,
+                    attempt_guidance=attempt_guidance,
+                )
 
-            # Cache attempt
+        def record(post: Post, attempt_number: int) -> bool:
+            quality_score = self._calculate_post_quality_score(post)
             attempts.append(
                 {
                     "post": post,
                     "quality_score": quality_score,
-                    "has_flags": len(post.flags) > 0 if post.flags else False,
-                    "attempt_number": attempt + 1,
+                    "has_flags": post.needs_review,
+                    "attempt_number": attempt_number,
                 }
             )
-
-            # If post has no quality flags, it's adequate - return immediately
-            if not post.flags or len(post.flags) == 0:
+            if not post.needs_review:
                 logger.info(
-                    f"Post {post_number} passed quality check on attempt {attempt + 1}/{max_attempts} "
-                    f"(quality score: {quality_score:.2%})"
+                    f"Post {post_number} passed quality check on attempt "
+                    f"{attempt_number}/{max_attempts} (quality score: {quality_score:.2%})"
                 )
-                return post
+                return True
 
-            # Log retry
             logger.info(
-                f"Post {post_number} attempt {attempt + 1}/{max_attempts} has quality issues: {post.flags}. "
-                f"Retrying..."
-                if attempt < max_attempts - 1
-                else "Max attempts reached."
+                f"Post {post_number} attempt {attempt_number}/{max_attempts} "
+                f"has quality issues: {post.review_reason}"
             )
+            return False
+
+        if record(await generate(), 1):
+            return attempts[0]["post"]
+
+        while len(attempts) < max_attempts:
+            if self._retry_budget_exhausted():
+                logger.warning(
+                    f"Quality retry token budget ({settings.QUALITY_RETRY_TOKEN_BUDGET:,}) "
+                    f"exhausted for this run; no further retries for post {post_number}"
+                )
+                break
+
+            first_number = len(attempts) + 1
+            numbers = range(first_number, min(first_number + round_size, max_attempts + 1))
+            feedback = self._build_retry_guidance(attempts[-1]["post"].review_reason)
+
+            # Tasks copy the context on creation, so retry calls carry this tag
+            with operation_scope(RETRY_OPERATION):
+                pending = {
+                    asyncio.create_task(
+                        generate(f"{feedback} (attempt {number} of {max_attempts})")
+                    ): number
+                    for number in numbers
+                }
+
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in sorted(done, key=lambda t: pending[t]):
+                        if record(task.result(), pending.pop(task)):
+                            return attempts[-1]["post"]
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
 
         # No adequate result - return best attempt
         best = max(attempts, key=lambda x: x["quality_score"])
         logger.warning(
-            f"Post {post_number} did not meet quality standards after {max_attempts} attempts. "
+            f"Post {post_number} did not meet quality standards after {len(attempts)} attempts. "
             f"Returning best attempt (#{best['attempt_number']}, quality score: {best['quality_score']:.2%}, "
-            f"flags: {best['post'].flags if best['post'].flags else 'none'})"
+            f"flags: {best['post'].review_reason or 'none'})"
         )
 
         return best["post"]
 
+    @staticmethod
+    def _api_call_limiter(max_concurrent: int) -> Callable[[], AsyncContextManager[None]]:
+        """
+        Per-call limiter for one generation run.
+
+        Each slot holds one of the run's max_concurrent permits and one slot of
+        the shared api_call_slot budget, so a run never exceeds its own limit
+        and runs in the same event loop never exceed MAX_CONCURRENT_API_CALLS
+        together.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        @asynccontextmanager
+        async def call_slot() -> AsyncIterator[None]:
+            wait_started = time.perf_counter()
+            async with semaphore:
+                record_queue_wait(time.perf_counter() - wait_started)
+                async with api_call_slot():
+                    yield
+
+        return call_slot
+
+    @staticmethod
+    def _build_retry_guidance(review_reason: Optional[str]) -> str:
+        """Describe why the previous attempt was rejected so the retry can fix it"""
+        if not review_reason:
+            return "Write a fresh version of this post"
+        return (
+            f"Previous attempt was rejected ({review_reason}). "
+            "Write a fresh version that fixes this"
+        )
+
+    @staticmethod
+    def _retry_budget_exhausted() -> bool:
+        """Check whether the active run has spent its quality retry token budget"""
+        budget = settings.QUALITY_RETRY_TOKEN_BUDGET
+        run = get_current_run()
+        if not budget or run is None:
+            return False
+        return run.operation_tokens(RETRY_OPERATION) >= budget
+
     def _calculate_post_quality_score(self, post: Post) -> float:
         """
         Calculate a quality score for a post based on various metrics.
@@ -1001,10 +1217,9 @@ Focus on providing deep value and comprehensive coverage of the topic. This is a
         """
         score = 1.0
 
-        # Penalize for each flag (0.2 per flag, max 3 flags considered)
-        if post.flags:
-            flag_penalty = min(len(post.flags) * 0.2, 0.6)
-            score -= flag_penalty
+        # Penalize flagged posts (the post keeps only its latest review reason)
+        if post.needs_review:
+            score -= 0.2
 
         # Reward for appropriate word count (within target range)
         if post.word_count:
@@ -1133,23 +1348,77 @@ Focus on providing deep value and comprehensive coverage of the topic. This is a
     ) -> str:
         """Build customized system prompt for client with platform-specific guidance
 
+        Assembled from cached fragments, most widely shared first: base prompt
+        with platform guidance and writing principles (same for every client),
+        then client voice and archetype, SEO keywords and client memory. Each
+        fragment is keyed by a hash of the inputs it renders, so the output is
+        byte-identical for identical inputs and multi-platform runs only
+        render the platform fragment per platform.
+
         Args:
             client_brief: Client brief with context
             platform: Target platform for content generation
             client_memory: Optional client memory for repeat client optimization
 
         Returns:
-            Customized system prompt string
+            Customized system prompt (a SystemPrompt carrying its segments)
         """
+        cache = get_prompt_fragment_cache()
+
+        platform_segment = cache.get_or_build(
+            "platform",
+            (self.SYSTEM_PROMPT, platform),
+            lambda: self._build_platform_fragment(platform),
+        )
+
+        client_fragments = [
+            cache.get_or_build(
+                "client_voice",
+                (
+                    client_brief.brand_personality,
+                    client_brief.key_phrases,
+                    client_brief.misconceptions,
+                    getattr(client_brief, "client_type", None),
+                    client_brief.business_description,
+                ),
+                lambda: self._build_client_voice_fragment(client_brief),
+            )
+        ]
+
+        # Add SEO keyword guidance if available
+        if self.keyword_strategy:
+            client_fragments.append(
+                cache.get_or_build(
+                    "keywords", (self.keyword_strategy,), self._build_keyword_guidance
+                )
+            )
+
+        # Add client memory insights for repeat clients (changes most often, so last)
+        if client_memory and client_memory.is_repeat_client:
+            client_fragments.append(
+                cache.get_or_build(
+                    "client_memory",
+                    (
+                        client_memory.total_projects,
+                        client_memory.voice_adjustments,
+                        client_memory.signature_phrases,
+                        client_memory.optimal_word_count_min,
+                        client_memory.optimal_word_count_max,
+                    ),
+                    lambda: self._build_client_memory_fragment(client_memory),
+                )
+            )
+
+        return SystemPrompt([platform_segment, "".join(client_fragments)])
+
+    def _build_platform_fragment(self, platform: Platform) -> str:
+        """Base prompt, platform requirements and writing principles (client-independent)"""
         # Start with base prompt
         prompt = self.SYSTEM_PROMPT
 
         # Add platform-specific guidance with enhanced emphasis
         platform_guidance = get_platform_prompt_guidance(platform)
         target_length = get_platform_target_length(platform)
-        from ..config.platform_specs import PLATFORM_LENGTH_SPECS
-
-        PLATFORM_LENGTH_SPECS.get(platform, {})
 
         # Add prominent platform header
         prompt += f"\n\n{'=' * 60}"
@@ -1330,6 +1599,16 @@ If your draft is under 1500 words after Section 4, you MUST:
         else:
             prompt += f"\n\n📏 REMINDER: Target length is {target_length}. DO NOT EXCEED THIS."
 
+        # Add professional writing principles
+        writing_principles = get_writing_principles_guidance()
+        prompt += f"\n{writing_principles}"
+
+        return prompt
+
+    def _build_client_voice_fragment(self, client_brief: ClientBrief) -> str:
+        """Client voice, key phrases, misconceptions and brand archetype guidance"""
+        prompt = ""
+
         # Add client-specific voice guidance
         if client_brief.brand_personality:
             personalities = ", ".join([p.value for p in client_brief.brand_personality])
@@ -1343,38 +1622,39 @@ If your draft is under 1500 words after Section 4, you MUST:
             avoid = ", ".join(client_brief.misconceptions)
             prompt += f"\n\nCOMMON MISCONCEPTIONS TO ADDRESS: {avoid}"
 
-        # NEW: Add client memory insights for repeat clients
-        if client_memory and client_memory.is_repeat_client:
-            prompt += f"\n\n[CLIENT HISTORY]: This is a repeat client with {client_memory.total_projects} previous project(s)."
-
-            # Add voice adjustments from past feedback
-            if client_memory.voice_adjustments:
-                prompt += "\n\nLEARNED PREFERENCES (from past feedback):"
-                for adj_type, adj_value in client_memory.voice_adjustments.items():
-                    prompt += f"\n  • {adj_type.replace('_', ' ').title()}: {adj_value}"
-
-            # Add signature phrases
-            if client_memory.signature_phrases:
-                phrases = '", "'.join(client_memory.signature_phrases)
-                prompt += f'\n\nCLIENT SIGNATURE PHRASES (use naturally): "{phrases}"'
-
-            # Add optimal word count guidance
-            if client_memory.optimal_word_count_min and client_memory.optimal_word_count_max:
-                prompt += f"\n\nOPTIMAL LENGTH FOR THIS CLIENT: {client_memory.optimal_word_count_min}-{client_memory.optimal_word_count_max} words (based on past successful posts)"
-
-        # Add SEO keyword guidance if available
-        if self.keyword_strategy:
-            prompt += self._build_keyword_guidance()
-
-        # NEW: Add brand archetype guidance
+        # Add brand archetype guidance
         archetype = self._infer_archetype(client_brief)
         if archetype:
             archetype_guidance = get_archetype_guidance(archetype)
             prompt += f"\n{archetype_guidance}"
 
-        # NEW: Add professional writing principles
-        writing_principles = get_writing_principles_guidance()
-        prompt += f"\n{writing_principles}"
+        return prompt
+
+    @staticmethod
+    def _build_client_memory_fragment(client_memory: ClientMemory) -> str:
+        """Insights from a repeat client's past projects"""
+        prompt = (
+            f"\n\n[CLIENT HISTORY]: This is a repeat client with "
+            f"{client_memory.total_projects} previous project(s)."
+        )
+
+        # Add voice adjustments from past feedback (sorted so the text is stable)
+        if client_memory.voice_adjustments:
+            prompt += "\n\nLEARNED PREFERENCES (from past feedback):"
+            for adj_type, adj_value in sorted(client_memory.voice_adjustments.items()):
+                prompt += f"\n  • {adj_type.replace('_', ' ').title()}: {adj_value}"
+
+        # Add signature phrases
+        if client_memory.signature_phrases:
+            phrases = '", "'.join(client_memory.signature_phrases)
+            prompt += f'\n\nCLIENT SIGNATURE PHRASES (use naturally): "{phrases}"'
+
+        # Add optimal word count guidance
+        if client_memory.optimal_word_count_min and client_memory.optimal_word_count_max:
+            prompt += (
+                f"\n\nOPTIMAL LENGTH FOR THIS CLIENT: {client_memory.optimal_word_count_min}-"
+                f"{client_memory.optimal_word_count_max} words (based on past successful posts)"
+            )
 
         return prompt
 
@@ -1551,6 +1831,7 @@ If your draft is under 1500 words after Section 4, you MUST:
             # Return original if revision fails
             return original_post
 
+    @tracked_operation("post_generation")
     async def generate_multi_platform_with_blog_links_async(
         self,
         client_brief: ClientBrief,
@@ -1559,91 +1840,146 @@ If your draft is under 1500 words after Section 4, you MUST:
         template_count: int = 15,
         randomize: bool = True,
         max_concurrent: int = 5,
+        teaser_platforms: Optional[Sequence[Platform]] = None,
     ) -> Dict[str, List[Post]]:
         """
         Generate multi-platform content with blog posts and social teasers that link to them
 
+        Each blog post is a small pipeline: as soon as it is generated, its
+        teasers for every teaser platform are started, while other blog posts
+        are still being written. Blog and teaser API calls share one
+        max_concurrent limit, so teaser work overlaps blog generation instead
+        of waiting for every blog post to finish.
+
         Args:
             client_brief: Client brief with context
             num_blog_posts: Number of blog posts to generate (default 5)
             social_teasers_per_blog: Number of social teasers per blog (default 2: 1 Twitter + 1 Facebook)
             template_count: Number of unique templates to use
             randomize: Whether to randomize post order
-            max_concurrent: Maximum concurrent API calls
+            max_concurrent: Maximum concurrent API calls (shared by blogs and teasers)
+            teaser_platforms: Platforms to write teasers for (default: the first
+                social_teasers_per_blog of Twitter, Facebook, LinkedIn)
 
         Returns:
-            Dictionary with keys 'blog', 'twitter', 'facebook' containing respective Post lists
+            Dictionary with key 'blog' plus one key per teaser platform (e.g. 'twitter',
+            'facebook'), each a Post list in blog order
         """
+        if teaser_platforms is None:
+            teaser_platforms = DEFAULT_TEASER_PLATFORMS[:social_teasers_per_blog]
+        teaser_platforms = list(dict.fromkeys(teaser_platforms))
+
         logger.info(
             f"Generating multi-platform content for {client_brief.company_name}: "
-            f"{num_blog_posts} blog posts + {num_blog_posts * social_teasers_per_blog} social teasers"
+            f"{num_blog_posts} blog posts + {num_blog_posts * len(teaser_platforms)} social teasers "
+            f"({', '.join(p.value for p in teaser_platforms)}; max concurrent: {max_concurrent})"
         )
 
-        # Step 1: Generate blog posts first
-        logger.info(f"Step 1: Generating {num_blog_posts} blog posts...")
-        blog_posts = await self.generate_posts_async(
-            client_brief=client_brief,
+        tasks = self._plan_post_tasks(
+            client_brief,
             num_posts=num_blog_posts,
             template_count=template_count,
-            randomize=randomize,
-            max_concurrent=max_concurrent,
+            template_ids=None,
             platform=Platform.BLOG,
+            use_client_memory=True,
         )
+        # Shuffle before numbering so link placeholders follow output order
+        if randomize:
+            random.shuffle(tasks)
 
-        # Step 2: Extract blog metadata
-        blog_metadata = []
-        for i, blog_post in enumerate(blog_posts):
-            title = self._extract_blog_title(blog_post.content)
-            slug = self._create_slug(title)
-            summary = self._extract_blog_summary(blog_post.content)
+        call_slot = self._api_call_limiter(max_concurrent)
 
-            blog_metadata.append(
-                {
-                    "id": i + 1,
-                    "post": blog_post,
-                    "title": title,
-                    "slug": slug,
-                    "summary": summary,
-                    "link_placeholder": f"[BLOG_LINK_{i + 1}]",
-                }
+        async def with_limit(generate: Callable[[], Awaitable[Post]]) -> Post:
+            async with call_slot():
+                return await generate()
+
+        def generate_blog(task_params: Dict[str, Any]) -> Awaitable[Post]:
+            # Takes a slot per attempt, so retry candidates count against the limit
+            return self._generate_single_post_with_retry_async(
+                template=task_params["template"],
+                client_brief=client_brief,
+                variant=task_params["variant"],
+                post_number=task_params["post_number"],
+                cached_system_prompt=task_params["cached_system_prompt"],
+                base_context=task_params["base_context"],
+                platform=Platform.BLOG,
+                max_attempts=10,
+                call_slot=call_slot,
             )
 
-            # Update blog post with its own metadata
-            blog_post.blog_title = title
-            blog_post.blog_link_placeholder = f"[BLOG_LINK_{i + 1}]"
+        async def blog_pipeline(
+            blog_id: int, task_params: Dict[str, Any], blog_post: Optional[Post] = None
+        ) -> Tuple[Post, List[Post]]:
+            """Generate one blog post, then all of its teasers concurrently"""
+            if blog_post is None:
+                blog_post = await generate_blog(task_params)
+            blog_meta = self._attach_blog_metadata(blog_post, blog_id)
+
+            teasers = await asyncio.gather(
+                *[
+                    with_limit(
+                        lambda teaser_platform=teaser_platform: self._generate_blog_teaser_async(
+                            client_brief=client_brief,
+                            blog_meta=blog_meta,
+                            platform=teaser_platform,
+                        )
+                    )
+                    for teaser_platform in teaser_platforms
+                ]
+            )
+            return blog_post, list(teasers)
 
-        logger.info(f"Extracted metadata for {len(blog_metadata)} blog posts")
+        cache_stats_before = self.client.get_prompt_cache_stats()
 
-        # Step 3: Generate social teasers for each blog
-        twitter_posts = []
-        facebook_posts = []
+        # Write the shared blog prompt prefix to the cache before fanning out
+        # (see _gather_post_tasks); its teasers then run alongside the rest
+        first_blog = None
+        if len(tasks) > 1 and settings.ENABLE_PROMPT_CACHING:
+            first_blog = await generate_blog(tasks[0])
 
-        for blog_meta in blog_metadata:
-            # Generate Twitter teaser
-            twitter_post = await self._generate_blog_teaser_async(
-                client_brief=client_brief,
-                blog_meta=blog_meta,
-                platform=Platform.TWITTER,
-            )
-            twitter_posts.append(twitter_post)
+        results = await asyncio.gather(
+            *[
+                blog_pipeline(blog_id, task_params, first_blog if blog_id == 1 else None)
+                for blog_id, task_params in enumerate(tasks, start=1)
+            ]
+        )
+        self._log_prompt_cache_usage(cache_stats_before)
 
-            # Generate Facebook teaser
-            facebook_post = await self._generate_blog_teaser_async(
-                client_brief=client_brief,
-                blog_meta=blog_meta,
-                platform=Platform.FACEBOOK,
-            )
-            facebook_posts.append(facebook_post)
+        content_package: Dict[str, List[Post]] = {"blog": [blog for blog, _ in results]}
+        for i, teaser_platform in enumerate(teaser_platforms):
+            content_package[teaser_platform.value] = [teasers[i] for _, teasers in results]
 
         logger.info(
-            f"Successfully generated multi-platform content: "
-            f"{len(blog_posts)} blog + {len(twitter_posts)} Twitter + {len(facebook_posts)} Facebook"
+            "Successfully generated multi-platform content: "
+            + " + ".join(f"{len(posts)} {key}" for key, posts in content_package.items())
         )
 
+        return content_package
+
+    def _attach_blog_metadata(self, blog_post: Post, blog_id: int) -> Dict[str, Any]:
+        """Extract title/slug/summary from a blog post and record its link placeholder
+
+        Args:
+            blog_post: Generated blog post (updated in place)
+            blog_id: 1-based blog number used in the link placeholder
+
+        Returns:
+            Blog metadata dict used to prompt its teasers
+        """
+        title = self._extract_blog_title(blog_post.content)
+        link_placeholder = f"[BLOG_LINK_{blog_id}]"
+
+        # Update blog post with its own metadata
+        blog_post.blog_title = title
+        blog_post.blog_link_placeholder = link_placeholder
+
         return {
-            "blog": blog_posts,
-            "twitter": twitter_posts,
-            "facebook": facebook_posts,
+            "id": blog_id,
+            "post": blog_post,
+            "title": title,
+            "slug": self._create_slug(title),
+            "summary": self._extract_blog_summary(blog_post.content),
+            "link_placeholder": link_placeholder,
         }
 
     def _extract_blog_title(self, content: str) -> str:
@@ -10,14 +10,15 @@ This agent coordinates all other agents to provide a seamless end-to-end experie
 6. Produces all deliverables
 """
 
+import asyncio
 from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from ..agents.brief_parser import BriefParserAgent
 from ..agents.client_classifier import ClientClassifier
 from ..agents.content_generator import ContentGeneratorAgent
-from ..agents.post_regenerator import PostRegenerator
+from ..agents.post_regenerator import PostRegenerator, RegenerationOutcome
 from ..agents.qa_agent import QAAgent
 from ..agents.voice_analyzer import VoiceAnalyzer
 from ..config.settings import settings
@@ -25,6 +26,7 @@ from ..models.client_brief import ClientBrief, DataUsagePreference, Platform, To
 from ..models.post import Post
 from ..utils.logger import logger
 from ..utils.output_formatter import OutputFormatter
+from ..utils.run_context import tracked_operation
 
 
 class CoordinatorAgent:
@@ -49,6 +51,7 @@ class CoordinatorAgent:
         self.post_regenerator = PostRegenerator()
         self.output_formatter = OutputFormatter()
 
+    @tracked_operation("content_workflow")
     async def run_complete_workflow(
         self,
         brief_input: Union[str, Path, Dict, ClientBrief],
@@ -121,12 +124,15 @@ class CoordinatorAgent:
             template_quantities_int = {int(k): v for k, v in template_quantities.items()}
             logger.info(f"   Template quantities: {template_quantities_int}")
 
+        regen_stats = None
         if settings.PARALLEL_GENERATION:
-            posts = await self.content_generator.generate_posts_async(
+            # QA (and, with auto_fix, regeneration) runs on each post as it arrives
+            posts, regen_stats = await self._generate_with_incremental_qa(
                 client_brief=client_brief,
                 template_quantities=template_quantities_int,
                 num_posts=num_posts,
                 platform=target_platform,
+                auto_fix=auto_fix,
             )
         else:
             posts = self.content_generator.generate_posts(
@@ -139,41 +145,17 @@ class CoordinatorAgent:
         logger.info(f"   Generated: {len(posts)} posts")
         logger.info(f"   Avg length: {sum(p.word_count for p in posts) // len(posts)} words")
 
-        # Step 5: Run QA validation
-        logger.info("\n[5/7] Running quality validation...")
-        qa_report = self.qa_agent.validate_posts(posts, client_brief.company_name)
-        logger.info(f"   Quality score: {int(qa_report.quality_score * 100)}%")
-        logger.info(f"   Status: {'PASSED' if qa_report.overall_passed else 'NEEDS REVIEW'}")
-
-        if qa_report.all_issues:
-            logger.info(f"   Issues found: {len(qa_report.all_issues)}")
-            for issue in qa_report.all_issues[:3]:  # Show first 3 issues
-                logger.info(f"     - {issue}")
-
-        # Step 5.5: Auto-regenerate failed posts (if enabled)
-        if auto_fix:
-            logger.info("\n[5.5/7] Auto-fixing quality issues...")
-
-            # Load templates for regeneration
-            from ..utils.template_loader import TemplateLoader
-            template_loader = TemplateLoader()
-            all_templates = template_loader.load_templates()
-
-            # Create simple system prompt for regeneration
-            system_prompt = (
-                f"You are an expert content strategist creating social media posts for {client_brief.company_name}. "
-                f"Ideal customer: {client_brief.ideal_customer}. "
-                f"Brand voice: {', '.join(t.value for t in client_brief.brand_personality)}. "
-                f"Focus on improving quality metrics while maintaining brand voice."
-            )
-
-            regenerated_posts, regen_stats = self.post_regenerator.regenerate_failed_posts(
+        # Step 5: Auto-regenerate failed posts (if enabled and not already done in flight)
+        if auto_fix and regen_stats is None:
+            logger.info("\n[5/7] Auto-fixing quality issues...")
+            posts, regen_stats = await self.post_regenerator.regenerate_failed_posts_async(
                 posts=posts,
-                templates=all_templates,
+                templates=self.content_generator.template_loader.get_all_templates(),
                 client_brief=client_brief,
-                system_prompt=system_prompt,
+                system_prompt=self._regeneration_system_prompt(client_brief),
             )
-            posts = regenerated_posts  # Update with regenerated versions
+
+        if regen_stats:
             logger.info(
                 f"   Regenerated: {regen_stats['posts_regenerated']}/{regen_stats['total_posts']} posts"
             )
@@ -184,6 +166,17 @@ class CoordinatorAgent:
                 for reason_type, count in regen_stats["reasons"].items():
                     logger.info(f"     - {reason_type}: {count}")
 
+        # Step 5.5: Quality report on the final posts
+        logger.info("\n[5.5/7] Running quality validation...")
+        qa_report = self.qa_agent.validate_posts(posts, client_brief.company_name)
+        logger.info(f"   Quality score: {int(qa_report.quality_score * 100)}%")
+        logger.info(f"   Status: {'PASSED' if qa_report.overall_passed else 'NEEDS REVIEW'}")
+
+        if qa_report.all_issues:
+            logger.info(f"   Issues found: {len(qa_report.all_issues)}")
+            for issue in qa_report.all_issues[:3]:  # Show first 3 issues
+                logger.info(f"     - {issue}")
+
         # Step 6: Generate all deliverables
         logger.info("\n[6/7] Generating deliverables package...")
 
@@ -234,6 +227,99 @@ class CoordinatorAgent:
 
         return saved_files
 
+    async def _generate_with_incremental_qa(
+        self,
+        client_brief: ClientBrief,
+        template_quantities: Optional[Dict[int, int]],
+        num_posts: int,
+        platform: Platform,
+        auto_fix: bool,
+    ) -> Tuple[List[Post], Optional[Dict]]:
+        """
+        Generate posts while validating each one as it completes
+
+        Every post goes through the incremental validator the moment it is
+        generated, so duplicate hooks, CTA overuse and same-length runs show up
+        while generation is still in flight. With auto_fix, a flagged post (or
+        one failing the regenerator's own checks) is regenerated immediately in
+        the background, overlapping the rest of generation instead of running
+        as a second phase afterwards.
+
+        Args:
+            client_brief: Client brief
+            template_quantities: Optional template ID -> quantity mapping
+            num_posts: Number of posts (when no template quantities)
+            platform: Target platform
+            auto_fix: Whether to regenerate flagged posts
+
+        Returns:
+            Tuple of (final posts, regeneration stats or None without auto_fix)
+        """
+        expected_posts = sum(template_quantities.values()) if template_quantities else num_posts
+        monitor = self.qa_agent.start_incremental(expected_posts, platform)
+        templates = self.content_generator.template_loader.get_all_templates() if auto_fix else []
+        system_prompt = self._regeneration_system_prompt(client_brief) if auto_fix else None
+        regenerations: List["asyncio.Task[RegenerationOutcome]"] = []
+
+        def on_post(post: Post) -> None:
+            check = monitor.add(post)
+            for issue in check.issues:
+                logger.info(f"   [QA] {issue}")
+            if not auto_fix:
+                return
+
+            _, quality_reasons = self.post_regenerator.should_regenerate(post)
+            reasons = quality_reasons + self.post_regenerator.reasons_from_check(post, check)
+            if reasons:
+                regenerations.append(
+                    self.post_regenerator.start_regeneration(
+                        check.index, post, reasons, templates, client_brief, system_prompt
+                    )
+                )
+
+        try:
+            posts = await self.content_generator.generate_posts_async(
+                client_brief=client_brief,
+                template_quantities=template_quantities,
+                num_posts=num_posts,
+                platform=platform,
+                on_post=on_post,
+            )
+        except BaseException:
+            for task in regenerations:
+                task.cancel()
+            await asyncio.gather(*regenerations, return_exceptions=True)
+            raise
+
+        if not auto_fix:
+            return posts, None
+
+        if regenerations:
+            logger.info(f"   Waiting for {len(regenerations)} in-flight regeneration(s)...")
+        outcomes = await asyncio.gather(*regenerations)
+
+        # Swap regenerated posts in by identity (generation may shuffle the list)
+        replacements = {}
+        for outcome in outcomes:
+            original = monitor.posts[outcome.index]
+            if outcome.post is not original:
+                monitor.replace(outcome.index, outcome.post)
+                replacements[id(original)] = outcome.post
+        posts = [replacements.get(id(post), post) for post in posts]
+
+        return posts, self.post_regenerator.summarize_outcomes(outcomes, len(posts))
+
+    @staticmethod
+    def _regeneration_system_prompt(client_brief: ClientBrief) -> str:
+        """Simple system prompt for quality regeneration"""
+        return (
+            f"You are an expert content strategist creating social media posts for "
+            f"{client_brief.company_name}. "
+            f"Ideal customer: {client_brief.ideal_customer}. "
+            f"Brand voice: {', '.join(t.value for t in client_brief.brand_personality)}. "
+            f"Focus on improving quality metrics while maintaining brand voice."
+        )
+
     async def _process_brief_input(
         self,
         brief_input: Union[str, Path, Dict, ClientBrief],
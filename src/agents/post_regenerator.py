@@ -4,7 +4,19 @@ This agent analyzes posts against quality thresholds and regenerates those that
 fall outside acceptable parameters for readability, length, engagement, or CTAs.
 """
 
-from typing import Dict, List, Optional, Tuple
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from ..config.constants import POST_GENERATION_TEMPERATURE
 from ..models.client_brief import ClientBrief
@@ -12,9 +24,14 @@ from ..models.post import Post
 from ..models.quality_profile import QualityProfile, get_default_profile
 from ..models.template import Template
 from ..utils.anthropic_client import AnthropicClient
+from ..utils.api_limiter import api_call_slot
 from ..utils.logger import logger
+from ..utils.run_context import operation_scope, tracked_operation
 from ..utils.voice_metrics import VoiceMetrics
 
+if TYPE_CHECKING:
+    from ..validators.incremental_validator import PostCheck
+
 
 class RegenerationReason:
     """Structured reason for why a post needs regeneration"""
@@ -38,6 +55,15 @@ class RegenerationReason:
         return f"{self.reason_type}: {self.details}"
 
 
+class RegenerationOutcome(NamedTuple):
+    """Result for one post of a regeneration batch"""
+
+    index: int  # Position of the post in the input list
+    post: Post  # Final post (regenerated, or the original when skipped)
+    reasons: List[RegenerationReason]  # Why the original failed (empty if it passed)
+    outcome: str  # "passed", "missing_template", "improved" or "unchanged"
+
+
 class PostRegenerator:
     """Agent that regenerates posts failing quality thresholds"""
 
@@ -132,6 +158,40 @@ class PostRegenerator:
         should_regen = len(reasons) > 0
         return should_regen, reasons
 
+    def reasons_from_check(self, post: Post, check: "PostCheck") -> List[RegenerationReason]:
+        """Regeneration reasons for set-level issues found by incremental QA
+
+        Per-post issues (length limits, missing CTA) are covered by
+        should_regenerate; this adds the ones that depend on the other posts.
+
+        Args:
+            post: Post that was checked
+            check: Result of IncrementalQAValidator.add() for the post
+
+        Returns:
+            Reasons for duplicate hooks, overused CTAs and same-length runs
+        """
+        reasons = []
+        if check.duplicate_of is not None:
+            reasons.append(
+                RegenerationReason(
+                    "duplicate_hook",
+                    f'Hook too similar to another post: "{check.duplicate_hook}"',
+                    round(check.hook_similarity, 2),
+                )
+            )
+        if check.overused_cta:
+            reasons.append(
+                RegenerationReason("overused_cta", f"CTA pattern '{check.cta_type}' overused")
+            )
+        if check.similar_length:
+            reasons.append(
+                RegenerationReason(
+                    "similar_length", "Too many posts share this length", post.word_count
+                )
+            )
+        return reasons
+
     def regenerate_post(
         self,
         post: Post,
@@ -154,71 +214,143 @@ class PostRegenerator:
         Returns:
             Regenerated Post object
         """
-        if attempt > self.profile.max_attempts:
-            logger.warning(
-                f"Max regeneration attempts ({self.profile.max_attempts}) reached for post {post.template_name}"
-            )
-            return post
-
-        logger.info(
-            f"Regenerating post {post.template_name} (attempt {attempt}/{self.profile.max_attempts}): "
-            f"{', '.join(r.reason_type for r in reasons)}"
+        attempts = self._regeneration_attempts(
+            post, template, client_brief, reasons, attempt, system_prompt
         )
+        try:
+            request = next(attempts)
+            while True:
+                try:
+                    content = self.client.generate_post_content(**request)
+                except Exception as e:
+                    request = attempts.throw(e)
+                else:
+                    request = attempts.send(content)
+        except StopIteration as done:
+            return done.value
 
-        # Build improvement guidance
-        improvement_prompt = self._build_improvement_prompt(post, reasons, client_brief)
+    async def regenerate_post_async(
+        self,
+        post: Post,
+        template: Template,
+        client_brief: ClientBrief,
+        reasons: List[RegenerationReason],
+        attempt: int = 1,
+        system_prompt: Optional[str] = None,
+    ) -> Post:
+        """Regenerate a post with improvement guidance (async version)
 
-        # Build context
-        context = client_brief.to_context_dict()
-        context["variant_guidance"] = improvement_prompt
-        context["template_type"] = template.template_type.value
-        context["requires_story"] = template.requires_story
-        context["requires_data"] = template.requires_data
+        Same attempts as regenerate_post. Each API call holds a slot of the
+        shared API limiter, so concurrent regenerations and generation runs
+        together respect MAX_CONCURRENT_API_CALLS.
+
+        Args:
+            post: Original post to improve
+            template: Template that was used
+            client_brief: Client context
+            reasons: Reasons for regeneration
+            attempt: Current attempt number (1-based)
+            system_prompt: Optional cached system prompt
 
+        Returns:
+            Regenerated Post object
+        """
+        attempts = self._regeneration_attempts(
+            post, template, client_brief, reasons, attempt, system_prompt
+        )
         try:
-            # Generate improved content
-            improved_content = self.client.generate_post_content(
-                template_structure=template.structure,
-                context=context,
-                system_prompt=system_prompt or "",
-                temperature=POST_GENERATION_TEMPERATURE,
-            )
+            request = next(attempts)
+            while True:
+                try:
+                    async with api_call_slot():
+                        content = await self.client.generate_post_content_async(**request)
+                except Exception as e:
+                    request = attempts.throw(e)
+                else:
+                    request = attempts.send(content)
+        except StopIteration as done:
+            return done.value
 
-            # Clean content
-            improved_content = self._clean_content(improved_content)
-
-            # Create new post
-            regenerated_post = Post(
-                content=improved_content,
-                template_id=post.template_id,
-                template_name=post.template_name,
-                variant=post.variant + 100 * attempt,  # Mark as regeneration (101, 201, etc.)
-                client_name=post.client_name,
-                target_platform=post.target_platform,
+    def _regeneration_attempts(
+        self,
+        post: Post,
+        template: Template,
+        client_brief: ClientBrief,
+        reasons: List[RegenerationReason],
+        attempt: int,
+        system_prompt: Optional[str],
+    ) -> Generator[Dict[str, Any], str, Post]:
+        """Attempt loop shared by the sync and async paths
+
+        Yields the keyword arguments of each generate_post_content call and
+        receives the generated content (API errors are thrown in). Returns
+        the final post: the last regeneration, or the input post when the
+        first call fails or attempts are already exhausted.
+        """
+        while True:
+            if attempt > self.profile.max_attempts:
+                logger.warning(
+                    f"Max regeneration attempts ({self.profile.max_attempts}) reached for post {post.template_name}"
+                )
+                return post
+
+            logger.info(
+                f"Regenerating post {post.template_name} (attempt {attempt}/{self.profile.max_attempts}): "
+                f"{', '.join(r.reason_type for r in reasons)}"
             )
 
-            # Check if regeneration succeeded
-            should_retry, new_reasons = self.should_regenerate(regenerated_post)
-
-            if should_retry and attempt < self.profile.max_attempts:
-                # Try again with more specific guidance
-                logger.info(f"Regeneration attempt {attempt} still has issues, retrying...")
-                return self.regenerate_post(
-                    regenerated_post,
-                    template,
-                    client_brief,
-                    new_reasons,
-                    attempt + 1,
-                    system_prompt,
-                )
+            context = self._build_regeneration_context(post, template, client_brief, reasons)
 
-            logger.info(f"Successfully regenerated post {post.template_name}")
-            return regenerated_post
+            try:
+                improved_content = yield {
+                    "template_structure": template.structure,
+                    "context": context,
+                    "system_prompt": system_prompt or "",
+                    "temperature": POST_GENERATION_TEMPERATURE,
+                }
 
-        except Exception as e:
-            logger.error(f"Failed to regenerate post: {str(e)}", exc_info=True)
-            # Return original post if regeneration fails
-            return post
+                regenerated_post = self._build_regenerated_post(post, improved_content, attempt)
+
+                # Check if regeneration succeeded
+                should_retry, new_reasons = self.should_regenerate(regenerated_post)
+            except Exception as e:
+                logger.error(f"Failed to regenerate post: {str(e)}", exc_info=True)
+                # Return the post this attempt started from if regeneration fails
+                return post
+
+            if not (should_retry and attempt < self.profile.max_attempts):
+                logger.info(f"Successfully regenerated post {post.template_name}")
+                return regenerated_post
+
+            # Try again with more specific guidance
+            logger.info(f"Regeneration attempt {attempt} still has issues, retrying...")
+            post, reasons, attempt = regenerated_post, new_reasons, attempt + 1
+
+    def _build_regeneration_context(
+        self,
+        post: Post,
+        template: Template,
+        client_brief: ClientBrief,
+        reasons: List[RegenerationReason],
+    ) -> Dict:
+        """Build generation context carrying the improvement guidance"""
+        context = client_brief.to_context_dict()
+        context["variant_guidance"] = self._build_improvement_prompt(post, reasons, client_brief)
+        context["template_type"] = template.template_type.value
+        context["requires_story"] = template.requires_story
+        context["requires_data"] = template.requires_data
+        return context
+
+    def _build_regenerated_post(self, post: Post, content: str, attempt: int) -> Post:
+        """Wrap regenerated content in a Post carrying the original's metadata"""
+        return Post(
+            content=self._clean_content(content),
+            template_id=post.template_id,
+            template_name=post.template_name,
+            variant=post.variant + 100 * attempt,  # Mark as regeneration (101, 201, etc.)
+            client_name=post.client_name,
+            target_platform=post.target_platform,
+        )
 
     def _build_improvement_prompt(
         self, post: Post, reasons: List[RegenerationReason], client_brief: ClientBrief
@@ -270,6 +402,28 @@ class PostRegenerator:
                     "'What's your experience with [topic]?' or 'Try [specific action] and let me know how it goes.'"
                 )
 
+            elif reason.reason_type == "duplicate_hook":
+                other_hook = reason.details.split(": ", 1)[-1]
+                guidance_parts.append(
+                    f"- Write a different opening line: the current hook is too similar to "
+                    f"another post in this batch ({other_hook}). Use a different angle or "
+                    f"hook style entirely."
+                )
+
+            elif reason.reason_type == "overused_cta":
+                guidance_parts.append(
+                    f"- Use a different kind of CTA: {reason.details} across this batch. "
+                    f"End with another style, e.g. a specific question, a resource, or an "
+                    f"invitation to book a call."
+                )
+
+            elif reason.reason_type == "similar_length":
+                guidance_parts.append(
+                    f"- Vary the length: many posts in this batch are around "
+                    f"{reason.current_value} words. Make this one noticeably shorter or longer "
+                    f"while staying within {self.profile.min_words}-{self.profile.max_words} words."
+                )
+
             elif reason.reason_type == "weak_headline":
                 guidance_parts.append(
                     f"- Strengthen opening: Include at least {self.profile.min_engagement_score} of these: "
@@ -297,6 +451,7 @@ class PostRegenerator:
 
         return content.strip()
 
+    @tracked_operation("post_regeneration")
     def regenerate_failed_posts(
         self,
         posts: List[Post],
@@ -316,13 +471,7 @@ class PostRegenerator:
             Tuple of (regenerated_posts: List[Post], stats: Dict)
         """
         regenerated_posts = []
-        stats = {
-            "total_posts": len(posts),
-            "posts_regenerated": 0,
-            "posts_improved": 0,
-            "posts_unchanged": 0,
-            "reasons": {},
-        }
+        stats = self._new_stats(len(posts))
 
         # Create template lookup
         template_map = {t.template_id: t for t in templates}
@@ -330,43 +479,219 @@ class PostRegenerator:
         for post in posts:
             should_regen, reasons = self.should_regenerate(post)
 
-            if should_regen:
-                # Track reasons
-                for reason in reasons:
-                    stats["reasons"][reason.reason_type] = (
-                        stats["reasons"].get(reason.reason_type, 0) + 1
-                    )
+            if not should_regen:
+                regenerated_posts.append(post)
+                continue
+
+            template = template_map.get(post.template_id)
+            if not template:
+                logger.warning(f"Template {post.template_id} not found, skipping regeneration")
+                regenerated_posts.append(post)
+                self._tally(stats, reasons, "missing_template")
+                continue
+
+            regenerated_post = self.regenerate_post(
+                post, template, client_brief, reasons, attempt=1, system_prompt=system_prompt
+            )
+            regenerated_posts.append(regenerated_post)  # Used even when not improved
+            self._tally(stats, reasons, self._classify(reasons, regenerated_post))
+
+        self._log_stats(stats)
+        return regenerated_posts, stats
+
+    @tracked_operation("post_regeneration")
+    async def regenerate_failed_posts_async(
+        self,
+        posts: List[Post],
+        templates: List[Template],
+        client_brief: ClientBrief,
+        system_prompt: Optional[str] = None,
+    ) -> Tuple[List[Post], Dict]:
+        """Regenerate all posts that fail quality checks, concurrently
+
+        Same results and stats as regenerate_failed_posts, in input order.
+
+        Args:
+            posts: List of posts to check
+            templates: Templates used (for regeneration)
+            client_brief: Client context
+            system_prompt: Optional cached system prompt
+
+        Returns:
+            Tuple of (regenerated_posts: List[Post], stats: Dict)
+        """
+        regenerated_posts: List[Post] = list(posts)
+        stats = self._new_stats(len(posts))
+
+        async for result in self.stream_regenerated_posts(
+            posts, templates, client_brief, system_prompt
+        ):
+            regenerated_posts[result.index] = result.post
+            self._tally(stats, result.reasons, result.outcome)
+
+        self._log_stats(stats)
+        return regenerated_posts, stats
+
+    async def stream_regenerated_posts(
+        self,
+        posts: List[Post],
+        templates: List[Template],
+        client_brief: ClientBrief,
+        system_prompt: Optional[str] = None,
+    ) -> AsyncIterator[RegenerationOutcome]:
+        """Regenerate failing posts concurrently, yielding each result as it finishes
 
-                # Get template
-                template = template_map.get(post.template_id)
-                if not template:
-                    logger.warning(f"Template {post.template_id} not found, skipping regeneration")
-                    regenerated_posts.append(post)
-                    stats["posts_unchanged"] += 1
+        Posts that pass quality checks are yielded immediately. API calls share
+        the process-wide limiter; if the consumer stops iterating early the
+        outstanding regenerations are cancelled.
+
+        Args:
+            posts: List of posts to check
+            templates: Templates used (for regeneration)
+            client_brief: Client context
+            system_prompt: Optional cached system prompt
+
+        Yields:
+            RegenerationOutcome per post, in completion order
+        """
+        template_map = {t.template_id: t for t in templates}
+        passed: List[RegenerationOutcome] = []
+        tasks = []
+
+        # Tasks copy the context on creation, so their calls carry this tag
+        with operation_scope("post_regeneration"):
+            for index, post in enumerate(posts):
+                should_regen, reasons = self.should_regenerate(post)
+                if not should_regen:
+                    passed.append(RegenerationOutcome(index, post, [], "passed"))
                     continue
+                tasks.append(
+                    asyncio.create_task(
+                        self._regenerate_one_async(
+                            index, post, reasons, template_map, client_brief, system_prompt
+                        )
+                    )
+                )
+
+        try:
+            for result in passed:
+                yield result
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def start_regeneration(
+        self,
+        index: int,
+        post: Post,
+        reasons: List[RegenerationReason],
+        templates: List[Template],
+        client_brief: ClientBrief,
+        system_prompt: Optional[str] = None,
+    ) -> "asyncio.Task[RegenerationOutcome]":
+        """Start regenerating one post in the background while its run continues
 
-                # Regenerate
-                regenerated_post = self.regenerate_post(
-                    post, template, client_brief, reasons, attempt=1, system_prompt=system_prompt
+        Used by incremental QA to fix a post as soon as it is flagged. API
+        calls share the process-wide limiter with generation.
+
+        Args:
+            index: Position of the post in its run (echoed in the outcome)
+            post: Post to regenerate
+            reasons: Why it needs regeneration
+            templates: Templates used (for regeneration)
+            client_brief: Client context
+            system_prompt: Optional cached system prompt
+
+        Returns:
+            Task resolving to the post's RegenerationOutcome
+        """
+        template_map = {t.template_id: t for t in templates}
+        with operation_scope("post_regeneration"):
+            return asyncio.create_task(
+                self._regenerate_one_async(
+                    index, post, reasons, template_map, client_brief, system_prompt
                 )
+            )
 
-                # Check if actually improved
-                new_should_regen, new_reasons = self.should_regenerate(regenerated_post)
+    def summarize_outcomes(
+        self, outcomes: Iterable[RegenerationOutcome], total_posts: int
+    ) -> Dict:
+        """Batch stats (as returned by regenerate_failed_posts) for individual outcomes
 
-                if not new_should_regen or len(new_reasons) < len(reasons):
-                    stats["posts_improved"] += 1
-                    regenerated_posts.append(regenerated_post)
-                else:
-                    stats["posts_unchanged"] += 1
-                    regenerated_posts.append(regenerated_post)  # Still use regenerated version
+        Args:
+            outcomes: Outcomes of the posts that were regenerated
+            total_posts: Number of posts in the run
 
-                stats["posts_regenerated"] += 1
-            else:
-                regenerated_posts.append(post)
+        Returns:
+            Stats dict with regenerated/improved/unchanged counts and reasons
+        """
+        stats = self._new_stats(total_posts)
+        for outcome in outcomes:
+            self._tally(stats, outcome.reasons, outcome.outcome)
+        self._log_stats(stats)
+        return stats
+
+    async def _regenerate_one_async(
+        self,
+        index: int,
+        post: Post,
+        reasons: List[RegenerationReason],
+        template_map: Dict[int, Template],
+        client_brief: ClientBrief,
+        system_prompt: Optional[str],
+    ) -> RegenerationOutcome:
+        """Regenerate one failing post of a batch"""
+        template = template_map.get(post.template_id)
+        if not template:
+            logger.warning(f"Template {post.template_id} not found, skipping regeneration")
+            return RegenerationOutcome(index, post, reasons, "missing_template")
+
+        regenerated_post = await self.regenerate_post_async(
+            post, template, client_brief, reasons, attempt=1, system_prompt=system_prompt
+        )
+        return RegenerationOutcome(
+            index, regenerated_post, reasons, self._classify(reasons, regenerated_post)
+        )
+
+    def _classify(self, reasons: List[RegenerationReason], regenerated_post: Post) -> str:
+        """Whether a regeneration fixed (or reduced) the original post's issues"""
+        new_should_regen, new_reasons = self.should_regenerate(regenerated_post)
+        if not new_should_regen or len(new_reasons) < len(reasons):
+            return "improved"
+        return "unchanged"
+
+    @staticmethod
+    def _new_stats(total_posts: int) -> Dict:
+        return {
+            "total_posts": total_posts,
+            "posts_regenerated": 0,
+            "posts_improved": 0,
+            "posts_unchanged": 0,
+            "reasons": {},
+        }
+
+    @staticmethod
+    def _tally(stats: Dict, reasons: List[RegenerationReason], outcome: str) -> None:
+        """Add one post's regeneration outcome to batch stats"""
+        if outcome == "passed":
+            return
 
+        for reason in reasons:
+            stats["reasons"][reason.reason_type] = stats["reasons"].get(reason.reason_type, 0) + 1
+
+        if outcome == "missing_template":
+            stats["posts_unchanged"] += 1
+            return
+
+        stats["posts_improved" if outcome == "improved" else "posts_unchanged"] += 1
+        stats["posts_regenerated"] += 1
+
+    @staticmethod
+    def _log_stats(stats: Dict) -> None:
         logger.info(
             f"Regeneration complete: {stats['posts_regenerated']}/{stats['total_posts']} posts regenerated, "
             f"{stats['posts_improved']} improved"
         )
-
-        return regenerated_posts, stats
@@ -2,6 +2,7 @@
 
 from typing import List, Optional
 
+from ..models.client_brief import Platform
 from ..models.post import Post
 from ..models.qa_report import QAReport
 from ..models.seo_keyword import KeywordStrategy
@@ -9,6 +10,7 @@ from ..utils.logger import logger
 from ..validators.cta_validator import CTAValidator
 from ..validators.headline_validator import HeadlineValidator
 from ..validators.hook_validator import HookValidator
+from ..validators.incremental_validator import IncrementalQAValidator
 from ..validators.keyword_validator import KeywordValidator
 from ..validators.length_validator import LengthValidator
 
@@ -35,6 +37,30 @@ class QAAgent:
         if keyword_strategy:
             self.keyword_validator = KeywordValidator(keyword_strategy)
 
+    def start_incremental(
+        self, expected_posts: int, platform: Optional[Platform] = None
+    ) -> IncrementalQAValidator:
+        """
+        Start validating a run's posts one at a time as they are generated
+
+        Uses this agent's hook, CTA and length thresholds. Call validate_posts
+        on the final posts for the full report.
+
+        Args:
+            expected_posts: Planned number of posts in the run
+            platform: Target platform (defaults to the first post's platform)
+
+        Returns:
+            IncrementalQAValidator accepting posts via add()
+        """
+        return IncrementalQAValidator(
+            expected_posts=expected_posts,
+            platform=platform,
+            hook_validator=self.hook_validator,
+            cta_validator=self.cta_validator,
+            length_validator=self.length_validator,
+        )
+
     def validate_posts(self, posts: List[Post], client_name: str) -> QAReport:
         """
         Run quality validation on a set of posts
@@ -4,7 +4,8 @@ This agent handles targeted post regeneration when clients request changes.
 Unlike auto-regeneration (quality-based), this applies specific client feedback.
 """
 
-from typing import List, Optional, Tuple
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
 
 from ..config.constants import POST_GENERATION_TEMPERATURE
 from ..models.client_brief import ClientBrief
@@ -12,7 +13,9 @@ from ..models.post import Post
 from ..models.project import RevisionDiff
 from ..models.template import Template
 from ..utils.anthropic_client import AnthropicClient
+from ..utils.api_limiter import api_call_slot
 from ..utils.logger import logger
+from ..utils.run_context import operation_scope, tracked_operation
 
 
 class RevisionAgent:
@@ -65,36 +68,85 @@ class RevisionAgent:
                 temperature=POST_GENERATION_TEMPERATURE,
             )
 
-            # Clean content
-            revised_content = self._clean_content(revised_content)
-
-            # Create revised post
-            revised_post = Post(
-                content=revised_content,
-                template_id=original_post.template_id,
-                template_name=original_post.template_name,
-                variant=original_post.variant,  # Keep same variant number
-                client_name=original_post.client_name,
-                target_platform=original_post.target_platform,
-            )
+            return self._finalize_revision(original_post, revised_content, client_feedback)
 
-            # Generate changes summary
-            changes_summary = self._generate_changes_summary(
-                original_post, revised_post, client_feedback
-            )
+        except Exception as e:
+            logger.error(f"Failed to revise post: {str(e)}", exc_info=True)
+            # Return original post if revision fails
+            return original_post, f"Revision failed: {str(e)}"
 
-            logger.info(
-                f"Successfully revised post #{original_post.variant}: "
-                f"{original_post.word_count} -> {revised_post.word_count} words"
-            )
+    async def generate_revised_post_async(
+        self,
+        original_post: Post,
+        client_feedback: str,
+        client_brief: ClientBrief,
+        template: Template,
+        system_prompt: Optional[str] = None,
+    ) -> Tuple[Post, str]:
+        """Generate a revised version of a post based on client feedback (async version)
+
+        The API call holds a slot of the shared API limiter, so concurrent
+        revisions respect MAX_CONCURRENT_API_CALLS.
+
+        Args:
+            original_post: The original post to revise
+            client_feedback: Specific feedback on what to change
+            client_brief: Client context
+            template: Template structure
+            system_prompt: Optional cached system prompt
+
+        Returns:
+            Tuple of (revised_post, changes_summary)
+        """
+        logger.info(
+            f"Generating revision for post #{original_post.variant} "
+            f"({original_post.template_name})"
+        )
+
+        revision_prompt = self._build_revision_prompt(
+            original_post, client_feedback, client_brief, template
+        )
+
+        try:
+            async with api_call_slot():
+                revised_content = await self.client.generate_post_content_async(
+                    template_structure=template.structure,
+                    context=revision_prompt,
+                    system_prompt=system_prompt or self._build_system_prompt(client_brief),
+                    temperature=POST_GENERATION_TEMPERATURE,
+                )
 
-            return revised_post, changes_summary
+            return self._finalize_revision(original_post, revised_content, client_feedback)
 
         except Exception as e:
             logger.error(f"Failed to revise post: {str(e)}", exc_info=True)
             # Return original post if revision fails
             return original_post, f"Revision failed: {str(e)}"
 
+    def _finalize_revision(
+        self, original_post: Post, revised_content: str, client_feedback: str
+    ) -> Tuple[Post, str]:
+        """Wrap revised content in a Post and summarize what changed"""
+        revised_post = Post(
+            content=self._clean_content(revised_content),
+            template_id=original_post.template_id,
+            template_name=original_post.template_name,
+            variant=original_post.variant,  # Keep same variant number
+            client_name=original_post.client_name,
+            target_platform=original_post.target_platform,
+        )
+
+        changes_summary = self._generate_changes_summary(
+            original_post, revised_post, client_feedback
+        )
+
+        logger.info(
+            f"Successfully revised post #{original_post.variant}: "
+            f"{original_post.word_count} -> {revised_post.word_count} words"
+        )
+
+        return revised_post, changes_summary
+
     def revise_multiple_posts(
         self,
         posts: List[Post],
@@ -136,6 +188,112 @@ class RevisionAgent:
 
         return revised_posts
 
+    @tracked_operation("post_revision")
+    async def revise_multiple_posts_async(
+        self,
+        posts: List[Post],
+        client_feedback: str,
+        client_brief: ClientBrief,
+        templates: List[Template],
+        system_prompt: Optional[str] = None,
+    ) -> List[Tuple[Post, str]]:
+        """Revise multiple posts concurrently based on client feedback
+
+        Same results as revise_multiple_posts, in input order.
+
+        Args:
+            posts: List of posts to revise
+            client_feedback: Overall feedback that applies to all posts
+            client_brief: Client context
+            templates: Available templates
+            system_prompt: Optional cached system prompt
+
+        Returns:
+            List of (revised_post, changes_summary) tuples
+        """
+        revised_posts: List[Tuple[Post, str]] = [(post, "") for post in posts]
+
+        async for index, revised_post, changes in self.stream_revisions(
+            posts, client_feedback, client_brief, templates, system_prompt
+        ):
+            revised_posts[index] = (revised_post, changes)
+
+        return revised_posts
+
+    async def stream_revisions(
+        self,
+        posts: List[Post],
+        client_feedback: str,
+        client_brief: ClientBrief,
+        templates: List[Template],
+        system_prompt: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[int, Post, str]]:
+        """Revise posts concurrently, yielding each revision as it finishes
+
+        If the consumer stops iterating early the outstanding revisions are
+        cancelled.
+
+        Args:
+            posts: List of posts to revise
+            client_feedback: Overall feedback that applies to all posts
+            client_brief: Client context
+            templates: Available templates
+            system_prompt: Optional cached system prompt
+
+        Yields:
+            (index, revised_post, changes_summary) tuples in completion order
+        """
+        template_map = {t.template_id: t for t in templates}
+        missing: List[Tuple[int, Post, str]] = []
+        tasks = []
+
+        # Tasks copy the context on creation, so their calls carry this tag
+        with operation_scope("post_revision"):
+            for index, post in enumerate(posts):
+                template = template_map.get(post.template_id)
+                if not template:
+                    logger.warning(
+                        f"Template {post.template_id} not found for post {post.variant}"
+                    )
+                    missing.append((index, post, "Template not found, kept original"))
+                    continue
+                tasks.append(
+                    asyncio.create_task(
+                        self._revise_one_async(
+                            index, post, client_feedback, client_brief, template, system_prompt
+                        )
+                    )
+                )
+
+        try:
+            for result in missing:
+                yield result
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _revise_one_async(
+        self,
+        index: int,
+        post: Post,
+        client_feedback: str,
+        client_brief: ClientBrief,
+        template: Template,
+        system_prompt: Optional[str],
+    ) -> Tuple[int, Post, str]:
+        """Revise one post of a batch, tagging the result with its input position"""
+        revised_post, changes = await self.generate_revised_post_async(
+            original_post=post,
+            client_feedback=client_feedback,
+            client_brief=client_brief,
+            template=template,
+            system_prompt=system_prompt,
+        )
+        return index, revised_post, changes
+
     def _build_revision_prompt(
         self,
         original_post: Post,
@@ -268,7 +426,7 @@ CRITICAL: This is a REVISION based on client feedback.
 **Client Context:**
 - Company: {client_brief.company_name}
 - Business: {client_brief.business_description}
-- Voice: {", ".join(client_brief.brand_voice_traits)}
+- Voice: {", ".join(t.value for t in client_brief.brand_personality)}
 
 **Your Task:**
 Generate a revised version of the post that addresses the client's specific feedback while maintaining the overall quality and structure.
@@ -79,6 +79,7 @@ class Settings(BaseSettings):
     DEFAULT_OUTPUT_DIR: str = "data/outputs"
     DEFAULT_BRIEFS_DIR: str = "data/briefs"
     PROJECTS_DIR: str = "data/projects"  # Completed client deliverables
+    TEMPLATE_INDEX_DIR: str = ".cache/template_index"  # Compiled template library indexes
 
     # Application
     LOG_LEVEL: str = "INFO"
@@ -96,17 +97,34 @@ class Settings(BaseSettings):
     PARALLEL_GENERATION: bool = True  # Phase 2 - Async parallel generation
     MAX_CONCURRENT_API_CALLS: int = 5  # Limit concurrent API requests
     BATCH_SIZE: int = 10  # Number of posts per batch
+    GENERATION_WORKERS: int = 2  # Warm worker processes for pooled jobs (0 = run on a thread)
+    QUALITY_RETRY_PARALLELISM: int = 3  # Candidates generated concurrently per retry round
+    QUALITY_RETRY_TOKEN_BUDGET: int = 200000  # Max tokens spent on quality retries per run (0 = unlimited)
 
     # API Response Caching (dev/testing only)
     ENABLE_RESPONSE_CACHE: bool = False  # Enable disk-based response cache
     RESPONSE_CACHE_DIR: str = ".cache/api_responses"  # Cache directory
     RESPONSE_CACHE_TTL: int = 86400  # Cache TTL in seconds (24 hours)
 
+    # Research tool result cache (see src/research/result_cache.py)
+    ENABLE_RESEARCH_CACHE: bool = True  # Reuse results of identical research runs
+    RESEARCH_CACHE_DIR: str = ".cache/research_results"  # Cache directory
+    RESEARCH_CACHE_TTL: int = 604800  # Cache TTL in seconds (7 days)
+    RESEARCH_LEDGER_MAX_BYTES: int = 10_000_000  # Rotate execution ledger segments (~10MB)
+
     # Anthropic Prompt Caching
     ENABLE_PROMPT_CACHING: bool = True  # Use Anthropic's prompt caching API
     CACHE_SYSTEM_PROMPTS: bool = True  # Cache system prompts
     CACHE_CLIENT_CONTEXT: bool = True  # Cache client brief context
 
+    # Conversation memory for the agent and assistant (see src/utils/conversation_window.py)
+    CONVERSATION_WINDOW_TOKENS: int = 12000  # Recent-turn window before older turns are summarized
+    CONVERSATION_SUMMARY_MODEL: str = "claude-3-5-haiku-latest"  # Model writing rolling summaries
+
+    # Agent tool execution (see agent/tool_executor.py)
+    AGENT_TOOL_CONCURRENCY: int = 8  # Read-only tool calls run at once within a turn
+    AGENT_TOOL_TIMEOUT: float = 120.0  # Default per-tool timeout in seconds
+
     class Config:
         """Pydantic settings configuration"""
 
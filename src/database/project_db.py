@@ -6,9 +6,9 @@ Uses SQLite for local storage with future option for PostgreSQL.
 
 import sqlite3
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 from ..models.client_memory import ClientMemory, FeedbackTheme, VoiceSample
 from ..models.project import (
@@ -46,11 +46,49 @@ class ProjectDatabase:
         schema_path = Path(__file__).parent / "schema.sql"
 
         with self._get_connection() as conn:
+            # Must run before the schema script, which indexes the new column
+            self._add_voice_upload_hashes(conn)
+
             with open(schema_path, "r", encoding="utf-8") as f:
                 schema_sql = f.read()
                 conn.executescript(schema_sql)
             conn.commit()
 
+            # Databases created before rollups existed need a one-time backfill
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT
+                    EXISTS(SELECT 1 FROM system_metrics),
+                    EXISTS(SELECT 1 FROM system_metric_rollups)
+            """
+            )
+            has_metrics, has_rollups = cursor.fetchone()
+            if has_metrics and not has_rollups:
+                self._rebuild_metric_rollups(conn)
+                conn.commit()
+
+    @staticmethod
+    def _add_voice_upload_hashes(conn: sqlite3.Connection) -> None:
+        """Add and backfill voice_sample_uploads.content_hash on older databases"""
+        from ..utils.file_parser import compute_content_hash
+
+        columns = {
+            row["name"] for row in conn.execute("PRAGMA table_info(voice_sample_uploads)")
+        }
+        if not columns or "content_hash" in columns:
+            return
+
+        conn.execute("ALTER TABLE voice_sample_uploads ADD COLUMN content_hash TEXT")
+        conn.executemany(
+            "UPDATE voice_sample_uploads SET content_hash = ? WHERE id = ?",
+            [
+                (compute_content_hash(row["sample_text"]), row["id"])
+                for row in conn.execute("SELECT id, sample_text FROM voice_sample_uploads")
+            ],
+        )
+        conn.commit()
+
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
         """Context manager for database connections"""
@@ -799,6 +837,7 @@ class ProjectDatabase:
         Returns:
             ID of stored sample
         """
+        from ..utils.file_parser import compute_content_hash
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
@@ -806,8 +845,8 @@ class ProjectDatabase:
                 """
                 INSERT INTO voice_sample_uploads (
                     client_name, sample_text, sample_source,
-                    word_count, file_name
-                ) VALUES (?, ?, ?, ?, ?)
+                    word_count, file_name, content_hash
+                ) VALUES (?, ?, ?, ?, ?, ?)
             """,
                 (
                     voice_sample.client_name,
@@ -815,6 +854,7 @@ class ProjectDatabase:
                     voice_sample.sample_source,
                     voice_sample.word_count,
                     voice_sample.file_name,
+                    compute_content_hash(voice_sample.sample_text),
                 ),
             )
             conn.commit()
@@ -833,6 +873,81 @@ class ProjectDatabase:
 
             return cursor.lastrowid or 0
 
+    def store_voice_sample_uploads(self, voice_samples: List["VoiceSampleUpload"]) -> int:
+        """
+        Store a batch of client-uploaded voice samples in one transaction
+
+        Samples whose content hash matches one already stored for the client
+        (or an earlier sample in the same batch) are skipped.
+
+        Args:
+            voice_samples: VoiceSampleUpload instances
+
+        Returns:
+            Number of samples stored
+        """
+        from ..utils.file_parser import compute_content_hash
+
+        if not voice_samples:
+            return 0
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            # Single commit at the end: a failed batch leaves no partial upload behind
+            seen = set()
+            rows = []
+            for sample in voice_samples:
+                content_hash = compute_content_hash(sample.sample_text)
+                key = (sample.client_name, content_hash)
+                if key in seen:
+                    continue
+                seen.add(key)
+                cursor.execute(
+                    """
+                    SELECT 1 FROM voice_sample_uploads
+                    WHERE client_name = ? AND content_hash = ?
+                    LIMIT 1
+                """,
+                    key,
+                )
+                if cursor.fetchone():
+                    continue
+                rows.append(
+                    (
+                        sample.client_name,
+                        sample.sample_text,
+                        sample.sample_source,
+                        sample.word_count,
+                        sample.file_name,
+                        content_hash,
+                    )
+                )
+
+            cursor.executemany(
+                """
+                INSERT INTO voice_sample_uploads (
+                    client_name, sample_text, sample_source,
+                    word_count, file_name, content_hash
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                rows,
+            )
+
+            if rows:
+                cursor.executemany(
+                    """
+                    UPDATE client_history
+                    SET has_voice_samples = 1,
+                        voice_samples_upload_date = CURRENT_TIMESTAMP
+                    WHERE client_name = ?
+                """,
+                    [(name,) for name in sorted({row[0] for row in rows})],
+                )
+
+            conn.commit()
+
+            return len(rows)
+
     def get_voice_sample_uploads(
         self, client_name: str, limit: Optional[int] = None
     ) -> List["VoiceSampleUpload"]:
@@ -1587,6 +1702,39 @@ class ProjectDatabase:
                 (metric_date, metric_type, metric_name, metric_value, metadata_json),
             )
 
+            # Refresh only the week and month buckets this date belongs to
+            day = date.fromisoformat(metric_date[:10])
+            for period_type in ("week", "month"):
+                start, end = self._metric_period_bounds(period_type, day)
+                cursor.execute(
+                    """
+                    INSERT INTO system_metric_rollups (
+                        period_type, period_start, metric_type, metric_name,
+                        value_sum, value_min, value_max, data_points
+                    )
+                    SELECT ?, ?, metric_type, metric_name,
+                        SUM(metric_value), MIN(metric_value), MAX(metric_value), COUNT(*)
+                    FROM system_metrics
+                    WHERE metric_type = ? AND metric_name = ?
+                        AND metric_date >= ? AND metric_date < ?
+                    GROUP BY metric_type, metric_name
+                    ON CONFLICT(period_type, period_start, metric_type, metric_name)
+                    DO UPDATE SET
+                        value_sum = excluded.value_sum,
+                        value_min = excluded.value_min,
+                        value_max = excluded.value_max,
+                        data_points = excluded.data_points
+                """,
+                    (
+                        period_type,
+                        start.isoformat(),
+                        metric_type,
+                        metric_name,
+                        start.isoformat(),
+                        end.isoformat(),
+                    ),
+                )
+
             conn.commit()
 
     def get_metrics(
@@ -1662,34 +1810,68 @@ class ProjectDatabase:
         """
         Get summary of recent metrics
 
+        Closed weeks and months inside the window are read from
+        system_metric_rollups; only the leftover days and the current open
+        period are read from raw system_metrics rows.
+
         Args:
             days: Number of days to look back
 
         Returns:
             Dictionary with metric summaries by type
         """
-        from datetime import date, timedelta
+        today = date.today()
+        start_date = today - timedelta(days=days)
+        buckets, raw_ranges = self._plan_metric_buckets(start_date, today)
+
+        parts = []
+        params: List[Any] = []
+
+        for period_type in ("month", "week"):
+            starts = [start.isoformat() for kind, start in buckets if kind == period_type]
+            if starts:
+                placeholders = ", ".join("?" for _ in starts)
+                parts.append(
+                    f"""
+                    SELECT metric_type, metric_name, value_sum, value_min, value_max, data_points
+                    FROM system_metric_rollups
+                    WHERE period_type = ? AND period_start IN ({placeholders})
+                """
+                )
+                params.extend([period_type, *starts])
+
+        raw_conditions = ["metric_date >= ?"]
+        params_raw: List[Any] = [today.isoformat()]
+        for range_start, range_end in raw_ranges:
+            raw_conditions.append("(metric_date >= ? AND metric_date < ?)")
+            params_raw.extend([range_start.isoformat(), range_end.isoformat()])
+        parts.append(
+            f"""
+            SELECT metric_type, metric_name, metric_value as value_sum,
+                metric_value as value_min, metric_value as value_max, 1 as data_points
+            FROM system_metrics
+            WHERE {" OR ".join(raw_conditions)}
+        """
+        )
+        params.extend(params_raw)
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
 
-            start_date = (date.today() - timedelta(days=days)).isoformat()
-
-            cursor.execute(
-                """
+            cursor.execute(  # nosec B608
+                f"""
                 SELECT
                     metric_type,
                     metric_name,
-                    AVG(metric_value) as avg_value,
-                    MIN(metric_value) as min_value,
-                    MAX(metric_value) as max_value,
-                    COUNT(*) as data_points
-                FROM system_metrics
-                WHERE metric_date >= ?
+                    SUM(value_sum) / SUM(data_points) as avg_value,
+                    MIN(value_min) as min_value,
+                    MAX(value_max) as max_value,
+                    SUM(data_points) as data_points
+                FROM ({" UNION ALL ".join(parts)})
                 GROUP BY metric_type, metric_name
                 ORDER BY metric_type, metric_name
             """,
-                (start_date,),
+                params,
             )
 
             rows = cursor.fetchall()
@@ -1713,6 +1895,301 @@ class ProjectDatabase:
 
             return summary
 
+    def rebuild_metric_rollups(self) -> None:
+        """Recompute every week/month rollup bucket from raw system_metrics"""
+        with self._get_connection() as conn:
+            self._rebuild_metric_rollups(conn)
+            conn.commit()
+
+    def _rebuild_metric_rollups(self, conn: sqlite3.Connection) -> None:
+        """Recompute all metric rollups on an open connection (caller commits)"""
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM system_metric_rollups")
+
+        period_expressions = {
+            "week": "date(metric_date, 'weekday 0', '-6 days')",
+            "month": "date(metric_date, 'start of month')",
+        }
+        for period_type, start_expr in period_expressions.items():
+            cursor.execute(  # nosec B608
+                f"""
+                INSERT INTO system_metric_rollups (
+                    period_type, period_start, metric_type, metric_name,
+                    value_sum, value_min, value_max, data_points
+                )
+                SELECT ?, {start_expr} as period_start, metric_type, metric_name,
+                    SUM(metric_value), MIN(metric_value), MAX(metric_value), COUNT(*)
+                FROM system_metrics
+                WHERE metric_date IS NOT NULL
+                GROUP BY period_start, metric_type, metric_name
+            """,
+                (period_type,),
+            )
+
+    @staticmethod
+    def _metric_period_bounds(period_type: str, day: date) -> Tuple[date, date]:
+        """Return [start, end) of the week (Monday-based) or month containing day"""
+        if period_type == "week":
+            start = day - timedelta(days=day.weekday())
+            return start, start + timedelta(days=7)
+
+        start = day.replace(day=1)
+        if start.month == 12:
+            return start, start.replace(year=start.year + 1, month=1)
+        return start, start.replace(month=start.month + 1)
+
+    def _plan_metric_buckets(
+        self, start: date, end: date
+    ) -> Tuple[List[Tuple[str, date]], List[Tuple[date, date]]]:
+        """
+        Cover [start, end) with the fewest closed rollup buckets
+
+        Walks forward from start, taking a whole month when the cursor sits on
+        the 1st and the month fits, otherwise a whole week when the cursor is a
+        Monday and the week fits, otherwise a single raw day.
+
+        Returns:
+            (list of (period_type, period_start), list of raw [start, end) date ranges)
+        """
+        buckets: List[Tuple[str, date]] = []
+        raw_ranges: List[Tuple[date, date]] = []
+        cursor = start
+
+        while cursor < end:
+            for period_type in ("month", "week"):
+                period_start, period_end = self._metric_period_bounds(period_type, cursor)
+                if period_start == cursor and period_end <= end:
+                    buckets.append((period_type, period_start))
+                    cursor = period_end
+                    break
+            else:
+                next_day = cursor + timedelta(days=1)
+                if raw_ranges and raw_ranges[-1][1] == cursor:
+                    raw_ranges[-1] = (raw_ranges[-1][0], next_day)
+                else:
+                    raw_ranges.append((cursor, next_day))
+                cursor = next_day
+
+        return buckets, raw_ranges
+
+    # ============================================================================
+    # Analytics Aggregations (CLI dashboard / analytics reports)
+    # ============================================================================
+
+    def get_client_totals(self) -> dict:
+        """
+        Get portfolio-wide client totals in a single aggregate query
+
+        Returns:
+            Dictionary with client counts by retention tier and summed totals
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT
+                    COUNT(*) as total_clients,
+                    COALESCE(SUM(total_projects), 0) as total_projects,
+                    COALESCE(SUM(total_posts_generated), 0) as total_posts,
+                    COALESCE(SUM(lifetime_value), 0.0) as total_lifetime_value,
+                    SUM(CASE WHEN total_projects <= 1 THEN 1 ELSE 0 END) as new_clients,
+                    SUM(CASE WHEN total_projects = 2 THEN 1 ELSE 0 END) as repeat_clients,
+                    SUM(CASE WHEN total_projects >= 3 THEN 1 ELSE 0 END) as loyal_clients
+                FROM client_history
+            """
+            )
+
+            row = cursor.fetchone()
+            total_clients = row["total_clients"] or 0
+            returning = (row["repeat_clients"] or 0) + (row["loyal_clients"] or 0)
+
+            return {
+                "total_clients": total_clients,
+                "total_projects": row["total_projects"],
+                "total_posts": row["total_posts"],
+                "total_lifetime_value": float(row["total_lifetime_value"]),
+                "new_clients": row["new_clients"] or 0,
+                "repeat_clients": row["repeat_clients"] or 0,
+                "loyal_clients": row["loyal_clients"] or 0,
+                "retention_rate": returning / total_clients if total_clients > 0 else 0.0,
+            }
+
+    def get_template_feedback_stats(self, client_name: Optional[str] = None) -> List[dict]:
+        """
+        Get per-template feedback rates grouped in SQL
+
+        Args:
+            client_name: Optional client to filter by
+
+        Returns:
+            List of per-template stats, best success rate first
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = """
+                SELECT
+                    template_id,
+                    MAX(template_name) as template_name,
+                    COUNT(*) as total,
+                    SUM(CASE WHEN feedback_type = 'kept' THEN 1 ELSE 0 END) as kept,
+                    SUM(CASE WHEN feedback_type = 'modified' THEN 1 ELSE 0 END) as modified,
+                    SUM(CASE WHEN feedback_type = 'rejected' THEN 1 ELSE 0 END) as rejected,
+                    SUM(CASE WHEN feedback_type = 'loved' THEN 1 ELSE 0 END) as loved,
+                    AVG(
+                        CASE WHEN engagement_data IS NOT NULL
+                        THEN COALESCE(json_extract(engagement_data, '$.likes'), 0)
+                        END
+                    ) as avg_likes
+                FROM post_feedback
+            """
+            params: List[Any] = []
+
+            if client_name:
+                query += " WHERE client_name = ?"
+                params.append(client_name)
+
+            query += " GROUP BY template_id"
+
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+            stats_list = []
+            for row in rows:
+                total = row["total"]
+                stats_list.append(
+                    {
+                        "template_id": row["template_id"],
+                        "template_name": row["template_name"],
+                        "total": total,
+                        "kept": row["kept"],
+                        "modified": row["modified"],
+                        "rejected": row["rejected"],
+                        "loved": row["loved"],
+                        "success_rate": (row["kept"] + row["loved"]) / total,
+                        "modified_rate": row["modified"] / total,
+                        "rejected_rate": row["rejected"] / total,
+                        "loved_rate": row["loved"] / total,
+                        "avg_engagement": float(row["avg_likes"]) if row["avg_likes"] else 0.0,
+                    }
+                )
+
+            stats_list.sort(key=lambda s: (s["success_rate"], s["total"]), reverse=True)
+            return stats_list
+
+    def get_retention_by_satisfaction(self) -> List[dict]:
+        """
+        Get client retention bucketed by whole-star average satisfaction
+
+        Returns:
+            List of buckets (highest satisfaction first) with client and repeat counts
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT
+                    CAST(average_satisfaction AS INTEGER) as satisfaction_bucket,
+                    COUNT(*) as total,
+                    SUM(CASE WHEN total_projects > 1 THEN 1 ELSE 0 END) as repeat
+                FROM client_history
+                WHERE average_satisfaction > 0
+                GROUP BY satisfaction_bucket
+                ORDER BY satisfaction_bucket DESC
+            """
+            )
+
+            return [
+                {
+                    "satisfaction_bucket": row["satisfaction_bucket"],
+                    "total": row["total"],
+                    "repeat": row["repeat"],
+                    "repeat_rate": row["repeat"] / row["total"] if row["total"] else 0.0,
+                }
+                for row in cursor.fetchall()
+            ]
+
+    def get_retention_cohorts(self) -> List[dict]:
+        """
+        Get retention cohorts keyed by the month of each client's first project
+
+        Returns:
+            List of cohorts (oldest first) with client, repeat and loyal counts
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(
+                """
+                SELECT
+                    strftime('%Y-%m', first_project_date) as cohort_month,
+                    COUNT(*) as clients,
+                    SUM(CASE WHEN total_projects > 1 THEN 1 ELSE 0 END) as repeat,
+                    SUM(CASE WHEN total_projects >= 3 THEN 1 ELSE 0 END) as loyal
+                FROM client_history
+                WHERE first_project_date IS NOT NULL
+                GROUP BY cohort_month
+                ORDER BY cohort_month
+            """
+            )
+
+            return [
+                {
+                    "cohort_month": row["cohort_month"],
+                    "clients": row["clients"],
+                    "repeat": row["repeat"],
+                    "loyal": row["loyal"],
+                    "repeat_rate": row["repeat"] / row["clients"] if row["clients"] else 0.0,
+                }
+                for row in cursor.fetchall()
+            ]
+
+    def get_client_costs_by_month(self, client_name: Optional[str] = None) -> List[dict]:
+        """
+        Get project counts and recorded revision API cost per client per month
+
+        Args:
+            client_name: Optional client to filter by
+
+        Returns:
+            List of (client, month) rows ordered by month then client
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            query = """
+                SELECT
+                    p.client_name,
+                    strftime('%Y-%m', p.created_at) as month,
+                    COUNT(DISTINCT p.project_id) as projects,
+                    COUNT(r.revision_id) as revisions,
+                    COALESCE(SUM(r.cost), 0.0) as revision_cost
+                FROM projects p
+                LEFT JOIN revisions r ON r.project_id = p.project_id
+            """
+            params: List[Any] = []
+
+            if client_name:
+                query += " WHERE p.client_name = ?"
+                params.append(client_name)
+
+            query += " GROUP BY p.client_name, month ORDER BY month, p.client_name"
+
+            cursor.execute(query, params)
+
+            return [
+                {
+                    "client_name": row["client_name"],
+                    "month": row["month"],
+                    "projects": row["projects"],
+                    "revisions": row["revisions"],
+                    "revision_cost": float(row["revision_cost"]),
+                }
+                for row in cursor.fetchall()
+            ]
+
     # ============================================================================
     # HELPER METHODS
     # ============================================================================
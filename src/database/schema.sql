@@ -17,6 +17,7 @@ CREATE TABLE IF NOT EXISTS projects (
 
 CREATE INDEX IF NOT EXISTS idx_projects_client ON projects(client_name);
 CREATE INDEX IF NOT EXISTS idx_projects_created ON projects(created_at);
+CREATE INDEX IF NOT EXISTS idx_projects_client_created ON projects(client_name, created_at);
 
 -- Revisions: Track revision requests per project
 CREATE TABLE IF NOT EXISTS revisions (
@@ -91,6 +92,8 @@ CREATE TABLE IF NOT EXISTS client_history (
 
 CREATE INDEX IF NOT EXISTS idx_client_history_name ON client_history(client_name);
 CREATE INDEX IF NOT EXISTS idx_client_history_updated ON client_history(last_updated);
+CREATE INDEX IF NOT EXISTS idx_client_history_projects ON client_history(total_projects);
+CREATE INDEX IF NOT EXISTS idx_client_history_first_project ON client_history(first_project_date);
 
 -- Revision Scope Tracking: Track scope usage per project
 CREATE TABLE IF NOT EXISTS revision_scope (
@@ -178,6 +181,7 @@ CREATE TABLE IF NOT EXISTS voice_sample_uploads (
     sample_source TEXT NOT NULL,  -- linkedin, blog, twitter, email, mixed
     word_count INTEGER NOT NULL,
     file_name TEXT,
+    content_hash TEXT,  -- compute_content_hash(sample_text), for duplicate detection
 
     FOREIGN KEY (client_name) REFERENCES client_history(client_name)
 );
@@ -185,6 +189,7 @@ CREATE TABLE IF NOT EXISTS voice_sample_uploads (
 CREATE INDEX IF NOT EXISTS idx_voice_uploads_client ON voice_sample_uploads(client_name);
 CREATE INDEX IF NOT EXISTS idx_voice_uploads_date ON voice_sample_uploads(upload_date);
 CREATE INDEX IF NOT EXISTS idx_voice_uploads_source ON voice_sample_uploads(sample_source);
+CREATE INDEX IF NOT EXISTS idx_voice_uploads_client_hash ON voice_sample_uploads(client_name, content_hash);
 
 -- Phase 8D: Post Feedback - Track post performance and client feedback
 CREATE TABLE IF NOT EXISTS post_feedback (
@@ -210,6 +215,8 @@ CREATE INDEX IF NOT EXISTS idx_post_feedback_project ON post_feedback(project_id
 CREATE INDEX IF NOT EXISTS idx_post_feedback_type ON post_feedback(feedback_type);
 CREATE INDEX IF NOT EXISTS idx_post_feedback_template ON post_feedback(template_id);
 CREATE INDEX IF NOT EXISTS idx_post_feedback_date ON post_feedback(feedback_date);
+-- Covers per-template GROUP BY aggregations in analytics reports
+CREATE INDEX IF NOT EXISTS idx_post_feedback_template_type ON post_feedback(template_id, feedback_type);
 
 -- Phase 8D: Client Satisfaction - Survey responses
 CREATE TABLE IF NOT EXISTS client_satisfaction (
@@ -262,6 +269,24 @@ CREATE INDEX IF NOT EXISTS idx_metrics_type ON system_metrics(metric_type);
 CREATE INDEX IF NOT EXISTS idx_metrics_name ON system_metrics(metric_name);
 CREATE INDEX IF NOT EXISTS idx_metrics_date_type ON system_metrics(metric_date, metric_type);
 
+-- Phase 8D: System Metric Rollups - Closed week/month buckets of system_metrics
+-- Maintained by ProjectDatabase.record_metric so period summaries read a handful of
+-- bucket rows instead of every daily metric row.
+CREATE TABLE IF NOT EXISTS system_metric_rollups (
+    period_type TEXT NOT NULL CHECK(period_type IN ('week', 'month')),
+    period_start DATE NOT NULL,  -- Monday for weeks, 1st of month for months
+    metric_type TEXT NOT NULL,
+    metric_name TEXT NOT NULL,
+    value_sum REAL NOT NULL,
+    value_min REAL NOT NULL,
+    value_max REAL NOT NULL,
+    data_points INTEGER NOT NULL,
+
+    PRIMARY KEY (period_type, period_start, metric_type, metric_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_metrics_type_name_date ON system_metrics(metric_type, metric_name, metric_date);
+
 -- Views for common queries
 
 -- Active projects with revision status
@@ -65,6 +65,7 @@ class ContentPiece(BaseModel):
     target_keyword: Optional[str] = Field(None, description="Primary keyword")
     keyword_ranking: Optional[str] = Field(None, description="Current ranking if known")
     seo_score: Optional[str] = Field(None, description="SEO optimization score")
+    topic: Optional[str] = Field(None, description="Topic cluster")
 
     # Analysis
     strengths: List[str] = Field(default_factory=list, description="What works well")
@@ -10,6 +10,10 @@ from typing import Any, Callable, Dict, List, Optional
 
 from ..utils.logger import logger
 from ..utils.anthropic_client import get_default_client
+from ..utils.response_cache import confirm_memoized, discard_memoized
+from ..utils.run_context import run_scope
+from .execution_ledger import get_execution_ledger
+from .result_cache import get_research_cache
 
 
 @dataclass
@@ -81,6 +85,14 @@ class ResearchTool(ABC):
     def price(self) -> int:
         """Return add-on price in USD"""
 
+    @property
+    def tool_version(self) -> str:
+        """Version of the tool's analysis logic, part of its result cache key
+
+        Bump it when prompts or parsing change so cached results are not reused.
+        """
+        return "1"
+
     @abstractmethod
     def validate_inputs(self, inputs: Dict[str, Any]) -> bool:
         """Validate required inputs are provided
@@ -118,11 +130,16 @@ class ResearchTool(ABC):
             Example: {'pdf': Path(...), 'json': Path(...), 'xlsx': Path(...)}
         """
 
-    def execute(self, inputs: Dict[str, Any]) -> ResearchResult:
+    def execute(self, inputs: Dict[str, Any], force_refresh: bool = False) -> ResearchResult:
         """Main execution method
 
+        Identical runs (same tool version and validated inputs) are served from
+        the research result cache; otherwise unchanged analysis steps reuse
+        their cached responses (see result_cache).
+
         Args:
             inputs: Input parameters for research
+            force_refresh: Ignore cached results and re-run every analysis step
 
         Returns:
             ResearchResult with outputs and metadata
@@ -135,13 +152,38 @@ class ResearchTool(ABC):
             if not self.validate_inputs(inputs):
                 raise ValueError(f"Invalid inputs for {self.tool_name}")
 
-            # Run analysis
-            logger.info(f"Running {self.tool_name} analysis")
-            analysis = self.run_analysis(inputs)
-
-            # Generate reports
-            logger.info(f"Generating reports for {self.tool_name}")
-            outputs = self.generate_reports(analysis)
+            cache = get_research_cache()
+            cache_key = cache.result_key(
+                self.tool_name, self.tool_version, self.project_id, inputs
+            )
+            cached = None if force_refresh else cache.get_result(cache_key)
+
+            operation = f"research:{self.tool_name}"
+            if cached is not None:
+                logger.info(f"Reusing cached {self.tool_name} analysis ({cache_key[:8]})")
+                outputs = cached.outputs
+                if not all(path.exists() for path in outputs.values()):
+                    # Reports were cleaned up: rebuild them without any API calls
+                    outputs = self.generate_reports(cached.analysis)
+                    cache.put_result(cache_key, cached.analysis, outputs)
+                api_usage: Dict[str, Any] = {}
+                cache_info: Dict[str, Any] = {"hit": True, "cached_at": cached.created_at}
+            else:
+                # Run analysis (API calls are attributed to this project and tool)
+                logger.info(f"Running {self.tool_name} analysis")
+                with run_scope(project_id=self.project_id, operation=operation) as usage:
+                    with cache.section_scope(
+                        self.tool_name, self.tool_version, force_refresh
+                    ) as sections:
+                        analysis = self.run_analysis(inputs)
+
+                # Generate reports
+                logger.info(f"Generating reports for {self.tool_name}")
+                outputs = self.generate_reports(analysis)
+                cache.put_result(cache_key, analysis, outputs)
+
+                api_usage = usage.to_dict()["operations"].get(operation, {})
+                cache_info = {"hit": False, "force_refresh": force_refresh, **sections.to_dict()}
 
             # Calculate duration
             duration = (datetime.now() - start_time).total_seconds()
@@ -157,6 +199,8 @@ class ResearchTool(ABC):
                     "duration_seconds": duration,
                     "price": self.price,
                     "inputs_summary": self._summarize_inputs(inputs),
+                    "api_usage": api_usage,
+                    "cache": {"key": cache_key, **cache_info},
                 },
             )
 
@@ -295,7 +339,8 @@ class ResearchTool(ABC):
             Parsed JSON dictionary
 
         Raises:
-            ValueError: If no valid JSON found in response
+            ValueError: If no valid JSON found in response (the response is
+                then not memoized for the section cache)
 
         Examples:
             >>> # Raw JSON
@@ -311,6 +356,18 @@ class ResearchTool(ABC):
             >>> self._extract_json_from_response(text)
             {'competitors': ['A', 'B']}
         """
+        # Inside a research run, only responses that parsed are memoized
+        try:
+            data = self._parse_json_response(response_text)
+        except ValueError:
+            discard_memoized(response_text)
+            raise
+        confirm_memoized(response_text)
+        return data
+
+    @staticmethod
+    def _parse_json_response(response_text: str) -> Dict[str, Any]:
+        """JSON object of a response (see _extract_json_from_response)"""
         # Try parsing as raw JSON first
         try:
             return json.loads(response_text)  # type: ignore[no-any-return]
@@ -346,27 +403,10 @@ class ResearchTool(ABC):
     def _log_execution(self, result: ResearchResult):
         """Log execution for billing and tracking
 
-        Saves execution log to JSON file for later billing/analytics
+        Appends one line to the shared execution ledger (see execution_ledger)
         """
-        log_file = self.output_dir / "execution_log.json"
-
-        # Load existing logs
-        logs = []
-        if log_file.exists():
-            try:
-                with open(log_file, "r") as f:
-                    logs = json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
-
-        # Append new log
-        logs.append(result.to_dict())
-
-        # Save
-        with open(log_file, "w") as f:
-            json.dump(logs, f, indent=2)
-
-        logger.debug(f"Logged execution to {log_file}")
+        get_execution_ledger(self.base_output_dir / "_ledger").append(result.to_dict())
+        logger.debug(f"Logged {self.tool_name} execution to research ledger")
 
     def _save_json(self, data: Any, filename: str) -> Path:
         """Save data as JSON
@@ -9,10 +9,17 @@ This tool analyzes a client's existing content to identify:
 - Content gaps
 """
 
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
 
+from anthropic import AuthenticationError, PermissionDeniedError
+
+from ..config.settings import settings
 from ..models.content_audit_models import (
     ArchiveRecommendation,
     ContentAuditAnalysis,
@@ -31,6 +38,75 @@ from .base import ResearchTool
 from .validation_mixin import CommonValidationMixin
 from ..utils.anthropic_client import get_default_client
 
+MAX_CONTENT_PIECES = 2000
+
+# Map-reduce analysis: inventory lines are packed into batches of at most
+# BATCH_INPUT_TOKENS (estimated) and MAX_BATCH_PIECES pieces, which keeps
+# each call's JSON output well inside its max_tokens
+BATCH_INPUT_TOKENS = 3000
+MAX_BATCH_PIECES = 25
+OUTPUT_TOKENS_PER_PIECE = 350
+CHARS_PER_TOKEN = 4
+MAX_DESCRIPTION_CHARS = 500
+# Share of failed batches above which the audit fails instead of reporting
+# mostly inventory defaults
+MAX_FAILED_BATCH_SHARE = 0.5
+MAX_TOPICS = 10
+
+# Common inventory type names that are not ContentType values
+CONTENT_TYPE_ALIASES = {
+    "blog": ContentType.BLOG_POST,
+    "article": ContentType.BLOG_POST,
+    "post": ContentType.BLOG_POST,
+    "social": ContentType.SOCIAL_POST,
+    "newsletter": ContentType.EMAIL,
+    "page": ContentType.LANDING_PAGE,
+    "ebook": ContentType.GUIDE,
+    "whitepaper": ContentType.GUIDE,
+}
+
+RANKED_PERFORMANCE_LEVELS = [
+    PerformanceLevel.UNDERPERFORMING,
+    PerformanceLevel.AVERAGE,
+    PerformanceLevel.GOOD_PERFORMER,
+    PerformanceLevel.TOP_PERFORMER,
+]
+PERFORMANCE_RANK = {level: rank for rank, level in enumerate(RANKED_PERFORMANCE_LEVELS)}
+
+TOPIC_RECOMMENDATIONS = {
+    PerformanceLevel.TOP_PERFORMER: "Double down: add new angles and repurpose the best pieces",
+    PerformanceLevel.GOOD_PERFORMER: "Keep investing; refresh the weaker pieces to lift the topic",
+    PerformanceLevel.AVERAGE: "Consolidate overlapping pieces and update the strongest ones",
+    PerformanceLevel.UNDERPERFORMING: "Rework or consolidate; check the topic fits the audience",
+}
+
+E = TypeVar("E", bound=Enum)
+
+
+def _enum_value(enum_cls: Type[E], value: Any, default: E) -> E:
+    """Parse an enum value from model output, falling back to a default"""
+    try:
+        return enum_cls(str(value).strip().lower())
+    except ValueError:
+        return default
+
+
+def _content_type(value: Any) -> ContentType:
+    """Map an inventory type (e.g. "blog", "Case Study") to a ContentType"""
+    if not value:
+        return ContentType.BLOG_POST
+    normalized = str(value).strip().lower().replace(" ", "_").replace("-", "_")
+    return CONTENT_TYPE_ALIASES.get(
+        normalized, _enum_value(ContentType, normalized, ContentType.OTHER)
+    )
+
+
+def _string_list(value: Any, limit: int = 5) -> List[str]:
+    """Non-empty strings from a model output list"""
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()][:limit]
+
 
 class ContentAuditor(ResearchTool, CommonValidationMixin):
     """Analyzes existing content for performance and opportunities"""
@@ -75,8 +151,11 @@ class ContentAuditor(ResearchTool, CommonValidationMixin):
         if len(content_inventory) == 0:
             raise ValueError("Provide at least 1 content piece to audit")
 
-        if len(content_inventory) > 100:
-            raise ValueError(f"Maximum 100 content pieces allowed (got {len(content_inventory)})")
+        if len(content_inventory) > MAX_CONTENT_PIECES:
+            raise ValueError(
+                f"Maximum {MAX_CONTENT_PIECES} content pieces allowed "
+                f"(got {len(content_inventory)})"
+            )
 
         # Validate each content piece in inventory
         for i, content_item in enumerate(content_inventory):
@@ -169,7 +248,7 @@ class ContentAuditor(ResearchTool, CommonValidationMixin):
 
         # Step 4: Analyze performance by topic
         logger.info("Step 4/8: Analyzing performance by topic...")
-        topic_performance = self._analyze_topic_performance(business_description, analyzed_content)
+        topic_performance = self._analyze_topic_performance(analyzed_content)
 
         # Step 5: Identify refresh opportunities
         logger.info("Step 5/8: Identifying refresh opportunities...")
@@ -257,64 +336,227 @@ class ContentAuditor(ResearchTool, CommonValidationMixin):
         content_inventory: List[Dict[str, Any]],
         performance_metrics: Dict[str, Any],
     ) -> List[ContentPiece]:
-        """Analyze each content piece"""
-        client = get_default_client()
+        """Analyze every content piece
+
+        Map step of the audit: the inventory is split into token-budgeted
+        batches that are analyzed concurrently (bounded by
+        MAX_CONCURRENT_API_CALLS). Pieces whose analysis is missing (failed
+        batch, omitted by the model) keep their inventory data with neutral
+        defaults.
+
+        Raises:
+            RuntimeError: If more than MAX_FAILED_BATCH_SHARE of the batches
+                failed (so also if none succeeded)
+            AuthenticationError, PermissionDeniedError: From the API, as is
+        """
+        if not isinstance(performance_metrics, dict):
+            performance_metrics = {}
 
-        # Prepare content list for analysis
-        content_list = "\n".join(
-            [
-                f"- {c.get('title', 'Untitled')} ({c.get('type', 'unknown')}): {c.get('description', 'No description')}"
-                for c in content_inventory[:20]  # Analyze up to 20 pieces in detail
+        batches = self._batch_inventory(content_inventory, performance_metrics)
+        system_prompt = self._build_analysis_prompt(business_description, target_audience)
+        logger.info(
+            f"Analyzing {len(content_inventory)} content pieces in {len(batches)} batches"
+        )
+
+        analyses: Dict[int, Dict[str, Any]] = {}
+        workers = min(len(batches), max(1, settings.MAX_CONCURRENT_API_CALLS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each batch runs in a copy of the caller's context so its API usage
+            # is attributed to the active run
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, self._analyze_batch, system_prompt, batch
+                )
+                for batch in batches
             ]
+            failed_batches = 0
+            for future in futures:
+                try:
+                    batch_analyses = future.result()
+                except Exception:
+                    # Auth errors fail every batch; don't wait for the rest
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                if batch_analyses is None:
+                    failed_batches += 1
+                else:
+                    analyses.update(batch_analyses)
+
+        if failed_batches:
+            logger.warning(f"{failed_batches} of {len(batches)} content audit batches failed")
+            if failed_batches / len(batches) > MAX_FAILED_BATCH_SHARE:
+                raise RuntimeError(
+                    f"Content analysis failed for {failed_batches} of {len(batches)} batches"
+                )
+
+        missing = len(content_inventory) - len(analyses)
+        if missing:
+            logger.warning(f"{missing} content pieces were not analyzed; using inventory data")
+
+        return [
+            self._build_content_piece(index, content_data, analyses.get(index))
+            for index, content_data in enumerate(content_inventory)
+        ]
+
+    def _batch_inventory(
+        self, content_inventory: List[Dict[str, Any]], performance_metrics: Dict[str, Any]
+    ) -> List[List[Tuple[int, str]]]:
+        """Split the inventory into batches of (index, prompt line) within the token budget"""
+        batches: List[List[Tuple[int, str]]] = []
+        current: List[Tuple[int, str]] = []
+        current_tokens = 0
+
+        for index, content_data in enumerate(content_inventory):
+            line = self._format_inventory_line(index, content_data, performance_metrics)
+            tokens = len(line) // CHARS_PER_TOKEN + 1
+            if current and (
+                current_tokens + tokens > BATCH_INPUT_TOKENS or len(current) >= MAX_BATCH_PIECES
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append((index, line))
+            current_tokens += tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _format_inventory_line(
+        index: int, content_data: Dict[str, Any], performance_metrics: Dict[str, Any]
+    ) -> str:
+        """One inventory line for the analysis prompt, tagged with the piece's index"""
+        parts = [
+            f"[{index}] {content_data.get('title') or 'Untitled'}",
+            f"type: {content_data.get('type') or 'unknown'}",
+        ]
+        for label, key in (
+            ("url", "url"),
+            ("published", "publish_date"),
+            ("updated", "last_updated"),
+            ("words", "word_count"),
+            ("keyword", "keyword"),
+        ):
+            if content_data.get(key):
+                parts.append(f"{label}: {content_data[key]}")
+
+        # Per-piece metrics, or tool-level metrics keyed by URL or title
+        metrics = (
+            content_data.get("performance_metrics")
+            or performance_metrics.get(content_data.get("url") or "")
+            or performance_metrics.get(content_data.get("title") or "")
         )
+        if isinstance(metrics, dict):
+            metrics = json.dumps(metrics)
+        if metrics:
+            parts.append(f"metrics: {metrics}")
+
+        description = (content_data.get("description") or "")[:MAX_DESCRIPTION_CHARS]
+        if description:
+            parts.append(f"description: {description}")
+        return " | ".join(parts)
 
-        prompt = f"""Analyze these content pieces for a business:
+    @staticmethod
+    def _build_analysis_prompt(business_description: str, target_audience: str) -> str:
+        """System prompt shared by every batch (identical, so prompt caching applies)"""
+        return f"""You are auditing the existing content of a business.
 
 BUSINESS: {business_description}
 
 TARGET AUDIENCE: {target_audience}
 
-CONTENT INVENTORY:
-{content_list}
+The user sends part of the content inventory, one piece per line as
+"[id] title | details". For each piece, provide:
+1. id (the number in brackets)
+2. topic (a 1-3 word topic cluster, e.g. "Churn Prediction"; reuse names for related pieces)
+3. performance_level (top_performer, good_performer, average, underperforming)
+4. health_status (excellent, good, needs_update, needs_refresh, archive)
+5. engagement_score (0-100)
+6. strengths (2-3 items)
+7. weaknesses (2-3 items)
+8. recommended_action (Keep/Update/Refresh/Archive/Consolidate)
+9. action_priority (High/Medium/Low)
+10. specific_updates_needed (2-3 items)
+
+Return only JSON in this format:
+{{"pieces": [{{"id": 0, "topic": "...", "performance_level": "...", "health_status": "...",
+"engagement_score": 0, "strengths": [], "weaknesses": [], "recommended_action": "...",
+"action_priority": "...", "specific_updates_needed": []}}]}}"""
+
+    def _analyze_batch(
+        self, system_prompt: str, batch: List[Tuple[int, str]]
+    ) -> Optional[Dict[int, Dict[str, Any]]]:
+        """Analyze one batch; returns per-piece analyses keyed by inventory index
+
+        Returns None if the batch failed. Authentication and permission errors
+        are raised, since no other batch can succeed either.
+        """
+        client = get_default_client()
+        content_list = "\n".join(line for _, line in batch)
 
-For each piece, provide:
-1. Performance level (top_performer, good_performer, average, underperforming)
-2. Health status (excellent, good, needs_update, needs_refresh, archive)
-3. Engagement score (0-100)
-4. Strengths (2-3 items)
-5. Weaknesses (2-3 items)
-6. Recommended action (Keep/Update/Refresh/Archive/Consolidate)
-7. Action priority (High/Medium/Low)
-8. Specific updates needed (2-3 items)
-
-Provide analysis in JSON array format."""
-
-        client.create_message(messages=[{"role": "user", "content": prompt}], max_tokens=16000)
-
-        # Parse response and create ContentPiece objects
-        analyzed_content = []
-        for i, content_data in enumerate(content_inventory):
-            # Create ContentPiece from inventory + AI analysis
-            piece = ContentPiece(
-                title=content_data.get("title", f"Content Piece {i+1}"),
-                url=content_data.get("url"),
-                content_type=ContentType(content_data.get("type", "blog_post")),
-                publish_date=content_data.get("publish_date"),
-                last_updated=content_data.get("last_updated"),
-                performance_level=PerformanceLevel.AVERAGE,  # Default
-                health_status=ContentHealth.GOOD,
-                engagement_score=70.0,  # Default
-                word_count=content_data.get("word_count"),
-                target_keyword=content_data.get("keyword"),
-                strengths=["Engaging topic", "Good structure"],
-                weaknesses=["Could be more detailed", "Needs update"],
-                recommended_action="Update",
-                action_priority="Medium",
-                specific_updates_needed=["Update statistics", "Add recent examples", "Improve SEO"],
+        try:
+            response = client.create_message(
+                messages=[{"role": "user", "content": f"CONTENT INVENTORY:\n{content_list}"}],
+                system=system_prompt,
+                max_tokens=min(16000, 500 + OUTPUT_TOKENS_PER_PIECE * len(batch)),
             )
-            analyzed_content.append(piece)
-
-        return analyzed_content
+            data = self._extract_json_from_response(response)
+        except (AuthenticationError, PermissionDeniedError):
+            raise
+        except Exception as e:
+            logger.error(f"Content audit batch of {len(batch)} pieces failed: {str(e)}")
+            return None
+
+        entries = data.get("pieces", []) if isinstance(data, dict) else data
+        batch_ids = {index for index, _ in batch}
+        analyses: Dict[int, Dict[str, Any]] = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if index in batch_ids:
+                analyses[index] = entry
+        return analyses
+
+    def _build_content_piece(
+        self, index: int, content_data: Dict[str, Any], analysis: Optional[Dict[str, Any]]
+    ) -> ContentPiece:
+        """Combine inventory data with the piece's analysis (neutral defaults if missing)"""
+        analysis = analysis or {}
+
+        engagement_score = None
+        try:
+            engagement_score = min(100.0, max(0.0, float(analysis["engagement_score"])))
+        except (KeyError, TypeError, ValueError):
+            pass
+
+        topic = analysis.get("topic")
+        return ContentPiece(
+            title=content_data.get("title") or f"Content Piece {index + 1}",
+            url=content_data.get("url"),
+            content_type=_content_type(content_data.get("type")),
+            publish_date=content_data.get("publish_date"),
+            last_updated=content_data.get("last_updated"),
+            performance_level=_enum_value(
+                PerformanceLevel, analysis.get("performance_level"), PerformanceLevel.AVERAGE
+            ),
+            health_status=_enum_value(
+                ContentHealth, analysis.get("health_status"), ContentHealth.GOOD
+            ),
+            engagement_score=engagement_score,
+            word_count=content_data.get("word_count"),
+            target_keyword=content_data.get("keyword"),
+            topic=topic.strip() if isinstance(topic, str) and topic.strip() else None,
+            strengths=_string_list(analysis.get("strengths")),
+            weaknesses=_string_list(analysis.get("weaknesses")),
+            recommended_action=str(analysis.get("recommended_action") or "Review"),
+            action_priority=str(analysis.get("action_priority") or "Medium"),
+            specific_updates_needed=_string_list(analysis.get("specific_updates_needed")),
+        )
 
     def _identify_top_performers(self, content_pieces: List[ContentPiece]) -> List[ContentPiece]:
         """Identify top 20% of content"""
@@ -331,45 +573,52 @@ Provide analysis in JSON array format."""
         ][:bottom_count]
 
     def _analyze_topic_performance(
-        self, business_description: str, content_pieces: List[ContentPiece]
+        self, content_pieces: List[ContentPiece]
     ) -> List[TopicPerformance]:
-        """Analyze performance by topic area"""
-        client = get_default_client()
-
-        content_titles = "\n".join(
-            [f"- {p.title} (Performance: {p.performance_level.value})" for p in content_pieces]
-        )
-
-        prompt = f"""Analyze these content pieces and group them into 5-7 topic clusters:
-
-BUSINESS: {business_description}
-
-CONTENT:
-{content_titles}
+        """Analyze performance by topic area
 
-For each topic cluster, provide:
-1. Topic name
-2. Content count
-3. Average performance (top_performer, good_performer, average, underperforming)
-4. Top performing piece in this topic
-5. Underperforming pieces (if any)
-6. Strategy recommendation
-
-Return as JSON array of topic performance objects."""
-
-        client.create_message(messages=[{"role": "user", "content": prompt}], max_tokens=8000)
-
-        # For now, return sample data
-        return [
-            TopicPerformance(
-                topic="Product Features",
-                content_count=8,
-                avg_performance="good_performer",
-                top_performing_piece=content_pieces[0].title if content_pieces else "N/A",
-                underperforming_pieces=[],
-                recommendation="Continue creating feature-focused content",
+        Reduce step of the audit: pieces are grouped by the topic assigned
+        during analysis (content type when none was assigned) and aggregated
+        locally, so the cost does not grow with inventory size.
+        """
+        groups: Dict[str, List[ContentPiece]] = {}
+        labels: Dict[str, str] = {}
+        for piece in content_pieces:
+            label = piece.topic or piece.content_type.value.replace("_", " ").title()
+            key = label.lower()
+            groups.setdefault(key, []).append(piece)
+            labels.setdefault(key, label)
+
+        ranked = sorted(groups.items(), key=lambda item: (-len(item[1]), item[0]))
+        if len(ranked) > MAX_TOPICS:
+            other = [piece for _, pieces in ranked[MAX_TOPICS - 1 :] for piece in pieces]
+            ranked = ranked[: MAX_TOPICS - 1] + [("other", other)]
+            labels["other"] = "Other"
+
+        topic_performance = []
+        for key, pieces in ranked:
+            ranks = [PERFORMANCE_RANK[piece.performance_level] for piece in pieces]
+            avg_level = RANKED_PERFORMANCE_LEVELS[round(sum(ranks) / len(ranks))]
+            best = max(
+                pieces,
+                key=lambda p: (PERFORMANCE_RANK[p.performance_level], p.engagement_score or 0),
             )
-        ]
+            topic_performance.append(
+                TopicPerformance(
+                    topic=labels[key],
+                    content_count=len(pieces),
+                    avg_performance=avg_level.value,
+                    top_performing_piece=best.title,
+                    underperforming_pieces=[
+                        p.title
+                        for p in pieces
+                        if p.performance_level == PerformanceLevel.UNDERPERFORMING
+                    ][:10],
+                    recommendation=TOPIC_RECOMMENDATIONS[avg_level],
+                )
+            )
+
+        return topic_performance
 
     def _identify_refresh_opportunities(
         self, content_pieces: List[ContentPiece], target_audience: str
@@ -0,0 +1,342 @@
+"""Append-only execution ledger for research tools
+
+Every successful research run is billed, so each execution is recorded as one
+JSON line in a shared ledger instead of rewriting a per-tool JSON array:
+
+- Appends are O(1): one O_APPEND write of a single line, serialized across
+  threads and (where fcntl is available) processes by a lock file, so
+  overlapping executions never lose entries.
+- The active segment (ledger.jsonl) is rotated into a sealed, timestamped
+  segment once it exceeds RESEARCH_LEDGER_MAX_BYTES.
+- index.json summarizes every sealed segment (time range, projects, tools,
+  entry count), so billing queries by project/tool/date range skip segments
+  that cannot match and stream only the rest.
+
+Usage:
+    ledger = get_execution_ledger(Path("data/research/_ledger"))
+    ledger.append(result.to_dict())
+
+    for entry in ledger.iter_entries(project_id="proj-1", start=datetime(2025, 1, 1)):
+        ...
+
+    # Billing export (streams the ledger; never loads it whole)
+    python -m src.research.execution_ledger export --since 2025-01-01 --output billing.csv
+    python -m src.research.execution_ledger import-legacy  # old execution_log.json files
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from ..config.settings import settings
+from ..utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still serialized within the process
+    fcntl = None  # type: ignore[assignment]
+
+ACTIVE_SEGMENT = "ledger.jsonl"
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+DEFAULT_LEDGER_DIR = Path("data/research/_ledger")
+
+BILLING_COLUMNS = [
+    "executed_at",
+    "project_id",
+    "tool_name",
+    "price",
+    "duration_seconds",
+    "api_calls",
+    "api_cost_usd",
+    "cache_hit",
+]
+
+
+class ExecutionLedger:
+    """Append-only, rotated JSONL ledger of research executions"""
+
+    def __init__(self, ledger_dir: Path, max_segment_bytes: Optional[int] = None):
+        """Initialize ledger
+
+        Args:
+            ledger_dir: Directory holding the segments and their index
+            max_segment_bytes: Rotation threshold (default: settings.RESEARCH_LEDGER_MAX_BYTES)
+        """
+        self.ledger_dir = Path(ledger_dir)
+        self.max_segment_bytes = max_segment_bytes or settings.RESEARCH_LEDGER_MAX_BYTES
+        self._lock = threading.Lock()
+
+    @property
+    def active_path(self) -> Path:
+        return self.ledger_dir / ACTIVE_SEGMENT
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Record one execution (a ResearchResult.to_dict())"""
+        line = (json.dumps(entry, default=str, separators=(",", ":")) + "\n").encode("utf-8")
+
+        with self._locked():
+            try:
+                size = self.active_path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(line) > self.max_segment_bytes:
+                self._rotate()
+
+            fd = os.open(self.active_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                written = 0
+                while written < len(line):
+                    written += os.write(fd, line[written:])
+            finally:
+                os.close(fd)
+
+    def iter_entries(
+        self,
+        project_id: Optional[str] = None,
+        tool_name: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream entries in execution order, filtered by project, tool and [start, end)"""
+        index = self._load_index()
+
+        for segment in self._segments():
+            summary = index.get(segment.name)
+            if summary is not None and not _segment_may_match(
+                summary, project_id, tool_name, start, end
+            ):
+                continue
+
+            for entry in _read_segment(segment):
+                if project_id is not None and entry.get("project_id") != project_id:
+                    continue
+                if tool_name is not None and entry.get("tool_name") != tool_name:
+                    continue
+                if start is not None or end is not None:
+                    executed_at = _parse_time(entry.get("executed_at"))
+                    if executed_at is None:
+                        continue
+                    if start is not None and executed_at < start:
+                        continue
+                    if end is not None and executed_at >= end:
+                        continue
+                yield entry
+
+    def export_billing_csv(self, output: TextIO, **filters: Any) -> int:
+        """Write one billing row per matching execution; returns the row count"""
+        writer = csv.writer(output)
+        writer.writerow(BILLING_COLUMNS)
+
+        rows = 0
+        for entry in self.iter_entries(**filters):
+            metadata = entry.get("metadata") or {}
+            api_usage = metadata.get("api_usage") or {}
+            writer.writerow(
+                [
+                    entry.get("executed_at"),
+                    entry.get("project_id"),
+                    entry.get("tool_name"),
+                    metadata.get("price"),
+                    metadata.get("duration_seconds"),
+                    api_usage.get("api_calls", 0),
+                    api_usage.get("cost_usd", 0.0),
+                    bool((metadata.get("cache") or {}).get("hit")),
+                ]
+            )
+            rows += 1
+        return rows
+
+    def import_legacy_logs(self, research_root: Path) -> int:
+        """Append entries of old per-tool execution_log.json files (renamed once imported)"""
+        imported = 0
+        for log_file in sorted(Path(research_root).glob("*/*/execution_log.json")):
+            try:
+                with open(log_file, "r", encoding="utf-8") as f:
+                    entries = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Skipping unreadable legacy log {log_file}: {e}")
+                continue
+
+            for entry in entries if isinstance(entries, list) else []:
+                self.append(entry)
+                imported += 1
+            log_file.rename(log_file.with_name("execution_log.json.imported"))
+
+        return imported
+
+    # ==================== Segments ====================
+
+    def _segments(self) -> List[Path]:
+        """Sealed segments (oldest first), then the active one"""
+        sealed = sorted(self.ledger_dir.glob("ledger-*.jsonl"))
+        if self.active_path.exists():
+            sealed.append(self.active_path)
+        return sealed
+
+    def _rotate(self) -> None:
+        """Seal the active segment and index it (caller holds the lock)"""
+        sealed = self.ledger_dir / f"ledger-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.jsonl"
+        os.replace(self.active_path, sealed)
+
+        summary: Dict[str, Any] = {
+            "entries": 0,
+            "first_executed_at": None,
+            "last_executed_at": None,
+            "projects": set(),
+            "tools": set(),
+        }
+        for entry in _read_segment(sealed):
+            summary["entries"] += 1
+            summary["projects"].add(entry.get("project_id"))
+            summary["tools"].add(entry.get("tool_name"))
+            executed_at = entry.get("executed_at")
+            if executed_at and _parse_time(executed_at) is not None:
+                first, last = summary["first_executed_at"], summary["last_executed_at"]
+                if first is None or executed_at < first:
+                    summary["first_executed_at"] = executed_at
+                if last is None or executed_at > last:
+                    summary["last_executed_at"] = executed_at
+
+        summary["projects"] = sorted(p for p in summary["projects"] if p is not None)
+        summary["tools"] = sorted(t for t in summary["tools"] if t is not None)
+
+        index = self._load_index()
+        index[sealed.name] = summary
+        tmp_path = self.ledger_dir / f"{INDEX_FILE}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.ledger_dir / INDEX_FILE)
+
+        logger.info(f"Rotated research ledger segment {sealed.name} ({summary['entries']} entries)")
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.ledger_dir / INDEX_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)  # type: ignore[no-any-return]
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            # Index is only an optimization: scan every segment instead
+            logger.warning(f"Ignoring unreadable research ledger index: {e}")
+            return {}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialize appends/rotation across threads and processes"""
+        with self._lock:
+            self.ledger_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.ledger_dir / LOCK_FILE, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _read_segment(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream the entries of one segment, skipping torn or corrupted lines"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping corrupted ledger line {path.name}:{line_number}")
+    except FileNotFoundError:
+        return  # Rotated away between listing and reading
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _segment_may_match(
+    summary: Dict[str, Any],
+    project_id: Optional[str],
+    tool_name: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> bool:
+    """Whether a sealed segment can hold entries matching the filters"""
+    if project_id is not None and project_id not in summary.get("projects", []):
+        return False
+    if tool_name is not None and tool_name not in summary.get("tools", []):
+        return False
+
+    first = _parse_time(summary.get("first_executed_at"))
+    last = _parse_time(summary.get("last_executed_at"))
+    if start is not None and last is not None and last < start:
+        return False
+    if end is not None and first is not None and first >= end:
+        return False
+    return True
+
+
+_ledgers: Dict[Path, ExecutionLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_execution_ledger(ledger_dir: Optional[Path] = None) -> ExecutionLedger:
+    """Get the shared ledger for a directory (one lock per ledger per process)"""
+    path = Path(ledger_dir or DEFAULT_LEDGER_DIR).resolve()
+    with _ledgers_lock:
+        if path not in _ledgers:
+            _ledgers[path] = ExecutionLedger(path)
+        return _ledgers[path]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Billing export and legacy import"""
+    parser = argparse.ArgumentParser(description="Research execution ledger")
+    parser.add_argument("--ledger-dir", type=Path, default=DEFAULT_LEDGER_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export billing rows as CSV")
+    export.add_argument("--project", help="Only this project")
+    export.add_argument("--tool", help="Only this research tool")
+    export.add_argument("--since", type=datetime.fromisoformat, help="Start (inclusive, ISO)")
+    export.add_argument("--until", type=datetime.fromisoformat, help="End (exclusive, ISO)")
+    export.add_argument("--output", type=Path, help="CSV file (default: stdout)")
+
+    legacy = commands.add_parser("import-legacy", help="Import old execution_log.json files")
+    legacy.add_argument("--root", type=Path, default=DEFAULT_LEDGER_DIR.parent)
+
+    args = parser.parse_args(argv)
+    ledger = get_execution_ledger(args.ledger_dir)
+
+    if args.command == "import-legacy":
+        print(f"Imported {ledger.import_legacy_logs(args.root)} executions")
+        return 0
+
+    filters = {
+        "project_id": args.project,
+        "tool_name": args.tool,
+        "start": args.since,
+        "end": args.until,
+    }
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as f:
+            rows = ledger.export_billing_csv(f, **filters)
+        print(f"Exported {rows} executions to {args.output}")
+    else:
+        ledger.export_billing_csv(sys.stdout, **filters)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
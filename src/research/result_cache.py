@@ -0,0 +1,362 @@
+"""Content-addressed cache of research tool results
+
+Research tools are the most token-expensive operations (up to 11 API calls
+per run), and operators often re-run a tool with identical inputs to
+regenerate a report format or after a UI error. ResearchTool.execute uses
+this cache at two levels:
+
+- Results: keyed by (tool name, tool version, hash of the validated inputs)
+  within a project, storing the analysis object and the generated report
+  paths (which live in the project's output directory). A hit skips
+  run_analysis entirely; report files that no longer exist are regenerated
+  from the cached analysis.
+- Sections: while run_analysis runs, every API response is memoized by the
+  hash of its full request. When only some inputs changed, the steps whose
+  prompts do not depend on them reuse their earlier responses. A response is
+  only stored once it was parsed (ResearchTool._extract_json_from_response)
+  or the run succeeded; unparseable responses are never replayed.
+
+force_refresh skips both lookups; the fresh results replace the cached ones.
+Entries are JSON files (no pickle) that expire after RESEARCH_CACHE_TTL;
+expired files are swept at most every SWEEP_INTERVAL_SECONDS.
+
+Usage:
+    cache = get_research_cache()
+    key = cache.result_key("seo_keywords", "1", project_id, validated_inputs)
+    cached = cache.get_result(key)
+    if cached is None:
+        with cache.section_scope("seo_keywords", "1") as sections:
+            analysis = tool.run_analysis(validated_inputs)
+        cache.put_result(key, analysis, tool.generate_reports(analysis))
+"""
+
+import importlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from pydantic import BaseModel
+
+from ..config.settings import settings
+from ..utils.logger import logger
+from ..utils.prompt_fragments import content_hash
+from ..utils.response_cache import response_memo_scope
+
+SWEEP_INTERVAL_SECONDS = 3600
+
+
+@dataclass
+class CachedResult:
+    """A research result restored from the cache"""
+
+    analysis: Any
+    outputs: Dict[str, Path]
+    created_at: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class SectionMemo:
+    """Memoizes the API responses of one research run (see response_memo_scope)
+
+    Fresh responses are held in memory until the caller confirms it parsed
+    them, or the run succeeds (section_scope flushes the rest); discarded and
+    still-pending responses of a failed run are never written.
+    """
+
+    def __init__(self, cache: "ResearchResultCache", namespace: str, force_refresh: bool = False):
+        self.cache = cache
+        self.namespace = namespace
+        self.force_refresh = force_refresh
+        self.reused = 0
+        self.computed = 0
+        self._pending: Dict[str, str] = {}
+        self._lock = threading.Lock()  # Tools may fan calls out over threads
+
+    def get(self, key: str) -> Optional[str]:
+        """Earlier response to an identical request, if any"""
+        if self.force_refresh:
+            return None
+        with self._lock:
+            response = self._pending.get(key)
+        if response is None:
+            data = self.cache._read(self.cache._section_path(self.namespace, key))
+            response = data.get("response") if data else None
+        with self._lock:
+            if response is not None:
+                self.reused += 1
+        self.cache._count("section_hits" if response is not None else "section_misses")
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        """Hold a fresh response until it is confirmed"""
+        with self._lock:
+            self.computed += 1
+            self._pending[key] = response
+
+    def confirm(self, response: str) -> None:
+        """Store a pending response the caller parsed successfully"""
+        self._write(self._take(response))
+
+    def discard(self, response: str) -> None:
+        """Drop a pending response the caller could not parse"""
+        self._take(response)
+
+    def flush(self) -> None:
+        """Store every pending response (the run that requested them succeeded)"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        self._write(pending)
+
+    def _take(self, response: str) -> Dict[str, str]:
+        with self._lock:
+            taken = {key: value for key, value in self._pending.items() if value == response}
+            for key in taken:
+                del self._pending[key]
+        return taken
+
+    def _write(self, entries: Dict[str, str]) -> None:
+        for key, response in entries.items():
+            self.cache._write(self.cache._section_path(self.namespace, key), {"response": response})
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"sections_reused": self.reused, "sections_computed": self.computed}
+
+
+class ResearchResultCache:
+    """Disk-backed result and section cache shared by all research tools"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        """Initialize research result cache
+
+        Args:
+            cache_dir: Directory for cache files (default: settings.RESEARCH_CACHE_DIR)
+            ttl_seconds: Entry lifetime (default: settings.RESEARCH_CACHE_TTL)
+            enabled: Whether caching is enabled (default: settings.ENABLE_RESEARCH_CACHE)
+        """
+        self.cache_dir = Path(cache_dir or settings.RESEARCH_CACHE_DIR)
+        self.ttl_seconds = settings.RESEARCH_CACHE_TTL if ttl_seconds is None else ttl_seconds
+        self.enabled = settings.ENABLE_RESEARCH_CACHE if enabled is None else enabled
+
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "section_hits": 0,
+            "section_misses": 0,
+        }
+
+    @staticmethod
+    def result_key(
+        tool_name: str, tool_version: str, project_id: str, inputs: Dict[str, Any]
+    ) -> str:
+        """Cache key of a run: tool, tool version, project and validated inputs"""
+        return content_hash(tool_name, tool_version, project_id, inputs)
+
+    def get_result(self, key: str) -> Optional[CachedResult]:
+        """Return the cached result for a key, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        data = self._read(self._result_path(key))
+        if data is None:
+            self._count("misses")
+            return None
+
+        try:
+            analysis = _restore_analysis(data["analysis"], data.get("analysis_type"))
+        except Exception as e:
+            # Model changed shape since the entry was written
+            logger.warning(f"Discarding unreadable research cache entry {key[:8]}: {e}")
+            self._result_path(key).unlink(missing_ok=True)
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return CachedResult(
+            analysis=analysis,
+            outputs={fmt: Path(path) for fmt, path in data.get("outputs", {}).items()},
+            created_at=data["created_at"],
+            metadata=data.get("metadata", {}),
+        )
+
+    def put_result(
+        self,
+        key: str,
+        analysis: Any,
+        outputs: Dict[str, Path],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Cache a result; returns False if the analysis is not JSON-serializable"""
+        if not self.enabled:
+            return False
+
+        if isinstance(analysis, BaseModel):
+            analysis_type: Optional[str] = (
+                f"{type(analysis).__module__}:{type(analysis).__qualname__}"
+            )
+            analysis_data = analysis.model_dump(mode="json")
+        else:
+            analysis_type, analysis_data = None, analysis
+
+        entry = {
+            "analysis_type": analysis_type,
+            "analysis": analysis_data,
+            "outputs": {fmt: str(path) for fmt, path in outputs.items()},
+            "metadata": metadata or {},
+        }
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            logger.debug(f"Research result {key[:8]} is not JSON-serializable; not cached")
+            return False
+
+        if self._write(self._result_path(key), entry):
+            self._count("stores")
+            return True
+        return False
+
+    @contextmanager
+    def section_scope(
+        self, tool_name: str, tool_version: str, force_refresh: bool = False
+    ) -> Iterator[SectionMemo]:
+        """Memoize the API responses of the enclosed run_analysis
+
+        Responses not confirmed by a parser are stored only if the block
+        completes; an exception discards them.
+        """
+        memo = SectionMemo(self, f"{tool_name}-v{tool_version}", force_refresh)
+        if not self.enabled:
+            yield memo
+            return
+        self.sweep_expired()
+        with response_memo_scope(memo):
+            yield memo
+        memo.flush()
+
+    def sweep_expired(self, force: bool = False) -> int:
+        """
+        Delete expired result and section files.
+
+        Entries are otherwise only removed when read after their TTL, so
+        sections of inputs that never repeat would accumulate. Runs at most
+        every SWEEP_INTERVAL_SECONDS per process unless forced.
+
+        Returns:
+            Number of files removed
+        """
+        now = time.time()
+        with self._lock:
+            if not force and now - self._last_sweep < SWEEP_INTERVAL_SECONDS:
+                return 0
+            self._last_sweep = now
+
+        removed = 0
+        for path in self.cache_dir.rglob("*"):
+            try:
+                # Written once (atomically), so the mtime is the entry's created_at
+                if path.is_file() and now - path.stat().st_mtime > self.ttl_seconds:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue  # Removed concurrently
+        if removed:
+            logger.debug(f"Swept {removed} expired research cache files")
+        return removed
+
+    def clear(self) -> None:
+        """Remove all cached results and sections"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        logger.info(f"Cleared research result cache {self.cache_dir}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this process"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        section_lookups = stats["section_hits"] + stats["section_misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["section_hit_rate"] = (
+            stats["section_hits"] / section_lookups if section_lookups else 0.0
+        )
+        stats["enabled"] = self.enabled
+        return stats
+
+    # ==================== Storage ====================
+
+    def _result_path(self, key: str) -> Path:
+        return self.cache_dir / "results" / f"{key}.json"
+
+    def _section_path(self, namespace: str, key: str) -> Path:
+        return self.cache_dir / "sections" / namespace / f"{key}.json"
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        """Load an entry, dropping it if expired or corrupted"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Removing corrupted research cache file {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        if time.time() - data.get("created_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+        return data  # type: ignore[no-any-return]
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> bool:
+        """Write an entry atomically (concurrent runs never see partial files)"""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({**entry, "created_at": time.time()}, f)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to write research cache file {path.name}: {e}")
+            return False
+
+
+def _restore_analysis(data: Any, analysis_type: Optional[str]) -> Any:
+    """Rebuild an analysis object from its cached JSON"""
+    if analysis_type is None:
+        return data
+
+    module_name, _, class_name = analysis_type.partition(":")
+    model_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(model_class, type) and issubclass(model_class, BaseModel)):
+        raise TypeError(f"{analysis_type} is not a pydantic model")
+    return model_class.model_validate(data)
+
+
+_default_cache: Optional[ResearchResultCache] = None
+
+
+def get_research_cache() -> ResearchResultCache:
+    """Get the process-wide research result cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResearchResultCache()
+    return _default_cache
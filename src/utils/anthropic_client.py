@@ -1,9 +1,10 @@
 """Wrapper for Anthropic API calls with error handling and retry logic"""
 
 import asyncio
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from anthropic import Anthropic, APIConnectionError, APIError, AsyncAnthropic, RateLimitError
 
@@ -17,7 +18,20 @@ from ..config.prompts import SystemPrompts
 from ..config.settings import settings
 from .cost_tracker import get_default_tracker
 from .logger import log_api_call, log_error, logger
-from .response_cache import ResponseCache
+from .response_cache import ResponseCache, get_response_memo, request_key
+from .run_context import get_current_operation, get_current_run
+
+
+# Context keys that change from post to post; everything else is per-client
+POST_CONTEXT_FIELDS = ("variant_guidance", "attempt_guidance")
+
+# Template metadata already expressed by the template structure itself
+TEMPLATE_METADATA_FIELDS = ("template_type", "requires_story", "requires_data")
+
+POST_GENERATION_INSTRUCTION = (
+    "Generate a post following this template structure, "
+    "customized for this client's voice and audience."
+)
 
 
 class AnthropicClient:
@@ -69,6 +83,16 @@ class AnthropicClient:
         # Initialize cost tracker
         self.cost_tracker = get_default_tracker()
 
+        # Running prompt cache usage (see get_prompt_cache_stats)
+        self._usage_lock = threading.Lock()
+        self._usage_totals = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_tokens": 0,
+            "cache_read_tokens": 0,
+        }
+
     def create_message(
         self,
         messages: List[Dict[str, str]],
@@ -113,8 +137,17 @@ class AnthropicClient:
             if cached_response:
                 return cached_response
 
+        # Then the memo of the caller's scope (e.g. research section reuse)
+        memo, memo_key = self._scoped_memo(
+            use_cache, messages, system, max_tokens, temperature, kwargs
+        )
+        if memo is not None:
+            memoized = memo.get(memo_key)
+            if memoized is not None:
+                return memoized
+
         # Estimate tokens for logging (rough approximation)
-        total_chars = sum(len(msg.get("content", "")) for msg in messages)
+        total_chars = sum(self._content_length(msg.get("content", "")) for msg in messages)
         if system:
             total_chars += len(system)
         estimated_tokens = total_chars // 4  # Rough estimate: 4 chars per token
@@ -145,34 +178,21 @@ class AnthropicClient:
                 elif system:
                     api_params["system"] = system
 
+                request_started = time.perf_counter()
                 response = self.client.messages.create(**api_params)
+                latency_ms = (time.perf_counter() - request_started) * 1000
 
                 # Extract text from response
                 if response.content and len(response.content) > 0:
                     response_text: str = response.content[0].text
 
-                    # Track cost if project_id provided
-                    if project_id and hasattr(response, "usage"):
-                        try:
-                            self.cost_tracker.track_api_call(
-                                project_id=project_id,
-                                operation=operation,
-                                model=self.model,
-                                input_tokens=response.usage.input_tokens,
-                                output_tokens=response.usage.output_tokens,
-                                cache_creation_tokens=getattr(
-                                    response.usage, "cache_creation_input_tokens", 0
-                                ),
-                                cache_read_tokens=getattr(
-                                    response.usage, "cache_read_input_tokens", 0
-                                ),
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to track API cost: {e}")
+                    self._account_call(response, project_id, operation, latency_ms, attempt)
 
                     # Cache the response
                     if use_cache and self.response_cache:
                         self.response_cache.put(messages, system or "", temperature, response_text)
+                    if memo is not None:
+                        memo.put(memo_key, response_text)
 
                     return response_text
                 else:
@@ -200,10 +220,12 @@ class AnthropicClient:
                 last_exception = e
                 # Don't retry on non-retryable errors
                 log_error(f"API error: {str(e)}", exc_info=True)
+                self._account_failure(operation, attempt)
                 raise
 
         # If we get here, all retries failed
         log_error(f"All {self.max_retries} retries failed", exc_info=True)
+        self._account_failure(operation, self.max_retries - 1)
         if last_exception is not None:
             raise last_exception
         else:
@@ -253,8 +275,17 @@ class AnthropicClient:
             if cached_response:
                 return cached_response
 
+        # Then the memo of the caller's scope (e.g. research section reuse)
+        memo, memo_key = self._scoped_memo(
+            use_cache, messages, system, max_tokens, temperature, kwargs
+        )
+        if memo is not None:
+            memoized = memo.get(memo_key)
+            if memoized is not None:
+                return memoized
+
         # Estimate tokens for logging (rough approximation)
-        total_chars = sum(len(msg.get("content", "")) for msg in messages)
+        total_chars = sum(self._content_length(msg.get("content", "")) for msg in messages)
         if system:
             total_chars += len(system)
         estimated_tokens = total_chars // 4  # Rough estimate: 4 chars per token
@@ -285,34 +316,21 @@ class AnthropicClient:
                 elif system:
                     api_params["system"] = system
 
+                request_started = time.perf_counter()
                 response = await self.async_client.messages.create(**api_params)
+                latency_ms = (time.perf_counter() - request_started) * 1000
 
                 # Extract text from response
                 if response.content and len(response.content) > 0:
                     response_text: str = response.content[0].text
 
-                    # Track cost if project_id provided
-                    if project_id and hasattr(response, "usage"):
-                        try:
-                            self.cost_tracker.track_api_call(
-                                project_id=project_id,
-                                operation=operation,
-                                model=self.model,
-                                input_tokens=response.usage.input_tokens,
-                                output_tokens=response.usage.output_tokens,
-                                cache_creation_tokens=getattr(
-                                    response.usage, "cache_creation_input_tokens", 0
-                                ),
-                                cache_read_tokens=getattr(
-                                    response.usage, "cache_read_input_tokens", 0
-                                ),
-                            )
-                        except Exception as e:
-                            logger.warning(f"Failed to track API cost: {e}")
+                    self._account_call(response, project_id, operation, latency_ms, attempt)
 
                     # Cache the response
                     if use_cache and self.response_cache:
                         self.response_cache.put(messages, system or "", temperature, response_text)
+                    if memo is not None:
+                        memo.put(memo_key, response_text)
 
                     return response_text
                 else:
@@ -340,15 +358,40 @@ class AnthropicClient:
                 last_exception = e
                 # Don't retry on non-retryable errors
                 log_error(f"API error: {str(e)}", exc_info=True)
+                self._account_failure(operation, attempt)
                 raise
 
         # If we get here, all retries failed
         log_error(f"All {self.max_retries} retries failed", exc_info=True)
+        self._account_failure(operation, self.max_retries - 1)
         if last_exception is not None:
             raise last_exception
         else:
             raise RuntimeError(f"All {self.max_retries} retries failed")
 
+    def _scoped_memo(
+        self,
+        use_cache: bool,
+        messages: List[Dict[str, str]],
+        system: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        extra: Dict[str, Any],
+    ) -> Tuple[Optional[Any], Optional[str]]:
+        """Active response memo and this request's key (None, None outside a scope)"""
+        memo = get_response_memo() if use_cache else None
+        if memo is None:
+            return None, None
+        key = request_key(
+            model=self.model,
+            system=system,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            extra=extra,
+        )
+        return memo, key
+
     def create_brief_analysis(self, brief_content: str, system_prompt: Optional[str] = None) -> str:
         """
         Analyze a client brief and extract structured information
@@ -391,18 +434,7 @@ class AnthropicClient:
         if not system_prompt:
             system_prompt = SystemPrompts.CONTENT_GENERATOR
 
-        # Format context for the prompt with smart filtering
-        context_str = self._format_context_optimized(context)
-
-        user_message = f"""Template Structure:
-{template_structure}
-
-Client Context:
-{context_str}
-
-Generate a post following this template structure, customized for this client's voice and audience."""
-
-        messages = [{"role": "user", "content": user_message}]
+        messages = self._build_post_messages(template_structure, context)
 
         return self.create_message(messages=messages, system=system_prompt, temperature=temperature)
 
@@ -428,22 +460,187 @@ Generate a post following this template structure, customized for this client's
         if not system_prompt:
             system_prompt = SystemPrompts.CONTENT_GENERATOR
 
-        # Format context for the prompt with smart filtering
-        context_str = self._format_context_optimized(context)
+        messages = self._build_post_messages(template_structure, context)
 
-        user_message = f"""Template Structure:
-{template_structure}
+        return await self.create_message_async(
+            messages=messages, system=system_prompt, temperature=temperature
+        )
 
-Client Context:
-{context_str}
+    def _build_post_messages(
+        self,
+        template_structure: str,
+        context: Dict[str, Any],
+        enable_caching: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """Lay out a post generation request from most to least stable content
 
-Generate a post following this template structure, customized for this client's voice and audience."""
+        The user turn is split into three blocks: the per-client context, the
+        template structure and the per-post guidance. Cache breakpoints after
+        the first two (the system prompt carries its own) let every post of a
+        run reuse the cached client prefix, and every variant of a template
+        reuse the template prefix as well.
 
-        messages = [{"role": "user", "content": user_message}]
+        Args:
+            template_structure: Template structure with placeholders
+            context: Client context merged with per-post fields
+            enable_caching: Place cache breakpoints (default: from settings)
 
-        return await self.create_message_async(
-            messages=messages, system=system_prompt, temperature=temperature
+        Returns:
+            Messages list with a single structured user turn
+        """
+        if enable_caching is None:
+            enable_caching = settings.ENABLE_PROMPT_CACHING and settings.CACHE_CLIENT_CONTEXT
+
+        client_context, post_context = self._split_context(context)
+
+        client_block: Dict[str, Any] = {
+            "type": "text",
+            "text": f"Client Context:\n{self._format_context_optimized(client_context)}",
+        }
+        template_block: Dict[str, Any] = {
+            "type": "text",
+            "text": f"Template Structure:\n{template_structure}",
+        }
+        if enable_caching:
+            client_block["cache_control"] = {"type": "ephemeral"}
+            template_block["cache_control"] = {"type": "ephemeral"}
+
+        post_lines = [f"{k}: {v}" for k, v in post_context.items() if v]
+        post_text = POST_GENERATION_INSTRUCTION
+        if post_lines:
+            post_text = "Post Guidance:\n" + "\n".join(post_lines) + "\n\n" + post_text
+
+        return [
+            {
+                "role": "user",
+                "content": [client_block, template_block, {"type": "text", "text": post_text}],
+            }
+        ]
+
+    @staticmethod
+    def _split_context(context: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Split a post context into (per-client fields, per-post fields)"""
+        client_context = {}
+        post_context = {}
+        for key, value in context.items():
+            if key in POST_CONTEXT_FIELDS:
+                post_context[key] = value
+            elif key not in TEMPLATE_METADATA_FIELDS:
+                client_context[key] = value
+        return client_context, post_context
+
+    @staticmethod
+    def _content_length(content: Any) -> int:
+        """Character length of a message content string or list of content blocks"""
+        if isinstance(content, str):
+            return len(content)
+        return sum(len(block.get("text", "")) for block in content if isinstance(block, dict))
+
+    def _account_call(
+        self,
+        response: Any,
+        project_id: Optional[str],
+        operation: str,
+        latency_ms: float,
+        retries: int,
+    ) -> None:
+        """Record a successful call's usage, cost and timing
+
+        Calls made inside a run scope (see run_context) are attributed to
+        that run and tagged with the scope's operation when the caller did
+        not name one, and are charged to the run's project when no
+        project_id is passed explicitly. Their cost records are queued on
+        the run and written when it ends, keeping the cost database off the
+        request path.
+        """
+        self._record_usage(response)
+
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        run = get_current_run()
+        if operation == "api_call":
+            operation = get_current_operation() or operation
+        if not project_id and run is not None:
+            project_id = run.project_id or run.run_id
+
+        tokens = {
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            "cache_creation_tokens": getattr(usage, "cache_creation_input_tokens", 0) or 0,
+            "cache_read_tokens": getattr(usage, "cache_read_input_tokens", 0) or 0,
+        }
+
+        cost = 0.0
+        if project_id:
+            call = {"project_id": project_id, "operation": operation, "model": self.model}
+            try:
+                if run is not None:
+                    cost = self.cost_tracker.calculate_cost(self.model, **tokens)
+                    run.defer_cost_record(self.cost_tracker, {**call, **tokens})
+                else:
+                    cost = self.cost_tracker.track_api_call(**call, **tokens)
+            except Exception as e:
+                logger.warning(f"Failed to track API cost: {e}")
+
+        if run is not None:
+            run.record_call(
+                operation, latency_ms=latency_ms, retries=retries, cost_usd=cost or 0.0, **tokens
+            )
+
+    def _account_failure(self, operation: str, retries: int) -> None:
+        """Record a call that ultimately failed against the active run, if any"""
+        run = get_current_run()
+        if run is None:
+            return
+        if operation == "api_call":
+            operation = get_current_operation() or operation
+        run.record_call(operation, retries=retries, failed=True)
+
+    def _record_usage(self, response: Any) -> None:
+        """Add a response's token usage to the running prompt cache totals"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+
+        with self._usage_lock:
+            totals = self._usage_totals
+            totals["requests"] += 1
+            totals["input_tokens"] += getattr(usage, "input_tokens", 0) or 0
+            totals["output_tokens"] += getattr(usage, "output_tokens", 0) or 0
+            totals["cache_creation_tokens"] += (
+                getattr(usage, "cache_creation_input_tokens", 0) or 0
+            )
+            totals["cache_read_tokens"] += getattr(usage, "cache_read_input_tokens", 0) or 0
+
+    def get_prompt_cache_stats(self, since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Token usage and prompt cache effectiveness for this client
+
+        Pass the stats returned at the start of a run as ``since`` to get the
+        usage of that run alone.
+
+        Args:
+            since: Earlier snapshot from this method to subtract
+
+        Returns:
+            Dictionary with request/token counters and cache_hit_rate, the
+            share of prompt tokens served from cache
+        """
+        with self._usage_lock:
+            stats: Dict[str, Any] = dict(self._usage_totals)
+
+        if since:
+            for key in self._usage_totals:
+                stats[key] -= since.get(key, 0)
+
+        prompt_tokens = (
+            stats["input_tokens"] + stats["cache_creation_tokens"] + stats["cache_read_tokens"]
         )
+        stats["cache_hit_rate"] = (
+            round(stats["cache_read_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+        )
+        return stats
 
     def _format_context_optimized(self, context: Dict[str, Any]) -> str:
         """Format context, excluding empty/redundant fields to reduce token usage
@@ -479,7 +676,7 @@ Generate a post following this template structure, customized for this client's
                 continue
 
             # Skip redundant template metadata (already in structure)
-            if k in ["template_type", "requires_story", "requires_data"]:
+            if k in TEMPLATE_METADATA_FIELDS:
                 continue
 
             # Skip empty strings
@@ -495,19 +692,32 @@ Generate a post following this template structure, customized for this client's
     ) -> List[Dict[str, Any]]:
         """Prepare system prompt with optional Anthropic prompt caching
 
+        A SystemPrompt with several segments (shared platform guidance, then
+        client-specific guidance) becomes one block per segment, each with its
+        own breakpoint, so other clients on the same platform still hit the
+        shared prefix. Together with the client and template blocks added by
+        _build_post_messages this stays within the 4 breakpoints allowed.
+
         Args:
-            system: System prompt text
+            system: System prompt text (optionally a SystemPrompt)
             enable_caching: Whether to enable prompt caching
 
         Returns:
             List of system message dictionaries with optional cache_control
         """
+        segments = getattr(system, "segments", None) or (system,)
+        if len(segments) > 2:
+            segments = (segments[0], "".join(segments[1:]))
+
         if not enable_caching or not settings.CACHE_SYSTEM_PROMPTS:
             # Return as simple list without caching
-            return [{"type": "text", "text": system}]
+            return [{"type": "text", "text": str(system)}]
 
         # Use Anthropic's prompt caching for ephemeral caching
-        return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+        return [
+            {"type": "text", "text": segment, "cache_control": {"type": "ephemeral"}}
+            for segment in segments
+        ]
 
     def refine_post(self, original_post: str, feedback: str, context: Dict[str, Any]) -> str:
         """
@@ -0,0 +1,46 @@
+"""Shared limiter for concurrent Anthropic API calls
+
+Batch agents (regeneration, revisions) fan out one task per post but acquire
+a slot from this limiter around each API call, so every batch running in the
+same event loop shares the settings.MAX_CONCURRENT_API_CALLS budget instead of
+each opening its own. Time spent waiting for a slot is charged to the active
+run as queue wait.
+
+Usage:
+    async with api_call_slot():
+        content = await client.generate_post_content_async(...)
+"""
+
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from ..config.settings import settings
+from .run_context import record_queue_wait
+
+# asyncio primitives are bound to the loop they are first used in
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_api_semaphore() -> asyncio.Semaphore:
+    """Return the running event loop's shared API semaphore"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max(1, settings.MAX_CONCURRENT_API_CALLS))
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+@asynccontextmanager
+async def api_call_slot() -> AsyncIterator[None]:
+    """Hold one shared API concurrency slot for the duration of the block"""
+    semaphore = get_api_semaphore()
+    wait_start = time.perf_counter()
+    async with semaphore:
+        record_queue_wait(time.perf_counter() - wait_start)
+        yield
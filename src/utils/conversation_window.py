@@ -0,0 +1,197 @@
+"""Token-budgeted conversation window with rolling summaries
+
+Long operator sessions (the CLI agent, the dashboard assistant) used to
+resend the full message history on every turn, so token cost and latency
+grew linearly with the session. ConversationWindow keeps the most recent
+turns within a token budget and folds older turns into a rolling summary:
+
+- Compaction only happens once the window exceeds max_tokens, and then
+  shrinks it to target_tokens (half the budget by default), so the summary
+  changes rarely and the system prompt prefix stays cacheable.
+- Turns are never split: the window always starts at a user text message,
+  so tool_use/tool_result pairs stay together.
+- The summary is produced by a caller-supplied function (previous summary +
+  evicted messages -> new summary) so callers choose the client, the model
+  and where summaries are stored or cached.
+
+Usage:
+    window = ConversationWindow(summarize=my_summarizer, summary=stored_summary)
+
+    messages.append({"role": "user", "content": user_message})
+    messages = window.compact(messages)
+    response = client.messages.create(
+        system=window.system_blocks(stable_prompt, dynamic_context),
+        messages=messages,
+        ...
+    )
+
+    # Stateless callers (full history sent by the client) replay it instead;
+    # summaries of unchanged prefixes come from their cache
+    recent = window.fit(history)
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config.settings import settings
+from .logger import logger
+
+CHARS_PER_TOKEN = 4  # Rough estimate, as in AnthropicClient
+MAX_TRANSCRIPT_CHARS_PER_MESSAGE = 2000  # Tool results can be huge; summaries need the gist
+SUMMARY_MAX_TOKENS = 1024
+
+SUMMARY_SYSTEM_PROMPT = """You maintain the running summary of a long conversation between an \
+operator and an AI assistant for a content agency.
+
+Update the previous summary with the new conversation turns. Keep:
+- clients, projects, files and IDs that were mentioned
+- decisions made, preferences stated and open questions
+- actions taken (tool calls) and their outcomes
+
+Drop pleasantries and repetition. Write concise bullet points (at most ~400 words) and \
+return only the updated summary."""
+
+SummarizeFn = Callable[[str, List[Dict[str, Any]]], str]
+
+
+def _block_value(block: Any, key: str) -> Any:
+    return block.get(key) if isinstance(block, dict) else getattr(block, key, None)
+
+
+def _content_text(content: Any) -> str:
+    """Readable text of a message content string or list of content blocks"""
+    if isinstance(content, str):
+        return content
+
+    parts = []
+    for block in content or []:
+        block_type = _block_value(block, "type")
+        if block_type == "tool_use":
+            tool_input = json.dumps(_block_value(block, "input") or {}, default=str)
+            parts.append(f"[called {_block_value(block, 'name')}({tool_input})]")
+        elif block_type == "tool_result":
+            parts.append(f"[tool result: {_content_text(_block_value(block, 'content') or '')}]")
+        elif _block_value(block, "text"):
+            parts.append(str(_block_value(block, "text")))
+    return "\n".join(parts)
+
+
+def estimate_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Rough token count of messages (content only)"""
+    return sum(len(_content_text(message.get("content"))) for message in messages) // (
+        CHARS_PER_TOKEN
+    )
+
+
+def is_turn_start(message: Dict[str, Any]) -> bool:
+    """Whether a message opens a turn (a user text message, not a tool result)"""
+    return message.get("role") == "user" and isinstance(message.get("content"), str)
+
+
+def render_transcript(messages: List[Dict[str, Any]]) -> str:
+    """Plain-text transcript of messages for the summarizer"""
+    lines = []
+    for message in messages:
+        text = _content_text(message.get("content")).strip()
+        if len(text) > MAX_TRANSCRIPT_CHARS_PER_MESSAGE:
+            text = text[:MAX_TRANSCRIPT_CHARS_PER_MESSAGE] + " [...]"
+        if text:
+            lines.append(f"{message.get('role', 'user')}: {text}")
+    return "\n\n".join(lines)
+
+
+def build_summary_request(
+    previous_summary: str, messages: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """System prompt and messages of a summary update (pass to messages.create)"""
+    prompt = (
+        f"Previous summary:\n{previous_summary or '(none yet)'}\n\n"
+        f"New conversation turns:\n{render_transcript(messages)}"
+    )
+    return {"system": SUMMARY_SYSTEM_PROMPT, "messages": [{"role": "user", "content": prompt}]}
+
+
+class ConversationWindow:
+    """Recent-turn window plus rolling summary of everything older"""
+
+    def __init__(
+        self,
+        summarize: SummarizeFn,
+        max_tokens: Optional[int] = None,
+        target_tokens: Optional[int] = None,
+        summary: str = "",
+    ):
+        """Initialize conversation window
+
+        Args:
+            summarize: Returns the new summary given the previous one and the evicted messages
+            max_tokens: Window size that triggers compaction
+                (default: settings.CONVERSATION_WINDOW_TOKENS)
+            target_tokens: Window size after compaction (default: half of max_tokens)
+            summary: Summary restored from an earlier session
+        """
+        self.summarize = summarize
+        self.max_tokens = max_tokens or settings.CONVERSATION_WINDOW_TOKENS
+        self.target_tokens = target_tokens or self.max_tokens // 2
+        self.summary = summary
+        self.compactions = 0
+
+    def compact(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the messages to send, folding older turns into the summary if over budget"""
+        sizes = [estimate_tokens([message]) for message in messages]
+        if sum(sizes) <= self.max_tokens:
+            return messages
+
+        # Earliest turn start leaving at most target_tokens; the latest turn is always kept
+        cut = 0
+        remaining = sum(sizes)
+        for index in range(1, len(messages)):
+            remaining -= sizes[index - 1]
+            if is_turn_start(messages[index]):
+                cut = index
+                if remaining <= self.target_tokens:
+                    break
+        if cut == 0:
+            return messages  # One oversized turn: nothing to fold
+
+        try:
+            summary = self.summarize(self.summary, messages[:cut]).strip()
+        except Exception as e:
+            # Keep the full window and retry at the next turn
+            logger.warning(f"Conversation summary failed, keeping {len(messages)} messages: {e}")
+            return messages
+
+        self.summary = summary
+        self.compactions += 1
+        logger.debug(f"Folded {cut} messages into the conversation summary")
+        return messages[cut:]
+
+    def fit(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Replay a full history turn by turn, returning the window to send
+
+        Deterministic for a given history, so a stateless caller re-derives the
+        same summaries every request (and can serve them from a cache).
+        """
+        window: List[Dict[str, Any]] = []
+        for message in history:
+            if is_turn_start(message):
+                window = self.compact(window)
+            window.append(message)
+        return self.compact(window)
+
+    def system_blocks(self, stable: str, dynamic: str = "") -> List[Dict[str, Any]]:
+        """System prompt blocks: cached stable prefix and summary, then uncached context"""
+        cache = {"cache_control": {"type": "ephemeral"}} if settings.ENABLE_PROMPT_CACHING else {}
+
+        blocks: List[Dict[str, Any]] = [{"type": "text", "text": stable, **cache}]
+        if self.summary:
+            blocks.append({"type": "text", "text": self.summary_prompt(), **cache})
+        if dynamic:
+            blocks.append({"type": "text", "text": dynamic})
+        return blocks
+
+    def summary_prompt(self) -> str:
+        """Summary section for a system prompt ("" when nothing was folded yet)"""
+        if not self.summary:
+            return ""
+        return f"SUMMARY OF THE EARLIER CONVERSATION:\n{self.summary}"
@@ -26,9 +26,9 @@ Usage:
 import json
 import sqlite3
 from dataclasses import asdict, dataclass
-from datetime import datetime
+from datetime import date, datetime, time, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..utils.logger import logger
 
@@ -151,6 +151,41 @@ class CostTracker:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_project_id ON api_calls(project_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON api_calls(timestamp)")
 
+        # Daily rollups of api_calls per project/operation/model. Rows are folded
+        # in incrementally past a high-water call_id, so period summaries read
+        # one row per day and dimension instead of every call.
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS api_call_daily_rollups (
+                bucket_date DATE NOT NULL,
+                project_id TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                model TEXT NOT NULL,
+                calls INTEGER NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                cache_creation_tokens INTEGER NOT NULL,
+                cache_read_tokens INTEGER NOT NULL,
+                cost REAL NOT NULL,
+
+                PRIMARY KEY (bucket_date, project_id, operation, model)
+            )
+        """
+        )
+
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rollup_state (
+                rollup_name TEXT PRIMARY KEY,
+                last_call_id INTEGER NOT NULL DEFAULT 0
+            )
+        """
+        )
+        cursor.execute(
+            "INSERT OR IGNORE INTO rollup_state (rollup_name, last_call_id) "
+            "VALUES ('api_call_daily_rollups', 0)"
+        )
+
         # Budget alerts table
         cursor.execute(
             """
@@ -167,6 +202,9 @@ class CostTracker:
         """
         )
 
+        # Fold any rows written before rollups existed (no-op when current)
+        self._refresh_rollups(cursor)
+
         conn.commit()
         conn.close()
 
@@ -194,14 +232,55 @@ class CostTracker:
         Returns:
             Cost of this API call in USD
         """
-        cost = self.calculate_cost(
-            model, input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens
-        )
+        return self.track_api_calls(
+            [
+                {
+                    "project_id": project_id,
+                    "operation": operation,
+                    "model": model,
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens,
+                    "cache_creation_tokens": cache_creation_tokens,
+                    "cache_read_tokens": cache_read_tokens,
+                }
+            ]
+        )[0]
+
+    def track_api_calls(self, calls: List[Dict[str, Any]]) -> List[float]:
+        """Track several API calls in one transaction and return their costs
+
+        Args:
+            calls: Keyword arguments of track_api_call, one dict per call
+
+        Returns:
+            Cost of each API call in USD, in input order
+        """
+        rows = [
+            (
+                call["project_id"],
+                call["operation"],
+                call["model"],
+                call["input_tokens"],
+                call["output_tokens"],
+                call.get("cache_creation_tokens", 0),
+                call.get("cache_read_tokens", 0),
+                self.calculate_cost(
+                    call["model"],
+                    call["input_tokens"],
+                    call["output_tokens"],
+                    call.get("cache_creation_tokens", 0),
+                    call.get("cache_read_tokens", 0),
+                ),
+            )
+            for call in calls
+        ]
+        if not rows:
+            return []
 
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        cursor.execute(
+        cursor.executemany(
             """
             INSERT INTO api_calls (
                 project_id, operation, model,
@@ -210,31 +289,24 @@ class CostTracker:
                 cost
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """,
-            (
-                project_id,
-                operation,
-                model,
-                input_tokens,
-                output_tokens,
-                cache_creation_tokens,
-                cache_read_tokens,
-                cost,
-            ),
+            rows,
         )
 
-        call_id = cursor.lastrowid
+        self._refresh_rollups(cursor)
         conn.commit()
         conn.close()
 
-        logger.debug(
-            f"Tracked API call {call_id}: {project_id} | {operation} | "
-            f"{input_tokens}in + {output_tokens}out = ${cost:.4f}"
-        )
+        for project_id, operation, _, input_tokens, output_tokens, _, _, cost in rows:
+            logger.debug(
+                f"Tracked API call: {project_id} | {operation} | "
+                f"{input_tokens}in + {output_tokens}out = ${cost:.4f}"
+            )
 
-        # Check budget alert
-        self._check_budget_alert(project_id)
+        # Check budget alerts
+        for project_id in dict.fromkeys(row[0] for row in rows):
+            self._check_budget_alert(project_id)
 
-        return cost
+        return [row[-1] for row in rows]
 
     def calculate_cost(
         self,
@@ -398,11 +470,104 @@ class CostTracker:
 
         return projects
 
+    def refresh_rollups(self) -> int:
+        """Fold api_calls rows newer than the rollup high-water mark into daily buckets
+
+        Returns:
+            Number of api_calls rows folded in
+        """
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        folded = self._refresh_rollups(cursor)
+        conn.commit()
+        conn.close()
+        return folded
+
+    def _refresh_rollups(self, cursor: sqlite3.Cursor) -> int:
+        """Incrementally update daily rollups on an open cursor (caller commits)"""
+        cursor.execute(
+            "SELECT last_call_id FROM rollup_state WHERE rollup_name = 'api_call_daily_rollups'"
+        )
+        last_call_id = cursor.fetchone()[0]
+
+        cursor.execute(
+            "SELECT COUNT(*), MAX(call_id) FROM api_calls WHERE call_id > ?", (last_call_id,)
+        )
+        pending, max_call_id = cursor.fetchone()
+        if not pending:
+            return 0
+
+        # Claim the range first: the conditional update takes the write lock, and
+        # a concurrent refresh that read the same high-water mark matches no row
+        cursor.execute(
+            """
+            UPDATE rollup_state SET last_call_id = ?
+            WHERE rollup_name = 'api_call_daily_rollups' AND last_call_id = ?
+        """,
+            (max_call_id, last_call_id),
+        )
+        if cursor.rowcount == 0:
+            return 0
+
+        cursor.execute(
+            """
+            INSERT INTO api_call_daily_rollups (
+                bucket_date, project_id, operation, model, calls,
+                input_tokens, output_tokens, cache_creation_tokens, cache_read_tokens, cost
+            )
+            SELECT
+                date(timestamp), project_id, operation, model, COUNT(*),
+                SUM(input_tokens), SUM(output_tokens),
+                SUM(cache_creation_tokens), SUM(cache_read_tokens), SUM(cost)
+            FROM api_calls
+            WHERE call_id > ? AND call_id <= ?
+            GROUP BY date(timestamp), project_id, operation, model
+            ON CONFLICT(bucket_date, project_id, operation, model) DO UPDATE SET
+                calls = calls + excluded.calls,
+                input_tokens = input_tokens + excluded.input_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                cache_creation_tokens = cache_creation_tokens + excluded.cache_creation_tokens,
+                cache_read_tokens = cache_read_tokens + excluded.cache_read_tokens,
+                cost = cost + excluded.cost
+        """,
+            (last_call_id, max_call_id),
+        )
+        return pending
+
+    def _split_range(
+        self, start_date: Optional[datetime], end_date: Optional[datetime]
+    ) -> Tuple[Optional[date], date]:
+        """Split a timestamp range into whole closed days served by rollups
+
+        Days before today that fall entirely inside [start_date, end_date] are
+        answered from rollups. The partial first/last day and the open current
+        day are answered from raw api_calls rows.
+
+        Returns:
+            (first full day or None for unbounded, exclusive end day)
+        """
+        today = datetime.now(timezone.utc).date()
+
+        first_full: Optional[date] = None
+        if start_date is not None:
+            first_full = start_date.date()
+            if start_date.time() != time.min:
+                first_full += timedelta(days=1)
+
+        end_exclusive = today
+        if end_date is not None:
+            end_exclusive = min(end_exclusive, end_date.date())
+
+        return first_full, end_exclusive
+
     def get_total_costs(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """Get total costs across all projects
 
+        Reads closed days from the daily rollups and only the partial boundary
+        days (including today) from raw api_calls rows.
+
         Args:
             start_date: Optional start date filter
             end_date: Optional end date filter
@@ -412,31 +577,55 @@ class CostTracker:
         """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        self._refresh_rollups(cursor)
+        conn.commit()
 
-        where_clause = []
-        params = []
+        first_full, end_exclusive = self._split_range(start_date, end_date)
+        first_full_sql = first_full.isoformat() if first_full else None
+        end_exclusive_sql = end_exclusive.isoformat()
 
+        # Rollup part: whole days in [first_full, end_exclusive)
+        rollup_where = ["bucket_date < ?"]
+        rollup_params: List[Any] = [end_exclusive_sql]
+        if first_full_sql:
+            rollup_where.append("bucket_date >= ?")
+            rollup_params.append(first_full_sql)
+
+        # Raw part: rows inside the requested range but outside the rollup days
+        raw_where = []
+        raw_params: List[Any] = []
         if start_date:
-            where_clause.append("timestamp >= ?")
-            params.append(start_date.isoformat())
+            raw_where.append("timestamp >= ?")
+            raw_params.append(start_date.isoformat(sep=" "))
         if end_date:
-            where_clause.append("timestamp <= ?")
-            params.append(end_date.isoformat())
-
-        where_sql = "WHERE " + " AND ".join(where_clause) if where_clause else ""
+            raw_where.append("timestamp <= ?")
+            raw_params.append(end_date.isoformat(sep=" "))
+        if first_full_sql and first_full_sql < end_exclusive_sql:
+            raw_where.append("(timestamp < ? OR timestamp >= ?)")
+            raw_params.extend([first_full_sql, end_exclusive_sql])
+        elif first_full_sql is None:
+            raw_where.append("timestamp >= ?")
+            raw_params.append(end_exclusive_sql)
 
         cursor.execute(  # nosec B608
             f"""
             SELECT
                 COUNT(DISTINCT project_id) as total_projects,
-                COUNT(*) as total_calls,
+                SUM(calls) as total_calls,
                 SUM(input_tokens) as total_input,
                 SUM(output_tokens) as total_output,
                 SUM(cost) as total_cost
-            FROM api_calls
-            {where_sql}
+            FROM (
+                SELECT project_id, calls, input_tokens, output_tokens, cost
+                FROM api_call_daily_rollups
+                WHERE {" AND ".join(rollup_where)}
+                UNION ALL
+                SELECT project_id, 1, input_tokens, output_tokens, cost
+                FROM api_calls
+                WHERE {" AND ".join(raw_where)}
+            )
         """,
-            params,
+            rollup_params + raw_params,
         )
 
         row = cursor.fetchone()
@@ -451,6 +640,79 @@ class CostTracker:
             "avg_cost_per_project": (row[4] or 0.0) / (row[0] or 1),
         }
 
+    def get_cost_rollups(
+        self,
+        period: str = "day",
+        group_by: Optional[List[str]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get cost and token totals bucketed by day, week or month
+
+        Served entirely from daily rollups (kept current on every tracked call).
+
+        Args:
+            period: "day", "week" (Monday start) or "month"
+            group_by: Optional dimensions among "project_id", "operation", "model"
+            start_date: Optional first day (inclusive)
+            end_date: Optional last day (inclusive)
+
+        Returns:
+            List of buckets ordered by period start, each with totals and dimensions
+        """
+        period_expressions = {
+            "day": "bucket_date",
+            "week": "date(bucket_date, 'weekday 0', '-6 days')",
+            "month": "date(bucket_date, 'start of month')",
+        }
+        if period not in period_expressions:
+            raise ValueError(f"Unknown rollup period '{period}'")
+
+        dimensions = group_by or []
+        invalid = set(dimensions) - {"project_id", "operation", "model"}
+        if invalid:
+            raise ValueError(f"Unknown rollup dimensions: {sorted(invalid)}")
+
+        where = []
+        params: List[Any] = []
+        if start_date:
+            where.append("bucket_date >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            where.append("bucket_date <= ?")
+            params.append(end_date.isoformat())
+        where_sql = "WHERE " + " AND ".join(where) if where else ""
+
+        select_dims = "".join(f", {d}" for d in dimensions)
+
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        self._refresh_rollups(cursor)
+        conn.commit()
+
+        cursor.execute(  # nosec B608
+            f"""
+            SELECT
+                {period_expressions[period]} as period_start{select_dims},
+                SUM(calls) as total_calls,
+                SUM(input_tokens) as total_input_tokens,
+                SUM(output_tokens) as total_output_tokens,
+                SUM(cache_creation_tokens) as total_cache_creation_tokens,
+                SUM(cache_read_tokens) as total_cache_read_tokens,
+                SUM(cost) as total_cost
+            FROM api_call_daily_rollups
+            {where_sql}
+            GROUP BY period_start{select_dims}
+            ORDER BY period_start{select_dims}
+        """,
+            params,
+        )
+
+        buckets = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return buckets
+
     def set_budget_alert(self, project_id: str, budget_limit: float, alert_threshold: float = 0.8):
         """Set budget alert for a project
 
@@ -7,12 +7,40 @@ Supports:
 - Word documents (.docx)
 - HTML files (.html)
 - JSON files (.json)
+
+Bulk uploads (directories or zip exports of hundreds of posts) go through
+extract_texts_from_files, which parses files in a process pool.
 """
 
+import hashlib
 import json
-import re
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple
+
+SUPPORTED_EXTENSIONS = (".txt", ".md", ".docx", ".html", ".htm", ".json")
+
+# Read sizes used when streaming JSON arrays and HTML documents
+_JSON_CHUNK_SIZE = 64 * 1024
+_HTML_CHUNK_SIZE = 64 * 1024
+
+# Below this many files the process pool costs more than it saves
+_PARALLEL_MIN_FILES = 4
+
+
+@dataclass
+class ExtractedText:
+    """Result of extracting one file during a bulk upload"""
+
+    path: Path
+    text: str = ""
+    word_count: int = 0
+    content_hash: str = ""
+    error: Optional[str] = None
 
 
 def extract_text_from_file(file_path: Path) -> Tuple[str, int]:
@@ -77,30 +105,121 @@ def _extract_from_docx(file_path: Path) -> str:
 
 
 def _extract_from_html(file_path: Path) -> str:
-    """Extract text from HTML file"""
-    html_content = file_path.read_text(encoding="utf-8")
+    """Extract text from HTML file, streaming it through the parser in chunks"""
+    try:
+        return _stream_html_text(file_path, encoding="utf-8")
+    except UnicodeDecodeError:
+        # Try with different encoding
+        return _stream_html_text(file_path, encoding="latin-1")
+
+
+def _stream_html_text(file_path: Path, encoding: str, chunk_size: int = _HTML_CHUNK_SIZE) -> str:
+    """Feed an HTML file to _HTMLTextExtractor chunk by chunk"""
+    extractor = _HTMLTextExtractor()
+    with open(file_path, "r", encoding=encoding) as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            extractor.feed(chunk)
+    extractor.close()
+    return extractor.get_text()
 
-    # Remove script and style elements
-    html_content = re.sub(r"<script[^>]*>.*?</script>", "", html_content, flags=re.DOTALL)
-    html_content = re.sub(r"<style[^>]*>.*?</style>", "", html_content, flags=re.DOTALL)
 
-    # Remove HTML tags
-    text = re.sub(r"<[^>]+>", " ", html_content)
+class _HTMLTextExtractor(HTMLParser):
+    """
+    Incremental HTML to text converter
 
-    # Decode HTML entities
-    text = text.replace("&nbsp;", " ")
-    text = text.replace("&amp;", "&")
-    text = text.replace("&lt;", "<")
-    text = text.replace("&gt;", ">")
-    text = text.replace("&quot;", '"')
-    text = text.replace("&#39;", "'")
+    Drops script/style/navigation content, decodes every named and numeric
+    entity (including ones split across chunks) and marks block-level
+    elements with blank lines so paragraph boundaries survive cleaning.
+    """
 
-    return text
+    SKIP_TAGS = frozenset({"script", "style", "nav", "noscript", "template"})
+    BLOCK_TAGS = frozenset(
+        {
+            "address",
+            "article",
+            "aside",
+            "blockquote",
+            "body",
+            "dd",
+            "div",
+            "dl",
+            "dt",
+            "figcaption",
+            "figure",
+            "footer",
+            "h1",
+            "h2",
+            "h3",
+            "h4",
+            "h5",
+            "h6",
+            "header",
+            "hr",
+            "li",
+            "main",
+            "ol",
+            "p",
+            "pre",
+            "section",
+            "table",
+            "title",
+            "tr",
+            "ul",
+        }
+    )
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag in self.SKIP_TAGS:
+            self._skip_depth += 1
+        elif self._skip_depth:
+            return
+        elif tag == "br":
+            self._parts.append("\n")
+        elif tag in self.BLOCK_TAGS:
+            self._parts.append("\n\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif not self._skip_depth and tag in self.BLOCK_TAGS:
+            self._parts.append("\n\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._parts.append(data)
+
+    def get_text(self) -> str:
+        """Return the text collected so far"""
+        return "".join(self._parts)
 
 
 def _extract_from_json(file_path: Path) -> str:
-    """Extract text from JSON file"""
-    data = json.loads(file_path.read_text(encoding="utf-8"))
+    """Extract text from JSON file
+
+    Top-level arrays (the usual shape of post exports) are decoded one item at
+    a time so large exports never have to be held in memory as a single tree.
+    """
+    with open(file_path, "r", encoding="utf-8") as handle:
+        first_char = _peek_non_whitespace(handle)
+        if first_char == "[":
+            texts = []
+            for item in _iter_json_array(handle):
+                if isinstance(item, str):
+                    texts.append(item)
+                elif isinstance(item, dict):
+                    texts.extend(_extract_strings_from_dict(item))
+            return "\n\n".join(texts)
+
+        data = json.load(handle)
 
     # Handle different JSON structures
     if isinstance(data, dict):
@@ -133,6 +252,74 @@ def _extract_from_json(file_path: Path) -> str:
         return str(data)
 
 
+def _peek_non_whitespace(handle: IO[str]) -> str:
+    """Return the first non-whitespace character and rewind the handle"""
+    while True:
+        char = handle.read(1)
+        if not char or not char.isspace():
+            handle.seek(0)
+            return char
+
+
+def _iter_json_array(handle: IO[str], chunk_size: int = _JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Incrementally decode the items of a top-level JSON array
+
+    Args:
+        handle: Text file handle positioned at the start of the document
+        chunk_size: Number of characters to read at a time
+
+    Yields:
+        Each decoded array item, in order
+
+    Raises:
+        json.JSONDecodeError: If the document is not a well-formed array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    eof = False
+    while not buffer and not eof:
+        chunk = handle.read(chunk_size)
+        eof = not chunk
+        buffer = chunk.lstrip()
+
+    if not buffer.startswith("["):
+        raise json.JSONDecodeError("Expected JSON array", buffer, 0)
+    buffer = buffer[1:]
+    read_size = chunk_size
+
+    while True:
+        buffer = buffer.lstrip()
+        if buffer.startswith(","):
+            buffer = buffer[1:]
+            continue
+        if buffer.startswith("]"):
+            return
+
+        if buffer:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # A number ending exactly at the buffer edge may continue in the next chunk
+                if end < len(buffer) or eof:
+                    yield item
+                    buffer = buffer[end:]
+                    read_size = chunk_size
+                    continue
+
+        if eof:
+            raise json.JSONDecodeError("Unterminated JSON array", buffer, len(buffer))
+
+        # Item spans past the buffer; grow reads geometrically so huge items stay linear
+        chunk = handle.read(read_size)
+        eof = not chunk
+        buffer += chunk
+        read_size *= 2
+
+
 def _extract_strings_from_dict(data: dict) -> list:
     """Recursively extract string values from a dictionary"""
     strings = []
@@ -153,18 +340,150 @@ def _extract_strings_from_dict(data: dict) -> list:
 
 
 def _clean_text(text: str) -> str:
-    """Clean extracted text"""
-    # Remove excessive whitespace
-    text = re.sub(r"\s+", " ", text)
-
-    # Remove leading/trailing whitespace
-    text = text.strip()
+    """Clean extracted text
 
+    Whitespace inside a paragraph collapses to single spaces; paragraphs
+    (separated by blank lines) are kept apart by a single blank line.
+    """
     # Remove common artifacts
     text = text.replace("\x00", "")  # Null bytes
     text = text.replace("\ufeff", "")  # BOM
 
-    return text
+    paragraphs = []
+    current: List[str] = []
+    for line in text.splitlines():
+        words = line.split()
+        if words:
+            current.extend(words)
+        elif current:
+            paragraphs.append(" ".join(current))
+            current = []
+    if current:
+        paragraphs.append(" ".join(current))
+
+    return "\n\n".join(paragraphs)
+
+
+def compute_content_hash(text: str) -> str:
+    """
+    Hash sample text for duplicate detection
+
+    Case and whitespace differences are ignored so the same post exported
+    twice in slightly different formats is still recognised as a duplicate.
+
+    Args:
+        text: Extracted sample text
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = " ".join(text.split()).casefold()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def collect_sample_files(paths: Iterable[Path], extract_dir: Path) -> List[Path]:
+    """
+    Expand directories and zip archives into a flat list of sample files
+
+    Args:
+        paths: Files, directories or .zip archives supplied by the user
+        extract_dir: Directory that supported zip members are extracted into
+
+    Returns:
+        Sorted paths of every supported file found (unsupported files skipped)
+    """
+    collected: List[Path] = []
+
+    for path in paths:
+        if path.is_dir():
+            collected.extend(
+                sorted(
+                    p
+                    for p in path.rglob("*")
+                    if p.is_file() and p.suffix.lower() in SUPPORTED_EXTENSIONS
+                )
+            )
+        elif path.suffix.lower() == ".zip":
+            collected.extend(_extract_zip_members(path, extract_dir))
+        else:
+            collected.append(path)
+
+    return collected
+
+
+def _extract_zip_members(archive_path: Path, extract_dir: Path) -> List[Path]:
+    """Extract supported members of a zip archive, flattening member paths"""
+    target_dir = extract_dir / archive_path.stem
+    target_dir.mkdir(parents=True, exist_ok=True)
+    extracted: List[Path] = []
+
+    with zipfile.ZipFile(archive_path) as archive:
+        for index, info in enumerate(archive.infolist()):
+            member_name = Path(info.filename).name
+            if info.is_dir() or member_name.startswith(".") or "__MACOSX" in info.filename:
+                continue
+            if Path(member_name).suffix.lower() not in SUPPORTED_EXTENSIONS:
+                continue
+
+            # Never trust member paths: flatten them, disambiguating repeated names
+            target = target_dir / member_name
+            if target.exists():
+                target = target_dir / f"{index}_{member_name}"
+            with archive.open(info) as source, open(target, "wb") as dest:
+                while True:
+                    block = source.read(1024 * 1024)
+                    if not block:
+                        break
+                    dest.write(block)
+            extracted.append(target)
+
+    return extracted
+
+
+def _extract_for_batch(file_path: Path) -> ExtractedText:
+    """Extract a single file, capturing errors (runs in worker processes)"""
+    try:
+        text, word_count = extract_text_from_file(file_path)
+    except Exception as e:
+        return ExtractedText(path=file_path, error=str(e) or type(e).__name__)
+
+    return ExtractedText(
+        path=file_path,
+        text=text,
+        word_count=word_count,
+        content_hash=compute_content_hash(text),
+    )
+
+
+def extract_texts_from_files(
+    file_paths: List[Path], max_workers: Optional[int] = None
+) -> List[ExtractedText]:
+    """
+    Extract text from many files, in parallel when worthwhile
+
+    Files are parsed in a process pool since docx/HTML/JSON parsing is CPU
+    bound. Failures are reported per file instead of aborting the batch.
+
+    Args:
+        file_paths: Files to extract
+        max_workers: Worker processes (None = CPU count, 1 = run serially)
+
+    Returns:
+        One ExtractedText per input path, in input order
+    """
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, len(file_paths))
+
+    if workers <= 1 or len(file_paths) < _PARALLEL_MIN_FILES:
+        return [_extract_for_batch(path) for path in file_paths]
+
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_extract_for_batch, file_paths, chunksize=chunksize))
+    except (OSError, NotImplementedError):
+        # Platforms without working multiprocessing primitives fall back to serial
+        return [_extract_for_batch(path) for path in file_paths]
 
 
 def validate_sample_text(
@@ -0,0 +1,142 @@
+"""Content-addressed cache for system prompt fragments
+
+Generation system prompts are assembled from fragments that change at very
+different rates: the base prompt plus platform guidance (identical for every
+client on a platform), the client's voice and archetype (stable per brief),
+SEO keyword guidance (per keyword strategy) and client memory (changes when a
+project completes). Each fragment is cached under a hash of exactly the
+inputs it renders, so multi-platform runs rebuild only the platform part and
+repeat clients get a byte-identical prompt run after run.
+
+The assembled prompt is a SystemPrompt: a plain str that also remembers its
+segments, letting the Anthropic client put a cache breakpoint after the
+shared platform segment as well as after the client segment.
+
+Usage:
+    cache = get_prompt_fragment_cache()
+    text = cache.get_or_build("platform", (platform.value,), lambda: render(platform))
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from .logger import logger
+
+
+class SystemPrompt(str):
+    """System prompt text that remembers its cacheable segments (most shared first)"""
+
+    segments: Tuple[str, ...]
+
+    def __new__(cls, segments: Iterable[str]) -> "SystemPrompt":
+        parts = tuple(segment for segment in segments if segment)
+        prompt = super().__new__(cls, "".join(parts))
+        prompt.segments = parts
+        return prompt
+
+    def __reduce__(self):
+        return (SystemPrompt, (self.segments,))
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable hash of JSON-serializable inputs (pydantic models via model_dump)"""
+
+    def normalize(value: Any) -> Any:
+        if hasattr(value, "model_dump"):
+            return value.model_dump(mode="json")
+        if hasattr(value, "value"):  # Enums
+            return value.value
+        return value
+
+    payload = json.dumps([normalize(part) for part in parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptFragmentCache:
+    """Thread-safe LRU cache of rendered prompt fragments keyed by content hash"""
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Initialize fragment cache
+
+        Args:
+            max_entries: Maximum number of fragments kept (default 512)
+        """
+        self.max_entries = max_entries
+        self._fragments: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = RLock()
+        self._hit_count = 0
+        self._miss_count = 0
+
+    def get_or_build(self, kind: str, key_parts: Tuple[Any, ...], build: Callable[[], str]) -> str:
+        """
+        Return a cached fragment, rendering it on first use
+
+        Args:
+            kind: Fragment kind (e.g. "platform", "client_voice", "client_memory")
+            key_parts: Every input the fragment depends on
+            build: Renders the fragment on a miss
+
+        Returns:
+            Fragment text
+        """
+        key = (kind, content_hash(*key_parts))
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is not None:
+                self._fragments.move_to_end(key)
+                self._hit_count += 1
+                return fragment
+            self._miss_count += 1
+
+        # Render outside the lock; a concurrent miss renders the same text
+        fragment = build()
+
+        with self._lock:
+            self._fragments[key] = fragment
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+
+        logger.debug(f"Built {kind} prompt fragment ({len(fragment)} chars)")
+        return fragment
+
+    def clear(self) -> None:
+        """Drop all fragments and reset statistics"""
+        with self._lock:
+            self._fragments.clear()
+            self._hit_count = 0
+            self._miss_count = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with size, hits, misses and hit rate
+        """
+        with self._lock:
+            total = self._hit_count + self._miss_count
+            return {
+                "size": len(self._fragments),
+                "max_entries": self.max_entries,
+                "hit_count": self._hit_count,
+                "miss_count": self._miss_count,
+                "hit_rate": self._hit_count / total if total else 0.0,
+            }
+
+
+_fragment_cache: Optional[PromptFragmentCache] = None
+_fragment_cache_lock = RLock()
+
+
+def get_prompt_fragment_cache() -> PromptFragmentCache:
+    """Return the process-wide prompt fragment cache"""
+    global _fragment_cache
+    with _fragment_cache_lock:
+        if _fragment_cache is None:
+            _fragment_cache = PromptFragmentCache()
+        return _fragment_cache
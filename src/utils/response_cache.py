@@ -22,8 +22,10 @@ Usage:
 import hashlib
 import json
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Protocol
 
 from ..utils.logger import logger
 
@@ -261,3 +263,66 @@ class ResponseCache:
             "oldest_timestamp": min(timestamps) if timestamps else None,
             "newest_timestamp": max(timestamps) if timestamps else None,
         }
+
+
+# ==================== Scoped response memo ====================
+
+
+class ResponseMemo(Protocol):
+    """Store consulted by AnthropicClient for calls made inside response_memo_scope
+
+    put() receives responses before the caller has parsed them; confirm() and
+    discard() report whether the caller could use a response, so a memo can
+    avoid replaying malformed ones.
+    """
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def put(self, key: str, response: str) -> None: ...
+
+    def confirm(self, response: str) -> None: ...
+
+    def discard(self, response: str) -> None: ...
+
+
+_response_memo: ContextVar[Optional[ResponseMemo]] = ContextVar("response_memo", default=None)
+
+
+@contextmanager
+def response_memo_scope(memo: ResponseMemo) -> Iterator[ResponseMemo]:
+    """Memoize every API response requested in this context
+
+    Unlike ResponseCache (global, dev/testing only) the memo is chosen by the
+    caller for one unit of work, e.g. a research run. Contextvars follow asyncio
+    tasks and copied contexts, so fanned-out calls are covered too.
+    """
+    token = _response_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _response_memo.reset(token)
+
+
+def get_response_memo() -> Optional[ResponseMemo]:
+    """Return the memo of the active response_memo_scope, if any"""
+    return _response_memo.get()
+
+
+def confirm_memoized(response: str) -> None:
+    """Report that a response was parsed successfully (no-op outside a memo scope)"""
+    memo = _response_memo.get()
+    if memo is not None:
+        memo.confirm(response)
+
+
+def discard_memoized(response: str) -> None:
+    """Report that a response could not be parsed, so it is not replayed"""
+    memo = _response_memo.get()
+    if memo is not None:
+        memo.discard(response)
+
+
+def request_key(**request: Any) -> str:
+    """Deterministic hash of everything that shapes an API response"""
+    content_str = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(content_str.encode()).hexdigest()
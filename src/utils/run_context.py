@@ -0,0 +1,310 @@
+"""Run-scoped API usage accounting
+
+A run scope tags every Anthropic API call made while it is active, however
+deep in the call stack, with the run/project it belongs to and the operation
+being performed. Scopes live in contextvars, so they follow asyncio tasks
+(asyncio.gather, create_task) and asyncio.to_thread without any parameter
+threading.
+
+Usage:
+    with run_scope(run_id="run-abc123", project_id="proj-1") as usage:
+        with operation_scope("post_generation"):
+            posts = await generator.generate_posts_async(...)
+
+    print(usage.to_dict())  # tokens, cache, latency, retries, cost per operation
+
+    # Agents tag their own calls, joining the caller's run when there is one
+    @tracked_operation("post_regeneration")
+    def regenerate_failed_posts(...): ...
+"""
+
+import asyncio
+import functools
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from .logger import logger
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_current_run: ContextVar[Optional["RunUsage"]] = ContextVar("current_run", default=None)
+_current_operation: ContextVar[Optional[str]] = ContextVar("current_operation", default=None)
+
+_COUNTER_FIELDS = (
+    "api_calls",
+    "failed_calls",
+    "retries",
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_tokens",
+    "cache_read_tokens",
+)
+_TIMING_FIELDS = ("api_latency_ms", "queue_wait_ms")
+
+
+def _empty_totals() -> Dict[str, float]:
+    totals: Dict[str, float] = {name: 0 for name in _COUNTER_FIELDS}
+    totals.update({name: 0.0 for name in _TIMING_FIELDS})
+    totals["cost_usd"] = 0.0
+    return totals
+
+
+@dataclass
+class RunUsage:
+    """Accumulated API usage for one run, overall and per operation"""
+
+    run_id: str
+    project_id: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    totals: Dict[str, float] = field(default_factory=_empty_totals)
+    operations: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    _pending_costs: List[Tuple[Any, Dict[str, Any]]] = field(
+        default_factory=list, repr=False, compare=False
+    )
+
+    def record_call(
+        self,
+        operation: str,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        cache_creation_tokens: int = 0,
+        cache_read_tokens: int = 0,
+        latency_ms: float = 0.0,
+        retries: int = 0,
+        cost_usd: float = 0.0,
+        failed: bool = False,
+    ) -> None:
+        """Record one API call (including its retries) against an operation"""
+        values = {
+            "api_calls": 1,
+            "failed_calls": 1 if failed else 0,
+            "retries": retries,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_tokens": cache_creation_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "api_latency_ms": latency_ms,
+            "cost_usd": cost_usd,
+        }
+        self._add(operation, values)
+
+    def record_queue_wait(self, operation: str, wait_ms: float) -> None:
+        """Record time spent waiting for a concurrency slot before calling the API"""
+        self._add(operation, {"queue_wait_ms": wait_ms})
+
+    def merge_summary(self, summary: Dict[str, Any]) -> None:
+        """Fold another run's to_dict() summary (e.g. from a worker process) into this run"""
+        for operation, values in summary.get("operations", {}).items():
+            self._add(
+                operation,
+                {
+                    key: values.get(key, 0)
+                    for key in (*_COUNTER_FIELDS, *_TIMING_FIELDS, "cost_usd")
+                },
+            )
+
+    def defer_cost_record(self, tracker: Any, call: Dict[str, Any]) -> None:
+        """Queue a call for tracker.track_api_calls(), written when the run ends"""
+        with self._lock:
+            self._pending_costs.append((tracker, call))
+
+    def flush_cost_records(self) -> int:
+        """Write queued cost records, one batch per tracker
+
+        Returns:
+            Number of records handed to their trackers
+        """
+        with self._lock:
+            pending, self._pending_costs = self._pending_costs, []
+
+        batches: Dict[int, Tuple[Any, List[Dict[str, Any]]]] = {}
+        for tracker, call in pending:
+            batches.setdefault(id(tracker), (tracker, []))[1].append(call)
+        for tracker, calls in batches.values():
+            try:
+                tracker.track_api_calls(calls)
+            except Exception as e:
+                logger.warning(f"Failed to track API cost: {e}")
+        return len(pending)
+
+    def operation_tokens(self, operation: str) -> int:
+        """Total tokens (prompt, cached and output) billed so far to an operation"""
+        with self._lock:
+            values = self.operations.get(operation)
+            if values is None:
+                return 0
+            return int(
+                values["input_tokens"]
+                + values["output_tokens"]
+                + values["cache_creation_tokens"]
+                + values["cache_read_tokens"]
+            )
+
+    def _add(self, operation: str, values: Dict[str, float]) -> None:
+        with self._lock:
+            per_operation = self.operations.setdefault(operation, _empty_totals())
+            for key, value in values.items():
+                self.totals[key] += value
+                per_operation[key] += value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary suitable for JSON storage (e.g. Run.usage_summary)"""
+        with self._lock:
+            totals = dict(self.totals)
+            operations = {name: dict(values) for name, values in self.operations.items()}
+
+        def finish(values: Dict[str, float]) -> Dict[str, Any]:
+            prompt_tokens = (
+                values["input_tokens"]
+                + values["cache_creation_tokens"]
+                + values["cache_read_tokens"]
+            )
+            values["cache_hit_rate"] = (
+                round(values["cache_read_tokens"] / prompt_tokens, 4) if prompt_tokens else 0.0
+            )
+            values["avg_latency_ms"] = (
+                round(values["api_latency_ms"] / values["api_calls"], 1)
+                if values["api_calls"]
+                else 0.0
+            )
+            values["api_latency_ms"] = round(values["api_latency_ms"], 1)
+            values["queue_wait_ms"] = round(values["queue_wait_ms"], 1)
+            values["cost_usd"] = round(values["cost_usd"], 6)
+            return values
+
+        return {
+            "run_id": self.run_id,
+            "project_id": self.project_id,
+            "wall_time_ms": round((time.time() - self.started_at) * 1000, 1),
+            **finish(totals),
+            "operations": {name: finish(values) for name, values in operations.items()},
+        }
+
+
+def get_current_run() -> Optional[RunUsage]:
+    """Return the active run's usage accumulator, if any"""
+    return _current_run.get()
+
+
+def get_current_operation() -> Optional[str]:
+    """Return the operation tag of the innermost active scope, if any"""
+    return _current_operation.get()
+
+
+@contextmanager
+def run_scope(
+    run_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    operation: Optional[str] = None,
+) -> Iterator[RunUsage]:
+    """
+    Attribute API calls made inside the block to a run
+
+    If a run is already active the block joins it (only the operation tag
+    changes), so library code can open a scope unconditionally and still
+    roll up into the caller's run. Cost records of the run's calls are
+    written to the cost database in one batch when the outermost scope exits.
+
+    Args:
+        run_id: Run identifier (generated when omitted)
+        project_id: Project the run's costs are charged to
+        operation: Operation tag for calls made in the block
+
+    Yields:
+        RunUsage accumulator for the run
+    """
+    usage = _current_run.get()
+    run_token = None
+    if usage is None:
+        usage = RunUsage(run_id=run_id or f"run-{uuid.uuid4().hex[:12]}", project_id=project_id)
+        run_token = _current_run.set(usage)
+
+    operation_token = _current_operation.set(operation) if operation else None
+    try:
+        yield usage
+    finally:
+        if operation_token is not None:
+            _current_operation.reset(operation_token)
+        if run_token is not None:
+            _current_run.reset(run_token)
+            usage.flush_cost_records()
+            _log_run_summary(usage)
+
+
+def _log_run_summary(usage: RunUsage) -> None:
+    """Log a one-line usage summary when a run that made API calls ends"""
+    summary = usage.to_dict()
+    if not summary["api_calls"]:
+        return
+
+    logger.info(
+        f"Run {usage.run_id} usage: {summary['api_calls']} calls "
+        f"({summary['retries']} retries, {summary['failed_calls']} failed), "
+        f"{summary['input_tokens']:,} in / {summary['output_tokens']:,} out tokens, "
+        f"cache {summary['cache_read_tokens']:,} read / "
+        f"{summary['cache_creation_tokens']:,} written, "
+        f"avg latency {summary['avg_latency_ms']:.0f}ms, "
+        f"queue wait {summary['queue_wait_ms']:.0f}ms, ${summary['cost_usd']:.4f}"
+    )
+
+
+@contextmanager
+def operation_scope(operation: str) -> Iterator[Optional[RunUsage]]:
+    """
+    Tag API calls made inside the block with an operation name
+
+    Args:
+        operation: Operation tag (e.g. "post_generation", "research:voice_analysis")
+
+    Yields:
+        The active RunUsage, or None when no run is active
+    """
+    token = _current_operation.set(operation)
+    try:
+        yield _current_run.get()
+    finally:
+        _current_operation.reset(token)
+
+
+def tracked_operation(operation: str) -> Callable[[F], F]:
+    """
+    Decorator running a function (sync or async) inside run_scope(operation=...)
+
+    Args:
+        operation: Operation tag for API calls made by the function
+
+    Returns:
+        Decorator preserving the wrapped function's signature
+    """
+
+    def decorator(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with run_scope(operation=operation):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with run_scope(operation=operation):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def record_queue_wait(wait_seconds: float) -> None:
+    """Attribute time spent waiting for a concurrency slot to the active run"""
+    run = _current_run.get()
+    if run is not None:
+        run.record_queue_wait(_current_operation.get() or "api_call", wait_seconds * 1000)
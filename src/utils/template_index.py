@@ -0,0 +1,315 @@
+"""Precompiled template index with bitset selection
+
+The template library is parsed once into a TemplateIndex: templates in
+library order plus integer bitsets (bit i = i-th template) for requirements,
+types, difficulty and, per client type, the preferred and avoided templates
+from TEMPLATE_PREFERENCES. Selecting templates for a client is then a few
+mask intersections instead of filtered list copies and list.remove() passes.
+
+The index is also written to settings.TEMPLATE_INDEX_DIR as JSON, keyed by
+the library file, so freshly spawned worker processes load it directly
+instead of regex-parsing the Markdown library again. The file is only used
+while the library's mtime/size and the selection rules still match.
+
+Usage:
+    index = TemplateIndex.build(templates)
+    selected = index.select(client_type, client_brief, count=15)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from ..config.settings import settings
+from ..config.template_rules import TEMPLATE_PREFERENCES, ClientType
+from ..models.template import Template, TemplateDifficulty, TemplateType
+from .logger import logger
+
+# Bump when the serialized layout changes
+INDEX_FORMAT_VERSION = 1
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the positions of set bits in ascending order"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _rules_fingerprint() -> str:
+    """Hash of TEMPLATE_PREFERENCES, so stale precomputed masks are never loaded"""
+    rules = {
+        client_type.value: {
+            key: [template_type.value for template_type in types]
+            for key, types in sorted(preferences.items())
+        }
+        for client_type, preferences in TEMPLATE_PREFERENCES.items()
+    }
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class TemplateIndex:
+    """Immutable template library compiled into bitsets"""
+
+    def __init__(
+        self,
+        templates: Sequence[Template],
+        type_masks: Dict[TemplateType, int],
+        difficulty_masks: Dict[TemplateDifficulty, int],
+        requires_story_mask: int,
+        requires_question_mask: int,
+        preferred_masks: Dict[ClientType, int],
+        avoid_type_masks: Dict[ClientType, int],
+    ):
+        """
+        Initialize from precomputed masks (use build() or from_dict())
+
+        Args:
+            templates: Templates in library order (bit i = templates[i])
+            type_masks: Templates of each type
+            difficulty_masks: Templates of each difficulty
+            requires_story_mask: Templates needing client stories
+            requires_question_mask: Templates needing customer questions
+            preferred_masks: Preferred templates per client type
+            avoid_type_masks: Templates of avoided types per client type
+        """
+        self.templates = tuple(templates)
+        self.all_mask = (1 << len(self.templates)) - 1
+        self.type_masks = type_masks
+        self.difficulty_masks = difficulty_masks
+        self.requires_story_mask = requires_story_mask
+        self.requires_question_mask = requires_question_mask
+        self.preferred_masks = preferred_masks
+        self.avoid_type_masks = avoid_type_masks
+        self._positions = {template.template_id: i for i, template in enumerate(self.templates)}
+
+    @classmethod
+    def build(cls, templates: Sequence[Template]) -> "TemplateIndex":
+        """
+        Compile templates into an index
+
+        Args:
+            templates: Templates in library order
+
+        Returns:
+            TemplateIndex with all masks precomputed
+        """
+        type_masks: Dict[TemplateType, int] = {}
+        difficulty_masks: Dict[TemplateDifficulty, int] = {}
+        requires_story_mask = 0
+        requires_question_mask = 0
+
+        for i, template in enumerate(templates):
+            bit = 1 << i
+            type_masks[template.template_type] = type_masks.get(template.template_type, 0) | bit
+            difficulty_masks[template.difficulty] = (
+                difficulty_masks.get(template.difficulty, 0) | bit
+            )
+            if template.requires_story:
+                requires_story_mask |= bit
+            if template.requires_question:
+                requires_question_mask |= bit
+
+        def types_mask(types: Iterable[TemplateType]) -> int:
+            mask = 0
+            for template_type in types:
+                mask |= type_masks.get(template_type, 0)
+            return mask
+
+        preferred_masks = {}
+        avoid_type_masks = {}
+        for client_type in ClientType:
+            preferences = TEMPLATE_PREFERENCES.get(
+                client_type, TEMPLATE_PREFERENCES[ClientType.UNKNOWN]
+            )
+            preferred_masks[client_type] = types_mask(preferences["preferred"])
+            avoid_type_masks[client_type] = types_mask(preferences["avoid"])
+
+        return cls(
+            templates=templates,
+            type_masks=type_masks,
+            difficulty_masks=difficulty_masks,
+            requires_story_mask=requires_story_mask,
+            requires_question_mask=requires_question_mask,
+            preferred_masks=preferred_masks,
+            avoid_type_masks=avoid_type_masks,
+        )
+
+    def __len__(self) -> int:
+        return len(self.templates)
+
+    def templates_for(self, mask: int) -> List[Template]:
+        """Templates whose bits are set, in library order"""
+        return [self.templates[i] for i in iter_bits(mask)]
+
+    def get(self, template_id: int) -> Optional[Template]:
+        """Template by ID, or None"""
+        position = self._positions.get(template_id)
+        return None if position is None else self.templates[position]
+
+    def ids_mask(self, template_ids: Optional[Iterable[int]]) -> int:
+        """Mask of the given template IDs (unknown IDs are ignored)"""
+        mask = 0
+        for template_id in template_ids or ():
+            position = self._positions.get(template_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def fillable_mask(self, client_brief) -> int:
+        """Templates the brief has data for (same rules as Template.can_be_filled)"""
+        mask = self.all_mask
+        if not client_brief.stories:
+            mask &= ~self.requires_story_mask
+        if not client_brief.customer_questions:
+            mask &= ~self.requires_question_mask
+        return mask
+
+    def select(
+        self,
+        client_type: ClientType,
+        client_brief,
+        count: int,
+        boost_templates: Optional[Iterable[int]] = None,
+        avoid_templates: Optional[Iterable[int]] = None,
+    ) -> List[Template]:
+        """
+        Select templates for a client in priority order
+
+        Passes, each taking templates in library order until count is reached:
+        boosted (client memory) and fillable; preferred type, fillable and not
+        avoided; fillable and neither avoided type nor avoided ID; any template
+        not avoided by ID; finally the ID-avoided ones as a last resort.
+
+        Args:
+            client_type: Classified client type
+            client_brief: ClientBrief (stories / customer_questions decide fillability)
+            count: Number of templates to select
+            boost_templates: Template IDs to prioritize
+            avoid_templates: Template IDs to deprioritize
+
+        Returns:
+            Selected templates, in selection order
+        """
+        fillable = self.fillable_mask(client_brief)
+        avoid_ids = self.ids_mask(avoid_templates)
+        preferred = self.preferred_masks[client_type]
+        avoid_types = self.avoid_type_masks[client_type]
+
+        selected: List[int] = []
+        remaining = self.all_mask
+
+        for candidates in (
+            lambda: self.ids_mask(boost_templates) & fillable,
+            lambda: remaining & preferred & fillable & ~avoid_ids,
+            lambda: remaining & fillable & ~avoid_types & ~avoid_ids,
+            lambda: remaining & ~avoid_ids,
+            lambda: remaining,
+        ):
+            for position in iter_bits(candidates()):
+                if len(selected) >= count:
+                    break
+                selected.append(position)
+                remaining &= ~(1 << position)
+
+        return [self.templates[i] for i in selected]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (masks as ints keyed by enum value)"""
+        return {
+            "format": INDEX_FORMAT_VERSION,
+            "rules": _rules_fingerprint(),
+            "templates": [template.model_dump(mode="json") for template in self.templates],
+            "type_masks": {key.value: mask for key, mask in self.type_masks.items()},
+            "difficulty_masks": {key.value: mask for key, mask in self.difficulty_masks.items()},
+            "requires_story_mask": self.requires_story_mask,
+            "requires_question_mask": self.requires_question_mask,
+            "preferred_masks": {key.value: mask for key, mask in self.preferred_masks.items()},
+            "avoid_type_masks": {key.value: mask for key, mask in self.avoid_type_masks.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TemplateIndex":
+        """Rebuild from to_dict() output without recomputing any mask"""
+        return cls(
+            templates=[Template.model_validate(template) for template in data["templates"]],
+            type_masks={TemplateType(k): v for k, v in data["type_masks"].items()},
+            difficulty_masks={
+                TemplateDifficulty(k): v for k, v in data["difficulty_masks"].items()
+            },
+            requires_story_mask=data["requires_story_mask"],
+            requires_question_mask=data["requires_question_mask"],
+            preferred_masks={ClientType(k): v for k, v in data["preferred_masks"].items()},
+            avoid_type_masks={ClientType(k): v for k, v in data["avoid_type_masks"].items()},
+        )
+
+
+def _index_path(template_file: Path) -> Path:
+    digest = hashlib.sha256(str(template_file.resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path(settings.TEMPLATE_INDEX_DIR) / f"templates_{digest}.json"
+
+
+def _source_key(template_file: Path) -> Dict[str, Any]:
+    stat = template_file.stat()
+    return {
+        "path": str(template_file.resolve()),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+def load_compiled_index(template_file: Path) -> Optional[TemplateIndex]:
+    """
+    Load the compiled index for a library file if it is still current
+
+    Args:
+        template_file: Template library Markdown file
+
+    Returns:
+        TemplateIndex, or None if missing, stale or unreadable
+    """
+    index_path = _index_path(template_file)
+    try:
+        data = json.loads(index_path.read_bytes())
+        if (
+            data.get("format") != INDEX_FORMAT_VERSION
+            or data.get("rules") != _rules_fingerprint()
+            or data.get("source") != _source_key(template_file)
+        ):
+            return None
+        return TemplateIndex.from_dict(data)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable template index {index_path}: {str(e)}")
+        return None
+
+
+def save_compiled_index(index: TemplateIndex, template_file: Path) -> Optional[Path]:
+    """
+    Write the compiled index for a library file (best effort)
+
+    Written to a temporary file and renamed, so concurrent workers never read
+    a partial index.
+
+    Args:
+        index: Compiled index
+        template_file: Template library the index was parsed from
+
+    Returns:
+        Path written, or None if the cache directory is not writable
+    """
+    index_path = _index_path(template_file)
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {**index.to_dict(), "source": _source_key(template_file)}
+        tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, index_path)
+        return index_path
+    except OSError as e:
+        logger.warning(f"Could not write template index {index_path}: {str(e)}")
+        return None
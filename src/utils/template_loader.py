@@ -11,6 +11,7 @@ from ..config.template_rules import TEMPLATE_PREFERENCES, ClientType
 from ..models.template import Template, TemplateDifficulty, TemplateType
 from .logger import logger
 from .template_cache import get_cache_manager
+from .template_index import TemplateIndex, load_compiled_index, save_compiled_index
 
 # Compiled regex patterns for performance
 PLACEHOLDER_PATTERN = re.compile(r"\[([A-Z][A-Z\s/_-]*?)\]")
@@ -19,6 +20,9 @@ STRUCTURE_PATTERN = re.compile(r"```\n(.*?)\n```", re.DOTALL)
 BEST_FOR_PATTERN = re.compile(r"\*\*Best for:\*\* (.+?)(?:\n|\*\*)")
 NAME_PATTERN = re.compile(r"(.+?)\n")
 
+# Stateless, so one instance serves every selection
+_classifier = ClientClassifier()
+
 
 class TemplateLoader:
     """Loads and parses templates from the template library file"""
@@ -60,6 +64,8 @@ class TemplateLoader:
             raise FileNotFoundError(f"Template library not found: {self.template_file}")
 
         self.templates: List[Template] = []
+        self._index: Optional[TemplateIndex] = None
+        self._index_source: Optional[List[Template]] = None
         self._load_templates()
 
     def _load_templates(self) -> None:
@@ -74,11 +80,22 @@ class TemplateLoader:
             logger.debug(f"Loaded {len(self.templates)} templates from cache")
             return
 
-        logger.info(f"Parsing templates from {self.template_file}")
-
         # Get file modification time for cache entry
         current_mtime = self.template_file.stat().st_mtime
 
+        # Next, a compiled index left by another process (e.g. a worker spawned earlier)
+        compiled = load_compiled_index(self.template_file)
+        if compiled is not None:
+            self.templates = list(compiled.templates)
+            self._set_index(compiled)
+            cache_manager.put(
+                path=self.template_file, templates=self.templates, mtime=current_mtime
+            )
+            logger.debug(f"Loaded {len(self.templates)} templates from compiled index")
+            return
+
+        logger.info(f"Parsing templates from {self.template_file}")
+
         content = self.template_file.read_text(encoding="utf-8")
 
         # Split by template headers using compiled pattern
@@ -138,9 +155,25 @@ class TemplateLoader:
 
         # Store in cache
         cache_manager.put(path=self.template_file, templates=self.templates, mtime=current_mtime)
+        save_compiled_index(self.index, self.template_file)
 
         logger.info(f"Loaded {len(self.templates)} templates successfully")
 
+    def _set_index(self, index: TemplateIndex) -> None:
+        self._index = index
+        self._index_source = self.templates
+
+    @property
+    def index(self) -> TemplateIndex:
+        """Bitset index over self.templates (rebuilt if the list is replaced or resized)"""
+        if (
+            self._index is None
+            or self._index_source is not self.templates
+            or len(self._index) != len(self.templates)
+        ):
+            self._set_index(TemplateIndex.build(self.templates))
+        return self._index  # type: ignore[return-value]
+
     def _infer_template_type(self, name: str) -> TemplateType:
         """Infer template type from name"""
         for keyword, template_type in self.TEMPLATE_TYPE_MAP.items():
@@ -250,18 +283,17 @@ class TemplateLoader:
 
     def get_template_by_id(self, template_id: int) -> Optional[Template]:
         """Get a specific template by ID"""
-        for template in self.templates:
-            if template.template_id == template_id:
-                return template
-        return None
+        return self.index.get(template_id)
 
     def get_templates_by_type(self, template_type: TemplateType) -> List[Template]:
         """Get all templates of a specific type"""
-        return [t for t in self.templates if t.template_type == template_type]
+        index = self.index
+        return index.templates_for(index.type_masks.get(template_type, 0))
 
     def get_templates_by_difficulty(self, difficulty: TemplateDifficulty) -> List[Template]:
         """Get all templates of a specific difficulty"""
-        return [t for t in self.templates if t.difficulty == difficulty]
+        index = self.index
+        return index.templates_for(index.difficulty_masks.get(difficulty, 0))
 
     def select_templates_for_client(
         self,
@@ -283,8 +315,7 @@ class TemplateLoader:
             List of selected templates optimized for client type
         """
         # Classify client to determine template preferences
-        classifier = ClientClassifier()
-        client_type, confidence = classifier.classify_client(client_brief)
+        client_type, confidence = _classifier.classify_client(client_brief)
 
         logger.info(f"Client type: {client_type.value} (confidence: {confidence:.1%})")
 
@@ -299,51 +330,14 @@ class TemplateLoader:
         boost_ids = set(boost_templates or [])
         avoid_ids = set(avoid_templates or [])
 
-        selected: List[Template] = []
-        remaining = self.templates.copy()
-
-        # Pass 0: Prioritize boost templates from client memory (highest priority)
-        if boost_ids:
-            boosted_templates = [t for t in remaining if t.template_id in boost_ids]
-            for template in boosted_templates:
-                can_fill, _ = template.can_be_filled(client_brief)
-                if can_fill and len(selected) < count:
-                    selected.append(template)
-                    remaining.remove(template)
-                    logger.debug(f"Boosted template {template.template_id} (client memory)")
-
-        # Pass 1: Add preferred templates that can be filled (excluding memory avoids)
-        preferred_templates = [
-            t
-            for t in remaining
-            if t.template_type in preferred_types and t.template_id not in avoid_ids
-        ]
-        for template in preferred_templates:
-            can_fill, _ = template.can_be_filled(client_brief)
-            if can_fill and len(selected) < count:
-                selected.append(template)
-                remaining.remove(template)
-
-        # Pass 2: Add other fillable templates (excluding avoided types and memory avoids)
-        neutral_templates = [
-            t
-            for t in remaining
-            if t.template_type not in avoid_types and t.template_id not in avoid_ids
-        ]
-        for template in neutral_templates:
-            can_fill, _ = template.can_be_filled(client_brief)
-            if can_fill and len(selected) < count:
-                selected.append(template)
-                remaining.remove(template)
-
-        # Pass 3: If still need more, add remaining (excluding memory avoids, but allowing type avoids)
-        available_remaining = [t for t in remaining if t.template_id not in avoid_ids]
-        while len(selected) < count and available_remaining:
-            selected.append(available_remaining.pop(0))
-
-        # Pass 4: Last resort - add memory avoided templates if absolutely necessary
-        while len(selected) < count and remaining:
-            selected.append(remaining.pop(0))
+        # Boosted, preferred, neutral, then fallback passes as bitset intersections
+        selected = self.index.select(
+            client_type,
+            client_brief,
+            count,
+            boost_templates=boost_ids,
+            avoid_templates=avoid_ids,
+        )
 
         # Shuffle for variety in final output
         random.shuffle(selected)
@@ -0,0 +1,418 @@
+"""Persistent in-process worker pool for generation, revision and research jobs
+
+Replaces spawning a fresh interpreter per run (run_jumpstart.py /
+03_post_generator.py subprocesses whose stdout had to be scraped for output
+paths). Workers are long-lived processes that import the src tree once and
+keep their agents, loaded templates, HTTP clients and event loop warm between
+jobs. Jobs and results are plain dataclasses passed over the executor's
+pickle channel, so callers get structured results instead of parsing text.
+
+API usage recorded inside a worker is returned with the result and folded
+into the caller's active run (see run_context), so costs of pooled runs are
+attributed exactly like in-process calls. Jobs carry the run and project the
+worker charges its calls to; when omitted they are taken from the caller's
+active run.
+
+Usage:
+    pool = get_worker_pool()
+    result = await pool.submit(GenerationJob(brief_path="brief.txt", num_posts=30))
+    if result.success:
+        print(result.output_dir, len(result.posts))
+
+Set settings.GENERATION_WORKERS = 0 to run jobs on a thread of the calling
+process instead (tests, environments without multiprocessing).
+"""
+
+import asyncio
+import dataclasses
+import importlib
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Type, Union
+
+from ..config.settings import settings
+from .logger import logger
+from .run_context import get_current_run, run_scope
+
+
+@dataclass
+class GenerationJob:
+    """Run the complete content workflow for one brief"""
+
+    brief_path: str
+    num_posts: int = 30
+    platform: Optional[str] = None  # Platform value, e.g. "linkedin"
+    voice_samples: Optional[List[str]] = None  # Sample texts (not paths)
+    template_quantities: Optional[Dict[str, int]] = None
+    include_analytics: bool = True
+    include_docx: bool = True
+    auto_fix: bool = False
+    register_project: bool = False  # Record the run in the revision tracking database
+    client_name: Optional[str] = None  # Project client name (defaults to the brief's company)
+    run_id: Optional[str] = None  # Run the worker's API calls are recorded under
+    project_id: Optional[str] = None  # Project the worker's API costs are charged to
+
+
+@dataclass
+class RevisionJob:
+    """Revise posts (Post.model_dump() dicts) against client feedback"""
+
+    brief_path: str
+    posts: List[Dict[str, Any]]
+    client_feedback: str
+    run_id: Optional[str] = None
+    project_id: Optional[str] = None
+
+
+@dataclass
+class ResearchJob:
+    """Execute one research tool"""
+
+    tool_path: str  # "module:ClassName" of the ResearchTool subclass
+    project_id: str
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    force_refresh: bool = False  # Bypass the research result cache
+    run_id: Optional[str] = None
+
+    @classmethod
+    def for_tool(
+        cls,
+        tool_class: Type,
+        project_id: str,
+        inputs: Optional[Dict[str, Any]] = None,
+        run_id: Optional[str] = None,
+    ) -> "ResearchJob":
+        """Build a job for a ResearchTool subclass"""
+        return cls(
+            tool_path=f"{tool_class.__module__}:{tool_class.__qualname__}",
+            project_id=project_id,
+            inputs=inputs or {},
+            run_id=run_id,
+        )
+
+
+Job = Union[GenerationJob, RevisionJob, ResearchJob]
+
+
+@dataclass
+class JobResult:
+    """Structured outcome of a pooled job"""
+
+    success: bool
+    error: Optional[str] = None
+    output_dir: Optional[str] = None
+    files: Dict[str, str] = field(default_factory=dict)
+    posts: List[Dict[str, Any]] = field(default_factory=list)
+    changes: List[str] = field(default_factory=list)  # Revision summaries, one per post
+    project_id: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    usage: Optional[Dict[str, Any]] = None  # RunUsage.to_dict() of the job
+    duration_seconds: float = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+# Per-thread so inline mode (GENERATION_WORKERS=0) can use a thread pool too
+_worker_state = threading.local()
+
+
+def _init_worker() -> None:
+    """Warm a worker: import the agent stack and build long-lived agents"""
+    from ..agents.coordinator import CoordinatorAgent
+    from ..agents.revision_agent import RevisionAgent
+
+    coordinator = CoordinatorAgent()
+    _worker_state.coordinator = coordinator
+    _worker_state.revision_agent = RevisionAgent(client=coordinator.content_generator.client)
+    _worker_state.loop = asyncio.new_event_loop()
+    importlib.import_module("src.research")
+
+
+def _warm_worker() -> None:
+    """Process initializer: warm up, leaving failures to surface per job"""
+    try:
+        _init_worker()
+    except Exception as e:
+        # A raising initializer breaks the whole pool; _state() retries per job
+        logger.warning(f"Generation worker warm-up failed: {str(e)}")
+
+
+def _state() -> threading.local:
+    if not hasattr(_worker_state, "coordinator"):
+        _init_worker()
+    return _worker_state
+
+
+def _run_job(job: Job) -> JobResult:
+    """Execute a job inside a worker (top-level so it pickles)"""
+    start = time.time()
+    try:
+        # Nested run_scope() calls in tools and agents join this run
+        with run_scope(run_id=job.run_id, project_id=job.project_id) as usage:
+            if isinstance(job, GenerationJob):
+                result = _state().loop.run_until_complete(_run_generation(job))
+            elif isinstance(job, RevisionJob):
+                result = _state().loop.run_until_complete(_run_revision(job))
+            elif isinstance(job, ResearchJob):
+                result = _run_research(job)
+            else:
+                raise TypeError(f"Unsupported job type: {type(job).__name__}")
+        result.usage = usage.to_dict()
+    except Exception as e:
+        logger.error(f"{type(job).__name__} failed: {str(e)}", exc_info=True)
+        result = JobResult(success=False, error=str(e))
+
+    result.duration_seconds = round(time.time() - start, 2)
+    return result
+
+
+async def _run_generation(job: GenerationJob) -> JobResult:
+    from ..models.client_brief import Platform
+
+    coordinator = _state().coordinator
+    saved_files = await coordinator.run_complete_workflow(
+        brief_input=Path(job.brief_path),
+        voice_samples=job.voice_samples,
+        num_posts=job.num_posts,
+        template_quantities=job.template_quantities,
+        platform=Platform(job.platform) if job.platform else None,
+        include_analytics=job.include_analytics,
+        include_docx=job.include_docx,
+        auto_fix=job.auto_fix,
+    )
+
+    posts: List[Dict[str, Any]] = []
+    posts_json = saved_files.get("posts_json")
+    if posts_json and Path(posts_json).exists():
+        posts = json.loads(Path(posts_json).read_text(encoding="utf-8"))
+
+    output_dir = str(next(iter(saved_files.values())).parent) if saved_files else None
+    result = JobResult(
+        success=True,
+        output_dir=output_dir,
+        files={key: str(path) for key, path in saved_files.items()},
+        posts=posts,
+    )
+
+    if job.register_project:
+        result.project_id = _register_project(job, saved_files, posts)
+
+    return result
+
+
+def _register_project(
+    job: GenerationJob, saved_files: Dict[str, Path], posts: List[Dict[str, Any]]
+) -> Optional[str]:
+    """Record a generation run for revision tracking (same as the CLI generate command)"""
+    from datetime import datetime
+
+    from ..database.project_db import ProjectDatabase
+    from ..models.project import Project, ProjectStatus
+
+    client_name = job.client_name or (posts[0]["client_name"] if posts else "Unknown")
+    project_id = f"{client_name.replace(' ', '')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+    try:
+        ProjectDatabase().create_project(
+            Project(
+                project_id=project_id,
+                client_name=client_name,
+                deliverable_path=str(saved_files.get("deliverable", "")),
+                brief_path=job.brief_path,
+                num_posts=len(posts),
+                status=ProjectStatus.COMPLETED,
+            )
+        )
+    except Exception as e:
+        # Don't fail the whole generation if database registration fails
+        logger.warning(f"Project registration failed: {str(e)}")
+        return None
+
+    return project_id
+
+
+async def _run_revision(job: RevisionJob) -> JobResult:
+    from ..models.post import Post
+
+    state = _state()
+    client_brief = await state.coordinator._process_brief_input(Path(job.brief_path))
+    templates = state.coordinator.content_generator.template_loader.get_all_templates()
+
+    revisions = await state.revision_agent.revise_multiple_posts_async(
+        posts=[Post(**post) for post in job.posts],
+        client_feedback=job.client_feedback,
+        client_brief=client_brief,
+        templates=templates,
+    )
+
+    return JobResult(
+        success=True,
+        posts=[post.model_dump(mode="json") for post, _ in revisions],
+        changes=[changes for _, changes in revisions],
+    )
+
+
+def _run_research(job: ResearchJob) -> JobResult:
+    module_name, _, class_name = job.tool_path.partition(":")
+    tool_class = getattr(importlib.import_module(module_name), class_name)
+
+    research = tool_class(project_id=job.project_id).execute(
+        job.inputs, force_refresh=job.force_refresh
+    )
+
+    return JobResult(
+        success=research.success,
+        error=research.error,
+        files={key: str(path) for key, path in research.outputs.items()},
+        metadata={
+            **research.metadata,
+            "executed_at": research.executed_at.isoformat(),
+            "tool_name": research.tool_name,
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# Caller side
+# ---------------------------------------------------------------------------
+
+
+class GenerationWorkerPool:
+    """Long-lived pool of warm generation workers"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the pool (workers start lazily on first submit)
+
+        Args:
+            max_workers: Worker processes (default settings.GENERATION_WORKERS;
+                0 runs jobs on threads of the calling process)
+        """
+        self.max_workers = settings.GENERATION_WORKERS if max_workers is None else max_workers
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.max_workers > 0:
+                    # spawn: never fork a process holding server threads and sockets
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="generation-worker"
+                    )
+                logger.info(f"Started generation worker pool ({self.max_workers} workers)")
+            return self._executor
+
+    def _discard_executor(self, executor: Executor) -> None:
+        """Drop a broken executor so the next job starts fresh workers"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def submit(self, job: Job, timeout: Optional[float] = None) -> JobResult:
+        """
+        Run a job on a worker
+
+        Args:
+            job: GenerationJob, RevisionJob or ResearchJob
+            timeout: Seconds to wait for the result (the worker finishes the
+                job regardless; only the wait is abandoned)
+
+        Returns:
+            JobResult (failures are reported in the result, not raised)
+        """
+        job = self._attribute_to_caller(job)
+        executor = self._get_executor()
+        future = asyncio.get_running_loop().run_in_executor(executor, _run_job, job)
+
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return JobResult(success=False, error=f"Job timed out after {timeout:.0f}s")
+        except BrokenProcessPool as e:
+            logger.error(f"Generation worker died: {str(e)}")
+            self._discard_executor(executor)
+            return JobResult(success=False, error=f"Worker process died: {str(e)}")
+
+        self._absorb_usage(result)
+        return result
+
+    def run(self, job: Job, timeout: Optional[float] = None) -> JobResult:
+        """Blocking variant of submit() for synchronous callers"""
+        job = self._attribute_to_caller(job)
+        executor = self._get_executor()
+        future = executor.submit(_run_job, job)
+
+        try:
+            result = future.result(timeout)
+        except FutureTimeoutError:  # not the builtin TimeoutError before Python 3.11
+            return JobResult(success=False, error=f"Job timed out after {timeout:.0f}s")
+        except BrokenProcessPool as e:
+            logger.error(f"Generation worker died: {str(e)}")
+            self._discard_executor(executor)
+            return JobResult(success=False, error=f"Worker process died: {str(e)}")
+
+        self._absorb_usage(result)
+        return result
+
+    @staticmethod
+    def _attribute_to_caller(job: Job) -> Job:
+        """Default the job's run and project to the caller's active run"""
+        run = get_current_run()
+        if run is None or (job.run_id and job.project_id):
+            return job
+        return dataclasses.replace(
+            job, run_id=job.run_id or run.run_id, project_id=job.project_id or run.project_id
+        )
+
+    @staticmethod
+    def _absorb_usage(result: JobResult) -> None:
+        """Fold a worker's API usage into the caller's active run"""
+        run = get_current_run()
+        if run is not None and result.usage:
+            run.merge_summary(result.usage)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all workers"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool: Optional[GenerationWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> GenerationWorkerPool:
+    """Return the process-wide worker pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = GenerationWorkerPool()
+        return _pool
+
+
+def shutdown_worker_pool(wait: bool = True) -> None:
+    """Stop the process-wide worker pool (e.g. on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
@@ -3,6 +3,7 @@
 from .cta_validator import CTAValidator
 from .headline_validator import HeadlineValidator
 from .hook_validator import HookValidator
+from .incremental_validator import IncrementalQAValidator, PostCheck
 from .length_validator import LengthValidator
 
 __all__ = [
@@ -10,4 +11,6 @@ __all__ = [
     "CTAValidator",
     "LengthValidator",
     "HeadlineValidator",
+    "IncrementalQAValidator",
+    "PostCheck",
 ]
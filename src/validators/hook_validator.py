@@ -5,6 +5,7 @@ Uses MinHash/LSH for O(n log n) performance on large post sets.
 """
 
 import difflib
+import importlib.util
 from typing import Any, Dict, List, Optional
 
 from ..config.constants import HOOK_SIMILARITY_THRESHOLD
@@ -12,13 +13,9 @@ from ..config.platform_specs import PLATFORM_HOOK_SPECS
 from ..models.client_brief import Platform
 from ..models.post import Post
 
-# Optional: MinHash/LSH for performance optimization
-try:
-    from datasketch import MinHash, MinHashLSH  # type: ignore[import-untyped]
-
-    MINHASH_AVAILABLE = True
-except ImportError:
-    MINHASH_AVAILABLE = False
+# Optional: MinHash/LSH for performance optimization. datasketch pulls in scipy
+# (~0.7s), so it is only imported when the optimized path actually runs.
+MINHASH_AVAILABLE = importlib.util.find_spec("datasketch") is not None
 
 
 class HookValidator:
@@ -308,6 +305,8 @@ class HookValidator:
             # Fallback to simple algorithm
             return self._find_duplicates_simple(hooks, posts)
 
+        from datasketch import MinHash, MinHashLSH  # type: ignore[import-untyped]
+
         # Initialize LSH index with similarity threshold
         # num_perm controls accuracy (higher = more accurate but slower)
         lsh = MinHashLSH(threshold=self.similarity_threshold, num_perm=128)
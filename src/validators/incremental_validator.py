@@ -0,0 +1,274 @@
+"""Incremental QA Validator
+
+Validates posts one at a time while a run is still generating them. Hook
+similarity, CTA usage and length buckets are maintained online, so a
+duplicate hook, an overused CTA or a run of same-length posts is reported as
+soon as the post that causes it arrives, instead of after the whole batch.
+
+Hook lookups use an incrementally updated MinHash/LSH index for runs large
+enough that HookValidator would use MinHash (candidates verified with the
+same similarity measure); smaller runs compare each new hook against the
+hooks seen so far. The final QAReport is still produced by QAAgent.validate_posts on
+the final post set, which is cheap next to generation.
+
+Usage:
+    validator = IncrementalQAValidator(expected_posts=30, platform=Platform.LINKEDIN)
+    check = validator.add(post)
+    if check.has_issues:
+        ...schedule regeneration...
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config.platform_specs import PLATFORM_LENGTH_SPECS
+from ..models.client_brief import Platform
+from ..models.post import Post
+from .cta_validator import CTAValidator
+from .hook_validator import MINHASH_AVAILABLE, HookValidator
+from .length_validator import LengthValidator
+
+# MinHash permutations for the online hook index (same as HookValidator)
+NUM_PERM = 128
+
+
+class PostCheck(NamedTuple):
+    """Set-level QA result for one post, relative to the other posts of the run"""
+
+    index: int  # Position of the post in arrival order
+    cta_type: str  # CTA pattern detected (see CTAValidator.CTA_PATTERNS)
+    duplicate_of: Optional[int] = None  # Other post with a near-identical hook
+    duplicate_hook: Optional[str] = None  # That post's hook
+    hook_similarity: float = 0.0  # Similarity to duplicate_of
+    overused_cta: bool = False  # This post pushed cta_type over the variety threshold
+    similar_length: bool = False  # Too many posts already share this length bucket
+    length_issue: Optional[str] = None  # "too_short" / "too_long" for the platform
+    issues: Tuple[str, ...] = ()  # Human-readable descriptions (QAReport style)
+
+    @property
+    def has_issues(self) -> bool:
+        return bool(self.issues)
+
+
+class IncrementalQAValidator:
+    """Online hook/CTA/length validation for posts arriving one at a time"""
+
+    def __init__(
+        self,
+        expected_posts: int,
+        platform: Optional[Platform] = None,
+        hook_validator: Optional[HookValidator] = None,
+        cta_validator: Optional[CTAValidator] = None,
+        length_validator: Optional[LengthValidator] = None,
+    ):
+        """
+        Initialize incremental validator
+
+        Args:
+            expected_posts: Planned size of the run; CTA and length-sameness limits
+                            are fractions of it so imbalance is caught mid-run
+            platform: Target platform (defaults to the first post's platform)
+            hook_validator: Validator supplying the hook similarity threshold
+            cta_validator: Validator supplying CTA patterns and variety thresholds
+            length_validator: Validator supplying word count limits and sameness threshold
+        """
+        self.expected_posts = max(1, expected_posts)
+        self.platform = platform
+        self.hook_validator = hook_validator or HookValidator()
+        self.cta_validator = cta_validator or CTAValidator()
+        self.length_validator = length_validator or LengthValidator()
+
+        self.posts: List[Optional[Post]] = []
+        self._hooks: List[str] = []
+        self._cta_types: List[str] = []
+        self._buckets: List[int] = []
+        self.cta_counts: Counter[str] = Counter()
+        self.length_buckets: Counter[int] = Counter()
+
+        self._lsh: Any = None
+        # Same switch-over as HookValidator: exact pairwise checks for small runs
+        if (
+            self.hook_validator.use_optimized
+            and MINHASH_AVAILABLE
+            and self.expected_posts >= self.hook_validator.minhash_threshold
+        ):
+            from datasketch import MinHashLSH  # type: ignore[import-untyped]
+
+            self._lsh = MinHashLSH(
+                threshold=self.hook_validator.similarity_threshold, num_perm=NUM_PERM
+            )
+
+    def add(self, post: Post) -> PostCheck:
+        """
+        Validate a post against the posts accepted so far and record it
+
+        Args:
+            post: Newly generated post
+
+        Returns:
+            PostCheck describing any set-level issues this post introduces
+        """
+        index = len(self.posts)
+        self.posts.append(None)
+        self._hooks.append("")
+        self._cta_types.append("")
+        self._buckets.append(0)
+        return self._check_and_store(index, post)
+
+    def replace(self, index: int, post: Post) -> PostCheck:
+        """
+        Swap a post (e.g. after regeneration) and re-check it against the others
+
+        Args:
+            index: Position returned by add() for the original post
+            post: Replacement post
+
+        Returns:
+            PostCheck for the replacement
+        """
+        self._forget(index)
+        return self._check_and_store(index, post)
+
+    @property
+    def max_posts_per_cta(self) -> int:
+        """Most posts of the planned run allowed to share one CTA pattern"""
+        threshold = self.cta_validator.PLATFORM_VARIETY_THRESHOLDS.get(
+            self.platform, self.cta_validator.variety_threshold
+        )
+        return max(1, int(self.expected_posts * threshold))
+
+    @property
+    def max_posts_per_length_bucket(self) -> int:
+        """Most posts of the planned run allowed in one ±10-word bucket"""
+        return max(2, int(self.expected_posts * self.length_validator.sameness_threshold))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Current online distributions
+
+        Returns:
+            Dictionary with post count, CTA distribution and length buckets
+        """
+        return {
+            "posts": sum(1 for post in self.posts if post is not None),
+            "expected_posts": self.expected_posts,
+            "cta_distribution": {cta: n for cta, n in self.cta_counts.items() if n},
+            "length_buckets": {bucket: n for bucket, n in sorted(self.length_buckets.items()) if n},
+        }
+
+    def _check_and_store(self, index: int, post: Post) -> PostCheck:
+        """Check a post for an empty slot against all other posts, then record it"""
+        if self.platform is None:
+            self.platform = self.cta_validator._detect_platform([post])
+
+        number = index + 1
+        issues = []
+
+        # Hook uniqueness against every other current post
+        hook = self.hook_validator._extract_hooks([post])[0]
+        duplicate_of, similarity = self._find_similar_hook(hook)
+        if duplicate_of is not None:
+            issues.append(
+                f"Post {number} hook is {similarity:.0%} similar to post {duplicate_of + 1}"
+            )
+
+        # CTA distribution
+        cta_type = self.cta_validator._extract_cta_types([post])[0]
+        cta_count = self.cta_counts[cta_type] + 1
+        overused_cta = cta_type != "no_cta" and cta_count > self.max_posts_per_cta
+        if cta_type == "no_cta":
+            issues.append(f"Post {number} missing clear CTA")
+        elif overused_cta:
+            issues.append(
+                f"CTA pattern '{cta_type}' overused: post {number} would be {cta_count} of "
+                f"{self.expected_posts} (max {self.max_posts_per_cta})"
+            )
+
+        # Length limits and distribution
+        length_issue = self._check_length(post)
+        if length_issue:
+            issues.append(
+                f"Post {number} {length_issue.replace('_', ' ')}: {post.word_count} words"
+            )
+
+        bucket = round(post.word_count / 10) * 10
+        bucket_count = self.length_buckets[bucket] + 1
+        similar_length = bucket_count > self.max_posts_per_length_bucket
+        if similar_length:
+            issues.append(
+                f"Post {number} would be post {bucket_count} at ~{bucket} words (±10) "
+                f"- lacks length variety"
+            )
+
+        # Record
+        self.posts[index] = post
+        self._hooks[index] = hook
+        self._cta_types[index] = cta_type
+        self._buckets[index] = bucket
+        self.cta_counts[cta_type] += 1
+        self.length_buckets[bucket] += 1
+        if self._lsh is not None and hook.strip():
+            self._lsh.insert(self._key(index), self._minhash(hook))
+
+        return PostCheck(
+            index=index,
+            cta_type=cta_type,
+            duplicate_of=duplicate_of,
+            duplicate_hook=self._hooks[duplicate_of] if duplicate_of is not None else None,
+            hook_similarity=similarity,
+            overused_cta=overused_cta,
+            similar_length=similar_length,
+            length_issue=length_issue,
+            issues=tuple(issues),
+        )
+
+    def _forget(self, index: int) -> None:
+        """Remove a post's contribution to the online state"""
+        if self.posts[index] is None:
+            return
+        self.cta_counts[self._cta_types[index]] -= 1
+        self.length_buckets[self._buckets[index]] -= 1
+        if self._lsh is not None and self._hooks[index].strip():
+            self._lsh.remove(self._key(index))
+        self.posts[index] = None
+        self._hooks[index] = ""
+
+    def _find_similar_hook(self, hook: str) -> Tuple[Optional[int], float]:
+        """Most similar other hook at or above the threshold, if any"""
+        if not hook.strip():
+            return None, 0.0
+
+        if self._lsh is not None:
+            query = self._lsh.query(self._minhash(hook))
+            candidates = sorted(int(key.split("_")[1]) for key in query)
+        else:
+            candidates = [i for i, other in enumerate(self._hooks) if other]
+
+        best, best_similarity = None, 0.0
+        for i in candidates:
+            similarity = self.hook_validator._calculate_similarity(hook, self._hooks[i])
+            threshold = self.hook_validator.similarity_threshold
+            if similarity >= threshold and similarity > best_similarity:
+                best, best_similarity = i, similarity
+        return best, best_similarity
+
+    def _check_length(self, post: Post) -> Optional[str]:
+        specs = PLATFORM_LENGTH_SPECS.get(self.platform, {}) if self.platform else {}
+        if post.word_count < specs.get("min_words", self.length_validator.min_words):
+            return "too_short"
+        if post.word_count > specs.get("max_words", self.length_validator.max_words):
+            return "too_long"
+        return None
+
+    @staticmethod
+    def _key(index: int) -> str:
+        return f"hook_{index}"
+
+    @staticmethod
+    def _minhash(hook: str) -> Any:
+        from datasketch import MinHash  # type: ignore[import-untyped]
+
+        minhash = MinHash(num_perm=NUM_PERM)
+        for word in hook.lower().split():
+            minhash.update(word.encode("utf-8"))
+        return minhash
@@ -14,12 +14,16 @@ OWASP LLM01: Prompt Injection
 """
 
 import re
+import string
 import logging
-from typing import List, Tuple
+from typing import Dict, List, Pattern, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Severity ranking used when several patterns match the same input
+_SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
 
 @dataclass
 class SanitizationResult:
@@ -31,6 +35,73 @@ class SanitizationResult:
     severity: str  # low, medium, high, critical
 
 
+@dataclass(frozen=True)
+class InjectionMatch:
+    """A single pattern hit reported by the combined scanner"""
+
+    severity: str  # low, medium, critical
+    text: str
+    start: int
+    end: int
+
+    @property
+    def label(self) -> str:
+        """Human-readable label used in blocked_patterns lists"""
+        return f"{self.severity.upper()}: {self.text}"
+
+
+# ASCII-only lowercase table, used when str.lower() would change the text length
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _fold_pattern_case(pattern: str) -> str:
+    """Lowercase literal letters in a regex, leaving escapes such as \\S or \\W intact"""
+    return re.sub(r"(?<!\\)[A-Z]", lambda m: m.group(0).lower(), pattern)
+
+
+def _fold_text_case(text: str) -> str:
+    """Lowercase text while keeping every character at the same offset"""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Some non-ASCII characters expand when lowercased; fall back to ASCII
+        # folding so match spans still line up with the original text
+        lowered = text.translate(_ASCII_LOWER)
+    return lowered
+
+
+def _compile_combined(
+    groups: List[Tuple[str, List[str]]]
+) -> Tuple[Pattern, Pattern, Dict[str, str]]:
+    """
+    Compile every pattern into one case-folded alternation
+
+    Two regexes are built from the same alternation. The scan regex has no
+    wrapping groups so the regex engine can skip ahead on the set of possible
+    first characters; the classifier regex wraps each alternative in a named
+    group and is only run anchored at positions where the scan found a hit.
+    Alternatives are ordered critical -> medium -> low so that when two
+    patterns match at the same position the most severe one wins.
+
+    Returns:
+        (scan_regex, classifier_regex, group name -> severity)
+    """
+    scan_alternatives = []
+    named_alternatives = []
+    severity_by_group = {}
+    for severity, patterns in groups:
+        for index, pattern in enumerate(patterns):
+            folded = _fold_pattern_case(pattern)
+            name = f"{severity}_{index}"
+            scan_alternatives.append(f"(?:{folded})")
+            named_alternatives.append(f"(?P<{name}>{folded})")
+            severity_by_group[name] = severity
+    return (
+        re.compile("|".join(scan_alternatives)),
+        re.compile("|".join(named_alternatives)),
+        severity_by_group,
+    )
+
+
 class PromptInjectionDetector:
     """
     Detects and blocks prompt injection attacks
@@ -104,50 +175,54 @@ class PromptInjectionDetector:
         """
         self.strict_mode = strict_mode
 
-        # Compile regex patterns for performance
-        self.critical_regex = [re.compile(p, re.IGNORECASE) for p in self.CRITICAL_PATTERNS]
-        self.medium_regex = [re.compile(p, re.IGNORECASE) for p in self.MEDIUM_PATTERNS]
-        self.low_regex = [re.compile(p, re.IGNORECASE) for p in self.LOW_PATTERNS]
+        # Patterns are compiled once at import and shared by every detector
+        self.critical_regex = _CRITICAL_REGEX
+        self.medium_regex = _MEDIUM_REGEX
+        self.low_regex = _LOW_REGEX
 
-    def detect_injection(self, text: str) -> Tuple[bool, List[str], str]:
+    def scan(self, text: str) -> List[InjectionMatch]:
         """
-        Detect prompt injection attempts
+        Scan text once with the combined pattern set
 
         Returns:
-            (is_malicious, blocked_patterns, severity)
+            Non-overlapping matches in input order, each with severity and span
         """
-        blocked_patterns = []
-        severity = "low"
-
-        # Check critical patterns
-        for pattern in self.critical_regex:
-            matches = pattern.findall(text)
-            if matches:
-                blocked_patterns.extend([f"CRITICAL: {m}" for m in matches])
-                severity = "critical"
-
-        # Check medium patterns
-        for pattern in self.medium_regex:
-            matches = pattern.findall(text)
-            if matches:
-                blocked_patterns.extend([f"MEDIUM: {m}" for m in matches])
-                if severity not in ["critical", "high"]:
-                    severity = "medium"
+        if not text:
+            return []
+
+        folded = _fold_text_case(text)
+        matches = []
+        for hit in _SCAN_REGEX.finditer(folded):
+            start, end = hit.span()
+            severity = _GROUP_SEVERITY[_CLASSIFIER_REGEX.match(folded, start).lastgroup]
+            matches.append(
+                InjectionMatch(severity=severity, text=text[start:end], start=start, end=end)
+            )
+        return matches
 
-        # Check low patterns
-        for pattern in self.low_regex:
-            matches = pattern.findall(text)
-            if matches:
-                blocked_patterns.extend([f"LOW: {m}" for m in matches])
-                if severity == "low":
-                    severity = "low"
+    def _classify(self, matches: List[InjectionMatch]) -> Tuple[bool, str]:
+        """Reduce scanner matches to (is_malicious, severity)"""
+        severity = "low"
+        for match in matches:
+            if _SEVERITY_RANK[match.severity] > _SEVERITY_RANK[severity]:
+                severity = match.severity
 
-        # Determine if malicious
         is_malicious = severity in ["critical", "high"]
         if self.strict_mode and severity == "medium":
             is_malicious = True
 
-        return is_malicious, blocked_patterns, severity
+        return is_malicious, severity
+
+    def detect_injection(self, text: str) -> Tuple[bool, List[str], str]:
+        """
+        Detect prompt injection attempts
+
+        Returns:
+            (is_malicious, blocked_patterns, severity)
+        """
+        matches = self.scan(text)
+        is_malicious, severity = self._classify(matches)
+        return is_malicious, [m.label for m in matches], severity
 
     def sanitize_input(self, text: str, remove_patterns: bool = True) -> SanitizationResult:
         """
@@ -160,7 +235,8 @@ class PromptInjectionDetector:
         Returns:
             SanitizationResult with sanitized text and metadata
         """
-        is_malicious, blocked_patterns, severity = self.detect_injection(text)
+        matches = self.scan(text)
+        is_malicious, severity = self._classify(matches)
 
         if not is_malicious:
             return SanitizationResult(
@@ -168,26 +244,28 @@ class PromptInjectionDetector:
             )
 
         # Log security event
+        blocked_patterns = [m.label for m in matches]
         logger.warning(
             f"Prompt injection detected (severity={severity}). "
             f"Blocked patterns: {len(blocked_patterns)}"
         )
 
-        # Sanitize by removing or escaping patterns
-        sanitized = text
-
-        if remove_patterns:
-            # Remove critical patterns entirely
-            for pattern in self.critical_regex:
-                sanitized = pattern.sub("[REDACTED]", sanitized)
-
-            # Escape medium patterns
-            for pattern in self.medium_regex:
-                sanitized = pattern.sub(lambda m: f"\\{m.group(0)}", sanitized)
-        else:
-            # Escape all patterns
-            for pattern in self.critical_regex + self.medium_regex:
-                sanitized = pattern.sub(lambda m: f"\\{m.group(0)}", sanitized)
+        # Rebuild the text from the spans found by the scan instead of re-running
+        # every pattern: critical hits are removed (or escaped), medium hits are
+        # escaped, low hits are informational and left untouched.
+        pieces = []
+        cursor = 0
+        for match in matches:
+            if match.severity == "low":
+                continue
+            pieces.append(text[cursor : match.start])
+            if remove_patterns and match.severity == "critical":
+                pieces.append("[REDACTED]")
+            else:
+                pieces.append(f"\\{match.text}")
+            cursor = match.end
+        pieces.append(text[cursor:])
+        sanitized = "".join(pieces)
 
         return SanitizationResult(
             sanitized_text=sanitized,
@@ -197,6 +275,20 @@ class PromptInjectionDetector:
         )
 
 
+_CRITICAL_REGEX = [
+    re.compile(p, re.IGNORECASE) for p in PromptInjectionDetector.CRITICAL_PATTERNS
+]
+_MEDIUM_REGEX = [re.compile(p, re.IGNORECASE) for p in PromptInjectionDetector.MEDIUM_PATTERNS]
+_LOW_REGEX = [re.compile(p, re.IGNORECASE) for p in PromptInjectionDetector.LOW_PATTERNS]
+_SCAN_REGEX, _CLASSIFIER_REGEX, _GROUP_SEVERITY = _compile_combined(
+    [
+        ("critical", PromptInjectionDetector.CRITICAL_PATTERNS),
+        ("medium", PromptInjectionDetector.MEDIUM_PATTERNS),
+        ("low", PromptInjectionDetector.LOW_PATTERNS),
+    ]
+)
+
+
 class OutputValidator:
     """
     Validates LLM outputs to detect leaked system prompts or sensitive data
@@ -260,6 +352,7 @@ class OutputValidator:
 # Convenience functions
 
 _detector = PromptInjectionDetector()
+_strict_detector = PromptInjectionDetector(strict_mode=True)
 _validator = OutputValidator()
 
 
@@ -277,9 +370,12 @@ def sanitize_prompt_input(text: str, strict: bool = False) -> str:
     Raises:
         ValueError: If critical prompt injection is detected and removal fails
     """
-    detector = PromptInjectionDetector(strict_mode=strict)
+    detector = _strict_detector if strict else _detector
     result = detector.sanitize_input(text, remove_patterns=True)
 
+    if result.is_safe:
+        return result.sanitized_text
+
     # Re-check if sanitized text still contains critical patterns
     is_still_malicious, _, severity_after = detector.detect_injection(result.sanitized_text)
 
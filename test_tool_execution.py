@@ -100,6 +100,7 @@ def test_agent_tool_definitions():
 
         agent = ContentAgentCoreEnhanced(api_key=api_key)
         tool_defs = agent._get_enhanced_tool_definitions()
+        agent.close()
 
         print(f"\n✅ Agent exposes {len(tool_defs)} tools to Claude\n")
 
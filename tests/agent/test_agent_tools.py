@@ -2,9 +2,16 @@
 Unit tests for agent tools
 """
 
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
 import pytest
 
 from agent.tools import AgentTools
+from src.database.project_db import ProjectDatabase
+from src.models.project import Project, RevisionStatus
+from src.utils.worker_pool import JobResult
 
 
 class TestAgentTools:
@@ -93,5 +100,70 @@ class TestAgentTools:
         assert project_id is None
 
 
+class TestProcessRevision:
+    """Test revisions on the worker pool follow the CLI's scope and tracking rules"""
+
+    @pytest.fixture
+    def tools(self, tmp_path):
+        tools = AgentTools.__new__(AgentTools)
+        tools.db = ProjectDatabase(db_path=tmp_path / "projects.db")
+        tools.project_dir = tmp_path
+
+        deliverable_dir = tmp_path / "outputs"
+        deliverable_dir.mkdir()
+        post = {"content": "one two three", "template_id": 1, "template_name": "Problem"}
+        (deliverable_dir / "Acme_posts.json").write_text(json.dumps([post]), encoding="utf-8")
+        tools.db.create_project(
+            Project(
+                project_id="acme-1",
+                client_name="Acme",
+                deliverable_path=str(deliverable_dir / "Acme_deliverable.md"),
+                brief_path=str(tmp_path / "brief.txt"),
+                num_posts=1,
+            )
+        )
+        return tools
+
+    def _revise(self, tools, result):
+        pool = AsyncMock()
+        pool.submit.return_value = result
+        with patch("agent.tools.get_worker_pool", return_value=pool):
+            outcome = asyncio.run(tools.process_revision("Acme", "acme-1", "More casual"))
+        return outcome, pool
+
+    def test_revision_is_tracked(self, tools):
+        """Test a pooled revision is recorded and counted against scope"""
+        revised = {"content": "one two", "template_id": 1, "template_name": "Problem"}
+        outcome, _ = self._revise(
+            tools, JobResult(success=True, posts=[revised], changes=["Shorter"])
+        )
+
+        assert outcome["success"] is True
+        revision = tools.db.get_revision(outcome["revision_id"])
+        assert revision.status == RevisionStatus.COMPLETED
+        assert tools.db.get_revision_scope("acme-1").used_revisions == 1
+        saved = tools.db.get_revision_posts(outcome["revision_id"])
+        assert [post["changes_summary"] for post in saved] == ["Shorter"]
+
+    def test_failed_revision_is_marked_failed(self, tools):
+        """Test a failed pool job leaves a failed revision record"""
+        outcome, _ = self._revise(tools, JobResult(success=False, error="boom"))
+
+        assert outcome["success"] is False
+        assert tools.db.get_revision(outcome["revision_id"]).status == RevisionStatus.FAILED
+
+    def test_revision_limit_blocks_pool(self, tools):
+        """Test an exhausted scope offers the upsell instead of revising"""
+        scope = tools.db.get_revision_scope("acme-1")
+        scope.used_revisions = scope.allowed_revisions
+        tools.db.update_revision_scope(scope)
+
+        outcome, pool = self._revise(tools, JobResult(success=True))
+
+        assert outcome["error"] == "revision_limit_reached"
+        pool.submit.assert_not_called()
+        assert tools.db.get_revision_scope("acme-1").upsell_offered is True
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
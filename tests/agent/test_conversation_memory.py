@@ -0,0 +1,97 @@
+"""
+Tests for bounded conversation memory of agent sessions
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from agent.context import ContextManager
+from agent.memory import ConversationMemory
+
+
+def _summary_client():
+    """Anthropic client stub whose summaries count the folded messages"""
+    client = MagicMock()
+
+    def create(**kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        folded = prompt.count("user: ") + prompt.count("assistant: ")
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{folded} messages folded")])
+
+    client.messages.create.side_effect = create
+    return client
+
+
+class TestConversationMemory:
+    """Test ConversationMemory with temporary database"""
+
+    def setup_method(self):
+        """Setup test with temporary database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.manager = ContextManager(db_path=str(Path(self.temp_dir) / "test_sessions.db"))
+        self.client = _summary_client()
+
+    def teardown_method(self):
+        """Cleanup temporary database"""
+        shutil.rmtree(self.temp_dir)
+
+    def _talk(self, memory, turns, start=0):
+        for i in range(start, start + turns):
+            question = f"question {i} " + "q" * 400
+            message_id = self.manager.save_message("session", "user", question)
+            memory.add_user_message(question, message_id=message_id)
+            memory.compact()
+            answer = f"answer {i} " + "a" * 400
+            self.manager.save_message("session", "assistant", answer)
+            memory.messages.append({"role": "assistant", "content": answer})
+
+    def test_long_session_stays_within_budget(self):
+        """Test old turns are summarized and the summary is stored with the session"""
+        memory = ConversationMemory(self.client, self.manager, "session", max_tokens=1000)
+        self._talk(memory, 20)
+
+        assert len(memory.messages) < 10
+        assert memory.summary.endswith("messages folded")
+
+        stored = self.manager.load_summary("session")
+        assert stored["summary"] == memory.summary
+        assert stored["window_start_id"] == memory.window_start_id
+
+        request = self.client.messages.create.call_args.kwargs
+        assert request["model"] == memory.summary_model
+
+    def test_resume_loads_only_window(self):
+        """Test a resumed session reloads the window and the summary"""
+        memory = ConversationMemory(self.client, self.manager, "session", max_tokens=1000)
+        self._talk(memory, 20)
+
+        resumed = ConversationMemory(self.client, self.manager, "session", max_tokens=1000)
+        resumed.load_history()
+
+        assert resumed.summary == memory.summary
+        assert resumed.messages == memory.messages
+        assert resumed.messages[0]["content"].startswith("question")
+
+    def test_system_blocks_include_summary(self):
+        """Test the summary is part of the cached system prefix"""
+        memory = ConversationMemory(self.client, self.manager, "session", max_tokens=1000)
+        self._talk(memory, 20)
+
+        blocks = memory.system_blocks("Agent prompt", "Current client: Acme")
+
+        assert blocks[0]["text"] == "Agent prompt"
+        assert memory.summary in blocks[1]["text"]
+        assert blocks[-1] == {"type": "text", "text": "Current client: Acme"}
+
+    def test_reset_clears_summary(self):
+        """Test resetting forgets the window and stored summary"""
+        memory = ConversationMemory(self.client, self.manager, "session", max_tokens=1000)
+        self._talk(memory, 20)
+
+        memory.reset()
+
+        assert memory.messages == [] and memory.summary == ""
+        assert self.manager.load_summary("session")["summary"] == ""
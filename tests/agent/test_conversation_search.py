@@ -0,0 +1,114 @@
+"""
+Tests for full-text search of agent conversation history
+"""
+
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from agent.context import ContextManager
+
+
+class TestConversationSearch:
+    """Test FTS5-backed ContextManager.search_conversation"""
+
+    def setup_method(self):
+        """Setup test with temporary database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / "test_sessions.db"
+        self.manager = ContextManager(db_path=str(self.db_path))
+
+    def teardown_method(self):
+        """Cleanup temporary database"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_results_are_ranked_with_snippets(self):
+        """Test the most relevant message comes first, with matched terms highlighted"""
+        self.manager.save_message("s1", "user", "Send the invoice to Acme once posts are approved")
+        self.manager.save_message("s1", "assistant", "Invoice reminder: the Acme invoice is overdue")
+        self.manager.save_message("s1", "user", "Generate posts for Globex")
+
+        results = self.manager.search_conversation("s1", "invoice")
+
+        assert [r["content"][:7] for r in results] == ["Invoice", "Send th"]
+        assert "**invoice**" in results[0]["snippet"]
+        assert results[0]["rank"] <= results[1]["rank"]
+
+    def test_words_match_as_prefixes_in_any_order(self):
+        """Test every query word must match, as a word prefix"""
+        self.manager.save_message("s1", "user", "Generating LinkedIn posts for Acme Corp")
+        self.manager.save_message("s1", "user", "Generating blog drafts for Acme Corp")
+
+        assert len(self.manager.search_conversation("s1", "acme generat")) == 2
+        assert len(self.manager.search_conversation("s1", "acme linkedin")) == 1
+        assert self.manager.search_conversation("s1", "globex") == []
+
+    def test_query_syntax_is_not_interpreted(self):
+        """Test FTS5 operators and quotes in user input are treated as plain words"""
+        self.manager.save_message("s1", "user", 'Brief says "NOT urgent" for Acme')
+
+        assert len(self.manager.search_conversation("s1", '"NOT urgent')) == 1
+        assert self.manager.search_conversation("s1", "*") == []
+
+    def test_session_role_and_cross_session_filters(self):
+        """Test filtering by session and role, and searching all sessions"""
+        self.manager.save_message("s1", "user", "Schedule posts for Acme")
+        self.manager.save_message("s1", "assistant", "Posts scheduled")
+        self.manager.save_message("s2", "user", "Review posts for Globex")
+
+        assert len(self.manager.search_conversation("s1", "posts")) == 2
+        assert len(self.manager.search_conversation("s1", "posts", role="assistant")) == 1
+
+        everywhere = self.manager.search_conversation(None, "posts")
+        assert {r["session_id"] for r in everywhere} == {"s1", "s2"}
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test triggers keep the index in sync with the messages table"""
+        message_id = self.manager.save_message("s1", "user", "Draft for Acme")
+
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute(
+            "UPDATE conversation_messages SET content = ? WHERE message_id = ?",
+            ("Draft for Globex", message_id),
+        )
+        conn.commit()
+        assert self.manager.search_conversation("s1", "acme") == []
+        assert len(self.manager.search_conversation("s1", "globex")) == 1
+
+        conn.execute("DELETE FROM conversation_messages WHERE message_id = ?", (message_id,))
+        conn.commit()
+        conn.close()
+        assert self.manager.search_conversation("s1", "globex") == []
+
+    def test_migration_indexes_existing_messages_and_drops_content_index(self):
+        """Test databases from before FTS get their messages indexed"""
+        legacy_path = Path(self.temp_dir) / "legacy.db"
+        conn = sqlite3.connect(str(legacy_path))
+        conn.execute(
+            """
+            CREATE TABLE conversation_messages (
+                message_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                metadata TEXT
+            )
+        """
+        )
+        conn.execute("CREATE INDEX idx_message_content ON conversation_messages(content)")
+        conn.execute(
+            "INSERT INTO conversation_messages (session_id, role, content, timestamp) "
+            "VALUES ('old', 'user', 'Onboard Initech next week', '2025-01-02T09:00:00')"
+        )
+        conn.commit()
+        conn.close()
+
+        manager = ContextManager(db_path=str(legacy_path))
+
+        assert len(manager.search_conversation("old", "initech")) == 1
+        conn = sqlite3.connect(str(legacy_path))
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        conn.close()
+        assert "idx_message_content" not in indexes
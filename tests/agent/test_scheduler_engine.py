@@ -0,0 +1,194 @@
+"""
+Tests for due-task lookup and the event-driven scheduler engine
+"""
+
+import asyncio
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from agent.scheduler import ScheduleFrequency, SchedulerEngine, TaskScheduler, TaskStatus
+
+
+async def _wait_for(condition, timeout=5.0):
+    """Poll until condition() is true"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+class TestDueTasks:
+    """Test indexed due-task queries"""
+
+    def setup_method(self):
+        """Setup test with temporary database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = Path(self.temp_dir) / "test_scheduler.db"
+        self.scheduler = TaskScheduler(db_path=str(self.db_path))
+
+    def teardown_method(self):
+        """Cleanup temporary database"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_only_pending_tasks_are_due(self):
+        """Test finished tasks with a past next_execution are not returned"""
+        due = self.scheduler.schedule_task("Due", "list_clients", {})
+        done = self.scheduler.schedule_task("Done", "list_clients", {})
+        done.next_execution = datetime.now() - timedelta(hours=1)
+        done.status = TaskStatus.COMPLETED
+        self.scheduler._save_task(done)
+        self.scheduler.schedule_task("Later", "list_clients", {}, execute_in=timedelta(hours=1))
+
+        assert [t.task_id for t in self.scheduler.get_due_tasks()] == [due.task_id]
+
+    def test_due_query_uses_status_index(self):
+        """Test due lookups are an index range scan"""
+        conn = sqlite3.connect(str(self.db_path))
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT task_id FROM scheduled_tasks "
+            "WHERE status = 'pending' AND due_at <= '2030-01-01'"
+        ).fetchall()
+        conn.close()
+
+        assert "idx_status_due" in str(plan)
+
+    def test_claim_marks_tasks_running_once(self):
+        """Test a due task is handed out by only one claim"""
+        self.scheduler.schedule_task("Report", "show_dashboard", {})
+
+        first = self.scheduler.claim_due_tasks()
+
+        assert [t.status for t in first] == [TaskStatus.RUNNING]
+        assert self.scheduler.claim_due_tasks() == []
+        assert self.scheduler.release_running_tasks() == 1
+
+    def test_task_cancelled_while_running_stays_cancelled(self):
+        """Test finishing a recurring task does not revive it after a cancel"""
+        self.scheduler.schedule_task(
+            "Weekly report", "show_dashboard", {}, frequency=ScheduleFrequency.WEEKLY
+        )
+        (task,) = self.scheduler.claim_due_tasks()
+        self.scheduler.cancel_task(task.task_id)
+
+        assert self.scheduler.mark_task_executed(task, success=True) is False
+        assert self.scheduler.get_upcoming_tasks() == []
+        assert self.scheduler.get_pending_due_times() == []
+
+    def test_legacy_database_is_migrated(self):
+        """Test databases without due_at are backfilled"""
+        legacy_path = Path(self.temp_dir) / "legacy.db"
+        conn = sqlite3.connect(str(legacy_path))
+        conn.execute(
+            """
+            CREATE TABLE scheduled_tasks (
+                task_id TEXT PRIMARY KEY, description TEXT NOT NULL,
+                tool_name TEXT NOT NULL, tool_params TEXT NOT NULL,
+                scheduled_for TIMESTAMP NOT NULL, frequency TEXT NOT NULL,
+                status TEXT NOT NULL, created_at TIMESTAMP NOT NULL,
+                executed_at TIMESTAMP, next_execution TIMESTAMP,
+                execution_count INTEGER DEFAULT 0, max_executions INTEGER, last_error TEXT
+            )
+        """
+        )
+        conn.execute(
+            "INSERT INTO scheduled_tasks VALUES ('old', 'Weekly report', 'show_dashboard', '{}', "
+            "'2025-01-01T09:00:00', 'weekly', 'pending', '2025-01-01T08:00:00', "
+            "'2025-01-01T09:00:00', '2025-01-08T09:00:00', 1, NULL, NULL)"
+        )
+        conn.commit()
+        conn.close()
+
+        scheduler = TaskScheduler(db_path=str(legacy_path))
+
+        assert scheduler.get_pending_due_times() == [(datetime(2025, 1, 8, 9), "old")]
+
+
+class TestSchedulerEngine:
+    """Test SchedulerEngine with temporary database"""
+
+    def setup_method(self):
+        """Setup test with temporary database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.scheduler = TaskScheduler(db_path=str(Path(self.temp_dir) / "test_scheduler.db"))
+        self.executed = []
+        self.active = 0
+        self.max_active = 0
+
+    def teardown_method(self):
+        """Cleanup temporary database"""
+        shutil.rmtree(self.temp_dir)
+
+    async def _execute(self, task):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        self.executed.append(task.task_id)
+        return task.tool_params.get("result", {"success": True})
+
+    @pytest.mark.asyncio
+    async def test_tasks_due_together_run_concurrently_with_bound(self):
+        """Test a pile-up at the same minute runs on the bounded pool"""
+        due_at = datetime.now()
+        for i in range(10):
+            self.scheduler.schedule_task(
+                f"Weekly report {i}", "show_dashboard", {}, execute_at=due_at
+            )
+
+        engine = SchedulerEngine(self.scheduler, self._execute, max_concurrency=3)
+        runner = asyncio.create_task(engine.run())
+        await _wait_for(lambda: len(self.executed) == 10)
+        engine.stop()
+        await runner
+
+        assert self.max_active == 3
+        assert self.scheduler.get_due_tasks() == []
+        assert self.scheduler.get_upcoming_tasks() == []
+
+    @pytest.mark.asyncio
+    async def test_engine_wakes_for_newly_scheduled_task(self):
+        """Test a sleeping engine runs a task scheduled after it started"""
+        self.scheduler.schedule_task("Far future", "list_clients", {}, execute_in=timedelta(days=7))
+        engine = SchedulerEngine(self.scheduler, self._execute)
+        runner = asyncio.create_task(engine.run())
+        await asyncio.sleep(0.05)
+
+        task = self.scheduler.schedule_task(
+            "Soon", "list_clients", {}, execute_in=timedelta(milliseconds=100)
+        )
+        await _wait_for(lambda: self.executed == [task.task_id], timeout=2.0)
+        engine.stop()
+        await runner
+
+    @pytest.mark.asyncio
+    async def test_recurring_task_returns_to_heap(self):
+        """Test recurring tasks are rescheduled and failures recorded"""
+        weekly = self.scheduler.schedule_task(
+            "Weekly report", "show_dashboard", {}, frequency=ScheduleFrequency.WEEKLY
+        )
+        failing = self.scheduler.schedule_task(
+            "Broken", "show_dashboard", {"result": {"success": False, "error": "no data"}}
+        )
+
+        engine = SchedulerEngine(self.scheduler, self._execute)
+        runner = asyncio.create_task(engine.run())
+        await _wait_for(lambda: len(self.executed) == 2)
+        engine.stop()
+        await runner
+
+        (upcoming,) = self.scheduler.get_upcoming_tasks()
+        assert upcoming.task_id == weekly.task_id
+        assert upcoming.next_execution > datetime.now() + timedelta(days=6)
+        assert engine.pending_count == 1
+
+        conn = sqlite3.connect(str(self.scheduler.db_path))
+        row = conn.execute(
+            "SELECT status, last_error FROM scheduled_tasks WHERE task_id = ?", (failing.task_id,)
+        ).fetchone()
+        conn.close()
+        assert row == (TaskStatus.FAILED.value, "no data")
@@ -0,0 +1,169 @@
+"""
+Tests for concurrent execution of agent tool calls
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agent.tool_executor import ToolExecutor
+from agent.tools import AgentTools
+
+
+class FakeTools:
+    """Tools that record when each call starts and finishes"""
+
+    def __init__(self):
+        self.events = []
+        self.active = 0
+        self.max_active = 0
+        self.threads = {}
+
+    async def _track(self, name, delay):
+        self.events.append(("start", name))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(delay)
+        self.active -= 1
+        self.events.append(("end", name))
+
+    async def list_projects(self, client_name=None, delay=0.05):
+        await self._track(f"list_projects:{client_name}", delay)
+        return {"success": True, "client": client_name}
+
+    async def generate_posts(self, client_name, delay=0.01):
+        await self._track(f"generate_posts:{client_name}", delay)
+        return {"success": True, "client": client_name}
+
+    def get_client_history(self, client_name):
+        self.threads[client_name] = threading.current_thread().name
+        time.sleep(0.1)
+        return {"success": True, "client": client_name}
+
+    async def get_project_status(self, project_id):
+        await asyncio.sleep(10)
+
+
+def _call(i, name, **tool_input):
+    return {"id": f"toolu_{i}", "name": name, "input": tool_input}
+
+
+class TestToolExecutor:
+    """Test ToolExecutor ordering, concurrency and timeouts"""
+
+    def setup_method(self):
+        """Setup executor over fake tools"""
+        self.tools = FakeTools()
+        self.executor = ToolExecutor(self.tools, max_concurrency=4)
+
+    def teardown_method(self):
+        """Release the thread pool"""
+        self.executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_read_only_calls_run_concurrently(self):
+        """Test a batch of lookups overlaps and results keep request order"""
+        calls = [_call(i, "list_projects", client_name=f"c{i}") for i in range(6)]
+
+        results = await self.executor.execute(calls)
+
+        assert [r["tool_use_id"] for r in results] == [f"toolu_{i}" for i in range(6)]
+        assert "'client': 'c5'" in results[5]["content"]
+        assert self.tools.max_active == 4  # bounded by max_concurrency
+
+    @pytest.mark.asyncio
+    async def test_mutating_call_is_a_barrier(self):
+        """Test writes wait for earlier calls and later calls wait for writes"""
+        calls = [
+            _call(0, "list_projects", client_name="a"),
+            _call(1, "list_projects", client_name="b"),
+            _call(2, "generate_posts", client_name="a"),
+            _call(3, "list_projects", client_name="c"),
+        ]
+
+        await self.executor.execute(calls)
+
+        events = self.tools.events
+        write_start = events.index(("start", "generate_posts:a"))
+        write_end = events.index(("end", "generate_posts:a"))
+        assert events.index(("end", "list_projects:a")) < write_start
+        assert events.index(("end", "list_projects:b")) < write_start
+        assert write_end < events.index(("start", "list_projects:c"))
+
+    @pytest.mark.asyncio
+    async def test_sync_tools_run_on_thread_pool(self):
+        """Test blocking tools overlap on worker threads instead of the event loop"""
+        calls = [_call(i, "get_client_history", client_name=f"c{i}") for i in range(3)]
+
+        started = time.monotonic()
+        results = await self.executor.execute(calls)
+
+        assert time.monotonic() - started < 0.25
+        assert all("'success': True" in r["content"] for r in results)
+        assert all(name.startswith("agent-tool") for name in self.tools.threads.values())
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_unknown_tool_become_error_results(self):
+        """Test failures are reported per call without failing the turn"""
+        executor = ToolExecutor(self.tools, timeouts={"get_project_status": 0.05})
+        calls = [
+            _call(0, "get_project_status", project_id="p1"),
+            _call(1, "delete_everything"),
+            _call(2, "list_projects", client_name="a"),
+        ]
+
+        results = await executor.execute(calls)
+        executor.shutdown()
+
+        assert "timed out" in results[0]["content"]
+        assert "Tool not found: delete_everything" in results[1]["content"]
+        assert "'success': True" in results[2]["content"]
+
+    @pytest.mark.asyncio
+    async def test_cancelling_turn_cancels_calls(self):
+        """Test cancelling the turn cancels in-flight tool calls"""
+        calls = [_call(i, "list_projects", client_name=f"c{i}", delay=10) for i in range(2)]
+
+        task = asyncio.create_task(self.executor.execute(calls))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert self.tools.active == 2  # neither call ran to completion
+        assert not any(event[0] == "end" for event in self.tools.events)
+
+    @pytest.mark.asyncio
+    async def test_shutdown_stops_the_thread_pool(self):
+        """Test a shut-down executor refuses sync tool calls (async tools still run)"""
+        await self.executor.call("get_client_history", {"client_name": "acme"})
+        assert any(thread.name.startswith("agent-tool") for thread in threading.enumerate())
+
+        self.executor.shutdown()
+
+        with pytest.raises(RuntimeError):
+            await self.executor.call("get_client_history", {"client_name": "acme"})
+        assert (await self.executor.call("generate_posts", {"client_name": "acme"}))["success"]
+
+
+class TestRunCli:
+    """Test the non-blocking CLI wrapper used by subprocess-backed tools"""
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process(self, tmp_path):
+        """Test a CLI call past its timeout is killed and the error re-raised"""
+        tools = AgentTools.__new__(AgentTools)
+        tools.project_dir = tmp_path
+        (tmp_path / "03_post_generator.py").write_text(
+            "import sys, time\nprint(sys.argv[1], flush=True)\ntime.sleep(float(sys.argv[2]))\n"
+        )
+
+        returncode, stdout, _ = await tools._run_cli("hello", "0")
+        assert (returncode, stdout.strip()) == (0, "hello")
+
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await tools._run_cli("slow", "30", timeout=0.5)
+        assert time.monotonic() - started < 10
@@ -265,6 +265,86 @@ def test_suggestion_generation():
     print("[OK] Suggestion generation works")
 
 
+def test_long_history_is_windowed_and_summarized():
+    """Test long conversations send recent turns plus a cached summary of older ones"""
+    from unittest.mock import patch
+
+    from backend.routers import assistant
+    from backend.routers.assistant import Message, build_assistant_prompt, build_conversation
+
+    history = [
+        Message(role=role, content=f"{role} turn {i} " + "x" * 2000)
+        for i in range(20)
+        for role in ("user", "assistant")
+    ]
+    history.insert(0, Message(role="assistant", content="Hi! How can I help?"))
+
+    with patch.object(assistant, "_summarize_history", return_value="Discussed turns") as summarize:
+        messages, summary, window_start = build_conversation(history, "And now?")
+
+    assert summarize.called
+    assert summary == "Discussed turns"
+    assert messages[0]["role"] == "user" and messages[-1]["content"] == "And now?"
+    assert len(messages) < len(history)
+    assert history[window_start].content == messages[0]["content"]
+
+    prompt = build_assistant_prompt("wizard", {"page": "wizard"}, summary)
+    assert prompt.segments[0].startswith(assistant.PAGE_CONTEXTS["wizard"])
+    assert "Discussed turns" in prompt.segments[1]
+    assert "And now?" not in prompt  # The question is a message, not part of the system prompt
+
+    print("[OK] Conversation history windowed")
+
+
+def test_returned_summary_is_continued_not_rebuilt():
+    """Test a client sending back summary and window_start only has newer turns summarized"""
+    from unittest.mock import patch
+
+    from backend.routers import assistant
+    from backend.routers.assistant import Message, build_conversation
+
+    history = [
+        Message(role=role, content=f"{role} turn {i} " + "x" * 2000)
+        for i in range(20)
+        for role in ("user", "assistant")
+    ]
+    with patch.object(assistant, "_summarize_history", return_value="Turns 0-9") as summarize:
+        messages, summary, window_start = build_conversation(
+            history, "And now?", summary="Turns 0-4", window_start=10
+        )
+
+    # Replay starts at window_start, continuing from the returned summary
+    previous_summary, folded = summarize.call_args_list[0].args
+    assert previous_summary == "Turns 0-4"
+    assert folded[0]["content"] == history[10].content
+    assert summary == "Turns 0-9"
+    assert window_start > 10 and history[window_start].content == messages[0]["content"]
+
+    # Nothing new to fold: the window and summary are kept as sent
+    with patch.object(assistant, "_summarize_history") as summarize:
+        messages, summary, window_start = build_conversation(
+            history, "And now?", summary="Turns 0-18", window_start=38
+        )
+    summarize.assert_not_called()
+    assert (summary, window_start, len(messages)) == ("Turns 0-18", 38, 3)
+
+
+def test_summaries_use_temperature_zero():
+    """Test summaries are deterministic, so replayed histories hit the summary cache"""
+    from unittest.mock import MagicMock, patch
+
+    from backend.routers import assistant
+
+    client = MagicMock()
+    client.create_message.return_value = "Summary"
+    with patch("src.utils.anthropic_client.get_default_client", return_value=client), patch.object(
+        assistant, "chat_cache", None
+    ):
+        assistant._summarize_history("", [{"role": "user", "content": "Hi"}])
+
+    assert client.create_message.call_args.kwargs["temperature"] == 0
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v", "-s"])
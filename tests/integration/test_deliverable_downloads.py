@@ -0,0 +1,209 @@
+"""Integration tests for deliverable downloads and previews (ETags, ranges, gzip, packages)"""
+
+import gzip
+import hashlib
+import io
+import os
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base, get_db
+from backend.main import app
+from backend.middleware.auth_dependency import get_current_user
+from backend.models import Client, Deliverable, Project, User
+from backend.routers import deliverables as deliverables_router
+
+
+@pytest.fixture
+def db_session():
+    """In-memory database shared with the TestClient's worker threads"""
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    yield session
+
+    session.close()
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def outputs_dir(tmp_path, monkeypatch):
+    """Point the deliverables router at a temporary outputs directory"""
+    outputs = tmp_path / "outputs"
+    (outputs / "acme").mkdir(parents=True)
+    monkeypatch.setattr(deliverables_router, "OUTPUTS_DIR", outputs)
+    return outputs
+
+
+@pytest.fixture
+def client(db_session):
+    """Create test client authenticated as the project owner"""
+    user = User(id="user-1", email="owner@example.com", hashed_password="x", is_active=True)
+    db_session.add(user)
+    db_session.add(Client(id="client-1", name="Acme", user_id="user-1"))
+    db_session.add(Project(id="project-1", client_id="client-1", name="Acme", user_id="user-1"))
+    db_session.commit()
+
+    def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _add_deliverable(db_session, outputs_dir, deliverable_id, name, content, checksum=None):
+    (outputs_dir / "acme" / name).write_bytes(content)
+    deliverable = Deliverable(
+        id=deliverable_id,
+        project_id="project-1",
+        client_id="client-1",
+        run_id="run-1",
+        format=name.rsplit(".", 1)[-1],
+        path=f"acme/{name}",
+        status="ready",
+        checksum=checksum,
+        file_size_bytes=len(content) if checksum else None,
+    )
+    db_session.add(deliverable)
+    db_session.commit()
+    return deliverable
+
+
+def test_download_has_strong_etag_and_revalidates(client, db_session, outputs_dir):
+    """Test the ETag is the file hash (backfilled once) and If-None-Match gives 304"""
+    content = b"Post 1\n" * 100
+    _add_deliverable(db_session, outputs_dir, "del-1", "posts.txt", content)
+    identity = {"Accept-Encoding": "identity"}
+
+    response = client.get("/api/deliverables/del-1/download", headers=identity)
+
+    assert response.status_code == 200
+    assert response.content == content
+    etag = f'"{hashlib.sha256(content).hexdigest()}"'
+    assert response.headers["etag"] == etag
+    assert response.headers["accept-ranges"] == "bytes"
+    assert db_session.get(Deliverable, "del-1").checksum == etag.strip('"')
+
+    response = client.get(
+        "/api/deliverables/del-1/download", headers={**identity, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_download_rehashes_file_rewritten_with_same_size(client, db_session, outputs_dir):
+    """Test a stored checksum is not reused once the file's mtime changes"""
+    content = b"Post 1\n" * 100
+    _add_deliverable(db_session, outputs_dir, "del-1", "posts.txt", content)
+    identity = {"Accept-Encoding": "identity"}
+    first = client.get("/api/deliverables/del-1/download", headers=identity).headers["etag"]
+
+    path = outputs_dir / "acme" / "posts.txt"
+    rewritten = b"Post 2\n" * 100
+    path.write_bytes(rewritten)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    response = client.get(
+        "/api/deliverables/del-1/download", headers={**identity, "If-None-Match": first}
+    )
+    assert response.status_code == 200
+    assert response.content == rewritten
+    assert response.headers["etag"] == f'"{hashlib.sha256(rewritten).hexdigest()}"'
+    assert db_session.get(Deliverable, "del-1").file_mtime == path.stat().st_mtime
+
+
+def test_download_range_resume(client, db_session, outputs_dir):
+    """Test Range returns 206 with the requested bytes, honoring If-Range"""
+    content = bytes(range(256)) * 40
+    checksum = hashlib.sha256(content).hexdigest()
+    _add_deliverable(db_session, outputs_dir, "del-1", "posts.docx", content, checksum=checksum)
+
+    response = client.get("/api/deliverables/del-1/download", headers={"Range": "bytes=100-"})
+    assert response.status_code == 206
+    assert response.content == content[100:]
+    assert response.headers["content-range"] == f"bytes 100-{len(content) - 1}/{len(content)}"
+
+    # A stale If-Range validator gets the whole (changed) file
+    response = client.get(
+        "/api/deliverables/del-1/download",
+        headers={"Range": "bytes=100-", "If-Range": '"old-version"'},
+    )
+    assert response.status_code == 200
+    assert response.content == content
+
+    response = client.get(
+        "/api/deliverables/del-1/download", headers={"Range": f"bytes={len(content)}-"}
+    )
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(content)}"
+
+
+def test_download_serves_precompressed_text(client, db_session, outputs_dir):
+    """Test text formats come from the .gz variant when gzip is accepted"""
+    content = b"date,post\n" * 500
+    _add_deliverable(db_session, outputs_dir, "del-1", "calendar.csv", content)
+
+    response = client.get(
+        "/api/deliverables/del-1/download",
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"].endswith('-gzip"')
+    assert response.content == content  # decoded by the client
+    assert gzip.decompress((outputs_dir / "acme" / "calendar.csv.gz").read_bytes()) == content
+
+
+def test_run_package_streams_zip(client, db_session, outputs_dir):
+    """Test a run's deliverables download as one zip with a stable ETag"""
+    _add_deliverable(db_session, outputs_dir, "del-1", "posts.md", b"# Posts\n" * 50)
+    _add_deliverable(db_session, outputs_dir, "del-2", "posts.docx", b"PK\x03\x04docx")
+    _add_deliverable(db_session, outputs_dir, "del-3", "schedule.ics", b"BEGIN:VCALENDAR\n")
+
+    response = client.get("/api/deliverables/runs/run-1/package")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        names = sorted(archive.namelist())
+        assert names == ["acme/posts.docx", "acme/posts.md", "acme/schedule.ics"]
+        assert archive.read("acme/schedule.ics") == b"BEGIN:VCALENDAR\n"
+
+    etag = response.headers["etag"]
+    response = client.get("/api/deliverables/runs/run-1/package", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    assert client.get("/api/deliverables/runs/other-run/package").status_code == 404
+
+
+def test_preview_window_endpoint(client, db_session, outputs_dir):
+    """Test /preview seeks to the requested offset and chains via nextOffset"""
+    content = "".join(f"Post {i}\n" for i in range(1000))
+    _add_deliverable(db_session, outputs_dir, "del-1", "posts.txt", content.encode("utf-8"))
+
+    response = client.get("/api/deliverables/del-1/preview", params={"offset": 100, "length": 50})
+
+    assert response.status_code == 200
+    window = response.json()
+    assert window["content"] == content[100:150]
+    assert window["nextOffset"] == 150
+    assert window["totalSize"] == len(content)
+
+    response = client.get(
+        "/api/deliverables/del-1/preview", params={"offset": len(content) - 8, "length": 50}
+    )
+    assert response.json()["nextOffset"] is None
+
+    _add_deliverable(db_session, outputs_dir, "del-2", "posts.pdf", b"%PDF-1.7")
+    assert client.get("/api/deliverables/del-2/preview").status_code == 400
@@ -1,7 +1,10 @@
 """
 Integration tests for Phase 8C: Voice Sample Upload & Matching
 """
+import json
+import sqlite3
 import tempfile
+import zipfile
 from datetime import datetime
 from pathlib import Path
 
@@ -11,7 +14,13 @@ from src.agents.voice_analyzer import VoiceAnalyzer
 from src.database.project_db import ProjectDatabase
 from src.models.post import Post
 from src.models.voice_sample import VoiceSampleBatch, VoiceSampleUpload
-from src.utils.file_parser import extract_text_from_file, validate_sample_text
+from src.utils.file_parser import (
+    collect_sample_files,
+    compute_content_hash,
+    extract_text_from_file,
+    extract_texts_from_files,
+    validate_sample_text,
+)
 from src.utils.voice_matcher import VoiceMatcher
 
 
@@ -130,6 +139,77 @@ class TestVoiceSampleUpload:
         stats = self.db.get_voice_sample_upload_stats(self.test_client)
         assert stats["sample_count"] == 0
 
+    def test_bulk_store_dedupes_in_one_batch(self, tmp_path):
+        """Test bulk storage skips duplicates within the batch and already stored"""
+        db = ProjectDatabase(tmp_path / "voice.db")
+        text = "This is a bulk voice sample used for dedupe testing. " * 20
+
+        def make(sample_text, file_name):
+            return VoiceSampleUpload(
+                client_name=self.test_client,
+                sample_text=sample_text,
+                sample_source="linkedin",
+                word_count=len(sample_text.split()),
+                file_name=file_name,
+            )
+
+        first = [make(text, "a.txt"), make(text.upper(), "b.txt"), make(text + "Extra.", "c.txt")]
+        assert db.store_voice_sample_uploads(first) == 2
+
+        second = [make(text, "a_copy.txt"), make("Another distinct sample here. " * 30, "d.txt")]
+        assert db.store_voice_sample_uploads(second) == 1
+
+        stats = db.get_voice_sample_upload_stats(self.test_client)
+        assert stats["sample_count"] == 3
+        assert db.store_voice_sample_uploads([]) == 0
+
+    def test_content_hash_backfilled_on_older_database(self, tmp_path):
+        """Test databases without content_hash get it added, filled and indexed"""
+        db_path = tmp_path / "legacy.db"
+        text = "An older voice sample stored before content hashes existed. " * 20
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            """
+            CREATE TABLE voice_sample_uploads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                client_name TEXT NOT NULL,
+                upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                sample_text TEXT NOT NULL,
+                sample_source TEXT NOT NULL,
+                word_count INTEGER NOT NULL,
+                file_name TEXT
+            )
+        """
+        )
+        conn.execute(
+            "INSERT INTO voice_sample_uploads "
+            "(client_name, sample_text, sample_source, word_count, file_name) "
+            "VALUES (?, ?, 'linkedin', ?, 'old.txt')",
+            (self.test_client, text, len(text.split())),
+        )
+        conn.commit()
+        conn.close()
+
+        db = ProjectDatabase(db_path)
+        duplicate = VoiceSampleUpload(
+            client_name=self.test_client,
+            sample_text=text,
+            sample_source="linkedin",
+            word_count=len(text.split()),
+            file_name="old_copy.txt",
+        )
+        assert db.store_voice_sample_uploads([duplicate]) == 0
+
+        conn = sqlite3.connect(db_path)
+        (stored_hash,) = conn.execute("SELECT content_hash FROM voice_sample_uploads").fetchone()
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT 1 FROM voice_sample_uploads "
+            "WHERE client_name = 'x' AND content_hash = 'y'"
+        ).fetchall()
+        conn.close()
+        assert stored_hash == compute_content_hash(text)
+        assert "idx_voice_uploads_client_hash" in str(plan)
+
 
 class TestFileParser:
     """Test file parsing utilities"""
@@ -170,6 +250,107 @@ class TestFileParser:
         finally:
             temp_path.unlink()
 
+    def test_extract_streams_json_array(self, tmp_path):
+        """Test JSON arrays are decoded incrementally with the same output"""
+        from src.utils.file_parser import _iter_json_array
+
+        posts = [{"id": i, "text": f"Post number {i} talks about leadership."} for i in range(200)]
+        posts.append("A bare string item at the end of the export")
+        posts.append(12345)
+        json_path = tmp_path / "export.json"
+        json_path.write_text("  \n" + json.dumps(posts, indent=2), encoding="utf-8")
+
+        text, _ = extract_text_from_file(json_path)
+        assert text.startswith("Post number 0 talks")
+        assert text.endswith("A bare string item at the end of the export")
+
+        # Tiny chunks force items and numbers to straddle read boundaries
+        with open(json_path, "r", encoding="utf-8") as handle:
+            assert list(_iter_json_array(handle, chunk_size=3)) == posts
+
+        bad_path = tmp_path / "bad.json"
+        bad_path.write_text('[{"text": "unterminated"', encoding="utf-8")
+        with open(bad_path, "r", encoding="utf-8") as handle:
+            with pytest.raises(json.JSONDecodeError):
+                list(_iter_json_array(handle, chunk_size=4))
+
+    def test_collect_sample_files_expands_zip(self, tmp_path):
+        """Test zip archives are expanded with member paths flattened"""
+        archive = tmp_path / "posts.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("posts/one.txt", "First post. " * 60)
+            zf.writestr("../escape/two.md", "Second post. " * 60)
+            zf.writestr("other/one.txt", "Third post. " * 60)
+            zf.writestr("image.png", b"not text")
+            zf.writestr("__MACOSX/posts/._one.txt", "junk")
+
+        extract_dir = tmp_path / "extracted"
+        files = collect_sample_files([archive], extract_dir)
+
+        assert len(files) == 3
+        assert all(path.parent == extract_dir / "posts" for path in files)
+        assert sorted(path.suffix for path in files) == [".md", ".txt", ".txt"]
+
+    def test_extract_texts_from_files_parallel(self, tmp_path):
+        """Test bulk extraction keeps input order and reports errors per file"""
+        paths = []
+        for i in range(6):
+            path = tmp_path / f"sample_{i}.txt"
+            path.write_text(f"Sample {i} content. " * 40, encoding="utf-8")
+            paths.append(path)
+        paths.append(tmp_path / "missing.txt")
+
+        parallel = extract_texts_from_files(paths, max_workers=2)
+        serial = extract_texts_from_files(paths, max_workers=1)
+
+        assert [r.path for r in parallel] == paths
+        assert [r.content_hash for r in parallel] == [r.content_hash for r in serial]
+        assert parallel[0].word_count == 120
+        assert parallel[0].content_hash == compute_content_hash(parallel[0].text)
+        assert parallel[-1].error is not None
+        assert all(r.error is None for r in parallel[:-1])
+
+    def test_extract_html_skips_boilerplate_and_decodes_entities(self, tmp_path):
+        """Test HTML extraction drops script/style/nav and keeps paragraphs"""
+        html_path = tmp_path / "page.html"
+        html_path.write_text(
+            "<html><head><style>p { color: red; }</style></head><body>"
+            "<nav><ul><li>Home</li><li>About</li></ul></nav>"
+            "<p>Caf&eacute; owners &amp; founders &mdash; listen &#8220;closely&#8221;.</p>"
+            "<script>if (a < b && c > d) { track(); }</script>"
+            "<p>Second   paragraph<br>continues here.</p>"
+            "</body></html>",
+            encoding="utf-8",
+        )
+
+        text, word_count = extract_text_from_file(html_path)
+
+        assert text == (
+            "Café owners & founders — listen \u201cclosely\u201d.\n\n"
+            "Second paragraph continues here."
+        )
+        assert word_count == 11
+
+    def test_extract_html_handles_entities_split_across_chunks(self, tmp_path):
+        """Test chunked streaming gives the same text as a single feed"""
+        from src.utils.file_parser import _stream_html_text
+
+        html_path = tmp_path / "chunked.html"
+        html_path.write_text(
+            "<div><p>Fish &amp; chips &hellip; &#x2014; done</p><p>Next</p></div>" * 50,
+            encoding="utf-8",
+        )
+
+        whole = _stream_html_text(html_path, encoding="utf-8", chunk_size=1_000_000)
+        for chunk_size in (1, 2, 7):
+            assert _stream_html_text(html_path, encoding="utf-8", chunk_size=chunk_size) == whole
+        assert "Fish & chips … — done" in whole
+
+    def test_compute_content_hash_normalizes(self):
+        """Test content hash ignores case and whitespace differences"""
+        assert compute_content_hash("Hello   World\n") == compute_content_hash("hello world")
+        assert compute_content_hash("Hello World") != compute_content_hash("Hello Worlds")
+
 
 class TestVoiceMatcher:
     """Test voice matching functionality"""
@@ -1,12 +1,13 @@
 """
 Integration tests for Phase 8D: Feedback Integration & Reporting Dashboard
 """
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 import pytest
 
 from src.database.project_db import ProjectDatabase
-from src.models.project import Project
+from src.models.client_memory import ClientMemory
+from src.models.project import Project, Revision
 
 
 class TestPostFeedback:
@@ -239,6 +240,86 @@ class TestSystemMetrics:
         assert "cost" in summary or len(summary) == 0  # May be empty if dates don't match
 
 
+class TestMetricRollups:
+    """Test week/month rollups backing get_metrics_summary"""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Isolated database"""
+        return ProjectDatabase(db_path=tmp_path / "metrics.db")
+
+    def test_record_metric_updates_week_and_month_buckets(self, db):
+        """Test that recording a metric refreshes its containing buckets"""
+        db.record_metric("2025-01-08", "cost", "api_cost", 10.0)  # Wednesday
+        db.record_metric("2025-01-09", "cost", "api_cost", 30.0)
+        db.record_metric("2025-01-09", "cost", "api_cost", 20.0)  # Upsert replaces 30
+
+        with db._get_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT period_type, period_start, value_sum, value_min, value_max, data_points
+                FROM system_metric_rollups ORDER BY period_type
+            """
+            ).fetchall()
+
+        assert [tuple(row) for row in rows] == [
+            ("month", "2025-01-01", 30.0, 10.0, 20.0, 2),
+            ("week", "2025-01-06", 30.0, 10.0, 20.0, 2),
+        ]
+
+    def test_metrics_summary_matches_raw_aggregation(self, db):
+        """Test that rollup-backed summaries equal a raw scan of the window"""
+        today = date.today()
+        for offset in range(120):
+            day = (today - timedelta(days=offset)).isoformat()
+            db.record_metric(day, "quality", "avg_score", float(offset % 17))
+
+        for days in (3, 30, 90):
+            start = (today - timedelta(days=days)).isoformat()
+            with db._get_connection() as conn:
+                expected = conn.execute(
+                    """
+                    SELECT AVG(metric_value), MIN(metric_value), MAX(metric_value), COUNT(*)
+                    FROM system_metrics WHERE metric_date >= ?
+                """,
+                    (start,),
+                ).fetchone()
+
+            metric = db.get_metrics_summary(days=days)["quality"][0]
+            assert metric["avg_value"] == pytest.approx(expected[0])
+            assert metric["min_value"] == expected[1]
+            assert metric["max_value"] == expected[2]
+            assert metric["data_points"] == expected[3]
+
+    def test_plan_metric_buckets_uses_closed_periods(self, db):
+        """Test that whole months and weeks are used and the rest is raw days"""
+        buckets, raw_ranges = db._plan_metric_buckets(date(2025, 1, 30), date(2025, 3, 12))
+
+        assert buckets == [
+            ("month", date(2025, 2, 1)),
+            ("week", date(2025, 3, 3)),
+        ]
+        assert raw_ranges == [
+            (date(2025, 1, 30), date(2025, 2, 1)),
+            (date(2025, 3, 1), date(2025, 3, 3)),
+            (date(2025, 3, 10), date(2025, 3, 12)),
+        ]
+
+    def test_existing_metrics_are_backfilled(self, tmp_path):
+        """Test that opening a pre-rollup database backfills buckets once"""
+        db = ProjectDatabase(db_path=tmp_path / "legacy.db")
+        db.record_metric("2025-01-08", "cost", "api_cost", 10.0)
+        with db._get_connection() as conn:
+            conn.execute("DELETE FROM system_metric_rollups")
+            conn.commit()
+
+        reopened = ProjectDatabase(db_path=tmp_path / "legacy.db")
+
+        with reopened._get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM system_metric_rollups").fetchone()[0]
+        assert count == 2
+
+
 class TestDatabaseIntegration:
     """Test overall database integration"""
 
@@ -311,5 +392,140 @@ class TestDatabaseIntegration:
         assert satisfaction[0]["satisfaction_score"] == 5
 
 
+class TestAnalyticsAggregations:
+    """Test SQL-side aggregations used by the dashboard and analytics commands"""
+
+    @pytest.fixture
+    def db(self, tmp_path):
+        """Isolated database with a small, known portfolio"""
+        db = ProjectDatabase(db_path=tmp_path / "analytics.db")
+
+        clients = [
+            # name, projects, posts, ltv, satisfaction, first project
+            ("Alpha", 1, 30, 1800.0, 4.5, datetime(2025, 1, 10)),
+            ("Beta", 2, 60, 3600.0, 4.0, datetime(2025, 1, 20)),
+            ("Gamma", 4, 120, 7200.0, 5.0, datetime(2025, 2, 3)),
+            ("Delta", 1, 30, 1800.0, None, datetime(2025, 2, 14)),
+        ]
+        for name, projects, posts, ltv, satisfaction, first in clients:
+            db.create_client_memory(
+                ClientMemory(
+                    client_name=name,
+                    total_projects=projects,
+                    total_posts_generated=posts,
+                    lifetime_value=ltv,
+                    average_satisfaction=satisfaction,
+                    first_project_date=first,
+                )
+            )
+
+        db.create_project(
+            Project(
+                project_id="Alpha_20250110_090000",
+                client_name="Alpha",
+                deliverable_path="alpha.md",
+                num_posts=30,
+                created_at=datetime(2025, 1, 10, 9, 0),
+            )
+        )
+        db.create_revision(
+            Revision(
+                revision_id="Alpha_20250110_090000_rev_1",
+                project_id="Alpha_20250110_090000",
+                attempt_number=1,
+                feedback="Make it shorter",
+                cost=0.25,
+            )
+        )
+
+        feedback = [
+            (1, "kept", {"likes": 10}),
+            (1, "loved", {"likes": 30}),
+            (1, "rejected", None),
+            (2, "modified", None),
+            (2, "kept", None),
+        ]
+        for i, (template_id, feedback_type, engagement) in enumerate(feedback):
+            db.store_post_feedback(
+                client_name="Alpha",
+                project_id="Alpha_20250110_090000",
+                post_id=f"post_{i}",
+                template_id=template_id,
+                template_name=f"Template {template_id}",
+                feedback_type=feedback_type,
+                engagement_data=engagement,
+            )
+
+        return db
+
+    def test_get_client_totals(self, db):
+        """Test portfolio totals and retention tiers"""
+        totals = db.get_client_totals()
+
+        assert totals["total_clients"] == 4
+        assert totals["total_projects"] == 8
+        assert totals["total_posts"] == 240
+        assert totals["total_lifetime_value"] == pytest.approx(14400.0)
+        assert totals["new_clients"] == 2
+        assert totals["repeat_clients"] == 1
+        assert totals["loyal_clients"] == 1
+        assert totals["retention_rate"] == pytest.approx(0.5)
+
+    def test_get_client_totals_empty(self, tmp_path):
+        """Test totals on an empty database"""
+        totals = ProjectDatabase(db_path=tmp_path / "empty.db").get_client_totals()
+
+        assert totals["total_clients"] == 0
+        assert totals["total_projects"] == 0
+        assert totals["retention_rate"] == 0.0
+
+    def test_get_template_feedback_stats(self, db):
+        """Test per-template rates grouped in SQL"""
+        stats = db.get_template_feedback_stats()
+
+        assert [s["template_id"] for s in stats] == [1, 2]
+        template_1 = stats[0]
+        assert template_1["total"] == 3
+        assert template_1["success_rate"] == pytest.approx(2 / 3)
+        assert template_1["rejected_rate"] == pytest.approx(1 / 3)
+        assert template_1["avg_engagement"] == pytest.approx(20.0)
+
+        template_2 = stats[1]
+        assert template_2["modified_rate"] == pytest.approx(0.5)
+        assert template_2["avg_engagement"] == 0.0
+
+    def test_get_retention_by_satisfaction(self, db):
+        """Test retention buckets skip clients without satisfaction data"""
+        buckets = db.get_retention_by_satisfaction()
+
+        assert [(b["satisfaction_bucket"], b["total"], b["repeat"]) for b in buckets] == [
+            (5, 1, 1),
+            (4, 2, 1),
+        ]
+
+    def test_get_retention_cohorts(self, db):
+        """Test cohorts grouped by first project month"""
+        cohorts = db.get_retention_cohorts()
+
+        assert [(c["cohort_month"], c["clients"], c["repeat"], c["loyal"]) for c in cohorts] == [
+            ("2025-01", 2, 1, 0),
+            ("2025-02", 2, 1, 1),
+        ]
+
+    def test_get_client_costs_by_month(self, db):
+        """Test per-client monthly project and revision cost rollup"""
+        rows = db.get_client_costs_by_month()
+
+        assert rows == [
+            {
+                "client_name": "Alpha",
+                "month": "2025-01",
+                "projects": 1,
+                "revisions": 1,
+                "revision_cost": pytest.approx(0.25),
+            }
+        ]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -128,12 +128,12 @@ def test_content_audit_validation():
         )
 
     # Test too many content pieces
-    with pytest.raises(ValueError, match="Maximum 100 content pieces"):
+    with pytest.raises(ValueError, match="Maximum 2000 content pieces"):
         auditor.validate_inputs(
             {
                 "business_description": "A" * 100,
                 "target_audience": "Teams",
-                "content_inventory": [{"title": f"Post {i}"} for i in range(101)],
+                "content_inventory": [{"title": f"Post {i}"} for i in range(2001)],
             }
         )
 
@@ -0,0 +1,261 @@
+"""
+Unit tests for the async batch paths of PostRegenerator and RevisionAgent.
+
+Batches fan out one task per post under the shared API limiter, return
+results in input order with the same stats as the sequential versions, and
+can be streamed in completion order.
+"""
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.agents.post_regenerator import PostRegenerator, RegenerationReason
+from src.agents.revision_agent import RevisionAgent
+from src.models.client_brief import ClientBrief, Platform
+from src.models.post import Post
+from src.models.template import Template, TemplateDifficulty, TemplateType
+
+
+@pytest.fixture
+def sample_brief():
+    """Sample client brief for testing"""
+    return ClientBrief(
+        company_name="Test Company",
+        business_description="Software development",
+        ideal_customer="Tech startups",
+        main_problem_solved="Development speed",
+        platforms=[Platform.LINKEDIN],
+    )
+
+
+@pytest.fixture
+def templates():
+    """Templates 1 and 2; posts for template 99 have no template"""
+    return [
+        Template(
+            template_id=tid,
+            name=f"Template {tid}",
+            template_type=TemplateType.PROBLEM_RECOGNITION,
+            difficulty=TemplateDifficulty.FAST,
+            structure=f"Structure {tid}",
+            best_for="Testing",
+        )
+        for tid in (1, 2)
+    ]
+
+
+def _post(content: str, template_id: int = 1, variant: int = 1) -> Post:
+    return Post(
+        content=content,
+        template_id=template_id,
+        template_name=f"Template {template_id}",
+        variant=variant,
+        client_name="Test Company",
+    )
+
+
+class FakeAsyncClient:
+    """Client whose async calls sleep and track concurrency"""
+
+    def __init__(self, delays=None, response="GOOD rewritten post"):
+        self.delays = delays or {}
+        self.response = response
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def generate_post_content_async(self, template_structure, context, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(template_structure, 0.01))
+            return f"{self.response} ({template_structure})"
+        finally:
+            self.in_flight -= 1
+
+
+def _fake_should_regenerate(post):
+    """Posts starting with BAD fail with one reason; everything else passes"""
+    if post.content.startswith("BAD"):
+        return True, [RegenerationReason("too_short", "Post too short", post.word_count)]
+    return False, []
+
+
+class TestRegenerateFailedPostsAsync:
+    """Test concurrent regeneration batches"""
+
+    @pytest.mark.asyncio
+    async def test_matches_sequential_results_and_stats(self, sample_brief, templates):
+        """Test async batch returns the sync batch's posts (in order) and stats"""
+        posts = [
+            _post("GOOD already fine", 1),
+            _post("BAD needs work", 1),
+            _post("BAD missing template", 99),
+            _post("BAD needs work too", 2),
+        ]
+        regenerator = PostRegenerator(client=FakeAsyncClient())
+        regenerator.client.generate_post_content = Mock(
+            side_effect=lambda template_structure, **kw: f"GOOD rewritten post ({template_structure})"
+        )
+
+        with patch.object(regenerator, "should_regenerate", side_effect=_fake_should_regenerate):
+            sync_posts, sync_stats = regenerator.regenerate_failed_posts(
+                posts, templates, sample_brief
+            )
+            async_posts, async_stats = await regenerator.regenerate_failed_posts_async(
+                posts, templates, sample_brief
+            )
+
+        assert [p.content for p in async_posts] == [p.content for p in sync_posts]
+        assert async_stats == sync_stats
+        assert async_stats["posts_regenerated"] == 2
+        assert async_stats["posts_improved"] == 2
+        assert async_stats["posts_unchanged"] == 1
+        assert async_stats["reasons"] == {"too_short": 3}
+        assert async_posts[2] is posts[2]
+
+    @pytest.mark.asyncio
+    async def test_fans_out_under_shared_limit(self, sample_brief, templates):
+        """Test regenerations run concurrently but never exceed MAX_CONCURRENT_API_CALLS"""
+        posts = [_post(f"BAD post {i}", 1, variant=i) for i in range(8)]
+        regenerator = PostRegenerator(client=FakeAsyncClient())
+
+        with patch("src.utils.api_limiter.settings") as mock_settings:
+            mock_settings.MAX_CONCURRENT_API_CALLS = 3
+            with patch.object(
+                regenerator, "should_regenerate", side_effect=_fake_should_regenerate
+            ):
+                await regenerator.regenerate_failed_posts_async(posts, templates, sample_brief)
+
+        assert regenerator.client.calls == 8
+        assert regenerator.client.peak == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_completion_order(self, sample_brief, templates):
+        """Test streamed outcomes arrive as they finish, tagged with input index"""
+        posts = [_post("BAD slow", 1), _post("BAD fast", 2), _post("GOOD", 1)]
+        regenerator = PostRegenerator(
+            client=FakeAsyncClient(delays={"Structure 1": 0.2, "Structure 2": 0.01})
+        )
+
+        with patch.object(regenerator, "should_regenerate", side_effect=_fake_should_regenerate):
+            outcomes = [
+                result
+                async for result in regenerator.stream_regenerated_posts(
+                    posts, templates, sample_brief
+                )
+            ]
+
+        assert [(r.index, r.outcome) for r in outcomes] == [
+            (2, "passed"),
+            (1, "improved"),
+            (0, "improved"),
+        ]
+
+
+    @pytest.mark.asyncio
+    async def test_sync_and_async_share_retry_and_failure_handling(
+        self, sample_brief, templates
+    ):
+        """Test both paths retry a still-failing rewrite and keep it if the retry errors"""
+        reasons = [RegenerationReason("too_short", "Post too short", 3)]
+        responses = ["BAD first rewrite", RuntimeError("API down")]
+
+        def sync_call(**kwargs):
+            response = responses[len(sync_requests)]
+            sync_requests.append(kwargs)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        async def async_call(**kwargs):
+            return sync_call(**kwargs)
+
+        regenerator = PostRegenerator(client=Mock())
+        regenerator.client.generate_post_content = sync_call
+        regenerator.client.generate_post_content_async = async_call
+
+        results = []
+        with patch.object(regenerator, "should_regenerate", side_effect=_fake_should_regenerate):
+            sync_requests = []
+            results.append(
+                regenerator.regenerate_post(_post("BAD"), templates[0], sample_brief, reasons)
+            )
+            sync_requests = []
+            results.append(
+                await regenerator.regenerate_post_async(
+                    _post("BAD"), templates[0], sample_brief, reasons
+                )
+            )
+
+        for post in results:
+            assert post.content == "BAD first rewrite"
+            assert post.variant == 101
+        assert len(sync_requests) == 2
+        assert sync_requests[0]["template_structure"] == "Structure 1"
+
+
+class TestReviseMultiplePostsAsync:
+    """Test concurrent revision batches"""
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_and_missing_templates(self, sample_brief, templates):
+        """Test revisions come back in input order even when finishing out of order"""
+        posts = [_post("Original one", 1), _post("Original orphan", 99), _post("Original two", 2)]
+        agent = RevisionAgent(
+            client=FakeAsyncClient(
+                delays={"Structure 1": 0.1, "Structure 2": 0.01}, response="Revised post"
+            )
+        )
+
+        results = await agent.revise_multiple_posts_async(
+            posts, "Make it more casual", sample_brief, templates
+        )
+
+        assert [post.content for post, _ in results] == [
+            "Revised post (Structure 1)",
+            "Original orphan",
+            "Revised post (Structure 2)",
+        ]
+        assert results[1][1] == "Template not found, kept original"
+        assert all(post.variant == original.variant for (post, _), original in zip(results, posts))
+
+    @pytest.mark.asyncio
+    async def test_stream_cancels_outstanding_revisions(self, sample_brief, templates):
+        """Test breaking out of the stream cancels revisions still in flight"""
+        posts = [_post("Original fast", 2), _post("Original slow", 1)]
+        client = FakeAsyncClient(delays={"Structure 1": 5.0, "Structure 2": 0.01})
+        agent = RevisionAgent(client=client)
+
+        stream = agent.stream_revisions(posts, "Shorter please", sample_brief, templates)
+        async for index, _, _ in stream:
+            assert index == 0
+            break
+        await stream.aclose()
+
+        assert client.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_revision_keeps_original(self, sample_brief, templates):
+        """Test an API failure for one post does not fail the batch"""
+        posts = [_post("Original one", 1), _post("Original two", 2)]
+        client = FakeAsyncClient(response="Revised")
+        original_call = client.generate_post_content_async
+
+        async def flaky(template_structure, context, **kwargs):
+            if template_structure == "Structure 1":
+                raise RuntimeError("API unavailable")
+            return await original_call(template_structure, context, **kwargs)
+
+        client.generate_post_content_async = flaky
+        agent = RevisionAgent(client=client)
+
+        results = await agent.revise_multiple_posts_async(
+            posts, "More data", sample_brief, templates
+        )
+
+        assert results[0][0] is posts[0]
+        assert results[0][1].startswith("Revision failed: API unavailable")
+        assert results[1][0].content == "Revised (Structure 2)"
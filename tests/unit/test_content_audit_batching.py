@@ -0,0 +1,191 @@
+"""Tests for the map-reduce content audit (batched piece analysis, local topic reduce)"""
+
+import json
+import re
+import threading
+from unittest.mock import patch
+
+import anthropic
+import httpx
+import pytest
+
+from src.models.content_audit_models import ContentHealth, ContentType, PerformanceLevel
+from src.research import content_audit
+from src.research.content_audit import ContentAuditor
+
+LEVELS = ["top_performer", "good_performer", "average", "underperforming"]
+
+
+class FakeClient:
+    """Answers each batch with one analysis per [id] line it was sent"""
+
+    def __init__(self, fail_containing=None):
+        self.fail_containing = fail_containing
+        self.batches = []
+        self.systems = set()
+        self.lock = threading.Lock()
+
+    def create_message(self, messages, system=None, max_tokens=None, **kwargs):
+        content = messages[0]["content"]
+        ids = [int(i) for i in re.findall(r"^\[(\d+)\]", content, re.MULTILINE)]
+        with self.lock:
+            self.batches.append(ids)
+            self.systems.add(system)
+        if self.fail_containing is not None and self.fail_containing in ids:
+            raise RuntimeError("overloaded")
+
+        pieces = [
+            {
+                "id": i,
+                "topic": f"Topic {i % 3}",
+                "performance_level": LEVELS[i % 4],
+                "health_status": "needs_update" if i % 2 else "good",
+                "engagement_score": i,
+                "strengths": [f"Strength {i}"],
+                "weaknesses": [],
+                "recommended_action": "Update",
+                "action_priority": "High",
+                "specific_updates_needed": ["Refresh stats"],
+            }
+            for i in ids
+        ]
+        return f"Here is the analysis:\n```json\n{json.dumps({'pieces': pieces})}\n```"
+
+
+@pytest.fixture
+def auditor():
+    return ContentAuditor(project_id="test_audit_batching")
+
+
+def _inventory(count, description=""):
+    return [
+        {"title": f"Post {i}", "type": "blog", "url": f"https://example.com/{i}",
+         "description": description}
+        for i in range(count)
+    ]
+
+
+def test_large_inventory_is_split_and_fully_parsed(auditor):
+    """Test every piece of a large inventory gets its own analysis, in order"""
+    client = FakeClient()
+    with patch.object(content_audit, "get_default_client", return_value=client):
+        pieces = auditor._analyze_content_pieces("Business", "Audience", _inventory(120), {})
+
+    assert len(pieces) == 120
+    assert len(client.batches) == 120 // content_audit.MAX_BATCH_PIECES + 1
+    assert all(len(batch) <= content_audit.MAX_BATCH_PIECES for batch in client.batches)
+    assert sorted(i for batch in client.batches for i in batch) == list(range(120))
+    assert len(client.systems) == 1  # Shared system prompt (cacheable)
+
+    assert pieces[5].title == "Post 5"
+    assert pieces[5].content_type == ContentType.BLOG_POST
+    assert pieces[5].performance_level == PerformanceLevel.GOOD_PERFORMER
+    assert pieces[5].health_status == ContentHealth.NEEDS_UPDATE
+    assert pieces[5].engagement_score == 5
+    assert pieces[5].topic == "Topic 2"
+    assert pieces[5].strengths == ["Strength 5"]
+
+
+def test_batches_respect_token_budget(auditor):
+    """Test long inventory lines produce smaller batches"""
+    inventory = _inventory(40, description="x" * 1000)
+    batches = auditor._batch_inventory(inventory, {})
+
+    for batch in batches:
+        tokens = sum(len(line) // content_audit.CHARS_PER_TOKEN + 1 for _, line in batch)
+        assert tokens <= content_audit.BATCH_INPUT_TOKENS or len(batch) == 1
+    assert len(batches[0]) < content_audit.MAX_BATCH_PIECES
+    assert sum(len(batch) for batch in batches) == 40
+
+
+def test_metrics_are_matched_by_url(auditor):
+    """Test tool-level performance metrics are added to the matching piece's line"""
+    line = auditor._format_inventory_line(
+        0, _inventory(1)[0], {"https://example.com/0": {"views": 1200}}
+    )
+    assert 'metrics: {"views": 1200}' in line
+
+
+def test_failed_batch_falls_back_to_inventory_data(auditor):
+    """Test a failed batch only affects its own pieces"""
+    client = FakeClient(fail_containing=0)
+    with patch.object(content_audit, "get_default_client", return_value=client):
+        pieces = auditor._analyze_content_pieces("Business", "Audience", _inventory(60), {})
+
+    assert len(pieces) == 60
+    assert pieces[0].performance_level == PerformanceLevel.AVERAGE
+    assert pieces[0].recommended_action == "Review" and pieces[0].strengths == []
+    assert pieces[59].strengths == ["Strength 59"]
+
+
+def test_mostly_failed_batches_fail_the_audit(auditor):
+    """Test the audit raises instead of reporting defaults when most batches fail"""
+    client = FakeClient(fail_containing=0)
+    with patch.object(content_audit, "get_default_client", return_value=client):
+        with pytest.raises(RuntimeError, match="1 of 1 batches"):
+            auditor._analyze_content_pieces("Business", "Audience", _inventory(10), {})
+
+    client = FakeClient(fail_containing=0)
+    with patch.object(content_audit, "MAX_FAILED_BATCH_SHARE", 0.25), patch.object(
+        content_audit, "get_default_client", return_value=client
+    ):
+        with pytest.raises(RuntimeError, match="1 of 3 batches"):
+            auditor._analyze_content_pieces("Business", "Audience", _inventory(60), {})
+
+
+def test_auth_error_propagates(auditor):
+    """Test an authentication error is raised, not turned into a failed batch"""
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    error = anthropic.AuthenticationError(
+        "invalid x-api-key", response=httpx.Response(401, request=request), body=None
+    )
+    client = FakeClient()
+    with patch.object(client, "create_message", side_effect=error), patch.object(
+        content_audit, "get_default_client", return_value=client
+    ):
+        with pytest.raises(anthropic.AuthenticationError):
+            auditor._analyze_content_pieces("Business", "Audience", _inventory(60), {})
+
+
+def test_topic_performance_is_reduced_locally(auditor):
+    """Test topic aggregates come from per-piece results without another API call"""
+    pieces = [
+        auditor._build_content_piece(
+            i,
+            {"title": f"Post {i}", "type": "guide"},
+            {"topic": "Churn" if i < 3 else None, "performance_level": level,
+             "engagement_score": 10 * i},
+        )
+        for i, level in enumerate(["top_performer", "underperforming", "top_performer", "average"])
+    ]
+
+    with patch.object(content_audit, "get_default_client") as get_client:
+        topics = auditor._analyze_topic_performance(pieces)
+    get_client.assert_not_called()
+
+    churn, guides = topics
+    assert churn.topic == "Churn" and churn.content_count == 3
+    assert churn.avg_performance == "good_performer"
+    assert churn.top_performing_piece == "Post 2"
+    assert churn.underperforming_pieces == ["Post 1"]
+    assert guides.topic == "Guide" and guides.avg_performance == "average"
+
+
+def test_topics_beyond_limit_fold_into_other(auditor):
+    """Test the long tail of topics is reported as one Other topic"""
+    pieces = [
+        auditor._build_content_piece(i, {"title": f"Post {i}"}, {"topic": f"Topic {i}"})
+        for i in range(content_audit.MAX_TOPICS + 5)
+    ]
+    topics = auditor._analyze_topic_performance(pieces)
+
+    assert len(topics) == content_audit.MAX_TOPICS
+    assert topics[-1].topic == "Other" and topics[-1].content_count == 6
+
+
+def test_content_type_aliases():
+    """Test inventory type names map onto ContentType"""
+    assert content_audit._content_type("blog") == ContentType.BLOG_POST
+    assert content_audit._content_type("Case Study") == ContentType.CASE_STUDY
+    assert content_audit._content_type("podcast") == ContentType.OTHER
+    assert content_audit._content_type(None) == ContentType.BLOG_POST
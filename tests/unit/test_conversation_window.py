@@ -0,0 +1,144 @@
+"""Tests for the token-budgeted conversation window and rolling summaries"""
+
+from unittest.mock import patch
+
+from src.utils.conversation_window import (
+    ConversationWindow,
+    build_summary_request,
+    estimate_tokens,
+    render_transcript,
+)
+
+
+class RecordingSummarizer:
+    """Summarizes by listing the evicted message texts"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, previous_summary, messages):
+        self.calls.append((previous_summary, list(messages)))
+        if self.fail:
+            raise RuntimeError("overloaded")
+        folded = " | ".join(str(message["content"])[:12] for message in messages)
+        return f"{previous_summary} + {folded}" if previous_summary else folded
+
+
+def _turn(i, size=400):
+    """One user/assistant exchange of roughly 2 * size / 4 tokens"""
+    return [
+        {"role": "user", "content": f"question {i} " + "q" * size},
+        {"role": "assistant", "content": f"answer {i} " + "a" * size},
+    ]
+
+
+def _tool_turn(i):
+    return [
+        {"role": "user", "content": f"question {i} " + "q" * 400},
+        {
+            "role": "assistant",
+            "content": [{"type": "tool_use", "id": f"t{i}", "name": "list_projects", "input": {}}],
+        },
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": f"t{i}",
+                                      "content": "r" * 400}]},
+        {"role": "assistant", "content": [{"type": "text", "text": "done " + "a" * 400}]},
+    ]
+
+
+def test_window_under_budget_is_untouched():
+    """Test short conversations are sent as-is without summarizing"""
+    summarize = RecordingSummarizer()
+    window = ConversationWindow(summarize, max_tokens=1000)
+    messages = _turn(0) + _turn(1)
+
+    assert window.compact(messages) is messages
+    assert summarize.calls == [] and window.summary == ""
+
+
+def test_compaction_folds_oldest_turns_down_to_target():
+    """Test over-budget windows shrink to the target at a turn boundary"""
+    summarize = RecordingSummarizer()
+    window = ConversationWindow(summarize, max_tokens=1000, target_tokens=500)
+    messages = [message for i in range(6) for message in _turn(i)]
+
+    retained = window.compact(messages)
+
+    assert estimate_tokens(retained) <= 500
+    assert retained[0]["content"].startswith("question 4")
+    assert len(summarize.calls[0][1]) == len(messages) - len(retained)
+    assert window.summary.startswith("question 0")
+    assert window.compactions == 1
+
+    # Hysteresis: the next turn fits without another summary
+    assert window.compact(retained + _turn(6)) == retained + _turn(6)
+    assert len(summarize.calls) == 1
+
+
+def test_tool_use_and_result_stay_together():
+    """Test the window never starts with a tool result"""
+    window = ConversationWindow(RecordingSummarizer(), max_tokens=600, target_tokens=350)
+    messages = [message for i in range(3) for message in _tool_turn(i)]
+
+    retained = window.compact(messages)
+
+    assert retained[0]["role"] == "user" and isinstance(retained[0]["content"], str)
+    assert len(retained) % 4 == 0
+
+
+def test_failed_summary_keeps_messages():
+    """Test a summarizer error keeps the window (retried at the next turn)"""
+    window = ConversationWindow(RecordingSummarizer(fail=True), max_tokens=300)
+    messages = [message for i in range(4) for message in _turn(i)]
+
+    assert window.compact(messages) is messages
+    assert window.summary == ""
+
+
+def test_single_oversized_turn_is_kept():
+    """Test the latest turn is sent even when it alone exceeds the budget"""
+    summarize = RecordingSummarizer()
+    window = ConversationWindow(summarize, max_tokens=100)
+    messages = _turn(0, size=2000)
+
+    assert window.compact(messages) is messages
+    assert summarize.calls == []
+
+
+def test_fit_replays_history_deterministically():
+    """Test stateless replays ask for the same summaries (so a cache can serve them)"""
+    history = [message for i in range(10) for message in _turn(i)]
+
+    first, second = RecordingSummarizer(), RecordingSummarizer()
+    window_a = ConversationWindow(first, max_tokens=1000)
+    window_b = ConversationWindow(second, max_tokens=1000)
+    recent_a = window_a.fit(history)
+    recent_b = window_b.fit(history + _turn(10))
+
+    assert estimate_tokens(recent_a) <= 1000
+    assert recent_a[0]["role"] == "user"
+    assert first.calls == second.calls[: len(first.calls)]
+    assert window_a.summary
+
+
+def test_system_blocks_cache_stable_prefix_and_summary():
+    """Test the stable prompt and summary are cache breakpoints; context is not"""
+    window = ConversationWindow(RecordingSummarizer(), summary="Client: Acme")
+
+    blocks = window.system_blocks("You are the agent.", "Current client: Acme")
+
+    assert [block.get("cache_control") is not None for block in blocks] == [True, True, False]
+    assert "Client: Acme" in blocks[1]["text"]
+
+    with patch("src.utils.conversation_window.settings.ENABLE_PROMPT_CACHING", False):
+        assert all("cache_control" not in block for block in window.system_blocks("x", "y"))
+
+
+def test_summary_request_renders_tool_calls():
+    """Test the summarizer sees tool calls and truncated tool results"""
+    request = build_summary_request("Earlier: onboarding", _tool_turn(0))
+    prompt = request["messages"][0]["content"]
+
+    assert "Earlier: onboarding" in prompt
+    assert "[called list_projects({})]" in prompt
+    assert "[tool result: rrr" in render_transcript(_tool_turn(0))
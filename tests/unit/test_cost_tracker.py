@@ -2,6 +2,9 @@
 
 import sqlite3
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -100,6 +103,27 @@ def test_track_api_call(tracker):
     assert project_cost.total_cost == pytest.approx(cost, rel=1e-6)
 
 
+def test_track_api_calls_batch(tracker):
+    """Test a batch of calls is stored in one go with per-call costs"""
+    calls = [
+        {
+            "project_id": project_id,
+            "operation": "post_generation",
+            "model": "claude-3-5-sonnet-20241022",
+            "input_tokens": 1000,
+            "output_tokens": 500,
+        }
+        for project_id in ("Project1", "Project1", "Project2")
+    ]
+
+    costs = tracker.track_api_calls(calls)
+
+    assert len(costs) == 3 and all(cost > 0 for cost in costs)
+    assert tracker.get_project_cost("Project1").total_calls == 2
+    assert tracker.get_project_cost("Project2").total_cost == pytest.approx(costs[2])
+    assert tracker.track_api_calls([]) == []
+
+
 def test_get_project_cost(tracker):
     """Test getting project cost summary"""
     project_id = "TestProject_20250101_120000"
@@ -312,5 +336,144 @@ def test_unknown_model_uses_default(tracker):
     assert cost == pytest.approx(expected_cost, rel=1e-6)
 
 
+def _insert_raw_call(db_path, project_id, timestamp, input_tokens=100, cost=0.01):
+    """Insert an api_calls row directly, bypassing rollup maintenance"""
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        INSERT INTO api_calls (
+            project_id, operation, model, input_tokens, output_tokens, cost, timestamp
+        ) VALUES (?, 'call', 'claude-3-5-sonnet-20241022', ?, 10, ?, ?)
+    """,
+        (project_id, input_tokens, cost, timestamp),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_track_api_call_updates_daily_rollup(tracker):
+    """Test that tracked calls are folded into the daily rollup immediately"""
+    for _ in range(3):
+        tracker.track_api_call(
+            project_id="Project1",
+            operation="post_generation",
+            model="claude-3-5-sonnet-20241022",
+            input_tokens=1000,
+            output_tokens=500,
+        )
+
+    conn = sqlite3.connect(tracker.db_path)
+    rows = conn.execute(
+        "SELECT project_id, operation, calls, input_tokens FROM api_call_daily_rollups"
+    ).fetchall()
+    conn.close()
+
+    assert rows == [("Project1", "post_generation", 3, 3000)]
+
+
+def test_refresh_rollups_folds_pending_rows(tracker):
+    """Test that rows written outside track_api_call are picked up incrementally"""
+    _insert_raw_call(tracker.db_path, "Project1", "2025-01-05 10:00:00")
+    _insert_raw_call(tracker.db_path, "Project1", "2025-01-05 11:00:00")
+
+    assert tracker.refresh_rollups() == 2
+    assert tracker.refresh_rollups() == 0
+
+
+def test_concurrent_refreshes_fold_each_row_once(tracker):
+    """Test that refreshes racing on the same high-water mark don't double count"""
+    for i in range(50):
+        _insert_raw_call(tracker.db_path, "Project1", f"2025-01-05 10:{i:02d}:00")
+
+    barrier = threading.Barrier(8)
+
+    def refresh():
+        barrier.wait()
+        return tracker.refresh_rollups()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        folded = list(pool.map(lambda _: refresh(), range(8)))
+
+    conn = sqlite3.connect(tracker.db_path)
+    calls = conn.execute("SELECT SUM(calls) FROM api_call_daily_rollups").fetchone()[0]
+    conn.close()
+
+    assert sum(folded) == 50
+    assert calls == 50
+
+
+def test_get_total_costs_date_range_matches_raw_rows(tracker):
+    """Test rollup-backed range totals match a raw scan, including partial days"""
+    calls = [
+        ("Project1", "2025-01-04 23:00:00", 1),
+        ("Project1", "2025-01-05 08:00:00", 10),
+        ("Project2", "2025-01-05 20:00:00", 100),
+        ("Project2", "2025-01-06 12:00:00", 1000),
+        ("Project3", "2025-01-07 09:00:00", 10000),
+    ]
+    for project_id, timestamp, tokens in calls:
+        _insert_raw_call(tracker.db_path, project_id, timestamp, input_tokens=tokens)
+
+    totals = tracker.get_total_costs(
+        start_date=datetime(2025, 1, 5, 12, 0), end_date=datetime(2025, 1, 7, 8, 0)
+    )
+    assert totals["total_calls"] == 2
+    assert totals["total_input_tokens"] == 1100
+    assert totals["total_projects"] == 1
+
+    totals = tracker.get_total_costs(start_date=datetime(2025, 1, 5))
+    assert totals["total_calls"] == 4
+    assert totals["total_input_tokens"] == 11110
+    assert totals["total_projects"] == 3
+
+
+def test_get_total_costs_includes_open_day(tracker):
+    """Test that calls from the current day are counted alongside closed days"""
+    _insert_raw_call(tracker.db_path, "Project1", "2025-01-05 10:00:00")
+    tracker.track_api_call(
+        project_id="Project2",
+        operation="call",
+        model="claude-3-5-sonnet-20241022",
+        input_tokens=1000,
+        output_tokens=500,
+    )
+
+    totals = tracker.get_total_costs()
+    assert totals["total_calls"] == 2
+    assert totals["total_projects"] == 2
+
+    recent = tracker.get_total_costs(start_date=datetime.now() - timedelta(days=2))
+    assert recent["total_calls"] == 1
+
+
+def test_get_cost_rollups_by_period(tracker):
+    """Test week and month buckets with dimensions"""
+    _insert_raw_call(tracker.db_path, "Project1", "2025-01-06 10:00:00", cost=1.0)
+    _insert_raw_call(tracker.db_path, "Project1", "2025-01-08 10:00:00", cost=2.0)
+    _insert_raw_call(tracker.db_path, "Project2", "2025-01-13 10:00:00", cost=4.0)
+    _insert_raw_call(tracker.db_path, "Project2", "2025-02-03 10:00:00", cost=8.0)
+
+    weeks = tracker.get_cost_rollups(period="week", end_date=datetime(2025, 1, 31).date())
+    assert [(w["period_start"], w["total_calls"]) for w in weeks] == [
+        ("2025-01-06", 2),
+        ("2025-01-13", 1),
+    ]
+
+    months = tracker.get_cost_rollups(period="month", group_by=["project_id"])
+    assert [(m["period_start"], m["project_id"], m["total_cost"]) for m in months] == [
+        ("2025-01-01", "Project1", 3.0),
+        ("2025-01-01", "Project2", 4.0),
+        ("2025-02-01", "Project2", 8.0),
+    ]
+
+
+def test_get_cost_rollups_rejects_unknown_dimension(tracker):
+    """Test that only known rollup dimensions are accepted"""
+    with pytest.raises(ValueError):
+        tracker.get_cost_rollups(group_by=["timestamp"])
+    with pytest.raises(ValueError):
+        tracker.get_cost_rollups(period="hour")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+"""Tests for stored deliverable previews and windowed preview reads"""
+
+import os
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from backend.models import Deliverable
+from backend.services import deliverable_service
+from backend.services.deliverable_service import (
+    PREVIEW_MAX_ROWS,
+    get_deliverable_details,
+    get_file_preview,
+    preview_file_version,
+    read_preview_window,
+    store_file_preview,
+)
+
+
+def test_text_preview_is_truncated(tmp_path):
+    """Test md/txt previews stop at max_chars"""
+    path = tmp_path / "posts.md"
+    path.write_text("# Week 1\n" + "x" * 100, encoding="utf-8")
+
+    assert get_file_preview(path, max_chars=8) == ("# Week 1", True)
+    assert get_file_preview(path, max_chars=1000) == (path.read_text(encoding="utf-8"), False)
+    assert get_file_preview(tmp_path / "missing.md") == (None, False)
+
+
+def test_csv_and_xlsx_previews_show_first_rows(tmp_path):
+    """Test tabular previews are the first rows, cells separated by pipes"""
+    openpyxl = pytest.importorskip("openpyxl")
+    rows = [("date", "post")] + [(f"2025-01-{i:02d}", f"Post {i}") for i in range(1, 31)]
+
+    csv_path = tmp_path / "calendar.csv"
+    csv_path.write_text("\n".join(",".join(row) for row in rows), encoding="utf-8")
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    xlsx_path = tmp_path / "calendar.xlsx"
+    workbook.save(xlsx_path)
+
+    for path in (csv_path, xlsx_path):
+        preview, truncated = get_file_preview(path)
+        lines = preview.split("\n")
+        assert truncated
+        assert len(lines) == PREVIEW_MAX_ROWS
+        assert lines[:2] == ["date | post", "2025-01-01 | Post 1"]
+
+
+def test_docx_preview_stored_on_deliverable(tmp_path):
+    """Test docx text is extracted once and stored on the record"""
+    docx = pytest.importorskip("docx")
+    document = docx.Document()
+    document.add_paragraph("Post 1: Launch day")
+    document.add_paragraph("Post 2: Behind the scenes")
+    path = tmp_path / "posts.docx"
+    document.save(path)
+    deliverable = Deliverable(id="del-1", format="docx", path="acme/posts.docx")
+
+    store_file_preview(deliverable, path)
+
+    assert deliverable.preview_text == "Post 1: Launch day\n\nPost 2: Behind the scenes"
+    assert deliverable.preview_truncated is False
+
+
+def test_unreadable_file_stores_no_preview(tmp_path):
+    """Test extraction errors leave the preview empty instead of storing the error text"""
+    path = tmp_path / "posts.txt"
+    path.write_bytes(b"\xff\xfe\x00binary")
+    deliverable = Deliverable(id="del-1", format="txt", path="acme/posts.txt")
+
+    store_file_preview(deliverable, path)
+
+    assert deliverable.preview_text is None
+    assert deliverable.preview_file_version == preview_file_version(path)
+    with pytest.raises(UnicodeDecodeError):
+        get_file_preview(path)
+
+
+def test_changed_file_preview_is_extracted_again(tmp_path, monkeypatch):
+    """Test the details request re-extracts a preview whose file version changed"""
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "data" / "outputs" / "acme" / "posts.md"
+    path.parent.mkdir(parents=True)
+    path.write_text("# Week 1", encoding="utf-8")
+    deliverable = Deliverable(
+        id="del-1", project_id="p", client_id="c", format="md", path="acme/posts.md",
+        status="ready", created_at=datetime.now(timezone.utc),
+    )
+    store_file_preview(deliverable, path)
+    db = MagicMock()
+
+    with patch.object(deliverable_service.crud, "get_deliverable", return_value=deliverable):
+        assert get_deliverable_details(db, "del-1").file_preview == "# Week 1"
+        db.commit.assert_not_called()  # Unchanged file: stored preview only
+
+        path.write_text("# Week 2", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert get_deliverable_details(db, "del-1").file_preview == "# Week 2"
+
+    db.commit.assert_called_once()
+    assert deliverable.preview_file_version == preview_file_version(path)
+
+
+def test_preview_window_pages_through_text(tmp_path):
+    """Test windows chain via next_offset and cover the file exactly"""
+    path = tmp_path / "posts.txt"
+    content = "".join(f"Post {i}\n" for i in range(500))
+    path.write_text(content, encoding="utf-8")
+
+    pieces, offset = [], 0
+    while offset is not None:
+        window = read_preview_window(path, offset, 1000)
+        pieces.append(window.content)
+        offset = window.next_offset
+
+    assert "".join(pieces) == content
+    assert window.total_size == len(content)
+
+    window = read_preview_window(path, 2000, 10)
+    assert window.content == content[2000:2010]
+
+
+def test_preview_window_respects_utf8_boundaries(tmp_path):
+    """Test windows never split a multi-byte character"""
+    path = tmp_path / "posts.md"
+    content = "Café ☕ naïve 🚀 " * 20
+    path.write_text(content, encoding="utf-8")
+    data = content.encode("utf-8")
+
+    for length in (1, 7):
+        pieces, offset = [], 0
+        while offset is not None:
+            window = read_preview_window(path, offset, length)
+            assert "�" not in window.content
+            pieces.append(window.content)
+            offset = window.next_offset
+        assert "".join(pieces) == content
+
+    # An offset inside "é" starts at the next character
+    mid_char = data.index("é".encode("utf-8")) + 1
+    window = read_preview_window(path, mid_char, 5)
+    assert window.offset == mid_char + 1
+    assert window.content.startswith(" ")
+
+
+def test_preview_window_rejects_unsupported_formats(tmp_path):
+    """Test formats without extractable text raise ValueError"""
+    path = tmp_path / "posts.pdf"
+    path.write_bytes(b"%PDF-1.7")
+
+    with pytest.raises(ValueError):
+        read_preview_window(path)
@@ -0,0 +1,184 @@
+"""Tests for the append-only research execution ledger (appends, rotation, index, export)"""
+
+import csv
+import io
+import json
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from src.research import execution_ledger
+from src.research.base import ResearchTool
+from src.research.execution_ledger import ExecutionLedger
+
+START = datetime(2025, 3, 1, 9, 0, 0)
+
+
+def _entry(i, project_id="proj-1", tool_name="seo_keywords", day=0):
+    return {
+        "tool_name": tool_name,
+        "project_id": project_id,
+        "executed_at": (START + timedelta(days=day, minutes=i)).isoformat(),
+        "success": True,
+        "outputs": {"json": f"/tmp/{i}.json"},
+        "metadata": {
+            "duration_seconds": 1.5,
+            "price": 400,
+            "api_usage": {"api_calls": 3, "cost_usd": 0.25},
+            "cache": {"hit": i % 2 == 1},
+        },
+        "error": None,
+    }
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return ExecutionLedger(tmp_path / "ledger", max_segment_bytes=2000)
+
+
+class DummyTool(ResearchTool):
+    """Minimal tool writing one report"""
+
+    @property
+    def tool_name(self) -> str:
+        return "dummy"
+
+    @property
+    def price(self) -> int:
+        return 300
+
+    def validate_inputs(self, inputs):
+        return True
+
+    def run_analysis(self, inputs):
+        return {"summary": inputs["topic"]}
+
+    def generate_reports(self, analysis):
+        return {"json": self._save_json(analysis, "dummy.json")}
+
+
+def test_concurrent_appends_are_not_lost(ledger):
+    """Test overlapping executions each land as one intact line"""
+    threads = [
+        threading.Thread(target=lambda n=n: [ledger.append(_entry(n * 10 + i)) for i in range(10)])
+        for n in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    entries = list(ledger.iter_entries())
+    assert len(entries) == 80
+    assert len({entry["outputs"]["json"] for entry in entries}) == 80
+
+
+def test_rotation_seals_and_indexes_segments(ledger):
+    """Test full segments are sealed and summarized in index.json"""
+    for i in range(20):
+        ledger.append(_entry(i, project_id=f"proj-{i % 2}"))
+
+    sealed = sorted(ledger.ledger_dir.glob("ledger-*.jsonl"))
+    assert sealed
+    assert all(path.stat().st_size <= ledger.max_segment_bytes for path in sealed)
+
+    index = json.loads((ledger.ledger_dir / "index.json").read_text(encoding="utf-8"))
+    assert set(index) == {path.name for path in sealed}
+    first = index[sealed[0].name]
+    assert first["projects"] == ["proj-0", "proj-1"] and first["tools"] == ["seo_keywords"]
+    assert first["first_executed_at"] == _entry(0)["executed_at"]
+    assert sum(summary["entries"] for summary in index.values()) < 20  # Rest is active
+
+    assert [e["outputs"]["json"] for e in ledger.iter_entries()] == [
+        f"/tmp/{i}.json" for i in range(20)
+    ]
+
+
+def test_filters_by_project_tool_and_date_range(ledger):
+    """Test queries return only matching entries; the end bound is exclusive"""
+    for day in range(5):
+        ledger.append(_entry(0, project_id="proj-a", day=day))
+        ledger.append(_entry(1, project_id="proj-b", tool_name="competitive_analysis", day=day))
+
+    in_range = list(
+        ledger.iter_entries(
+            project_id="proj-a", start=START + timedelta(days=1), end=START + timedelta(days=3)
+        )
+    )
+    assert [entry["executed_at"][:10] for entry in in_range] == ["2025-03-02", "2025-03-03"]
+    assert len(list(ledger.iter_entries(tool_name="competitive_analysis"))) == 5
+
+
+def test_index_skips_segments_that_cannot_match(ledger):
+    """Test sealed segments outside the filters are never opened"""
+    for i in range(10):
+        ledger.append(_entry(i, project_id="proj-old"))
+    for i in range(3):
+        ledger.append(_entry(i, project_id="proj-new", day=30))
+
+    read = []
+    real_read = execution_ledger._read_segment
+
+    def tracking_read(path):
+        read.append(path.name)
+        return real_read(path)
+
+    with patch.object(execution_ledger, "_read_segment", side_effect=tracking_read):
+        entries = list(ledger.iter_entries(start=START + timedelta(days=30)))
+
+    assert len(entries) == 3
+    assert read == ["ledger.jsonl"]
+
+
+def test_corrupted_line_is_skipped(ledger):
+    """Test a torn line (e.g. after a crash) does not break queries"""
+    ledger.append(_entry(0))
+    with open(ledger.active_path, "a", encoding="utf-8") as f:
+        f.write('{"tool_name": "seo_key')
+    ledger.append(_entry(1))
+
+    assert len(list(ledger.iter_entries())) == 1
+
+
+def test_billing_export_streams_rows(ledger):
+    """Test the CSV export has one row per matching execution"""
+    for i in range(4):
+        ledger.append(_entry(i, project_id="proj-a" if i < 3 else "proj-b"))
+
+    output = io.StringIO()
+    rows = ledger.export_billing_csv(output, project_id="proj-a")
+
+    records = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert rows == 3 and len(records) == 3
+    assert records[1]["price"] == "400" and records[1]["api_cost_usd"] == "0.25"
+    assert [r["cache_hit"] for r in records] == ["False", "True", "False"]
+
+
+def test_import_legacy_logs(ledger, tmp_path):
+    """Test old execution_log.json files are appended once"""
+    legacy = tmp_path / "research" / "seo_keywords" / "proj-1" / "execution_log.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps([_entry(0), _entry(1)]), encoding="utf-8")
+
+    assert ledger.import_legacy_logs(tmp_path / "research") == 2
+    assert ledger.import_legacy_logs(tmp_path / "research") == 0
+    assert len(list(ledger.iter_entries())) == 2
+
+
+def test_execute_appends_to_ledger(tmp_path):
+    """Test successful executions are recorded in the tool's ledger"""
+    tool = DummyTool("proj-1")
+    tool.base_output_dir = tmp_path / "research"
+
+    with patch("src.research.base.get_research_cache") as get_cache:
+        get_cache.return_value.get_result.return_value = None
+        tool.execute({"topic": "churn"})
+        tool.execute({"topic": "pricing"})
+
+    ledger = execution_ledger.get_execution_ledger(tmp_path / "research" / "_ledger")
+    entries = list(ledger.iter_entries(project_id="proj-1", tool_name="dummy"))
+    assert len(entries) == 2
+    assert entries[0]["metadata"]["price"] == 300
+    assert not list((tmp_path / "research").glob("**/execution_log.json"))
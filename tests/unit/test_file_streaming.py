@@ -0,0 +1,94 @@
+"""Tests for streaming deliverable downloads (ranges, zip streaming, gzip variants)"""
+
+import gzip
+import io
+import os
+import zipfile
+
+import pytest
+
+from backend.utils.file_streaming import (
+    CHUNK_SIZE,
+    get_gzip_variant,
+    iter_file,
+    iter_zip,
+    parse_range_header,
+)
+from backend.utils.file_utils import calculate_file_checksum
+
+
+def test_parse_range_header():
+    """Test single ranges are parsed and clamped; anything else serves the whole file"""
+    assert parse_range_header("bytes=0-99", 1000) == (0, 99)
+    assert parse_range_header("bytes=900-", 1000) == (900, 999)
+    assert parse_range_header("bytes=-100", 1000) == (900, 999)
+    assert parse_range_header("bytes=500-5000", 1000) == (500, 999)
+
+    assert parse_range_header(None, 1000) is None
+    assert parse_range_header("bytes=0-1,5-6", 1000) is None
+    assert parse_range_header("items=0-1", 1000) is None
+    assert parse_range_header("bytes=a-b", 1000) is None
+
+    with pytest.raises(ValueError):
+        parse_range_header("bytes=1000-", 1000)
+    with pytest.raises(ValueError):
+        parse_range_header("bytes=-0", 1000)
+
+
+def test_iter_file_range(tmp_path):
+    """Test a byte range spanning chunks is returned exactly"""
+    data = os.urandom(CHUNK_SIZE * 3)
+    path = tmp_path / "posts.docx"
+    path.write_bytes(data)
+
+    start, end = CHUNK_SIZE - 10, 2 * CHUNK_SIZE + 10
+
+    assert b"".join(iter_file(path, start, end)) == data[start : end + 1]
+    assert b"".join(iter_file(path)) == data
+
+
+def test_iter_zip_streams_readable_archive(tmp_path):
+    """Test the streamed zip opens and text members are deflated"""
+    text = tmp_path / "posts.md"
+    text.write_text("# Week 1\n" * 5000, encoding="utf-8")
+    binary = tmp_path / "posts.docx"
+    binary.write_bytes(os.urandom(CHUNK_SIZE + 123))
+
+    chunks = list(iter_zip([(text, "acme/posts.md"), (binary, "acme/posts.docx")]))
+
+    assert len(chunks) > 2  # emitted incrementally, not as one buffer
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.testzip() is None
+        assert archive.read("acme/posts.md") == text.read_bytes()
+        assert archive.read("acme/posts.docx") == binary.read_bytes()
+        assert archive.getinfo("acme/posts.md").compress_type == zipfile.ZIP_DEFLATED
+        assert archive.getinfo("acme/posts.docx").compress_type == zipfile.ZIP_STORED
+
+
+def test_gzip_variant_is_cached_and_refreshed(tmp_path):
+    """Test .gz variants are reused until the source file changes"""
+    path = tmp_path / "calendar.csv"
+    path.write_text("date,post\n" * 100, encoding="utf-8")
+
+    gz_path = get_gzip_variant(path)
+    assert gzip.decompress(gz_path.read_bytes()) == path.read_bytes()
+
+    mtime = gz_path.stat().st_mtime_ns
+    assert get_gzip_variant(path).stat().st_mtime_ns == mtime
+
+    path.write_text("date,post\nchanged\n", encoding="utf-8")
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+    assert gzip.decompress(get_gzip_variant(path).read_bytes()) == b"date,post\nchanged\n"
+
+    assert get_gzip_variant(tmp_path / "posts.docx") is None
+
+
+def test_calculate_file_checksum(tmp_path):
+    """Test checksums are SHA-256 hex digests and None for missing files"""
+    path = tmp_path / "posts.txt"
+    path.write_bytes(b"hello")
+
+    assert calculate_file_checksum(str(path)) == (
+        "2cf24dba5fb0a30e26e83b2ac5b9e29e1b161e5c1fa7425e73043362938b9824"
+    )
+    assert calculate_file_checksum(str(tmp_path / "missing.txt")) is None
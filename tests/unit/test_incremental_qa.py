@@ -0,0 +1,197 @@
+"""
+Unit tests for incremental QA.
+
+Posts are validated one at a time as they are generated, so duplicate hooks
+and CTA imbalance are caught mid-run and regeneration can start immediately.
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agents.coordinator import CoordinatorAgent
+from src.agents.post_regenerator import PostRegenerator
+from src.agents.qa_agent import QAAgent
+from src.models.client_brief import ClientBrief, Platform
+from src.models.post import Post
+from src.validators.hook_validator import MINHASH_AVAILABLE, HookValidator
+from src.validators.incremental_validator import IncrementalQAValidator
+
+def _post(hook: str, cta: str = "What's your take?", words: int = 200, template_id: int = 1):
+    body = " ".join(["word"] * words)
+    return Post(
+        content=f"{hook}\n\n{body}\n\n{cta}",
+        template_id=template_id,
+        template_name=f"Template {template_id}",
+        variant=1,
+        client_name="TestClient",
+        target_platform=Platform.LINKEDIN,
+    )
+
+
+HOOKS = [
+    "The secret to success is persistence",
+    "How to grow your business faster",
+    "Why customer service matters most",
+    "Three ways to improve efficiency",
+    "Best practices for team management",
+]
+
+
+class TestIncrementalQAValidator:
+    """Test online hook/CTA/length tracking"""
+
+    def test_duplicate_hook_flagged_on_arrival(self):
+        """Test the second near-identical hook is reported against the first"""
+        validator = IncrementalQAValidator(expected_posts=10)
+
+        first = validator.add(_post("The secret to success is persistence"))
+        second = validator.add(_post("How to grow your business faster"))
+        third = validator.add(_post("The secret to success is persistence!"))
+
+        assert first.duplicate_of is None and second.duplicate_of is None
+        assert third.duplicate_of == 0
+        assert third.duplicate_hook == "The secret to success is persistence"
+        assert "hook is" in third.issues[0]
+
+    @pytest.mark.skipif(not MINHASH_AVAILABLE, reason="datasketch not installed")
+    def test_lsh_index_used_for_large_runs(self):
+        """Test large runs query the incremental MinHash index"""
+        validator = IncrementalQAValidator(expected_posts=60)
+        assert validator._lsh is not None
+
+        for hook in HOOKS:
+            assert validator.add(_post(hook)).duplicate_of is None
+        assert validator.add(_post(HOOKS[2])).duplicate_of == 2
+
+    def test_matches_batch_hook_duplicates(self):
+        """Test every post the batch validator pairs with an earlier one is flagged"""
+        hooks = HOOKS + [HOOKS[0] + "!", HOOKS[3].lower(), "Something else entirely"]
+        posts = [_post(hook) for hook in hooks]
+        validator = IncrementalQAValidator(expected_posts=len(posts))
+
+        checks = [validator.add(post) for post in posts]
+        flagged = {check.index for check in checks if check.duplicate_of is not None}
+        batch = HookValidator(similarity_threshold=validator.hook_validator.similarity_threshold)
+        expected = {dup["post2_idx"] for dup in batch.validate(posts)["duplicates"]}
+
+        assert flagged == expected == {5, 6}
+
+    def test_cta_overuse_detected_against_planned_run(self):
+        """Test a CTA is flagged once it exceeds its share of the planned run"""
+        validator = IncrementalQAValidator(expected_posts=5, platform=Platform.LINKEDIN)
+        assert validator.max_posts_per_cta == 2  # 40% of 5
+
+        checks = [
+            validator.add(_post(hook, words=150 + 20 * i)) for i, hook in enumerate(HOOKS[:3])
+        ]
+
+        assert [check.overused_cta for check in checks] == [False, False, True]
+        assert validator.get_stats()["cta_distribution"] == {"question_take": 3}
+
+    def test_length_sameness_and_limits(self):
+        """Test same-length runs and out-of-range lengths are reported"""
+        validator = IncrementalQAValidator(expected_posts=4, platform=Platform.LINKEDIN)
+        ctas = ["What's your take?", "Drop a comment below", "DM me", "Book a call"]
+
+        checks = [validator.add(_post(hook, cta=cta)) for hook, cta in zip(HOOKS, ctas)]
+        short = validator.add(_post("Short one", cta="Learn more", words=5))
+
+        assert validator.max_posts_per_length_bucket == 2
+        assert [check.similar_length for check in checks] == [False, False, True, True]
+        assert short.length_issue == "too_short"
+
+    def test_replace_updates_distributions(self):
+        """Test a regenerated post replaces the original's hook and CTA"""
+        validator = IncrementalQAValidator(expected_posts=10)
+        validator.add(_post(HOOKS[0]))
+        duplicate = validator.add(_post(HOOKS[0]))
+        assert duplicate.duplicate_of == 0
+
+        check = validator.replace(1, _post(HOOKS[1], cta="Drop a comment below"))
+
+        assert check.index == 1 and check.duplicate_of is None
+        assert validator.get_stats()["cta_distribution"] == {
+            "question_take": 1,
+            "comment_request": 1,
+        }
+        assert validator.add(_post(HOOKS[1])).duplicate_of == 1
+
+
+class TestRegenerationReasons:
+    """Test set-level issues become regeneration guidance"""
+
+    def test_reasons_and_guidance(self):
+        """Test duplicate hooks and overused CTAs get specific guidance"""
+        regenerator = PostRegenerator(client=MagicMock())
+        validator = IncrementalQAValidator(expected_posts=2)
+        validator.add(_post(HOOKS[0]))
+        post = _post(HOOKS[0])
+        check = validator.add(post)
+
+        reasons = regenerator.reasons_from_check(post, check)
+        guidance = regenerator._build_improvement_prompt(post, reasons, MagicMock())
+
+        assert [r.reason_type for r in reasons] == ["duplicate_hook", "overused_cta"]
+        assert HOOKS[0] in guidance
+        assert "different kind of CTA" in guidance
+
+
+class TestCoordinatorIncrementalQA:
+    """Test regeneration is scheduled while generation is still running"""
+
+    def test_flagged_post_regenerated_in_flight(self):
+        """Test a duplicate is regenerated before the last post is generated"""
+        events = []
+        ctas = ["What's your take?", "Drop a comment below", "DM me", "Book a call"]
+        posts = [
+            _post(hook, cta=ctas[i % 4], words=120 + 25 * i, template_id=i)
+            for i, hook in enumerate(HOOKS[:3] + [HOOKS[0]] + HOOKS[3:])
+        ]
+
+        async def generate_posts_async(on_post, **kwargs):
+            for post in posts:
+                await asyncio.sleep(0.01)
+                on_post(post)
+            events.append("generation_done")
+            return list(reversed(posts))
+
+        async def regenerate_post_async(post, template, client_brief, reasons, **kwargs):
+            events.append(("regenerate", [r.reason_type for r in reasons]))
+            return _post("A completely fresh opening line", cta="Drop a comment below")
+
+        coordinator = CoordinatorAgent.__new__(CoordinatorAgent)
+        coordinator.qa_agent = QAAgent()
+        coordinator.post_regenerator = PostRegenerator(client=MagicMock())
+        coordinator.content_generator = MagicMock()
+        coordinator.content_generator.generate_posts_async = generate_posts_async
+        coordinator.content_generator.template_loader.get_all_templates.return_value = [
+            MagicMock(template_id=i) for i in range(len(posts))
+        ]
+        brief = ClientBrief(
+            company_name="TestClient",
+            business_description="B2B SaaS",
+            ideal_customer="Managers",
+            main_problem_solved="Slow releases",
+        )
+
+        with patch.object(
+            coordinator.post_regenerator, "should_regenerate", return_value=(False, [])
+        ), patch.object(
+            coordinator.post_regenerator, "regenerate_post_async", side_effect=regenerate_post_async
+        ):
+            final_posts, stats = asyncio.run(
+                coordinator._generate_with_incremental_qa(
+                    client_brief=brief,
+                    template_quantities=None,
+                    num_posts=len(posts),
+                    platform=Platform.LINKEDIN,
+                    auto_fix=True,
+                )
+            )
+
+        assert events == [("regenerate", ["duplicate_hook"]), "generation_done"]
+        expected = list(reversed(posts))
+        assert final_posts[2].content.startswith("A completely fresh opening line")
+        assert final_posts[:2] + final_posts[3:] == expected[:2] + expected[3:]
+        assert stats["posts_regenerated"] == 1
@@ -0,0 +1,136 @@
+"""
+Unit tests for pipelined multi-platform generation.
+
+Each blog post's teasers start as soon as that blog post is written, and
+blog and teaser calls share one concurrency limit.
+"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agents.content_generator import ContentGeneratorAgent
+from src.models.client_brief import ClientBrief, Platform
+from src.models.post import Post
+
+
+@pytest.fixture
+def brief():
+    return ClientBrief(
+        company_name="Test Company",
+        business_description="B2B SaaS analytics",
+        ideal_customer="Engineering managers",
+        main_problem_solved="Slow release cycles",
+    )
+
+
+class FakeApi:
+    """Stand-in generation calls that record timing and concurrency"""
+
+    def __init__(self, blog_delays):
+        self.blog_delays = blog_delays
+        self.events = []
+        self.active = 0
+        self.max_active = 0
+
+    async def _call(self, delay):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(delay)
+        self.active -= 1
+
+    async def blog(self, template, client_brief, variant, post_number, call_slot, **kwargs):
+        async with call_slot():
+            await self._call(self.blog_delays[post_number - 1])
+        self.events.append(("blog_done", post_number))
+        return Post(
+            content=f"# Blog {post_number}\n\nBody",
+            template_id=post_number,
+            template_name="Blog",
+            variant=variant,
+            client_name=client_brief.company_name,
+            target_platform=Platform.BLOG,
+        )
+
+    async def teaser(self, client_brief, blog_meta, platform):
+        self.events.append(("teaser_start", blog_meta["id"]))
+        await self._call(0.01)
+        return Post(
+            content=f"Read it → {blog_meta['link_placeholder']}",
+            template_id=0,
+            template_name="Blog Teaser",
+            variant=1,
+            client_name=client_brief.company_name,
+            target_platform=platform,
+            related_blog_post_id=blog_meta["id"],
+            blog_link_placeholder=blog_meta["link_placeholder"],
+            blog_title=blog_meta["title"],
+        )
+
+
+def _run(brief, blog_delays, max_concurrent=10, **kwargs):
+    client = MagicMock()
+    client.get_prompt_cache_stats.return_value = {"requests": 0}
+    generator = ContentGeneratorAgent(client=client, template_loader=MagicMock())
+    api = FakeApi(blog_delays)
+    tasks = [
+        {
+            "template": MagicMock(),
+            "variant": 1,
+            "post_number": i,
+            "cached_system_prompt": "system",
+            "base_context": {},
+        }
+        for i in range(1, len(blog_delays) + 1)
+    ]
+
+    with patch.object(generator, "_plan_post_tasks", return_value=tasks), patch.object(
+        generator, "_generate_single_post_with_retry_async", side_effect=api.blog
+    ), patch.object(generator, "_generate_blog_teaser_async", side_effect=api.teaser):
+        package = asyncio.run(
+            generator.generate_multi_platform_with_blog_links_async(
+                brief,
+                num_blog_posts=len(blog_delays),
+                randomize=False,
+                max_concurrent=max_concurrent,
+                **kwargs,
+            )
+        )
+    return package, api
+
+
+class TestMultiPlatformPipeline:
+    """Test blog-first teaser pipelining"""
+
+    def test_teasers_start_before_slower_blogs_finish(self, brief):
+        """Test a fast blog's teasers do not wait for the slowest blog"""
+        _, api = _run(brief, blog_delays=[0.01, 0.01, 0.3])
+
+        assert api.events.index(("teaser_start", 2)) < api.events.index(("blog_done", 3))
+
+    def test_shared_concurrency_limit(self, brief):
+        """Test blogs and teasers together never exceed max_concurrent"""
+        _, api = _run(brief, blog_delays=[0.02] * 6, max_concurrent=3)
+
+        assert api.max_active == 3
+
+    def test_package_layout_and_links(self, brief):
+        """Test every platform gets one teaser per blog, linked in blog order"""
+        package, _ = _run(
+            brief,
+            blog_delays=[0.03, 0.01, 0.02],
+            teaser_platforms=[Platform.LINKEDIN, Platform.TWITTER, Platform.FACEBOOK],
+        )
+
+        assert list(package) == ["blog", "linkedin", "twitter", "facebook"]
+        placeholders = [post.blog_link_placeholder for post in package["blog"]]
+        assert placeholders == ["[BLOG_LINK_1]", "[BLOG_LINK_2]", "[BLOG_LINK_3]"]
+        for platform in ("linkedin", "twitter", "facebook"):
+            assert [post.blog_link_placeholder for post in package[platform]] == placeholders
+        assert package["blog"][0].blog_title == "Blog 1"
+
+    def test_default_platforms_follow_teasers_per_blog(self, brief):
+        """Test the legacy social_teasers_per_blog argument still picks the platforms"""
+        package, _ = _run(brief, blog_delays=[0.01], social_teasers_per_blog=2)
+
+        assert list(package) == ["blog", "twitter", "facebook"]
@@ -0,0 +1,138 @@
+"""
+Unit tests for prompt-cache-aware request layout in AnthropicClient.
+
+Post generation requests are ordered from most to least stable content
+(system -> client context -> template -> per-post guidance) with cache
+breakpoints at each stable boundary.
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.utils.anthropic_client import AnthropicClient
+
+
+@pytest.fixture
+def client():
+    """Client with a dummy key; no request ever leaves the process"""
+    return AnthropicClient(api_key="test-key", enable_response_cache=False)
+
+
+@pytest.fixture
+def post_context():
+    """Client context merged with per-post fields, as built by ContentGeneratorAgent"""
+    return {
+        "company_name": "Acme Analytics",
+        "ideal_customer": "Operations leaders",
+        "problem_solved": "Reporting takes too long",
+        "brand_voice": "direct, data_driven",
+        "pain_points": ["manual exports", "stale dashboards"],
+        "stories": [],
+        "main_cta": "book a demo",
+        "variant_guidance": "Use a story-driven or example-based angle",
+        "template_type": "problem_recognition",
+        "requires_story": True,
+        "requires_data": False,
+    }
+
+
+def _fake_response(text="Generated post", **usage):
+    usage_defaults = {
+        "input_tokens": 100,
+        "output_tokens": 50,
+        "cache_creation_input_tokens": 0,
+        "cache_read_input_tokens": 0,
+    }
+    usage_defaults.update(usage)
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=text)],
+        usage=SimpleNamespace(**usage_defaults),
+    )
+
+
+class TestPostMessageLayout:
+    """Test block ordering and cache breakpoints"""
+
+    def test_blocks_ordered_from_stable_to_variable(self, client, post_context):
+        """Test client context, template structure and post guidance are separate blocks"""
+        messages = client._build_post_messages("Hook\nBody\nCTA", post_context, enable_caching=True)
+
+        assert len(messages) == 1
+        blocks = messages[0]["content"]
+        assert [b["type"] for b in blocks] == ["text", "text", "text"]
+
+        client_block, template_block, post_block = blocks
+        assert client_block["text"].startswith("Client Context:\ncompany_name: Acme Analytics")
+        assert "pain_points: manual exports, stale dashboards" in client_block["text"]
+        assert template_block["text"] == "Template Structure:\nHook\nBody\nCTA"
+        assert post_block["text"].startswith(
+            "Post Guidance:\nvariant_guidance: Use a story-driven or example-based angle"
+        )
+
+        # Per-post and template metadata never leak into the cached client block
+        assert "variant_guidance" not in client_block["text"]
+        assert "requires_story" not in client_block["text"]
+
+    def test_cache_breakpoints_on_stable_blocks_only(self, client, post_context):
+        """Test cache_control is set on client and template blocks, not the post block"""
+        blocks = client._build_post_messages("Structure", post_context, enable_caching=True)[0][
+            "content"
+        ]
+
+        assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+        assert blocks[1]["cache_control"] == {"type": "ephemeral"}
+        assert "cache_control" not in blocks[2]
+
+        uncached = client._build_post_messages("Structure", post_context, enable_caching=False)
+        assert all("cache_control" not in b for b in uncached[0]["content"])
+
+    def test_client_block_identical_across_variants(self, client, post_context):
+        """Test the cached prefix is byte-identical for every post of a client"""
+        other_variant = dict(post_context, variant_guidance="Use a direct angle")
+        other_template = dict(other_variant, template_type="statistic")
+
+        first = client._build_post_messages("Template A", post_context)[0]["content"]
+        second = client._build_post_messages("Template A", other_variant)[0]["content"]
+        third = client._build_post_messages("Template B", other_template)[0]["content"]
+
+        assert first[0] == second[0] == third[0]
+        assert first[1] == second[1]
+        assert first[2] != second[2]
+
+
+class TestPromptCacheStats:
+    """Test per-run cache usage reporting"""
+
+    @pytest.mark.asyncio
+    async def test_generate_post_content_async_records_cache_usage(self, client, post_context):
+        """Test usage from responses accumulates and can be diffed per run"""
+        client.async_client.messages.create = AsyncMock(
+            side_effect=[
+                _fake_response(input_tokens=40, cache_creation_input_tokens=2000),
+                _fake_response(input_tokens=40, cache_read_input_tokens=2000),
+                _fake_response(input_tokens=40, cache_read_input_tokens=2000),
+            ]
+        )
+
+        before = client.get_prompt_cache_stats()
+        for _ in range(3):
+            await client.generate_post_content_async("Structure", post_context)
+
+        stats = client.get_prompt_cache_stats(since=before)
+        assert stats["requests"] == 3
+        assert stats["cache_creation_tokens"] == 2000
+        assert stats["cache_read_tokens"] == 4000
+        assert stats["input_tokens"] == 120
+        assert stats["cache_hit_rate"] == pytest.approx(4000 / 6120, abs=1e-4)
+
+        # Request carries the system breakpoint plus the structured user turn
+        call_kwargs = client.async_client.messages.create.call_args.kwargs
+        assert call_kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+        assert isinstance(call_kwargs["messages"][0]["content"], list)
+
+    def test_stats_empty_before_any_request(self, client):
+        """Test stats are zeroed with no division by zero"""
+        stats = client.get_prompt_cache_stats()
+        assert stats["requests"] == 0
+        assert stats["cache_hit_rate"] == 0.0
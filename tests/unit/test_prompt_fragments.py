@@ -0,0 +1,177 @@
+"""
+Unit tests for the memoized system prompt builder.
+
+System prompts are assembled from fragments cached by content hash, so the
+same inputs give a byte-identical prompt (keeping Anthropic's prompt cache
+warm across runs) and multi-platform runs reuse the client fragments.
+"""
+import pickle
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.agents.content_generator import ContentGeneratorAgent
+from src.models.client_brief import ClientBrief, Platform, TonePreference
+from src.models.client_memory import ClientMemory
+from src.utils.anthropic_client import AnthropicClient
+from src.utils.prompt_fragments import (
+    PromptFragmentCache,
+    SystemPrompt,
+    content_hash,
+    get_prompt_fragment_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_fragment_cache():
+    get_prompt_fragment_cache().clear()
+    yield
+    get_prompt_fragment_cache().clear()
+
+
+@pytest.fixture
+def brief():
+    return ClientBrief(
+        company_name="Test Company",
+        business_description="B2B SaaS analytics for software teams",
+        ideal_customer="Engineering managers",
+        main_problem_solved="Slow release cycles",
+        brand_personality=[TonePreference.DIRECT],
+        key_phrases=["ship fast"],
+    )
+
+
+@pytest.fixture
+def memory():
+    return ClientMemory(
+        client_name="Test Company",
+        total_projects=2,
+        voice_adjustments={"tone": "more casual", "length": "shorter"},
+        signature_phrases=["data-driven"],
+    )
+
+
+def _generator() -> ContentGeneratorAgent:
+    return ContentGeneratorAgent(client=MagicMock(), template_loader=MagicMock())
+
+
+@pytest.fixture
+def generator():
+    return _generator()
+
+
+class TestPromptFragmentCache:
+    """Test the fragment cache itself"""
+
+    def test_builds_once_per_content(self):
+        """Test equal inputs hit the cache and different inputs miss"""
+        cache = PromptFragmentCache()
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "fragment"
+
+        cache.get_or_build("kind", ("a", {"x": 1, "y": 2}), build)
+        cache.get_or_build("kind", ("a", {"y": 2, "x": 1}), build)
+        cache.get_or_build("kind", ("b",), build)
+
+        assert len(calls) == 2
+        assert cache.get_stats()["hit_count"] == 1
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache stays bounded"""
+        cache = PromptFragmentCache(max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            cache.get_or_build("kind", (key,), lambda: key)
+
+        assert cache.get_stats()["size"] == 2
+        rebuilt = []
+        cache.get_or_build("kind", ("a",), lambda: rebuilt.append(1) or "a")
+        assert rebuilt == []
+
+    def test_content_hash_normalizes_models(self, brief):
+        """Test pydantic models and enums hash by value"""
+        assert content_hash(brief, Platform.TWITTER) == content_hash(
+            brief.model_copy(), Platform.TWITTER
+        )
+        assert content_hash(Platform.TWITTER) != content_hash(Platform.LINKEDIN)
+
+    def test_system_prompt_is_plain_text_with_segments(self):
+        """Test SystemPrompt compares as its text and survives pickling"""
+        prompt = SystemPrompt(["shared", "", "client"])
+
+        assert prompt == "sharedclient"
+        assert prompt.segments == ("shared", "client")
+        assert pickle.loads(pickle.dumps(prompt)).segments == prompt.segments
+
+
+class TestSystemPromptBuilder:
+    """Test ContentGeneratorAgent._build_system_prompt"""
+
+    def test_identical_inputs_give_identical_prompt(self, generator, brief, memory):
+        """Test rebuilding (and a fresh cache) reproduces the prompt byte for byte"""
+        first = generator._build_system_prompt(brief, Platform.LINKEDIN, memory)
+        second = generator._build_system_prompt(brief, Platform.LINKEDIN, memory)
+        get_prompt_fragment_cache().clear()
+        third = _generator()._build_system_prompt(brief, Platform.LINKEDIN, memory)
+
+        assert first == second == third
+        assert first.segments == third.segments
+
+    def test_client_fragments_reused_across_platforms(self, generator, brief, memory):
+        """Test a multi-platform run only renders the platform fragment per platform"""
+        with patch.object(
+            generator, "_infer_archetype", wraps=generator._infer_archetype
+        ) as infer:
+            prompts = [
+                generator._build_system_prompt(brief, platform, memory)
+                for platform in (Platform.LINKEDIN, Platform.TWITTER, Platform.FACEBOOK)
+            ]
+
+        infer.assert_called_once()
+        assert len({prompt.segments[1] for prompt in prompts}) == 1
+        assert "PLATFORM-SPECIFIC REQUIREMENTS FOR TWITTER" in prompts[1].segments[0]
+
+    def test_memory_change_only_changes_client_segment(self, generator, brief, memory):
+        """Test updated memory keeps the shared platform prefix intact"""
+        before = generator._build_system_prompt(brief, Platform.LINKEDIN, memory)
+        updated = memory.model_copy(update={"total_projects": 3})
+        after = generator._build_system_prompt(brief, Platform.LINKEDIN, updated)
+
+        assert before.segments[0] == after.segments[0]
+        assert "3 previous project" in after
+        assert "3 previous project" not in before
+
+    def test_voice_adjustment_order_does_not_matter(self, generator, brief, memory):
+        """Test learned preferences render in a stable order"""
+        reordered = memory.model_copy(
+            update={"voice_adjustments": dict(reversed(list(memory.voice_adjustments.items())))}
+        )
+        first = generator._build_system_prompt(brief, Platform.LINKEDIN, memory)
+        get_prompt_fragment_cache().clear()
+        second = generator._build_system_prompt(brief, Platform.LINKEDIN, reordered)
+
+        assert first == second
+
+
+class TestSystemBlocks:
+    """Test cache breakpoints on segmented system prompts"""
+
+    def test_segments_become_cached_blocks(self):
+        """Test the shared and client segments each get a breakpoint"""
+        client = AnthropicClient.__new__(AnthropicClient)
+
+        blocks = client._prepare_system_with_caching(SystemPrompt(["shared", "client"]), True)
+
+        assert [block["text"] for block in blocks] == ["shared", "client"]
+        assert all(block["cache_control"] == {"type": "ephemeral"} for block in blocks)
+
+    def test_plain_string_stays_single_block(self):
+        """Test other callers' prompts are unchanged"""
+        client = AnthropicClient.__new__(AnthropicClient)
+
+        assert len(client._prepare_system_with_caching("system", True)) == 1
+        assert client._prepare_system_with_caching(SystemPrompt(["a", "b"]), False) == [
+            {"type": "text", "text": "ab"}
+        ]
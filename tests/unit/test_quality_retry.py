@@ -0,0 +1,235 @@
+"""
+Unit tests for the parallel, budgeted quality-retry loop in ContentGeneratorAgent.
+
+After a flagged first attempt, retries run as rounds of concurrent candidates;
+the first candidate without quality flags wins and the rest are cancelled.
+Retry tokens are charged to the active run and capped per run.
+"""
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.agents.content_generator import RETRY_OPERATION, ContentGeneratorAgent
+from src.models.client_brief import ClientBrief, Platform
+from src.models.post import Post
+from src.models.template import Template, TemplateDifficulty, TemplateType
+from src.utils.anthropic_client import AnthropicClient
+from src.utils.run_context import get_current_operation, get_current_run, run_scope
+
+
+@pytest.fixture
+def sample_brief():
+    """Sample client brief for testing"""
+    return ClientBrief(
+        company_name="Test Company",
+        business_description="Software development",
+        ideal_customer="Tech startups",
+        main_problem_solved="Development speed",
+        platforms=[Platform.LINKEDIN],
+    )
+
+
+@pytest.fixture
+def sample_template():
+    """Sample template for testing"""
+    return Template(
+        template_id=1,
+        name="Problem Recognition",
+        template_type=TemplateType.PROBLEM_RECOGNITION,
+        difficulty=TemplateDifficulty.FAST,
+        structure="Test structure",
+        best_for="Testing",
+    )
+
+
+@pytest.fixture
+def generator():
+    """Generator with a dummy client; the single-post call is always mocked"""
+    return ContentGeneratorAgent(
+        client=AnthropicClient(api_key="test-key", enable_response_cache=False),
+        template_loader=Mock(),
+    )
+
+
+def _post(content: str, flagged: bool) -> Post:
+    post = Post(
+        content=content,
+        template_id=1,
+        template_name="Problem Recognition",
+        variant=1,
+        client_name="Test Company",
+    )
+    if flagged:
+        post.flag_for_review("Post too short: 40 words")
+    return post
+
+
+async def _retry(generator, brief, template, **kwargs):
+    return await generator._generate_single_post_with_retry_async(
+        template=template, client_brief=brief, variant=1, post_number=1, **kwargs
+    )
+
+
+class TestParallelQualityRetry:
+    """Test candidate rounds, early exit and cancellation"""
+
+    @pytest.mark.asyncio
+    async def test_first_attempt_passing_skips_retries(
+        self, generator, sample_brief, sample_template
+    ):
+        """Test a clean first attempt returns without launching candidates"""
+        calls = []
+
+        async def fake_generate(**kwargs):
+            calls.append(kwargs.get("attempt_guidance"))
+            return _post("clean", flagged=False)
+
+        with patch.object(generator, "_generate_single_post_async", side_effect=fake_generate):
+            post = await _retry(generator, sample_brief, sample_template)
+
+        assert post.content == "clean"
+        assert calls == [None]
+
+    @pytest.mark.asyncio
+    async def test_first_passing_candidate_wins_and_rest_cancelled(
+        self, generator, sample_brief, sample_template
+    ):
+        """Test candidates run concurrently and slower ones are cancelled"""
+        guidance = []
+        cancelled = []
+        in_flight = 0
+        peak = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal in_flight, peak
+            attempt_guidance = kwargs.get("attempt_guidance")
+            if attempt_guidance is None:
+                return _post("first", flagged=True)
+
+            guidance.append(attempt_guidance)
+            index = len(guidance)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                # Candidate 2 finishes first and passes; the others are slower
+                await asyncio.sleep(0.01 if index == 2 else 1.0)
+                return _post(f"candidate {index}", flagged=False)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            finally:
+                in_flight -= 1
+
+        with patch.object(generator, "_generate_single_post_async", side_effect=fake_generate):
+            post = await _retry(generator, sample_brief, sample_template, parallel_candidates=3)
+
+        assert post.content == "candidate 2"
+        assert peak == 3
+        assert sorted(cancelled) == [1, 3]
+
+        # Each candidate gets distinct guidance carrying the previous flags
+        assert len(set(guidance)) == 3
+        assert all("Post too short: 40 words" in g for g in guidance)
+
+    @pytest.mark.asyncio
+    async def test_returns_best_attempt_when_all_flagged(
+        self, generator, sample_brief, sample_template
+    ):
+        """Test max_attempts is respected across rounds and the best post returned"""
+        calls = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal calls
+            calls += 1
+            return _post(f"attempt {calls}", flagged=True)
+
+        with patch.object(generator, "_generate_single_post_async", side_effect=fake_generate):
+            post = await _retry(
+                generator, sample_brief, sample_template, max_attempts=5, parallel_candidates=3
+            )
+
+        assert calls == 5
+        assert post.needs_review
+
+
+    @pytest.mark.asyncio
+    async def test_candidates_share_the_call_limit(
+        self, generator, sample_brief, sample_template
+    ):
+        """Test retry candidates take a call slot each instead of one per post"""
+        in_flight = 0
+        peak = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _post("attempt", flagged=True)
+
+        call_slot = ContentGeneratorAgent._api_call_limiter(2)
+        with patch.object(generator, "_generate_single_post_async", side_effect=fake_generate):
+            await asyncio.gather(
+                *[
+                    _retry(
+                        generator,
+                        sample_brief,
+                        sample_template,
+                        max_attempts=4,
+                        parallel_candidates=3,
+                        call_slot=call_slot,
+                    )
+                    for _ in range(3)
+                ]
+            )
+
+        assert peak == 2
+
+
+class TestRetryTokenBudget:
+    """Test per-run retry token budget"""
+
+    @pytest.mark.asyncio
+    async def test_budget_exhaustion_stops_new_rounds(
+        self, generator, sample_brief, sample_template
+    ):
+        """Test no further rounds start once retry tokens reach the budget"""
+        calls = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal calls
+            calls += 1
+            if kwargs.get("attempt_guidance"):
+                get_current_run().record_call(get_current_operation(), output_tokens=600)
+            return _post(f"attempt {calls}", flagged=True)
+
+        with patch("src.agents.content_generator.settings") as mock_settings:
+            mock_settings.QUALITY_RETRY_PARALLELISM = 2
+            mock_settings.QUALITY_RETRY_TOKEN_BUDGET = 1000
+            with run_scope(run_id="run-budget") as usage:
+                with patch.object(
+                    generator, "_generate_single_post_async", side_effect=fake_generate
+                ):
+                    post = await _retry(generator, sample_brief, sample_template)
+
+        # First attempt + one round of 2 candidates (1200 tokens) exhausts the budget
+        assert calls == 3
+        assert usage.operation_tokens(RETRY_OPERATION) == 1200
+        assert post.needs_review
+
+    @pytest.mark.asyncio
+    async def test_no_budget_without_active_run(self, generator, sample_brief, sample_template):
+        """Test retries are only capped by max_attempts outside a run scope"""
+        calls = 0
+
+        async def fake_generate(**kwargs):
+            nonlocal calls
+            calls += 1
+            return _post(f"attempt {calls}", flagged=True)
+
+        with patch.object(generator, "_generate_single_post_async", side_effect=fake_generate):
+            await _retry(generator, sample_brief, sample_template, max_attempts=4)
+
+        assert calls == 4
@@ -0,0 +1,277 @@
+"""Unit tests for the research result cache
+
+ResearchTool.execute reuses whole results of identical runs and memoizes
+individual API responses (sections) so runs with partially changed inputs
+only pay for the steps that changed.
+"""
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from src.research.base import ResearchTool
+from src.research.result_cache import ResearchResultCache, SectionMemo
+from src.utils.anthropic_client import AnthropicClient
+
+
+class CacheTestAnalysis(BaseModel):
+    business_summary: str
+    audience_summary: str
+
+
+class TwoStepTool(ResearchTool):
+    """Research tool whose two steps each depend on one input"""
+
+    version = "1"
+
+    def __init__(self, project_id, client, output_root):
+        super().__init__(project_id)
+        self.client = client
+        self.base_output_dir = output_root
+
+    @property
+    def tool_name(self) -> str:
+        return "two_step"
+
+    @property
+    def price(self) -> int:
+        return 100
+
+    @property
+    def tool_version(self) -> str:
+        return self.version
+
+    def validate_inputs(self, inputs):
+        return True
+
+    def run_analysis(self, inputs):
+        business = self.client.create_message(
+            messages=[{"role": "user", "content": f"Summarize {inputs['business']}"}]
+        )
+        audience = self.client.create_message(
+            messages=[{"role": "user", "content": f"Describe {inputs['audience']}"}]
+        )
+        return CacheTestAnalysis(business_summary=business, audience_summary=audience)
+
+    def generate_reports(self, analysis):
+        path = self.output_dir / "analysis.json"
+        path.write_text(analysis.model_dump_json(), encoding="utf-8")
+        return {"json": path}
+
+
+def _fake_response(**request):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text=f"answer: {request['messages'][0]['content']}")],
+        usage=SimpleNamespace(
+            input_tokens=100,
+            output_tokens=50,
+            cache_creation_input_tokens=0,
+            cache_read_input_tokens=0,
+        ),
+    )
+
+
+@pytest.fixture
+def client():
+    """Client with a dummy key whose requests are answered locally"""
+    client = AnthropicClient(api_key="test-key", enable_response_cache=False)
+    client.client.messages.create = MagicMock(side_effect=_fake_response)
+    return client
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResearchResultCache(cache_dir=tmp_path / "cache", enabled=True)
+    with patch("src.research.base.get_research_cache", return_value=cache):
+        yield cache
+
+
+@pytest.fixture
+def make_tool(client, tmp_path):
+    def make(project_id="proj-1"):
+        return TwoStepTool(project_id, client, tmp_path / "research")
+
+    return make
+
+
+INPUTS = {"business": "Acme churn analytics", "audience": "CS leaders"}
+
+
+def _api_calls(client):
+    return client.client.messages.create.call_count
+
+
+class TestResultReuse:
+    """Test whole-result caching"""
+
+    def test_identical_run_is_served_from_cache(self, cache, client, make_tool):
+        """Test a re-run with identical inputs makes no API calls"""
+        first = make_tool().execute(dict(INPUTS))
+        second = make_tool().execute(dict(INPUTS))
+
+        assert first.success and second.success
+        assert _api_calls(client) == 2
+        assert first.metadata["cache"]["hit"] is False
+        assert second.metadata["cache"]["hit"] is True
+        assert second.metadata["api_usage"] == {}
+        assert second.outputs == first.outputs
+
+    def test_force_refresh_reruns_everything(self, cache, client, make_tool):
+        """Test force_refresh skips result and section reuse"""
+        make_tool().execute(dict(INPUTS))
+        refreshed = make_tool().execute(dict(INPUTS), force_refresh=True)
+
+        assert _api_calls(client) == 4
+        assert refreshed.metadata["cache"]["hit"] is False
+        assert refreshed.metadata["cache"]["sections_computed"] == 2
+
+    def test_missing_reports_are_regenerated_from_cached_analysis(
+        self, cache, client, make_tool
+    ):
+        """Test deleted report files are rebuilt without API calls"""
+        first = make_tool().execute(dict(INPUTS))
+        first.outputs["json"].unlink()
+
+        second = make_tool().execute(dict(INPUTS))
+
+        assert _api_calls(client) == 2
+        assert second.outputs["json"].exists()
+        report = json.loads(second.outputs["json"].read_text(encoding="utf-8"))
+        assert report["business_summary"] == "answer: Summarize Acme churn analytics"
+
+    def test_version_and_project_scope_results(self, cache, client, make_tool):
+        """Test a new tool version or another project does not reuse the result"""
+        make_tool().execute(dict(INPUTS))
+
+        other_project = make_tool("proj-2").execute(dict(INPUTS))
+        bumped = make_tool()
+        bumped.version = "2"
+        new_version = bumped.execute(dict(INPUTS))
+
+        assert other_project.metadata["cache"]["hit"] is False
+        assert other_project.metadata["cache"]["sections_reused"] == 2  # Same prompts
+        assert new_version.metadata["cache"]["hit"] is False
+        assert new_version.metadata["cache"]["sections_computed"] == 2
+
+
+class TestSectionReuse:
+    """Test partial reuse when only some inputs changed"""
+
+    def test_unchanged_steps_reuse_responses(self, cache, client, make_tool):
+        """Test only the step depending on the changed input calls the API"""
+        make_tool().execute(dict(INPUTS))
+        changed = make_tool().execute({**INPUTS, "audience": "RevOps teams"})
+
+        assert _api_calls(client) == 3
+        assert changed.metadata["cache"]["sections_reused"] == 1
+        assert changed.metadata["cache"]["sections_computed"] == 1
+
+        report = json.loads(changed.outputs["json"].read_text(encoding="utf-8"))
+        assert report["audience_summary"] == "answer: Describe RevOps teams"
+
+    def test_unparseable_response_is_not_replayed(self, cache, client, make_tool):
+        """Test a response whose JSON failed to parse is requested again on retry"""
+        replies = iter(["not json", '{"summary": "ok"}'])
+        client.client.messages.create = MagicMock(
+            side_effect=lambda **request: SimpleNamespace(
+                content=[SimpleNamespace(text=next(replies))], usage=_fake_response(**request).usage
+            )
+        )
+        tool = make_tool()
+
+        def run_analysis(inputs):
+            response = tool.client.create_message(messages=[{"role": "user", "content": "Hi"}])
+            summary = tool._extract_json_from_response(response)["summary"]
+            return CacheTestAnalysis(business_summary=summary, audience_summary="")
+
+        tool.run_analysis = run_analysis
+
+        assert not tool.execute(dict(INPUTS)).success
+        retried = tool.execute(dict(INPUTS))
+
+        assert retried.success
+        assert _api_calls(client) == 2
+        assert retried.metadata["cache"]["sections_computed"] == 1
+
+    def test_failed_run_keeps_only_parsed_responses(self, cache, client, make_tool):
+        """Test a failed run stores confirmed responses and drops unconfirmed ones"""
+        tool = make_tool()
+        with cache.section_scope("two_step", "1") as memo:
+            memo.put("parsed", '{"a": 1}')
+            memo.put("pending", "answer")
+            tool._extract_json_from_response('{"a": 1}')
+        assert memo.get("parsed") and memo.get("pending")
+
+        with pytest.raises(RuntimeError):
+            with cache.section_scope("two_step", "1") as memo:
+                memo.put("kept", '{"b": 2}')
+                memo.put("dropped", "answer")
+                tool._extract_json_from_response('{"b": 2}')
+                raise RuntimeError("report generation failed")
+
+        fresh = SectionMemo(cache, "two_step-v1")
+        assert fresh.get("kept") == '{"b": 2}'
+        assert fresh.get("dropped") is None
+
+    def test_calls_outside_a_scope_are_not_memoized(self, cache, client):
+        """Test the memo only applies inside research runs"""
+        for _ in range(2):
+            client.create_message(messages=[{"role": "user", "content": "Hello"}])
+
+        assert _api_calls(client) == 2
+
+
+class TestCacheBehaviour:
+    """Test expiry, disabling and metrics"""
+
+    def test_disabled_cache_always_runs(self, tmp_path, client, make_tool):
+        """Test ENABLE_RESEARCH_CACHE=False behaves like no cache"""
+        disabled = ResearchResultCache(cache_dir=tmp_path / "off", enabled=False)
+        with patch("src.research.base.get_research_cache", return_value=disabled):
+            make_tool().execute(dict(INPUTS))
+            make_tool().execute(dict(INPUTS))
+
+        assert _api_calls(client) == 4
+        assert not (tmp_path / "off").exists()
+
+    def test_expired_entries_miss(self, tmp_path, client, make_tool):
+        """Test entries older than the TTL are not reused"""
+        expiring = ResearchResultCache(cache_dir=tmp_path / "ttl", ttl_seconds=-1, enabled=True)
+        with patch("src.research.base.get_research_cache", return_value=expiring):
+            make_tool().execute(dict(INPUTS))
+            second = make_tool().execute(dict(INPUTS))
+
+        assert _api_calls(client) == 4
+        assert second.metadata["cache"]["hit"] is False
+
+    def test_sweep_removes_expired_files(self, tmp_path, client, make_tool):
+        """Test expired sections are deleted even if they are never read again"""
+        sweeping = ResearchResultCache(cache_dir=tmp_path / "sweep", enabled=True)
+        with patch("src.research.base.get_research_cache", return_value=sweeping):
+            make_tool().execute(dict(INPUTS))
+        files = [path for path in (tmp_path / "sweep").rglob("*.json")]
+        assert len(files) == 3  # One result, two sections
+
+        assert sweeping.sweep_expired() == 0  # Throttled, and nothing expired
+        sweeping.ttl_seconds = -1
+        assert sweeping.sweep_expired(force=True) == 3
+        assert not any(path.exists() for path in files)
+
+    def test_unserializable_analysis_is_not_cached(self, cache):
+        """Test analyses that are not JSON-serializable are skipped"""
+        assert cache.put_result("key", {"when": object()}, {}) is False
+        assert cache.get_result("key") is None
+
+    def test_stats_count_hits_and_misses(self, cache, client, make_tool):
+        """Test hit/miss counters for results and sections"""
+        make_tool().execute(dict(INPUTS))
+        make_tool().execute(dict(INPUTS))
+        make_tool().execute({**INPUTS, "audience": "RevOps teams"})
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2
+        assert stats["stores"] == 2
+        assert stats["section_hits"] == 1 and stats["section_misses"] == 3
+        assert stats["hit_rate"] == pytest.approx(1 / 3)
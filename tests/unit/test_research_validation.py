@@ -216,13 +216,13 @@ def test_content_audit_empty():
 
 
 def test_content_audit_too_many():
-    """Test content audit rejects more than 100 pieces."""
-    pieces = [ContentPiece(title=f"Post {i}", url=f"https://example.com/{i}") for i in range(101)]
+    """Test content audit rejects more than 2000 pieces."""
+    pieces = [ContentPiece(title=f"Post {i}", url=f"https://example.com/{i}") for i in range(2001)]
     with pytest.raises(ValidationError) as exc_info:
         ContentAuditParams(content_inventory=pieces)
 
     errors = exc_info.value.errors()
-    assert any("1-100" in str(error["msg"]) for error in errors)
+    assert any("1-2000" in str(error["msg"]) for error in errors)
 
 
 def test_content_piece_invalid_url():
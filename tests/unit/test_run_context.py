@@ -0,0 +1,190 @@
+"""
+Unit tests for run-scoped API usage accounting (src/utils/run_context.py).
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.utils.anthropic_client import AnthropicClient
+from src.utils.run_context import (
+    get_current_operation,
+    get_current_run,
+    operation_scope,
+    record_queue_wait,
+    run_scope,
+    tracked_operation,
+)
+
+
+def _fake_response(input_tokens=100, output_tokens=40, cache_read=0, cache_write=0):
+    return SimpleNamespace(
+        content=[SimpleNamespace(text="ok")],
+        usage=SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cache_creation_input_tokens=cache_write,
+            cache_read_input_tokens=cache_read,
+        ),
+    )
+
+
+@pytest.fixture
+def client():
+    """Client with mocked API and cost tracker (no network, no cost DB writes)"""
+    api_client = AnthropicClient(api_key="test-key", enable_response_cache=False)
+    api_client.cost_tracker = Mock()
+    api_client.cost_tracker.track_api_call.return_value = 0.01
+    api_client.cost_tracker.calculate_cost.return_value = 0.01
+    return api_client
+
+
+class TestRunScope:
+    """Test scope nesting and propagation"""
+
+    def test_nested_scope_joins_outer_run(self):
+        """Test inner scopes reuse the outer run and only change the operation"""
+        assert get_current_run() is None
+
+        with run_scope(run_id="run-outer", project_id="proj-1", operation="workflow") as outer:
+            with run_scope(run_id="ignored", operation="post_generation") as inner:
+                assert inner is outer
+                assert get_current_operation() == "post_generation"
+            assert get_current_operation() == "workflow"
+
+            with operation_scope("qa") as active:
+                assert active is outer
+                assert get_current_operation() == "qa"
+
+        assert get_current_run() is None
+        assert get_current_operation() is None
+        assert outer.run_id == "run-outer"
+
+    @pytest.mark.asyncio
+    async def test_usage_follows_gathered_tasks(self):
+        """Test contextvars carry the run into asyncio tasks"""
+
+        async def worker(n):
+            with operation_scope(f"op{n % 2}"):
+                record_queue_wait(0.005)
+                get_current_run().record_call(get_current_operation(), input_tokens=n)
+
+        with run_scope(run_id="run-async") as usage:
+            await asyncio.gather(*[worker(n) for n in range(1, 5)])
+
+        summary = usage.to_dict()
+        assert summary["api_calls"] == 4
+        assert summary["input_tokens"] == 10
+        assert summary["operations"]["op0"]["input_tokens"] == 6
+        assert summary["operations"]["op1"]["input_tokens"] == 4
+        assert summary["queue_wait_ms"] == pytest.approx(20.0)
+
+    @pytest.mark.asyncio
+    async def test_tracked_operation_decorator(self):
+        """Test the decorator opens a run for sync and async functions"""
+
+        @tracked_operation("sync_op")
+        def sync_func():
+            return get_current_run(), get_current_operation()
+
+        @tracked_operation("async_op")
+        async def async_func():
+            return get_current_run(), get_current_operation()
+
+        run, operation = sync_func()
+        assert run is not None and operation == "sync_op"
+
+        run, operation = await async_func()
+        assert run is not None and operation == "async_op"
+
+        with run_scope(run_id="run-caller") as usage:
+            run, _ = sync_func()
+            assert run is usage
+
+
+class TestClientAttribution:
+    """Test AnthropicClient attributes calls to the active run"""
+
+    @pytest.mark.asyncio
+    async def test_calls_without_project_id_are_attributed(self, client):
+        """Test generation-style calls (no project_id) are charged to the run's project"""
+        client.async_client.messages.create = AsyncMock(
+            side_effect=[_fake_response(cache_write=500), _fake_response(cache_read=500)]
+        )
+
+        with run_scope(run_id="run-1", project_id="proj-9") as usage:
+            with operation_scope("post_generation"):
+                await client.create_message_async([{"role": "user", "content": "a"}])
+                await client.create_message_async([{"role": "user", "content": "b"}])
+            client.cost_tracker.track_api_calls.assert_not_called()
+
+        client.cost_tracker.track_api_call.assert_not_called()
+        (tracked,) = client.cost_tracker.track_api_calls.call_args.args
+        assert len(tracked) == 2
+        assert all(c["project_id"] == "proj-9" for c in tracked)
+        assert all(c["operation"] == "post_generation" for c in tracked)
+
+        summary = usage.to_dict()
+        op = summary["operations"]["post_generation"]
+        assert op["api_calls"] == 2
+        assert op["input_tokens"] == 200
+        assert op["output_tokens"] == 80
+        assert op["cache_creation_tokens"] == 500
+        assert op["cache_read_tokens"] == 500
+        assert op["cost_usd"] == pytest.approx(0.02)
+        assert op["api_latency_ms"] >= 0
+
+    def test_explicit_operation_and_project_win(self, client):
+        """Test explicit arguments override the scope's tags"""
+        client.client.messages.create = Mock(return_value=_fake_response())
+
+        with run_scope(project_id="proj-scope", operation="scoped"):
+            client.create_message(
+                [{"role": "user", "content": "x"}],
+                project_id="proj-explicit",
+                operation="brief_parsing",
+            )
+
+        ((call,),) = client.cost_tracker.track_api_calls.call_args.args
+        assert call["project_id"] == "proj-explicit"
+        assert call["operation"] == "brief_parsing"
+
+    def test_call_outside_run_is_tracked_immediately(self, client):
+        """Test calls with no run to batch them are written right away"""
+        client.client.messages.create = Mock(return_value=_fake_response())
+
+        client.create_message([{"role": "user", "content": "x"}], project_id="proj-1")
+
+        kwargs = client.cost_tracker.track_api_call.call_args.kwargs
+        assert kwargs["project_id"] == "proj-1"
+        client.cost_tracker.track_api_calls.assert_not_called()
+
+    def test_retries_and_failures_recorded(self, client, monkeypatch):
+        """Test retried and ultimately failed calls show up in the run"""
+        from anthropic import APIConnectionError
+
+        monkeypatch.setattr("src.utils.anthropic_client.time.sleep", lambda _: None)
+        error = APIConnectionError(request=Mock())
+        client.max_retries = 3
+        client.client.messages.create = Mock(side_effect=[error, _fake_response()])
+
+        with run_scope(operation="research:test") as usage:
+            client.create_message([{"role": "user", "content": "x"}])
+
+            client.client.messages.create = Mock(side_effect=error)
+            with pytest.raises(APIConnectionError):
+                client.create_message([{"role": "user", "content": "y"}])
+
+        summary = usage.to_dict()
+        assert summary["api_calls"] == 2
+        assert summary["failed_calls"] == 1
+        assert summary["retries"] == 1 + 2
+
+    def test_no_scope_without_project_skips_tracking(self, client):
+        """Test calls outside any run and without project_id are not charged"""
+        client.client.messages.create = Mock(return_value=_fake_response())
+
+        client.create_message([{"role": "user", "content": "x"}])
+
+        client.cost_tracker.track_api_call.assert_not_called()
@@ -0,0 +1,186 @@
+"""
+Unit tests for the precompiled template index.
+
+Selection runs as bitset intersections over the compiled library and must
+pick the same templates as the list-based passes it replaced; the compiled
+index is persisted so new processes skip parsing the Markdown library.
+"""
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.config.template_rules import TEMPLATE_PREFERENCES, ClientType
+from src.models.client_brief import ClientBrief, Platform
+from src.models.template import TemplateType
+from src.utils import template_index as template_index_module
+from src.utils.template_cache import get_cache_manager
+from src.utils.template_index import (
+    TemplateIndex,
+    iter_bits,
+    load_compiled_index,
+    save_compiled_index,
+)
+from src.utils.template_loader import TemplateLoader
+
+LIBRARY = Path(__file__).parent.parent.parent / "02_POST_TEMPLATE_LIBRARY.md"
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    """Compiled indexes go to a temporary directory"""
+    with patch.object(template_index_module.settings, "TEMPLATE_INDEX_DIR", str(tmp_path)):
+        yield tmp_path
+
+
+@pytest.fixture
+def loader(index_dir):
+    get_cache_manager().clear()
+    return TemplateLoader(template_file=LIBRARY)
+
+
+def _brief(stories=None, questions=None) -> ClientBrief:
+    return ClientBrief(
+        company_name="Test Company",
+        business_description="B2B SaaS platform for software teams",
+        ideal_customer="Engineering managers at startups",
+        main_problem_solved="Slow release cycles",
+        platforms=[Platform.LINKEDIN],
+        stories=stories or [],
+        customer_questions=questions or [],
+    )
+
+
+def _list_select(templates, client_type, brief, count, boost_ids, avoid_ids):
+    """Reference: the list-based selection passes the index replaces"""
+    preferences = TEMPLATE_PREFERENCES.get(client_type, TEMPLATE_PREFERENCES[ClientType.UNKNOWN])
+    preferred_types = set(preferences["preferred"])
+    avoid_types = set(preferences["avoid"])
+    selected, remaining = [], list(templates)
+
+    def take(candidates, check_fill=True):
+        for template in candidates:
+            if (not check_fill or template.can_be_filled(brief)[0]) and len(selected) < count:
+                selected.append(template)
+                remaining.remove(template)
+
+    take([t for t in remaining if t.template_id in boost_ids])
+    take(
+        [
+            t
+            for t in remaining
+            if t.template_type in preferred_types and t.template_id not in avoid_ids
+        ]
+    )
+    take(
+        [
+            t
+            for t in remaining
+            if t.template_type not in avoid_types and t.template_id not in avoid_ids
+        ]
+    )
+    take([t for t in remaining if t.template_id not in avoid_ids], check_fill=False)
+    take(list(remaining), check_fill=False)
+    return selected
+
+
+class TestSelection:
+    """Test bitset selection"""
+
+    def test_iter_bits_ascending(self):
+        """Test set bit positions come out in library order"""
+        assert list(iter_bits(0b101001)) == [0, 3, 5]
+        assert list(iter_bits(0)) == []
+
+    @pytest.mark.parametrize("client_type", list(ClientType))
+    @pytest.mark.parametrize("with_stories", [False, True])
+    def test_matches_list_based_passes(self, loader, client_type, with_stories):
+        """Test every client type selects the same templates as the list passes"""
+        brief = _brief(stories=["We shipped in a week"] if with_stories else None)
+        index = loader.index
+
+        for count, boost_ids, avoid_ids in [(15, set(), set()), (8, {9, 12}, {3}), (5, {1}, set())]:
+            expected = _list_select(
+                loader.templates, client_type, brief, count, boost_ids, avoid_ids
+            )
+            actual = index.select(client_type, brief, count, boost_ids, avoid_ids)
+            assert [t.template_id for t in actual] == [t.template_id for t in expected]
+
+    def test_unfillable_templates_come_after_fillable(self, loader):
+        """Test story templates are only used once fillable ones run out"""
+        selected = loader.index.select(ClientType.B2B_SAAS, _brief(), count=15)
+
+        story_positions = [i for i, t in enumerate(selected) if t.requires_story]
+        assert story_positions == list(range(15 - len(story_positions), 15))
+
+    def test_avoided_ids_are_last_resort_without_duplicates(self, loader):
+        """Test memory-avoided templates fill the tail and nothing is picked twice"""
+        selected = loader.index.select(
+            ClientType.UNKNOWN, _brief(), count=15, avoid_templates={2, 5}
+        )
+
+        ids = [t.template_id for t in selected]
+        assert len(ids) == len(set(ids)) == 15
+        assert set(ids[-2:]) == {2, 5}
+
+    def test_boost_does_not_force_unfillable_template(self, loader):
+        """Test boosting a story template is ignored when the brief has no stories"""
+        selected = loader.select_templates_for_client(_brief(), count=10, boost_templates=[7])
+
+        ids = {t.template_id for t in selected}
+        assert len(ids) == 10
+        assert 7 not in ids
+
+    def test_lookups(self, loader):
+        """Test ID/type lookups answer from the index"""
+        assert loader.get_template_by_id(3).template_id == 3
+        assert loader.get_template_by_id(99) is None
+        assert all(
+            t.template_type == TemplateType.STATISTIC
+            for t in loader.get_templates_by_type(TemplateType.STATISTIC)
+        )
+
+    def test_index_follows_replaced_template_list(self, loader):
+        """Test assigning a new template list rebuilds the index"""
+        loader.templates = loader.templates[:3]
+
+        assert len(loader.index) == 3
+        assert loader.get_template_by_id(10) is None
+
+
+class TestCompiledIndex:
+    """Test the persisted index"""
+
+    def test_round_trip_preserves_masks(self, loader):
+        """Test from_dict(to_dict()) restores templates and masks without recomputing"""
+        index = loader.index
+        restored = TemplateIndex.from_dict(index.to_dict())
+
+        assert restored.templates == index.templates
+        assert restored.preferred_masks == index.preferred_masks
+        assert restored.requires_story_mask == index.requires_story_mask
+
+    def test_new_process_loads_compiled_index_instead_of_parsing(self, loader):
+        """Test a loader with a cold in-process cache skips the Markdown parse"""
+        get_cache_manager().clear()
+
+        with patch("src.utils.template_loader.TEMPLATE_PATTERN") as pattern:
+            second = TemplateLoader(template_file=LIBRARY)
+
+        pattern.finditer.assert_not_called()
+        assert second.templates == loader.templates
+
+    def test_stale_index_ignored_after_library_change(self, index_dir, tmp_path):
+        """Test editing the library invalidates the compiled index"""
+        library = tmp_path / "library.md"
+        library.write_text(LIBRARY.read_text(encoding="utf-8"), encoding="utf-8")
+        get_cache_manager().clear()
+        index = TemplateLoader(template_file=library).index
+        assert save_compiled_index(index, library) is not None
+        assert load_compiled_index(library) is not None
+
+        stat = library.stat()
+        os.utime(library, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert load_compiled_index(library) is None
@@ -0,0 +1,238 @@
+"""
+Unit tests for the persistent generation worker pool.
+
+Jobs run inline (GENERATION_WORKERS=0 mode) against fake warm worker state,
+covering job dispatch, structured results, usage roll-up and failure handling.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.research.base import ResearchResult
+from src.utils import worker_pool
+from src.utils.run_context import get_current_run, run_scope
+from src.utils.worker_pool import (
+    GenerationJob,
+    GenerationWorkerPool,
+    ResearchJob,
+    RevisionJob,
+)
+
+POST = {
+    "content": "Original post content",
+    "template_id": 1,
+    "template_name": "Problem Recognition",
+    "variant": 1,
+    "client_name": "Acme",
+}
+
+
+class FakeCoordinator:
+    """Coordinator whose workflow writes a posts JSON file and records API usage"""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.calls = []
+        self.content_generator = SimpleNamespace(
+            template_loader=SimpleNamespace(get_all_templates=lambda: ["template"])
+        )
+
+    async def run_complete_workflow(self, **kwargs):
+        self.calls.append(kwargs)
+        get_current_run().record_call("post_generation", input_tokens=100, output_tokens=50)
+        posts_json = self.output_dir / "Acme_posts.json"
+        posts_json.write_text(json.dumps([POST]), encoding="utf-8")
+        return {"posts_json": posts_json, "deliverable": self.output_dir / "Acme_deliverable.md"}
+
+    async def _process_brief_input(self, brief_input, interactive=False):
+        return "parsed brief"
+
+
+class FakeRevisionAgent:
+    async def revise_multiple_posts_async(self, posts, client_feedback, client_brief, templates):
+        assert client_brief == "parsed brief"
+        assert templates == ["template"]
+        return [(post.model_copy(update={"content": "Revised"}), "Shortened") for post in posts]
+
+
+class FakeResearchTool:
+    """Stands in for a ResearchTool subclass"""
+
+    runs = []  # (run_id, project_id) of the run each execution was charged to
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+
+    def execute(self, inputs, force_refresh=False):
+        # Like ResearchTool.execute: a project scope that joins any active run
+        with run_scope(project_id=self.project_id) as usage:
+            FakeResearchTool.runs.append((usage.run_id, usage.project_id))
+        return ResearchResult(
+            tool_name="fake_tool",
+            project_id=self.project_id,
+            executed_at=datetime(2025, 1, 1),
+            success=True,
+            outputs={"json": Path("out/analysis.json")},
+            metadata={"inputs_seen": sorted(inputs)},
+        )
+
+
+@pytest.fixture
+def fake_state(tmp_path):
+    """Warm worker state backed by fakes (patched for every worker thread)"""
+    state = SimpleNamespace(
+        coordinator=FakeCoordinator(tmp_path),
+        revision_agent=FakeRevisionAgent(),
+        loop=None,
+    )
+
+    def get_state():
+        # Each worker thread owns a persistent loop, as in a worker process
+        if state.loop is None:
+            state.loop = asyncio.new_event_loop()
+        return state
+
+    with patch.object(worker_pool, "_state", side_effect=get_state):
+        yield state
+
+
+@pytest.fixture
+def pool():
+    pool = GenerationWorkerPool(max_workers=0)
+    yield pool
+    pool.shutdown()
+
+
+class TestJobDispatch:
+    """Test each job type returns structured results"""
+
+    @pytest.mark.asyncio
+    async def test_generation_job_returns_posts_and_files(self, pool, fake_state, tmp_path):
+        """Test generation results carry posts loaded from the workflow's JSON output"""
+        result = await pool.submit(
+            GenerationJob(brief_path="brief.txt", num_posts=10, platform="twitter")
+        )
+
+        assert result.success, result.error
+        assert result.posts == [POST]
+        assert result.output_dir == str(tmp_path)
+        assert set(result.files) == {"posts_json", "deliverable"}
+        assert result.usage["output_tokens"] == 50
+
+        call = fake_state.coordinator.calls[0]
+        assert call["num_posts"] == 10
+        assert call["platform"].value == "twitter"
+
+    @pytest.mark.asyncio
+    async def test_revision_job_returns_revised_posts(self, pool, fake_state):
+        """Test revision results pair each revised post with its change summary"""
+        result = await pool.submit(
+            RevisionJob(brief_path="brief.txt", posts=[POST, POST], client_feedback="Shorter")
+        )
+
+        assert result.success, result.error
+        assert [p["content"] for p in result.posts] == ["Revised", "Revised"]
+        assert result.changes == ["Shortened", "Shortened"]
+
+    @pytest.mark.asyncio
+    async def test_research_job_resolves_tool_class(self, pool, fake_state):
+        """Test research jobs import the tool by path and flatten its result"""
+        job = ResearchJob.for_tool(FakeResearchTool, project_id="proj-1", inputs={"a": 1})
+        assert job.tool_path == f"{__name__}:FakeResearchTool"
+
+        result = await pool.submit(job)
+
+        assert result.success
+        assert result.files == {"json": str(Path("out/analysis.json"))}
+        assert result.metadata["tool_name"] == "fake_tool"
+        assert result.metadata["inputs_seen"] == ["a"]
+
+
+class TestPoolBehaviour:
+    """Test usage roll-up, warm reuse and failures"""
+
+    @pytest.mark.asyncio
+    async def test_usage_folds_into_callers_run(self, pool, fake_state):
+        """Test worker API usage is attributed to the submitting run"""
+        with run_scope(run_id="run-pool") as usage:
+            await pool.submit(GenerationJob(brief_path="brief.txt"))
+            await pool.submit(GenerationJob(brief_path="brief.txt"))
+
+        assert usage.totals["api_calls"] == 2
+        assert usage.operation_tokens("post_generation") == 300
+
+    @pytest.mark.asyncio
+    async def test_worker_calls_charged_to_job_run_and_project(self, pool, fake_state):
+        """Test nested scopes in the worker join the job's run, not an anonymous one"""
+        FakeResearchTool.runs.clear()
+
+        await pool.submit(ResearchJob.for_tool(FakeResearchTool, "proj-1", run_id="run-r"))
+        with run_scope(run_id="run-caller", project_id="proj-2"):
+            await pool.submit(ResearchJob.for_tool(FakeResearchTool, "proj-1"))
+
+        assert FakeResearchTool.runs == [("run-r", "proj-1"), ("run-caller", "proj-1")]
+
+    @pytest.mark.asyncio
+    async def test_worker_state_reused_across_jobs(self, pool, fake_state):
+        """Test consecutive jobs share one warm coordinator and event loop"""
+        await pool.submit(GenerationJob(brief_path="brief.txt"))
+        loop = fake_state.loop
+        await pool.submit(GenerationJob(brief_path="brief.txt"))
+
+        assert len(fake_state.coordinator.calls) == 2
+        assert fake_state.loop is loop
+
+    @pytest.mark.asyncio
+    async def test_job_exception_reported_in_result(self, pool, fake_state):
+        """Test a failing job returns success=False instead of raising"""
+
+        async def boom(**kwargs):
+            raise FileNotFoundError("Brief file not found: missing.txt")
+
+        fake_state.coordinator.run_complete_workflow = boom
+        result = await pool.submit(GenerationJob(brief_path="missing.txt"))
+
+        assert not result.success
+        assert "Brief file not found" in result.error
+
+    @pytest.mark.asyncio
+    async def test_timeout_reported_in_result(self, pool, fake_state):
+        """Test the caller stops waiting after the timeout"""
+
+        def slow_execute(self, inputs):
+            time.sleep(0.5)
+
+        with patch.object(FakeResearchTool, "execute", slow_execute):
+            result = await pool.submit(
+                ResearchJob.for_tool(FakeResearchTool, project_id="proj-1"), timeout=0.05
+            )
+
+        assert not result.success
+        assert "timed out" in result.error
+
+    def test_blocking_run_timeout(self, pool, fake_state):
+        """Test the blocking entry point reports concurrent.futures timeouts"""
+
+        def slow_execute(self, inputs):
+            time.sleep(0.5)
+
+        with patch.object(FakeResearchTool, "execute", slow_execute):
+            result = pool.run(
+                ResearchJob.for_tool(FakeResearchTool, project_id="proj-1"), timeout=0.05
+            )
+
+        assert not result.success
+        assert "timed out" in result.error
+
+    def test_blocking_run(self, pool, fake_state):
+        """Test the synchronous entry point returns the same structured result"""
+        result = pool.run(GenerationJob(brief_path="brief.txt"))
+
+        assert result.success
+        assert result.posts == [POST]